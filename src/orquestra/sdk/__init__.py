@@ -11,6 +11,8 @@ from ._base._api import (
     current_run_ids,
     list_workflow_runs,
     migrate_config_file,
+    wait_all,
+    wait_any,
 )
 from ._base._dsl import (
     ArtifactFuture,
@@ -56,6 +58,8 @@ __all__ = [
     "migrate_config_file",
     "secrets",
     "task",
+    "wait_all",
+    "wait_any",
     "workflow",
     "workflow_logger",
     "wfprint",
@@ -10,13 +10,23 @@ We re-export symbols here for grouping concepts under the "api" umbrella, e.g.
 
 from ._config import RuntimeConfig, migrate_config_file
 from ._task_run import TaskRun, current_run_ids
-from ._wf_run import WorkflowRun, list_workflow_runs
+from ._waiting import wait_all, wait_any
+from ._wf_run import (
+    WorkflowRun,
+    iter_workflow_run_statuses,
+    iter_workflow_runs,
+    list_workflow_runs,
+)
 
 __all__ = [
     "RuntimeConfig",
     "TaskRun",
     "current_run_ids",
     "WorkflowRun",
+    "iter_workflow_run_statuses",
+    "iter_workflow_runs",
     "list_workflow_runs",
     "migrate_config_file",
+    "wait_all",
+    "wait_any",
 ]
@@ -17,6 +17,7 @@ from orquestra.sdk.schema.workflow_run import TaskRunId, WorkflowRunId
 
 from ..._base import _exec_ctx
 from ...exceptions import TaskRunNotFound, WorkflowRunIDNotFoundError
+from .._artifact_cache import ArtifactReader
 from ..abc import ArtifactValue, RuntimeInterface
 from ..serde import deserialize_constant
 
@@ -44,6 +45,7 @@ class TaskRun:
         workflow_run_id: WorkflowRunId,
         runtime: RuntimeInterface,
         wf_def: ir.WorkflowDef,
+        artifacts: t.Optional[ArtifactReader] = None,
     ):
         """
         This object isn't intended to be directly initialized. Instead, please use
@@ -52,6 +54,9 @@ class TaskRun:
         self._task_run_id = task_run_id
         self._task_invocation_id = task_invocation_id
         self._runtime = runtime
+        self._artifacts = (
+            artifacts if artifacts is not None else ArtifactReader(runtime, None)
+        )
         self._wf_def = wf_def
         self._workflow_run_id = workflow_run_id
 
@@ -121,9 +126,9 @@ class TaskRun:
         Raises:
             TaskRunNotFound: if the task wasn't completed yet, or the ID is invalid.
         """
-        # NOTE: this is a possible place for improvement. If future runtime APIs support
-        # getting a subset of artifacts, we should use them here.
-        workflow_artifacts = self._runtime.get_available_outputs(self.workflow_run_id)
+        workflow_artifacts = self._artifacts.get_outputs(
+            self.workflow_run_id, [self.task_invocation_id]
+        )
 
         try:
             task_outputs = workflow_artifacts[self.task_invocation_id]
@@ -150,6 +155,30 @@ class TaskRun:
             if output in inv.output_ids
         )
 
+    def _parent_invocation_ids(
+        self, task_invocation: ir.TaskInvocation
+    ) -> t.Set[TaskInvocationId]:
+        """
+        Helper method that finds invocations producing the arguments of
+        ``task_invocation``.
+        """
+        parent_inv_ids = set()
+        # for every arg in the function
+        for arg_id in chain(
+            task_invocation.args_ids, task_invocation.kwargs_ids.values()
+        ):
+            # If it's constant or secret, there is no parent task that produces it
+            if (
+                arg_id in self._wf_def.constant_nodes
+                or arg_id in self._wf_def.secret_nodes
+            ):
+                continue
+            # find invocation that produces it
+            parent_inv = self._find_invocation_by_output_id(arg_id)
+            parent_inv_ids.add(parent_inv.id)
+
+        return parent_inv_ids
+
     def _find_value_by_id(
         self,
         arg_id: ir.ArgumentId,
@@ -199,15 +228,17 @@ class TaskRun:
         Returns:  Input namedTuple with Input.args and .kwargs parameters.
         """
 
-        all_inv_outputs = self._runtime.get_available_outputs(self.workflow_run_id)
-
         task_invocation = self._wf_def.task_invocations[self.task_invocation_id]
+        parent_outputs = self._artifacts.get_outputs(
+            self.workflow_run_id, sorted(self._parent_invocation_ids(task_invocation))
+        )
+
         args = [
-            self._find_value_by_id(arg_id, all_inv_outputs)
+            self._find_value_by_id(arg_id, parent_outputs)
             for arg_id in task_invocation.args_ids
         ]
         kwargs = {
-            param_name: self._find_value_by_id(kwarg_id, all_inv_outputs)
+            param_name: self._find_value_by_id(kwarg_id, parent_outputs)
             for param_name, kwarg_id in task_invocation.kwargs_ids.items()
         }
 
@@ -229,17 +260,7 @@ class TaskRun:
 
         # 1. Get parent invocation IDs
         task_invocation = self._wf_def.task_invocations[self.task_invocation_id]
-        parent_inv_ids = set()
-        # for every arg in the function
-        for arg_id in chain(
-            task_invocation.args_ids, task_invocation.kwargs_ids.values()
-        ):
-            # If it's constant, there is no parent task that produces it
-            if arg_id in self._wf_def.constant_nodes:
-                continue
-            # find invocation that produces it
-            parent_inv = self._find_invocation_by_output_id(arg_id)
-            parent_inv_ids.add(parent_inv.id)
+        parent_inv_ids = self._parent_invocation_ids(task_invocation)
 
         # 2. Get parent task run models
         wf_run_model = self._runtime.get_workflow_run_status(self.workflow_run_id)
@@ -255,6 +276,7 @@ class TaskRun:
                 workflow_run_id=self.workflow_run_id,
                 runtime=self._runtime,
                 wf_def=self._wf_def,
+                artifacts=self._artifacts,
             )
             for model in parent_run_models
         ]
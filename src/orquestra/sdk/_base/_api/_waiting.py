@@ -0,0 +1,227 @@
+################################################################################
+# © Copyright 2023 Zapata Computing Inc.
+################################################################################
+"""
+Waiting until workflow runs finish.
+
+Runs are polled together: each poll makes a single ``get_workflow_run_states()`` call
+per runtime. The time between polls grows exponentially, and is randomly spread so
+that many clients don't poll a cluster in lockstep.
+"""
+import random
+import sys
+import time
+import typing as t
+
+from ... import exceptions
+from ...schema.configs import RuntimeName
+from ...schema.workflow_run import State, WorkflowRunId
+
+if t.TYPE_CHECKING:
+    from ._wf_run import WorkflowRun
+
+DEFAULT_INITIAL_INTERVAL = 0.5
+DEFAULT_MAX_INTERVAL = 4.0
+_BACKOFF_FACTOR = 2.0
+# Each sleep time is randomly spread by this fraction, up or down.
+_JITTER = 0.2
+
+_UNFINISHED_STATES = frozenset({State.WAITING, State.RUNNING})
+_FINISHED_STATES = frozenset({State.SUCCEEDED, State.TERMINATED, State.FAILED})
+
+
+def _backoff(initial: float, maximum: float) -> t.Iterator[float]:
+    """
+    Yields sleep times that start at ``initial`` and double until ``maximum``.
+    """
+    interval = min(initial, maximum)
+    while True:
+        yield min(interval * random.uniform(1 - _JITTER, 1 + _JITTER), maximum)
+        interval = min(interval * _BACKOFF_FACTOR, maximum)
+
+
+def _group_by_runtime(
+    runs: t.Sequence["WorkflowRun"],
+) -> t.List[t.List["WorkflowRun"]]:
+    """
+    Runs that were started with equal configs share the runtime backend, so their
+    states can be read with a single call. In-process runtimes keep their runs in
+    memory, so each of them is polled separately.
+    """
+    groups: t.List[t.List["WorkflowRun"]] = []
+    for run in runs:
+        for group in groups:
+            if _same_backend(group[0], run):
+                group.append(run)
+                break
+        else:
+            groups.append([run])
+    return groups
+
+
+def _same_backend(run1: "WorkflowRun", run2: "WorkflowRun") -> bool:
+    if run1._runtime is run2._runtime:
+        return True
+    config = run1._config
+    if config is None or config._runtime_name == RuntimeName.IN_PROCESS:
+        return False
+    return config == run2._config
+
+
+def _poll(runs: t.Sequence["WorkflowRun"]) -> t.Dict[WorkflowRunId, State]:
+    states: t.Dict[WorkflowRunId, State] = {}
+    for group in _group_by_runtime(runs):
+        runtime = group[0]._runtime
+        states.update(runtime.get_workflow_run_states([run.run_id for run in group]))
+
+    # Runtimes are supposed to raise for runs they can't find. Without this check,
+    # such runs would be waited for forever.
+    if missing := [run.run_id for run in runs if run.run_id not in states]:
+        raise exceptions.WorkflowRunNotFoundError(
+            f"Couldn't get the state of workflow run(s): {', '.join(missing)}"
+        )
+    return states
+
+
+def _check_finished_state(run_id: WorkflowRunId, state: State):
+    if state not in _FINISHED_STATES:
+        raise NotImplementedError(
+            f'Workflow run with id "{run_id}" '
+            f'finished with unrecognised state "{state}"'
+        )
+
+
+def _wait(
+    runs: t.Sequence["WorkflowRun"],
+    *,
+    n_required: int,
+    timeout: t.Optional[float],
+    initial_interval: float,
+    max_interval: float,
+    verbose: bool,
+) -> t.Dict[WorkflowRunId, State]:
+    """
+    Polls the runs until at least ``n_required`` of them finish. Finished runs aren't
+    polled again.
+
+    Returns:
+        The states of the runs that finished, in the order they were found.
+    """
+    deadline = None if timeout is None else time.monotonic() + timeout
+    pending = {run.run_id: run for run in runs}
+    finished: t.Dict[WorkflowRunId, State] = {}
+    sleep_times = _backoff(initial_interval, max_interval)
+
+    while True:
+        states = _poll(list(pending.values()))
+        for run_id, state in states.items():
+            if state not in _UNFINISHED_STATES:
+                _check_finished_state(run_id, state)
+                finished[run_id] = state
+                del pending[run_id]
+
+        if len(finished) >= n_required or not pending:
+            if verbose:
+                for run_id, state in finished.items():
+                    print(f"{run_id} is {state.name}", file=sys.stderr)
+            return finished
+
+        sleep_time = next(sleep_times)
+        if deadline is not None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError(
+                    f"{len(pending)} workflow run(s) didn't finish in {timeout}s"
+                )
+            sleep_time = min(sleep_time, remaining)
+
+        if verbose:
+            if len(runs) == 1:
+                run_id = next(iter(pending))
+                status = f"{run_id} is {states[run_id].name}"
+            else:
+                status = f"{len(finished)}/{len(pending) + len(finished)} finished"
+            print(f"{status}. Sleeping for {sleep_time:.1f}s...", file=sys.stderr)
+
+        time.sleep(sleep_time)
+
+
+def wait_all(
+    runs: t.Iterable["WorkflowRun"],
+    *,
+    timeout: t.Optional[float] = None,
+    max_interval: float = DEFAULT_MAX_INTERVAL,
+    verbose: bool = False,
+) -> t.List[State]:
+    """Block until all of the workflow runs finish.
+
+    The runs are polled together, with a single request per runtime where the
+    runtime supports it. Polling starts often and slows down until ``max_interval``.
+
+    Args:
+        runs: the workflow runs to wait for.
+        timeout: the longest time to wait, in seconds. If omitted, waits
+            indefinitely.
+        max_interval: the longest time between two polls, in seconds.
+        verbose: If ``True``, each iteration of the polling loop will print to
+            stderr.
+
+    Returns:
+        The states of the finished workflow runs, in the same order as ``runs``.
+
+    Raises:
+        TimeoutError: when some of the runs didn't finish in ``timeout`` seconds.
+    """
+    runs = list(runs)
+    finished = _wait(
+        runs,
+        n_required=len(runs),
+        timeout=timeout,
+        initial_interval=DEFAULT_INITIAL_INTERVAL,
+        max_interval=max_interval,
+        verbose=verbose,
+    )
+    return [finished[run.run_id] for run in runs]
+
+
+def wait_any(
+    runs: t.Iterable["WorkflowRun"],
+    *,
+    timeout: t.Optional[float] = None,
+    max_interval: float = DEFAULT_MAX_INTERVAL,
+    verbose: bool = False,
+) -> "WorkflowRun":
+    """Block until at least one of the workflow runs finishes.
+
+    The runs are polled together, with a single request per runtime where the
+    runtime supports it. Polling starts often and slows down until ``max_interval``.
+
+    Args:
+        runs: the workflow runs to wait for.
+        timeout: the longest time to wait, in seconds. If omitted, waits
+            indefinitely.
+        max_interval: the longest time between two polls, in seconds.
+        verbose: If ``True``, each iteration of the polling loop will print to
+            stderr.
+
+    Returns:
+        A finished workflow run. If more than one run finished, the first of them in
+        the order of ``runs``.
+
+    Raises:
+        TimeoutError: when none of the runs finished in ``timeout`` seconds.
+        ValueError: when ``runs`` is empty.
+    """
+    runs = list(runs)
+    if not runs:
+        raise ValueError("At least one workflow run is required")
+
+    finished = _wait(
+        runs,
+        n_required=1,
+        timeout=timeout,
+        initial_interval=DEFAULT_INITIAL_INTERVAL,
+        max_interval=max_interval,
+        verbose=verbose,
+    )
+    return next(run for run in runs if run.run_id in finished)
@@ -3,8 +3,6 @@
 ################################################################################
 
 import re
-import sys
-import time
 import typing as t
 import warnings
 from datetime import timedelta
@@ -28,10 +26,12 @@ from ...schema.workflow_run import ProjectId, State, TaskInvocationId
 from ...schema.workflow_run import WorkflowRun as WorkflowRunModel
 from ...schema.workflow_run import WorkflowRunId, WorkflowRunMinimal, WorkspaceId
 from .. import serde
+from .._artifact_cache import ArtifactReader
 from .._spaces._resolver import resolve_studio_project_ref
 from ..abc import RuntimeInterface
 from ._config import RuntimeConfig, _resolve_config
 from ._task_run import TaskRun
+from ._waiting import wait_all
 
 COMPLETED_STATES = [State.FAILED, State.TERMINATED, State.SUCCEEDED]
 
@@ -166,6 +166,18 @@ class WorkflowRun:
         self._runtime = runtime
         self._config = config
 
+    @cached_property
+    def _artifacts(self) -> ArtifactReader:
+        if self._config is None:
+            return ArtifactReader.for_config(self._runtime, None, None, {})
+
+        return ArtifactReader.for_config(
+            self._runtime,
+            self._config._runtime_name,
+            self._config.name,
+            self._config._get_runtime_options(),
+        )
+
     def __str__(self) -> str:
         outstr: str = ""
 
@@ -216,8 +228,12 @@ class WorkflowRun:
         This method draws no distinctions between whether the workflow run completes
         successfully, fails, or is terminated for any other reason.
 
+        The status is checked often at first, then less and less often until the
+        checks are ``1 / frequency`` seconds apart.
+
         Args:
-            frequency: The frequency in Hz at which the status should be checked.
+            frequency: The lowest frequency in Hz at which the status should be
+                checked.
             verbose: If ``True``, each iteration of the polling loop will print to
                 stderr.
 
@@ -227,33 +243,9 @@ class WorkflowRun:
 
         assert frequency > 0.0, "Frequency must be a positive non-zero value"
 
-        status = self.get_status()
+        (state,) = wait_all([self], max_interval=1.0 / frequency, verbose=verbose)
 
-        while status == State.RUNNING or status == State.WAITING:
-            sleep_time = 1.0 / frequency
-
-            if verbose:
-                print(
-                    f"{self.run_id} is {status.name}. Sleeping for {sleep_time}s...",
-                    file=sys.stderr,
-                )
-
-            time.sleep(sleep_time)
-            status = self.get_status()
-
-        if status not in [State.SUCCEEDED, State.TERMINATED, State.FAILED]:
-            raise NotImplementedError(
-                f'Workflow run with id "{self.run_id}" '
-                f'finished with unrecognised state "{status}"'
-            )
-
-        if verbose:
-            print(
-                f"{self.run_id} is {status.name}",
-                file=sys.stderr,
-            )
-
-        return status
+        return state
 
     def stop(self):
         """
@@ -317,7 +309,7 @@ class WorkflowRun:
             results = (
                 *(
                     serde.deserialize(o)
-                    for o in self._runtime.get_workflow_run_outputs_non_blocking(
+                    for o in self._artifacts.get_workflow_run_outputs_non_blocking(
                         self.run_id
                     )
                 ),
@@ -346,7 +338,7 @@ class WorkflowRun:
         """
         # NOTE: this is a possible place for improvement. If future runtime APIs support
         # getting a subset of artifacts, we should use them here.
-        inv_outputs = self._runtime.get_available_outputs(self.run_id)
+        inv_outputs = self._artifacts.get_available_outputs(self.run_id)
 
         # The output shape differs across runtimes when the workflow functions returns a
         # single, packed future. See more in:
@@ -372,6 +364,24 @@ class WorkflowRun:
         """
         return self._runtime.get_workflow_logs(wf_run_id=self.run_id)
 
+    def iter_logs(
+        self, *, follow: bool = False
+    ) -> t.Iterator[t.Tuple[TaskInvocationId, str]]:
+        """
+        Unstable: this API will change.
+
+        Streaming version of ``get_logs()``. Log lines are yielded as they are read,
+        without keeping all of them in memory.
+
+        Args:
+            follow: if ``True``, keeps yielding new log lines as they are produced,
+                until the workflow run finishes.
+
+        Yields:
+            (task invocation ID, log line) pairs.
+        """
+        return self._runtime.iter_workflow_logs(self.run_id, follow=follow)
+
     # TODO: ORQSDK-617 add filtering ability for the users
     def get_tasks(self) -> t.Set[TaskRun]:
         wf_run_model = self.get_status_model()
@@ -383,6 +393,7 @@ class WorkflowRun:
                 workflow_run_id=self.run_id,
                 runtime=self._runtime,
                 wf_def=self._wf_def,
+                artifacts=self._artifacts,
             )
             for task_run_model in wf_run_model.task_runs
         }
@@ -421,6 +432,112 @@ def list_workflow_runs(
     Returns:
         a list of WorkflowRuns
     """
+    return list(
+        iter_workflow_runs(
+            config,
+            limit=limit,
+            max_age=max_age,
+            state=state,
+            project_dir=project_dir,
+            workspace=workspace,
+            project=project,
+        )
+    )
+
+
+def iter_workflow_runs(
+    config: t.Union[ConfigName, "RuntimeConfig"],
+    *,
+    limit: t.Optional[int] = None,
+    max_age: t.Optional[str] = None,
+    state: t.Optional[t.Union[State, t.List[State]]] = None,
+    project_dir: t.Optional[t.Union[Path, str]] = None,
+    workspace: t.Optional[WorkspaceId] = None,
+    project: t.Optional[ProjectId] = None,
+) -> t.Iterator[WorkflowRun]:
+    """
+    Lazy version of ``list_workflow_runs()``, accepting the same arguments. Runs are
+    yielded as soon as the runtime returns them.
+
+    The config and filters are resolved when this function is called, so errors
+    about them are raised immediately. Runtime errors are raised while iterating.
+    """
+    resolved_config, runtime, run_statuses = _iter_workflow_run_models(
+        config,
+        limit=limit,
+        max_age=max_age,
+        state=state,
+        project_dir=project_dir,
+        workspace=workspace,
+        project=project,
+    )
+
+    # We need to convert to the public API notion of a WorkflowRun
+    return (
+        WorkflowRun(
+            run_id=run_status.id,
+            wf_def=run_status.workflow_def,
+            runtime=runtime,
+            config=resolved_config,
+        )
+        for run_status in run_statuses
+    )
+
+
+def iter_workflow_run_statuses(
+    config: t.Union[ConfigName, "RuntimeConfig"],
+    *,
+    limit: t.Optional[int] = None,
+    max_age: t.Optional[str] = None,
+    state: t.Optional[t.Union[State, t.List[State]]] = None,
+    project_dir: t.Optional[t.Union[Path, str]] = None,
+    workspace: t.Optional[WorkspaceId] = None,
+    project: t.Optional[ProjectId] = None,
+) -> t.Iterator[WorkflowRunModel]:
+    """
+    Like ``iter_workflow_runs()``, but yields the status of each run, as returned by
+    ``WorkflowRun.get_status_model()``. Statuses the runtime returns when listing
+    the runs are reused. Only the runs listed without a status are fetched again.
+
+    The config and filters are resolved when this function is called, so errors
+    about them are raised immediately. Runtime errors are raised while iterating.
+    """
+    _, runtime, run_models = _iter_workflow_run_models(
+        config,
+        limit=limit,
+        max_age=max_age,
+        state=state,
+        project_dir=project_dir,
+        workspace=workspace,
+        project=project,
+    )
+
+    return (
+        run_model
+        if isinstance(run_model, WorkflowRunModel)
+        else runtime.get_workflow_run_status(run_model.id)
+        for run_model in run_models
+    )
+
+
+def _iter_workflow_run_models(
+    config: t.Union[ConfigName, "RuntimeConfig"],
+    *,
+    limit: t.Optional[int] = None,
+    max_age: t.Optional[str] = None,
+    state: t.Optional[t.Union[State, t.List[State]]] = None,
+    project_dir: t.Optional[t.Union[Path, str]] = None,
+    workspace: t.Optional[WorkspaceId] = None,
+    project: t.Optional[ProjectId] = None,
+) -> t.Tuple["RuntimeConfig", RuntimeInterface, t.Iterator[WorkflowRunMinimal]]:
+    """
+    Resolves the config and asks its runtime for the workflow runs, as returned by
+    the runtime. Some runtimes list the runs with their status, see
+    ``orquestra.sdk.schema.workflow_run.WorkflowRun``.
+
+    Returns:
+        The resolved config, its runtime, and the iterator over the listed runs.
+    """
     # TODO: update docstring when platform workspace/project filtering is merged [ORQP-1479](https://zapatacomputing.atlassian.net/browse/ORQP-1479?atlOrigin=eyJpIjoiZWExMWI4MDUzYTI0NDQ0ZDg2ZTBlNzgyNjE3Njc4MDgiLCJwIjoiaiJ9) # noqa: E501
 
     if project and not workspace:
@@ -447,7 +564,7 @@ def list_workflow_runs(
     # Grab the "workflow runs" from the runtime.
     # Note: WorkflowRun means something else in runtime land. To avoid overloading, this
     #       import is aliased to WorkflowRunStatus in here.
-    run_statuses: t.Sequence[WorkflowRunMinimal] = runtime.list_workflow_runs(
+    run_statuses: t.Iterator[WorkflowRunMinimal] = runtime.iter_workflow_runs(
         limit=limit,
         max_age=_parse_max_age(max_age),
         state=state,
@@ -455,18 +572,7 @@ def list_workflow_runs(
         project=project,
     )
 
-    # We need to convert to the public API notion of a WorkflowRun
-    runs = []
-    for run_status in run_statuses:
-        assert run_status.workflow_def is not None
-        workflow_run = WorkflowRun(
-            run_id=run_status.id,
-            wf_def=run_status.workflow_def,
-            runtime=runtime,
-            config=resolved_config,
-        )
-        runs.append(workflow_run)
-    return runs
+    return resolved_config, runtime, run_statuses
 
 
 def _parse_max_age(age: t.Optional[str]) -> t.Optional[timedelta]:
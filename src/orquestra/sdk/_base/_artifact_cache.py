@@ -0,0 +1,484 @@
+################################################################################
+# © Copyright 2023 Zapata Computing Inc.
+################################################################################
+"""
+Local cache of finished workflow runs' artifacts.
+
+Remote runtimes download every artifact of a workflow run each time a user asks for
+them. Artifacts of a finished run can't change anymore, so we can keep a copy on disk
+and skip the download next time.
+
+Artifacts are stored in files named after the hash of their content, so identical
+values are kept once. A small SQLite index maps (scope, workflow run ID, task invocation
+ID, artifact ID) to the content hash. Workflow run IDs are only unique within a single
+cluster, so each entry is scoped to the runtime configuration it was read with, see
+``cache_scope()``.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import time
+import typing as t
+from contextlib import closing, contextmanager
+from pathlib import Path
+
+import pydantic
+
+from orquestra.sdk.schema.configs import RuntimeName
+from orquestra.sdk.schema.ir import TaskInvocationId
+from orquestra.sdk.schema.responses import WorkflowResult
+from orquestra.sdk.schema.workflow_run import TERMINAL_STATES, WorkflowRunId
+
+from . import serde
+from ._env import ARTIFACT_CACHE_MAX_SIZE_ENV, ARTIFACT_CACHE_PATH_ENV
+from .abc import RuntimeInterface
+
+DEFAULT_MAX_SIZE = 1024**3
+
+# Each workflow run can have two sets of cached artifacts. "Workflow outputs" are the
+# values returned from the workflow function. They're indexed by position. "Task
+# outputs" are whole (packed) values returned from each task invocation.
+_WORKFLOW_OUTPUTS = "workflow_outputs"
+_TASK_OUTPUTS = "task_outputs"
+_NO_INV_ID = ""
+_PACKED_ARTIFACT_ID = ""
+
+_CacheEntry = t.Tuple[TaskInvocationId, str, WorkflowResult]
+
+# Bumped when the layout of the index changes. The index is a cache, so older
+# layouts are dropped instead of migrated.
+_INDEX_VERSION = 1
+
+
+def _get_default_cache_location() -> Path:
+    try:
+        return Path(os.environ[ARTIFACT_CACHE_PATH_ENV])
+    except KeyError:
+        return Path.home() / ".orquestra" / "artifacts"
+
+
+def _get_default_max_size() -> int:
+    try:
+        return int(os.environ[ARTIFACT_CACHE_MAX_SIZE_ENV])
+    except KeyError:
+        return DEFAULT_MAX_SIZE
+
+
+def cache_scope(config_name: t.Optional[str], runtime_options: t.Mapping) -> str:
+    """
+    Identifies the cluster whose workflow runs are read with a runtime configuration.
+    Credentials aren't part of it, so refreshing a token keeps the cached artifacts.
+    """
+    cluster = runtime_options.get("uri", runtime_options.get("address"))
+    return json.dumps([config_name, cluster])
+
+
+class CacheStats(t.NamedTuple):
+    hits: int
+    misses: int
+    # Total size of the cached artifacts, in bytes.
+    size: int
+    n_runs: int
+
+
+class ArtifactCache:
+    """
+    On-disk, size-bounded cache of workflow run artifacts. When the size limit is
+    exceeded, the least recently used workflow runs are evicted.
+
+    The cache doesn't know about workflow run states. It's up to the caller to store
+    artifacts of finished runs only.
+    """
+
+    @classmethod
+    def from_env(cls) -> "ArtifactCache":
+        return cls(path=_get_default_cache_location(), max_size=_get_default_max_size())
+
+    def __init__(self, path: Path, max_size: int = DEFAULT_MAX_SIZE):
+        """
+        Args:
+            path: directory to keep the cached artifacts in. Created on first write.
+            max_size: size limit of the stored artifacts, in bytes. 0 disables the
+                cache.
+        """
+        self._path = path
+        self._max_size = max_size
+
+    @property
+    def enabled(self) -> bool:
+        return self._max_size > 0
+
+    # ----------------------------- public API -------------------------------
+
+    def get_workflow_outputs(
+        self, scope: str, wf_run_id: WorkflowRunId
+    ) -> t.Optional[t.Sequence[WorkflowResult]]:
+        """
+        Args:
+            scope: the cluster the workflow run was submitted to, see
+                ``cache_scope()``.
+            wf_run_id: the workflow run to get the outputs of.
+
+        Returns:
+            Cached workflow function outputs, or None if they weren't cached.
+        """
+        entries = self._get_entries(scope, wf_run_id, _WORKFLOW_OUTPUTS)
+        if entries is None:
+            return None
+
+        return tuple(
+            result for _, _, result in sorted(entries, key=lambda entry: int(entry[1]))
+        )
+
+    def put_workflow_outputs(
+        self,
+        scope: str,
+        wf_run_id: WorkflowRunId,
+        outputs: t.Sequence[WorkflowResult],
+    ):
+        self._put_entries(
+            scope,
+            wf_run_id,
+            _WORKFLOW_OUTPUTS,
+            [
+                (_NO_INV_ID, str(output_i), output)
+                for output_i, output in enumerate(outputs)
+            ],
+        )
+
+    def get_task_outputs(
+        self, scope: str, wf_run_id: WorkflowRunId
+    ) -> t.Optional[t.Dict[TaskInvocationId, WorkflowResult]]:
+        """
+        Args:
+            scope: the cluster the workflow run was submitted to, see
+                ``cache_scope()``.
+            wf_run_id: the workflow run to get the task outputs of.
+
+        Returns:
+            Cached task outputs, keyed by task invocation ID, or None if they weren't
+            cached.
+        """
+        entries = self._get_entries(scope, wf_run_id, _TASK_OUTPUTS)
+        if entries is None:
+            return None
+
+        return {inv_id: result for inv_id, _, result in entries}
+
+    def put_task_outputs(
+        self,
+        scope: str,
+        wf_run_id: WorkflowRunId,
+        outputs: t.Mapping[TaskInvocationId, WorkflowResult],
+    ):
+        self._put_entries(
+            scope,
+            wf_run_id,
+            _TASK_OUTPUTS,
+            [
+                (inv_id, _PACKED_ARTIFACT_ID, output)
+                for inv_id, output in outputs.items()
+            ],
+        )
+
+    def stats(self) -> CacheStats:
+        """
+        Hit and miss counters are shared by all processes using this cache location.
+        """
+        if not self._index_path.exists():
+            return CacheStats(hits=0, misses=0, size=0, n_runs=0)
+
+        with self._connect() as db:
+            counters = dict(db.execute("SELECT name, value FROM counters").fetchall())
+            (size,) = db.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()
+            (n_runs,) = db.execute(
+                "SELECT COUNT(*) FROM (SELECT DISTINCT scope, wf_run_id FROM runs)"
+            ).fetchone()
+
+        return CacheStats(
+            hits=counters.get("hits", 0),
+            misses=counters.get("misses", 0),
+            size=size,
+            n_runs=n_runs,
+        )
+
+    # ------------------------------ internals -------------------------------
+
+    @property
+    def _index_path(self) -> Path:
+        return self._path / "index.db"
+
+    def _blob_path(self, content_hash: str) -> Path:
+        return self._path / "objects" / content_hash[:2] / content_hash
+
+    @contextmanager
+    def _connect(self) -> t.Iterator[sqlite3.Connection]:
+        self._path.mkdir(parents=True, exist_ok=True)
+        with closing(sqlite3.connect(self._index_path, timeout=30)) as db:
+            with db:
+                (version,) = db.execute("PRAGMA user_version").fetchone()
+                if version != _INDEX_VERSION:
+                    # Entries of older versions weren't scoped. They might belong to
+                    # any cluster, so they can't be reused.
+                    db.execute("DROP TABLE IF EXISTS runs")
+                    db.execute("DROP TABLE IF EXISTS artifacts")
+                db.execute(
+                    "CREATE TABLE IF NOT EXISTS runs (scope, wf_run_id, kind, "
+                    "last_access, PRIMARY KEY (scope, wf_run_id, kind))"
+                )
+                db.execute(
+                    "CREATE TABLE IF NOT EXISTS artifacts (scope, wf_run_id, kind, "
+                    "task_inv_id, artifact_id, content_hash, "
+                    "PRIMARY KEY (scope, wf_run_id, kind, task_inv_id, artifact_id))"
+                )
+                db.execute(
+                    "CREATE TABLE IF NOT EXISTS blobs (content_hash PRIMARY KEY, size)"
+                )
+                db.execute(
+                    "CREATE TABLE IF NOT EXISTS counters (name PRIMARY KEY, value)"
+                )
+                if version != _INDEX_VERSION:
+                    self._delete_orphaned_blobs(db)
+                    db.execute(f"PRAGMA user_version = {_INDEX_VERSION}")
+            yield db
+
+    @staticmethod
+    def _increment(db: sqlite3.Connection, counter: str):
+        db.execute(
+            "INSERT INTO counters VALUES (?, 1) "
+            "ON CONFLICT(name) DO UPDATE SET value = value + 1",
+            (counter,),
+        )
+
+    def _get_entries(
+        self, scope: str, wf_run_id: WorkflowRunId, kind: str
+    ) -> t.Optional[t.List[_CacheEntry]]:
+        if not self.enabled:
+            return None
+
+        run_key = (scope, wf_run_id, kind)
+        with self._connect() as db, db:
+            cached_run = db.execute(
+                "SELECT 1 FROM runs WHERE scope=? AND wf_run_id=? AND kind=?", run_key
+            ).fetchone()
+            rows = db.execute(
+                "SELECT task_inv_id, artifact_id, content_hash FROM artifacts "
+                "WHERE scope=? AND wf_run_id=? AND kind=?",
+                run_key,
+            ).fetchall()
+
+            entries: t.Optional[t.List[_CacheEntry]] = None
+            if cached_run is not None:
+                try:
+                    entries = [
+                        (inv_id, artifact_id, self._read_blob(content_hash))
+                        for inv_id, artifact_id, content_hash in rows
+                    ]
+                except FileNotFoundError:
+                    # The files were removed behind our back. We need to download the
+                    # artifacts again.
+                    self._delete_run(db, *run_key)
+
+            if entries is None:
+                self._increment(db, "misses")
+            else:
+                self._increment(db, "hits")
+                db.execute(
+                    "UPDATE runs SET last_access=? "
+                    "WHERE scope=? AND wf_run_id=? AND kind=?",
+                    (time.time(), *run_key),
+                )
+
+        return entries
+
+    def _read_blob(self, content_hash: str) -> WorkflowResult:
+        return pydantic.parse_raw_as(
+            WorkflowResult,  # type: ignore[arg-type]
+            self._blob_path(content_hash).read_bytes(),
+        )
+
+    def _write_blob(self, content: bytes) -> str:
+        content_hash = hashlib.sha256(content).hexdigest()
+        blob_path = self._blob_path(content_hash)
+        if not blob_path.exists():
+            blob_path.parent.mkdir(parents=True, exist_ok=True)
+            # Other processes can read the cache at the same time. Moving a complete
+            # file into place ensures they never see a partially written one.
+            tmp_path = blob_path.with_name(f"{content_hash}.{os.getpid()}.tmp")
+            tmp_path.write_bytes(content)
+            os.replace(tmp_path, blob_path)
+
+        return content_hash
+
+    def _put_entries(
+        self,
+        scope: str,
+        wf_run_id: WorkflowRunId,
+        kind: str,
+        entries: t.Sequence[_CacheEntry],
+    ):
+        if not self.enabled:
+            return
+
+        contents = [
+            serde.to_text_result(result).json().encode() for _, _, result in entries
+        ]
+        if sum(len(content) for content in contents) > self._max_size:
+            # It would be evicted right away.
+            return
+
+        blobs = [(self._write_blob(content), len(content)) for content in contents]
+
+        with self._connect() as db, db:
+            self._delete_run(db, scope, wf_run_id, kind)
+            db.executemany("INSERT OR IGNORE INTO blobs VALUES (?, ?)", blobs)
+            db.executemany(
+                "INSERT INTO artifacts VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (scope, wf_run_id, kind, inv_id, artifact_id, content_hash)
+                    for (inv_id, artifact_id, _), (content_hash, _) in zip(
+                        entries, blobs
+                    )
+                ],
+            )
+            db.execute(
+                "INSERT INTO runs VALUES (?, ?, ?, ?)",
+                (scope, wf_run_id, kind, time.time()),
+            )
+            self._evict(db)
+
+    @staticmethod
+    def _delete_run(
+        db: sqlite3.Connection, scope: str, wf_run_id: WorkflowRunId, kind: str
+    ):
+        run_key = (scope, wf_run_id, kind)
+        db.execute(
+            "DELETE FROM artifacts WHERE scope=? AND wf_run_id=? AND kind=?", run_key
+        )
+        db.execute("DELETE FROM runs WHERE scope=? AND wf_run_id=? AND kind=?", run_key)
+
+    def _evict(self, db: sqlite3.Connection):
+        while True:
+            (size,) = db.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()
+            if size <= self._max_size:
+                break
+
+            lru_run = db.execute(
+                "SELECT scope, wf_run_id, kind FROM runs ORDER BY last_access LIMIT 1"
+            ).fetchone()
+            if lru_run is None:
+                break
+            self._delete_run(db, *lru_run)
+            self._delete_orphaned_blobs(db)
+
+    def _delete_orphaned_blobs(self, db: sqlite3.Connection):
+        orphans = db.execute(
+            "SELECT content_hash FROM blobs "
+            "WHERE content_hash NOT IN (SELECT content_hash FROM artifacts)"
+        ).fetchall()
+        for (content_hash,) in orphans:
+            self._blob_path(content_hash).unlink(missing_ok=True)
+        db.executemany("DELETE FROM blobs WHERE content_hash=?", orphans)
+
+
+class ArtifactReader:
+    """
+    Gets artifacts of workflow runs from a runtime. Artifacts of finished workflow
+    runs are served from an ``ArtifactCache``, if there's one.
+    """
+
+    def __init__(
+        self,
+        runtime: RuntimeInterface,
+        cache: t.Optional[ArtifactCache],
+        scope: str = "",
+    ):
+        """
+        Args:
+            runtime: the runtime to get the artifacts from.
+            cache: where to keep artifacts of finished workflow runs. None disables
+                caching.
+            scope: identifies the cluster ``runtime`` is connected to, see
+                ``cache_scope()``.
+        """
+        self._runtime = runtime
+        self._cache = cache if cache is not None and cache.enabled else None
+        self._scope = scope
+
+    @classmethod
+    def for_config(
+        cls,
+        runtime: RuntimeInterface,
+        runtime_name: t.Optional[RuntimeName],
+        config_name: t.Optional[str],
+        runtime_options: t.Mapping,
+    ) -> "ArtifactReader":
+        """
+        Uses the default cache for runtimes whose workflow runs outlive the process.
+        """
+        if runtime_name in (None, RuntimeName.IN_PROCESS):
+            # The in-process runtime keeps artifacts in memory, and its run IDs don't
+            # outlive the process.
+            return cls(runtime, None)
+
+        return cls(
+            runtime,
+            ArtifactCache.from_env(),
+            scope=cache_scope(config_name, runtime_options),
+        )
+
+    def get_workflow_run_outputs_non_blocking(
+        self, workflow_run_id: WorkflowRunId
+    ) -> t.Sequence[WorkflowResult]:
+        if self._cache is None:
+            return self._runtime.get_workflow_run_outputs_non_blocking(workflow_run_id)
+
+        if (
+            cached := self._cache.get_workflow_outputs(self._scope, workflow_run_id)
+        ) is not None:
+            return cached
+
+        # Raises when the workflow hasn't succeeded. If we get the outputs, the run
+        # is finished.
+        outputs = self._runtime.get_workflow_run_outputs_non_blocking(workflow_run_id)
+        self._cache.put_workflow_outputs(self._scope, workflow_run_id, outputs)
+
+        return outputs
+
+    def get_available_outputs(
+        self, workflow_run_id: WorkflowRunId
+    ) -> t.Dict[TaskInvocationId, WorkflowResult]:
+        if self._cache is None:
+            return self._runtime.get_available_outputs(workflow_run_id)
+
+        if (
+            cached := self._cache.get_task_outputs(self._scope, workflow_run_id)
+        ) is not None:
+            return cached
+
+        # The state has to be checked before getting the outputs. Otherwise, a run
+        # might finish in between and we'd cache an incomplete set of outputs.
+        wf_run = self._runtime.get_workflow_run_status(workflow_run_id)
+        outputs = self._runtime.get_available_outputs(workflow_run_id)
+        if wf_run.status.state in TERMINAL_STATES:
+            self._cache.put_task_outputs(self._scope, workflow_run_id, outputs)
+
+        return outputs
+
+    def get_outputs(
+        self,
+        workflow_run_id: WorkflowRunId,
+        task_inv_ids: t.Sequence[TaskInvocationId],
+    ) -> t.Dict[TaskInvocationId, WorkflowResult]:
+        if (
+            self._cache is not None
+            and (cached := self._cache.get_task_outputs(self._scope, workflow_run_id))
+            is not None
+        ):
+            return {
+                inv_id: cached[inv_id] for inv_id in task_inv_ids if inv_id in cached
+            }
+
+        # We only cache complete sets of task outputs. A subset is fetched directly.
+        return self._runtime.get_outputs(workflow_run_id, task_inv_ids)
@@ -1,10 +1,12 @@
 ################################################################################
 # © Copyright 2022 Zapata Computing Inc.
 ################################################################################
-from ._db import WorkflowDB
+from ._db import CompactionResult, StoredWorkflowRunRow, WorkflowDB
 from ._migration import migrate_project_db_to_shared_db
 
 __all__ = [
+    "CompactionResult",
+    "StoredWorkflowRunRow",
     "WorkflowDB",
     "migrate_project_db_to_shared_db",
 ]
@@ -1,11 +1,29 @@
 ################################################################################
 # © Copyright 2022 Zapata Computing Inc.
 ################################################################################
+import functools
+import hashlib
+import json
 import os
 import sqlite3
-from contextlib import AbstractContextManager
+import threading
+import zlib
+from contextlib import AbstractContextManager, closing
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import List, Optional, Union
+from typing import (
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
 
 from orquestra.sdk._base._db._migration import migrate_project_db_to_shared_db
 from orquestra.sdk._base._env import DB_PATH_ENV
@@ -13,24 +31,440 @@ from orquestra.sdk._base.abc import WorkflowRepo
 from orquestra.sdk.exceptions import WorkflowNotFoundError
 from orquestra.sdk.schema.ir import WorkflowDef
 from orquestra.sdk.schema.local_database import StoredWorkflowRun
-from orquestra.sdk.schema.workflow_run import WorkflowRunId
+from orquestra.sdk.schema.workflow_run import State, WorkflowRun, WorkflowRunId
 
+# Conservative limit of "?" placeholders in a single query. Older SQLite versions
+# allow at most 999.
+_MAX_QUERY_PARAMS = 500
+
+# How long a writer waits for another process or thread to release the write lock,
+# in seconds.
+_BUSY_TIMEOUT = 30.0
+
+
+# Stored in the database file as "PRAGMA user_version". Version 0 is the schema of
+# SDK versions before the workflow definitions were deduplicated. Version 2 adds the
+# index on the cached state. Version 3 compresses the workflow definitions.
+_SCHEMA_VERSION = 3
+
+# How many rows are read from the database at once when iterating over query results.
+_PAGE_SIZE = 1000
+
+# SDK versions that stored whole workflow definitions with each run can't read this
+# schema. Their database, "workflows.db" or the file set with ORQ_DB_PATH, is left as
+# it is, so these versions keep working. This version uses a file next to it, with
+# the version inserted before the extension, e.g. "workflows.v2.db". The runs of the
+# older database are copied into it when it's created.
+_LEGACY_DB_FILE_NAME = "workflows.db"
+_DB_VERSION_TAG = ".v2"
+
+
+def _workflow_def_hash(workflow_def_json: str) -> str:
+    return hashlib.sha256(workflow_def_json.encode()).hexdigest()
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _compress_workflow_def(workflow_def_json: str) -> bytes:
+    # Definitions with pickled constants and inline functions can take megabytes.
+    # They're mostly base64 and JSON keys, which compress well.
+    return zlib.compress(workflow_def_json.encode())
+
+
+def _decompress_workflow_def(stored: Union[str, bytes]) -> str:
+    # Definitions stored before version 3 are plain text.
+    if isinstance(stored, str):
+        return stored
+    return zlib.decompress(stored).decode()
+
+
+def _create_workflow_table(
+    db: sqlite3.Connection, legacy_db_location: Optional[Path] = None
+):
+    """
+    Creates the tables, or upgrades the ones created by older SDK versions.
+
+    Args:
+        db: connection to the database to set up.
+        legacy_db_location: database of older SDK versions. Its runs are copied
+            into ``db`` if the tables are created from scratch. The file isn't
+            modified.
+    """
+    (version,) = db.execute("PRAGMA user_version").fetchone()
+    if version >= _SCHEMA_VERSION:
+        return
 
-def _create_workflow_table(db: sqlite3.Connection):
     with db:
+        # Another process might be upgrading the same file. The write lock makes it
+        # wait, and the version is read again.
+        db.execute("BEGIN IMMEDIATE")
+        (version,) = db.execute("PRAGMA user_version").fetchone()
+        if version >= _SCHEMA_VERSION:
+            return
+
+        if version < 1:
+            _create_v1_tables(db, legacy_db_location)
+
         db.execute(
-            "CREATE TABLE IF NOT EXISTS workflow_runs (workflow_run_id, config_name, workflow_def)"  # noqa: E501
+            "CREATE INDEX IF NOT EXISTS workflow_runs_state ON workflow_runs(state)"
         )
+
+        if version < 3:
+            db.executemany(
+                "UPDATE workflow_defs SET workflow_def=? WHERE hash=?",
+                [
+                    (_compress_workflow_def(row[1]), row[0])
+                    for row in db.execute(
+                        "SELECT hash, workflow_def FROM workflow_defs "
+                        "WHERE typeof(workflow_def)='text'"
+                    )
+                ],
+            )
+
+        db.execute(f"PRAGMA user_version={_SCHEMA_VERSION}")
+
+
+def _create_v1_tables(db: sqlite3.Connection, legacy_db_location: Optional[Path]):
+    has_v0_runs = (
         db.execute(
-            "CREATE UNIQUE INDEX IF NOT EXISTS workflow_runs_id ON workflow_runs(workflow_run_id)"  # noqa: E501
+            "SELECT 1 FROM sqlite_master " "WHERE type='table' AND name='workflow_runs'"
+        ).fetchone()
+        is not None
+    )
+    if has_v0_runs:
+        db.execute("ALTER TABLE workflow_runs RENAME TO workflow_runs_v0")
+
+    # Workflow definitions, deduplicated by the SHA-256 of their JSON.
+    db.execute(
+        "CREATE TABLE IF NOT EXISTS workflow_defs "
+        "(hash TEXT PRIMARY KEY, workflow_def BLOB NOT NULL)"
+    )
+    # "state" caches the state of finished runs. It's NULL for runs that
+    # weren't seen finished. "submitted_at" is NULL for runs stored by SDK
+    # versions that didn't record it.
+    db.execute(
+        "CREATE TABLE IF NOT EXISTS workflow_runs ("
+        "workflow_run_id TEXT PRIMARY KEY, "
+        "config_name TEXT, "
+        "workflow_def_hash TEXT NOT NULL REFERENCES workflow_defs(hash), "
+        "workflow_name TEXT, "
+        "submitted_at TEXT, "
+        "state TEXT)"
+    )
+    db.execute(
+        "CREATE INDEX IF NOT EXISTS workflow_runs_config_name "
+        "ON workflow_runs(config_name)"
+    )
+    db.execute(
+        "CREATE INDEX IF NOT EXISTS workflow_runs_submitted_at "
+        "ON workflow_runs(submitted_at)"
+    )
+    db.execute(
+        "CREATE INDEX IF NOT EXISTS workflow_runs_workflow_name "
+        "ON workflow_runs(workflow_name)"
+    )
+    # Statuses of runs that won't change anymore. "workflow_run" is the
+    # WorkflowRun JSON without the workflow definition. The definition is kept in
+    # "workflow_defs".
+    db.execute(
+        "CREATE TABLE IF NOT EXISTS finished_workflow_runs (workflow_run_id, workflow_run)"  # noqa: E501
+    )
+    db.execute(
+        "CREATE UNIQUE INDEX IF NOT EXISTS finished_workflow_runs_id ON finished_workflow_runs(workflow_run_id)"  # noqa: E501
+    )
+
+    if has_v0_runs:
+        rows = db.execute(
+            "SELECT workflow_run_id, config_name, workflow_def "
+            "FROM workflow_runs_v0 ORDER BY rowid"
+        ).fetchall()
+        _insert_workflow_runs(
+            db,
+            [(row[0], row[1], row[2], None) for row in rows],
+        )
+        db.execute("DROP TABLE workflow_runs_v0")
+        db.executemany(
+            "UPDATE workflow_runs SET state=? WHERE workflow_run_id=?",
+            [
+                (json.loads(row[1])["status"]["state"], row[0])
+                for row in db.execute(
+                    "SELECT workflow_run_id, workflow_run "
+                    "FROM finished_workflow_runs"
+                )
+            ],
+        )
+    elif legacy_db_location is not None:
+        _insert_workflow_runs(
+            db,
+            [
+                (row[0], row[1], row[2], None)
+                for row in _read_legacy_workflow_runs(legacy_db_location)
+            ],
+        )
+
+
+def _read_legacy_workflow_runs(
+    legacy_db_location: Path,
+) -> List[Tuple[WorkflowRunId, str, str]]:
+    """
+    Reads the runs stored with the schema of older SDK versions, without modifying
+    the file.
+
+    Returns:
+        Tuples of (workflow run ID, config name, workflow definition JSON), in the
+        order the runs were saved.
+    """
+    if not legacy_db_location.exists():
+        return []
+
+    with closing(
+        sqlite3.connect(f"{legacy_db_location.resolve().as_uri()}?mode=ro", uri=True)
+    ) as legacy_db:
+        (version,) = legacy_db.execute("PRAGMA user_version").fetchone()
+        has_runs = (
+            legacy_db.execute(
+                "SELECT 1 FROM sqlite_master "
+                "WHERE type='table' AND name='workflow_runs'"
+            ).fetchone()
+            is not None
         )
+        if version != 0 or not has_runs:
+            return []
+        return legacy_db.execute(
+            "SELECT workflow_run_id, config_name, workflow_def "
+            "FROM workflow_runs ORDER BY rowid"
+        ).fetchall()
+
+
+def _insert_workflow_runs(
+    db: sqlite3.Connection,
+    rows: Sequence[Tuple[WorkflowRunId, str, str, Optional[str]]],
+):
+    """
+    Args:
+        rows: tuples of (workflow run ID, config name, workflow definition JSON,
+            submission time)
+    """
+    defs: Dict[str, str] = {}
+    names: Dict[str, Optional[str]] = {}
+    runs = []
+    for workflow_run_id, config_name, workflow_def_json, submitted_at in rows:
+        def_hash = _workflow_def_hash(workflow_def_json)
+        if def_hash not in defs:
+            defs[def_hash] = workflow_def_json
+            names[def_hash] = json.loads(workflow_def_json).get("name")
+        runs.append(
+            (workflow_run_id, config_name, def_hash, names[def_hash], submitted_at)
+        )
+    # Definitions are compressed only if they aren't stored yet. "OR IGNORE" covers
+    # definitions stored by another writer since they were looked up.
+    new_defs = [
+        (def_hash, workflow_def_json)
+        for def_hash, workflow_def_json in defs.items()
+        if db.execute(
+            "SELECT 1 FROM workflow_defs WHERE hash=?", (def_hash,)
+        ).fetchone()
+        is None
+    ]
+    db.executemany(
+        "INSERT OR IGNORE INTO workflow_defs VALUES (?, ?)",
+        [
+            (def_hash, _compress_workflow_def(workflow_def_json))
+            for def_hash, workflow_def_json in new_defs
+        ],
+    )
+    db.executemany(
+        "INSERT INTO workflow_runs (workflow_run_id, config_name, workflow_def_hash, "
+        "workflow_name, submitted_at) VALUES (?, ?, ?, ?, ?)",
+        runs,
+    )
+
+
+def _parse_finished_workflow_run(
+    workflow_run: str, workflow_def: WorkflowDef
+) -> WorkflowRun:
+    return WorkflowRun.parse_obj(
+        {**json.loads(workflow_run), "workflow_def": workflow_def}
+    )
+
+
+@dataclass(frozen=True)
+class StoredWorkflowRunRow:
+    """
+    Row of the workflow runs table, yielded by ``WorkflowDB.iter_workflow_runs()``.
+    The workflow definition isn't parsed until ``get_workflow_def()`` is called, so
+    listing runs is cheap for callers that only need the IDs or config names.
+    """
+
+    workflow_run_id: WorkflowRunId
+    config_name: str
+    _load_workflow_def: Callable[[], WorkflowDef] = field(repr=False, compare=False)
+
+    def get_workflow_def(self) -> WorkflowDef:
+        """
+        Parses the workflow definition. Rows read by the same query share parsed
+        definitions, so each distinct one is parsed at most once.
+        """
+        return self._load_workflow_def()
+
+    def to_stored_workflow_run(self) -> StoredWorkflowRun:
+        return StoredWorkflowRun(
+            workflow_run_id=self.workflow_run_id,
+            config_name=self.config_name,
+            workflow_def=self.get_workflow_def(),
+        )
+
+
+class _WorkflowDefLoader:
+    """
+    Parses each distinct workflow definition at most once. The JSON is read from the
+    rows returned by a query.
+    """
+
+    def __init__(self, defs_json: Dict[str, Union[str, bytes]]):
+        self._defs_json = defs_json
+        self._defs: Dict[str, WorkflowDef] = {}
+        self._loaders: Dict[str, Callable[[], WorkflowDef]] = {}
+
+    def loader(self, def_hash: str) -> Callable[[], WorkflowDef]:
+        try:
+            return self._loaders[def_hash]
+        except KeyError:
+            loader = self._loaders[def_hash] = functools.partial(self._load, def_hash)
+            return loader
+
+    def _load(self, def_hash: str) -> WorkflowDef:
+        try:
+            return self._defs[def_hash]
+        except KeyError:
+            workflow_def = WorkflowDef.parse_raw(
+                _decompress_workflow_def(self._defs_json[def_hash])
+            )
+            self._defs[def_hash] = workflow_def
+            return workflow_def
+
+
+def _get_versioned_db_location(legacy_db_location: Path) -> Path:
+    return legacy_db_location.with_name(
+        legacy_db_location.stem + _DB_VERSION_TAG + legacy_db_location.suffix
+    )
 
 
 def _get_default_db_location() -> Path:
     try:
-        return Path(os.environ[DB_PATH_ENV])
+        legacy_db_location = Path(os.environ[DB_PATH_ENV])
     except KeyError:
-        return Path.home() / ".orquestra" / "workflows.db"
+        legacy_db_location = Path.home() / ".orquestra" / _LEGACY_DB_FILE_NAME
+    return _get_versioned_db_location(legacy_db_location)
+
+
+def _get_legacy_db_location(db_location: Path) -> Optional[Path]:
+    """
+    Returns the database of older SDK versions that sits next to ``db_location``,
+    e.g. "workflows.db" for "workflows.v2.db", or None if ``db_location`` doesn't
+    have the version in its name.
+    """
+    head, tag, tail = db_location.name.rpartition(_DB_VERSION_TAG)
+    if not tag or not head + tail:
+        return None
+    legacy_db_location = db_location.with_name(head + tail)
+    if _get_versioned_db_location(legacy_db_location) != db_location:
+        return None
+    return legacy_db_location
+
+
+def _connect(db_location: Path) -> sqlite3.Connection:
+    db = sqlite3.connect(
+        db_location,
+        timeout=_BUSY_TIMEOUT,
+        # Write transactions take the write lock when they start instead of
+        # upgrading a read lock later, which could fail with "database is locked".
+        # Reads don't start transactions.
+        isolation_level="IMMEDIATE",
+    )
+    # With write-ahead logging, readers don't block the writer and vice versa. It's
+    # a persistent setting of the database file. Some file systems, e.g. network
+    # ones, don't support it; SQLite keeps the previous journal mode then.
+    db.execute("PRAGMA journal_mode=WAL")
+    # Durable with WAL, except for the last transactions on power loss.
+    db.execute("PRAGMA synchronous=NORMAL")
+    _create_workflow_table(db, _get_legacy_db_location(db_location))
+    return db
+
+
+class _ConnectionKey(NamedTuple):
+    pid: int
+    path: str
+    # Identifies the file. A removed and recreated database has a new inode.
+    device: int
+    inode: int
+
+
+class _ConnectionPool:
+    """
+    Keeps an open connection per thread, reused by subsequent ``open_db()`` calls.
+
+    SQLite connections can't be shared across threads nor forked processes. Each
+    thread keeps the connection to the database it used last. Reusing the connection
+    skips setting up the schema and lets SQLite reuse prepared statements.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def acquire(self, db_location: Path) -> sqlite3.Connection:
+        key: Optional[_ConnectionKey] = getattr(self._local, "key", None)
+        if key is not None and key == self._key(db_location, key.pid):
+            return self._local.db
+
+        self.clear()
+        db = _connect(db_location)
+        self._local.key = self._key(db_location, os.getpid())
+        self._local.db = db
+        return db
+
+    def clear(self):
+        """
+        Closes the connection of the current thread, if any.
+        """
+        db: Optional[sqlite3.Connection] = getattr(self._local, "db", None)
+        key: Optional[_ConnectionKey] = getattr(self._local, "key", None)
+        self._local.db = None
+        self._local.key = None
+        # Connections inherited from the parent process are left alone.
+        if db is not None and key is not None and key.pid == os.getpid():
+            db.close()
+
+    @staticmethod
+    def _key(db_location: Path, pid: int) -> Optional[_ConnectionKey]:
+        if pid != os.getpid():
+            return None
+        try:
+            stat = os.stat(db_location)
+        except FileNotFoundError:
+            return None
+        return _ConnectionKey(
+            pid=pid, path=str(db_location), device=stat.st_dev, inode=stat.st_ino
+        )
+
+
+_pool = _ConnectionPool()
+
+# Project directories checked for a database to migrate.
+_migrated_project_dirs: Set[Path] = set()
+_migrated_project_dirs_lock = threading.Lock()
+
+
+class CompactionResult(NamedTuple):
+    """
+    Returned by ``WorkflowDB.compact()``. Sizes are in bytes.
+    """
+
+    n_removed_runs: int
+    size_before: int
+    size_after: int
 
 
 class WorkflowDB(WorkflowRepo, AbstractContextManager):
@@ -40,41 +474,55 @@ class WorkflowDB(WorkflowRepo, AbstractContextManager):
 
     @classmethod
     def open_project_db(cls, project_dir: Union[Path, str]):
-        old_db_location = Path(project_dir) / ".orquestra" / "workflows.db"
-        if old_db_location != _get_default_db_location():
-            migrate_project_db_to_shared_db(Path(project_dir))
+        old_db_location = Path(project_dir) / ".orquestra" / _LEGACY_DB_FILE_NAME
+        db_location = _get_default_db_location()
+        if old_db_location not in (db_location, _get_legacy_db_location(db_location)):
+            # Checked once per process. The SDK doesn't write to project databases
+            # anymore, so a migrated one won't reappear.
+            with _migrated_project_dirs_lock:
+                if old_db_location not in _migrated_project_dirs:
+                    migrate_project_db_to_shared_db(Path(project_dir))
+                    _migrated_project_dirs.add(old_db_location)
         return cls.open_db()
 
     @classmethod
     def open_db(cls):
+        """
+        Returns a WorkflowDB backed by the calling thread's pooled connection to the
+        shared database. The connection stays open after leaving the context
+        manager.
+        """
         db_location = _get_default_db_location()
         db_location.parent.mkdir(parents=True, exist_ok=True)
-        db = sqlite3.connect(db_location, isolation_level="EXCLUSIVE")
-        _create_workflow_table(db)
-        return WorkflowDB(db)
+        return WorkflowDB(_pool.acquire(db_location), close_on_exit=False)
 
-    def __init__(self, db: sqlite3.Connection):
+    def __init__(self, db: sqlite3.Connection, close_on_exit: bool = True):
         self._db = db
+        self._close_on_exit = close_on_exit
 
     def __enter__(self):
         return self
 
     def __exit__(self, __exc_type, __exc_value, __traceback):
         self._db.commit()
-        self._db.close()
+        if self._close_on_exit:
+            self._db.close()
 
     def save_workflow_run(
         self,
         workflow_run: StoredWorkflowRun,
     ):
         with self._db:
-            self._db.execute(
-                "INSERT INTO workflow_runs VALUES (?, ?, ?)",
-                (
-                    workflow_run.workflow_run_id,
-                    workflow_run.config_name,
-                    workflow_run.workflow_def.json(),
-                ),
+            _insert_workflow_runs(
+                self._db,
+                [
+                    (
+                        workflow_run.workflow_run_id,
+                        workflow_run.config_name,
+                        workflow_run.workflow_def.json(),
+                        datetime.now(timezone.utc).isoformat(),
+                    )
+                ],
             )
 
     def get_workflow_run(self, workflow_run_id: WorkflowRunId) -> StoredWorkflowRun:
@@ -90,22 +538,12 @@ class WorkflowDB(WorkflowRepo, AbstractContextManager):
         Returns:
             StoredWorkflowRun: the details of the stored workflow.
         """
-        with self._db:
-            cur = self._db.cursor()
-            cur.execute(
-                "SELECT * FROM workflow_runs WHERE workflow_run_id=?",
-                (workflow_run_id,),
-            )
-            result = cur.fetchone()
-            if result is None or len(result) == 0:
-                raise WorkflowNotFoundError(
-                    f"Workflow run with ID {workflow_run_id} not found"
-                )
-            return StoredWorkflowRun(
-                workflow_run_id=result[0],
-                config_name=result[1],
-                workflow_def=WorkflowDef.parse_raw(result[2]),
+        rows = list(self._query_workflow_runs("workflow_run_id=?", (workflow_run_id,)))
+        if not rows:
+            raise WorkflowNotFoundError(
+                f"Workflow run with ID {workflow_run_id} not found"
             )
+        return rows[0].to_stored_workflow_run()
 
     def get_workflow_runs_list(
         self, prefix: Optional[str] = None, config_name: Optional[str] = None
@@ -122,29 +560,294 @@ class WorkflowDB(WorkflowRepo, AbstractContextManager):
 
         Returns:
             A list of workflow runs for a given config. Includes: run ID, stored
-            config, and WorkflowDef
+            config, and WorkflowDef. Each distinct workflow definition is parsed
+            once. Use iter_workflow_runs() to skip parsing them.
+        """
+        return [
+            row.to_stored_workflow_run()
+            for row in self.iter_workflow_runs(prefix=prefix, config_name=config_name)
+        ]
+
+    def iter_workflow_runs(
+        self,
+        *,
+        prefix: Optional[str] = None,
+        config_name: Optional[str] = None,
+    ) -> Iterator[StoredWorkflowRunRow]:
+        """
+        Queries the stored workflow runs, in the order they were saved. The config
+        name filter is served by an index. The rows are read in pages as the runs
+        are consumed.
+
+        Arguments:
+            prefix: Only return workflow runs whose IDs start with the prefix.
+                ASCII letters match regardless of case.
+            config_name: Only return workflow runs that use the specified
+                configuration name.
+
+        Yields:
+            Rows of the stored workflow runs. Workflow definitions are parsed only
+            by ``StoredWorkflowRunRow.get_workflow_def()``.
         """
-        query = "SELECT * FROM workflow_runs"
+        conditions = []
+        params: List[str] = []
 
-        if prefix is not None:
-            query += f' WHERE workflow_run_id LIKE "{prefix}%"'
+        if prefix:
+            # LIKE matches ASCII letters regardless of case, as in older SDK
+            # versions. "_" and "%" in the prefix are escaped, so they aren't
+            # wildcards.
+            conditions.append("workflow_run_id LIKE ? ESCAPE '\\'")
+            params.append(_escape_like(prefix) + "%")
 
         if config_name is not None:
-            if prefix is not None:
-                query += " AND"
-            else:
-                query += " WHERE"
-            query += f' config_name="{config_name}"'
+            conditions.append("config_name=?")
+            params.append(config_name)
+
+        query = " AND ".join(conditions) or None
+        return self._query_workflow_runs(query, params)
+
+    def _query_workflow_runs(
+        self, condition: Optional[str], params: Sequence
+    ) -> Iterator[StoredWorkflowRunRow]:
+        query = (
+            "SELECT workflow_run_id, config_name, workflow_def_hash FROM workflow_runs"
+        )
+        if condition is not None:
+            query += f" WHERE {condition}"
+        # The rowid follows the order in which the runs were saved.
+        query += " ORDER BY rowid"
+
+        # Definitions are read once per distinct hash, as they appear in the pages.
+        defs_json: Dict[str, Union[str, bytes]] = {}
+        defs = _WorkflowDefLoader(defs_json)
+        cur = self._db.execute(query, params)
+        try:
+            while rows := cur.fetchmany(_PAGE_SIZE):
+                new_hashes = list({row[2] for row in rows} - defs_json.keys())
+                for chunk_start in range(0, len(new_hashes), _MAX_QUERY_PARAMS):
+                    chunk = new_hashes[chunk_start : chunk_start + _MAX_QUERY_PARAMS]
+                    placeholders = ", ".join("?" * len(chunk))
+                    defs_json.update(
+                        self._db.execute(
+                            "SELECT hash, workflow_def FROM workflow_defs "
+                            f"WHERE hash IN ({placeholders})",
+                            chunk,
+                        )
+                    )
+                for row in rows:
+                    yield StoredWorkflowRunRow(
+                        workflow_run_id=row[0],
+                        config_name=row[1],
+                        _load_workflow_def=defs.loader(row[2]),
+                    )
+        finally:
+            cur.close()
+
+    def save_finished_workflow_run(self, workflow_run: WorkflowRun):
+        """
+        Stores the status of a workflow run that won't change anymore, e.g. because
+        the run has succeeded. Replaces the previously stored status, if any.
+
+        Args:
+            workflow_run: the run's status. Its workflow definition isn't stored again.
+        """
+        with self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO finished_workflow_runs VALUES (?, ?)",
+                (
+                    workflow_run.id,
+                    workflow_run.json(exclude={"workflow_def"}),
+                ),
+            )
+            self._db.execute(
+                "UPDATE workflow_runs SET state=? WHERE workflow_run_id=?",
+                (workflow_run.status.state.value, workflow_run.id),
+            )
+
+    def get_finished_workflow_run(
+        self, workflow_run_id: WorkflowRunId
+    ) -> Optional[WorkflowRun]:
+        """
+        Returns:
+            The status stored with save_finished_workflow_run(), or None if there's
+            no status stored for this run.
+        """
+        finished = self._query_finished_workflow_runs(
+            "f.workflow_run_id=?", (workflow_run_id,)
+        )
+        return finished.get(workflow_run_id)
 
+    def get_finished_workflow_run_states(
+        self, workflow_run_ids: Sequence[WorkflowRunId]
+    ) -> Dict[WorkflowRunId, State]:
+        """
+        Cheaper version of get_finished_workflow_run() for many runs. Only the
+        cached state is read.
+
+        Returns:
+            A dictionary of workflow run ID -> state, for runs that have a status
+            stored with save_finished_workflow_run().
+        """
+        states: Dict[WorkflowRunId, State] = {}
         with self._db:
             cur = self._db.cursor()
-            cur.execute(query)
-            result = cur.fetchall()
-        return [
-            StoredWorkflowRun(
-                workflow_run_id=row[0],
-                config_name=row[1],
-                workflow_def=WorkflowDef.parse_raw(row[2]),
+            for chunk_start in range(0, len(workflow_run_ids), _MAX_QUERY_PARAMS):
+                chunk = workflow_run_ids[chunk_start : chunk_start + _MAX_QUERY_PARAMS]
+                placeholders = ", ".join("?" * len(chunk))
+                cur.execute(
+                    "SELECT workflow_run_id, state FROM workflow_runs "
+                    f"WHERE workflow_run_id IN ({placeholders}) AND state IS NOT NULL",
+                    tuple(chunk),
+                )
+                for row in cur.fetchall():
+                    states[row[0]] = State(row[1])
+        return states
+
+    def get_finished_workflow_runs(
+        self, config_name: Optional[str] = None
+    ) -> Dict[WorkflowRunId, WorkflowRun]:
+        """
+        Retrieve the stored statuses of finished workflow runs.
+
+        Arguments:
+            config_name (Optional): Only return workflow runs that use the
+            specified configuration name.
+
+        Returns:
+            A dictionary of workflow run ID -> status stored with
+            save_finished_workflow_run().
+        """
+        if config_name is None:
+            return self._query_finished_workflow_runs(None, ())
+        return self._query_finished_workflow_runs("r.config_name=?", (config_name,))
+
+    def _query_finished_workflow_runs(
+        self, condition: Optional[str], params: Sequence
+    ) -> Dict[WorkflowRunId, WorkflowRun]:
+        query = (
+            "SELECT f.workflow_run_id, f.workflow_run, d.hash, d.workflow_def "
+            "FROM finished_workflow_runs f "
+            "JOIN workflow_runs r ON f.workflow_run_id = r.workflow_run_id "
+            "JOIN workflow_defs d ON r.workflow_def_hash = d.hash"
+        )
+        if condition is not None:
+            query += f" WHERE {condition}"
+
+        with self._db:
+            cur = self._db.cursor()
+            cur.execute(query, params)
+            rows = cur.fetchall()
+
+        defs = _WorkflowDefLoader({row[2]: row[3] for row in rows})
+        return {
+            row[0]: _parse_finished_workflow_run(row[1], defs.loader(row[2])())
+            for row in rows
+        }
+
+    def compact(
+        self,
+        *,
+        max_age: Optional[timedelta] = None,
+        max_count_per_config: Optional[int] = None,
+    ) -> CompactionResult:
+        """
+        Removes old workflow runs, and the definitions and statuses nothing refers to
+        anymore, then rebuilds the database file to give the free space back.
+
+        Removed runs can't be listed or looked up by ID anymore. This matters for QE,
+        where the local database is the only list of submitted runs.
+
+        Args:
+            max_age: Remove runs saved longer than this ago. Runs stored by SDK
+                versions that didn't record the submission time are kept.
+            max_count_per_config: Keep at most this many of the most recently saved
+                finished runs for each config name. Only runs whose status was
+                stored with save_finished_workflow_run() are counted and removed.
+
+        Raises:
+            ValueError: if ``max_count_per_config`` is less than 1.
+
+        Returns:
+            The number of removed runs, and the database size before and after.
+        """
+        size_before = self.size()
+        removed = self._runs_to_remove(max_age, max_count_per_config)
+
+        with self._db:
+            self._db.executemany(
+                "DELETE FROM workflow_runs WHERE rowid=?", [(r,) for r in removed]
             )
-            for row in result
-        ]
+            self._db.execute(
+                "DELETE FROM finished_workflow_runs WHERE workflow_run_id NOT IN "
+                "(SELECT workflow_run_id FROM workflow_runs)"
+            )
+            self._db.execute(
+                "DELETE FROM workflow_defs WHERE hash NOT IN "
+                "(SELECT workflow_def_hash FROM workflow_runs)"
+            )
+        # Can't run inside a transaction.
+        self._db.execute("VACUUM")
+        self._db.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+        return CompactionResult(
+            n_removed_runs=len(removed),
+            size_before=size_before,
+            size_after=self.size(),
+        )
+
+    def count_runs_to_remove(
+        self,
+        *,
+        max_age: Optional[timedelta] = None,
+        max_count_per_config: Optional[int] = None,
+    ) -> int:
+        """
+        Returns:
+            The number of runs compact() would remove with the same arguments. The
+            database isn't modified.
+
+        Raises:
+            ValueError: if ``max_count_per_config`` is less than 1.
+        """
+        return len(self._runs_to_remove(max_age, max_count_per_config))
+
+    def _runs_to_remove(
+        self, max_age: Optional[timedelta], max_count_per_config: Optional[int]
+    ) -> Set[int]:
+        if max_count_per_config is not None and max_count_per_config < 1:
+            raise ValueError(
+                f"max_count_per_config must be at least 1, not {max_count_per_config}"
+            )
+
+        removed: Set[int] = set()
+
+        if max_age is not None:
+            cutoff = (datetime.now(timezone.utc) - max_age).isoformat()
+            removed.update(
+                row[0]
+                for row in self._db.execute(
+                    "SELECT rowid FROM workflow_runs WHERE submitted_at < ?", (cutoff,)
+                )
+            )
+
+        if max_count_per_config is not None:
+            # Runs that weren't seen finished might still be executing.
+            counts: Dict[Optional[str], int] = {}
+            for rowid, config_name in self._db.execute(
+                "SELECT rowid, config_name FROM workflow_runs "
+                "WHERE state IS NOT NULL ORDER BY rowid DESC"
+            ):
+                counts[config_name] = counts.get(config_name, 0) + 1
+                if counts[config_name] > max_count_per_config:
+                    removed.add(rowid)
+
+        return removed
+
+    def size(self) -> int:
+        """
+        Returns:
+            The size of the database in bytes, including the free pages.
+        """
+        (page_count,) = self._db.execute("PRAGMA page_count").fetchone()
+        (page_size,) = self._db.execute("PRAGMA page_size").fetchone()
+        return page_count * page_size
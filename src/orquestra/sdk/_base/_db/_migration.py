@@ -1,23 +1,41 @@
 ################################################################################
 # © Copyright 2022 Zapata Computing Inc.
 ################################################################################
+import sqlite3
+from contextlib import closing
 from pathlib import Path
 
 
 def migrate_project_db_to_shared_db(project_dir: Path):
     # Avoid circular import:
     from orquestra.sdk._base._db import WorkflowDB
+    from orquestra.sdk._base._db._db import _create_workflow_table
 
     old_location = project_dir / ".orquestra" / "workflows.db"
     if not old_location.exists():
         return
+
+    # Bring the project DB to the current schema first, so the tables can be
+    # copied as they are.
+    with closing(sqlite3.connect(old_location)) as old_db:
+        _create_workflow_table(old_db)
+
     with WorkflowDB.open_db() as new_db:
-        c = new_db._db.cursor()
-        c.execute("BEGIN TRANSACTION")
-        c.execute("ATTACH DATABASE ? AS old_db", (str(old_location),))
-        c.execute("INSERT INTO workflow_runs SELECT * FROM old_db.workflow_runs")
-        c.execute("COMMIT")
-        c.execute("DETACH DATABASE old_db")
-        c.close()
+        db = new_db._db
+        db.execute("ATTACH DATABASE ? AS old_db", (str(old_location),))
+        try:
+            # The connection is pooled. Make sure it's left without an open
+            # transaction nor the attached database.
+            with db:
+                db.execute(
+                    "INSERT OR IGNORE INTO workflow_defs "
+                    "SELECT * FROM old_db.workflow_defs"
+                )
+                db.execute(
+                    "INSERT INTO workflow_runs SELECT * FROM old_db.workflow_runs "
+                    "ORDER BY rowid"
+                )
+        finally:
+            db.execute("DETACH DATABASE old_db")
 
     old_location.rename(old_location.with_suffix(".old"))
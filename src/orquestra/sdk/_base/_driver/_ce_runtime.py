@@ -4,13 +4,27 @@
 """
 RuntimeInterface implementation that uses Compute Engine.
 """
+import os
 import warnings
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import timedelta
 from pathlib import Path
-from typing import Dict, List, Optional, Sequence, Union
+from typing import (
+    Dict,
+    Generator,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
+
+import requests
 
 from orquestra.sdk import Project, ProjectRef, Workspace, exceptions
-from orquestra.sdk._base import _retry, serde
+from orquestra.sdk._base import _env, _log_follow, _retry, serde
 from orquestra.sdk._base._db import WorkflowDB
 from orquestra.sdk._base.abc import RuntimeInterface
 from orquestra.sdk.kubernetes.quantity import parse_quantity
@@ -30,6 +44,24 @@ from orquestra.sdk.schema.workflow_run import (
 
 from . import _client, _exceptions, _models
 
+DEFAULT_ARTIFACT_DOWNLOAD_CONCURRENCY = 8
+
+# Log lines that weren't produced by a task, like Ray's own output, are grouped under
+# this key.
+UNKNOWN_TASK_INV_ID = "UNKNOWN TASK INV ID"
+
+
+def _artifact_download_concurrency() -> int:
+    value = os.getenv(_env.CE_ARTIFACT_DOWNLOAD_CONCURRENCY_ENV)
+    if value is None:
+        return DEFAULT_ARTIFACT_DOWNLOAD_CONCURRENCY
+    try:
+        return max(int(value), 1)
+    except ValueError as e:
+        raise exceptions.RuntimeConfigError(
+            f"Invalid {_env.CE_ARTIFACT_DOWNLOAD_CONCURRENCY_ENV} value: `{value}`"
+        ) from e
+
 
 def _get_max_resources(workflow_def: WorkflowDef) -> _models.Resources:
     max_gpu = None
@@ -84,7 +116,12 @@ class CERuntime(RuntimeInterface):
                 "Invalid CE configuration. Did you login first?"
             ) from e
 
-        self._client = _client.DriverClient.from_token(base_uri=base_uri, token=token)
+        self._download_concurrency = _artifact_download_concurrency()
+        self._client = _client.DriverClient.from_token(
+            base_uri=base_uri,
+            token=token,
+            max_connections=self._download_concurrency,
+        )
 
     @classmethod
     def from_runtime_configuration(
@@ -182,6 +219,39 @@ class CERuntime(RuntimeInterface):
                 "- the authorization token was rejected by the remote cluster."
             ) from e
 
+    def get_workflow_run_states(
+        self, workflow_run_ids: Sequence[WorkflowRunId]
+    ) -> Dict[WorkflowRunId, State]:
+        """
+        Gets only the states of the workflow runs. Requests are made in parallel.
+
+        Raises:
+            WorkflowRunNotFoundError: if any of the workflow runs cannot be found
+            UnauthorizedError: if the remote cluster rejects the token
+        """
+        if not workflow_run_ids:
+            return {}
+
+        # Bounded by the size of the client's connection pool.
+        n_workers = min(self._download_concurrency, len(workflow_run_ids))
+        with ThreadPoolExecutor(max_workers=n_workers) as executor:
+            states = executor.map(self._get_workflow_run_state, workflow_run_ids)
+            return dict(zip(workflow_run_ids, states))
+
+    def _get_workflow_run_state(self, workflow_run_id: WorkflowRunId) -> State:
+        try:
+            return self._client.get_workflow_run_status(workflow_run_id).state
+        except (_exceptions.InvalidWorkflowRunID, _exceptions.WorkflowRunNotFound) as e:
+            raise exceptions.WorkflowRunNotFoundError(
+                f"Workflow run with id `{workflow_run_id}` not found"
+            ) from e
+        except (_exceptions.InvalidTokenError, _exceptions.ForbiddenError) as e:
+            raise exceptions.UnauthorizedError(
+                "Could not get the workflow status for run with id "
+                f"`{workflow_run_id}` "
+                "- the authorization token was rejected by the remote cluster."
+            ) from e
+
     @_retry.retry(
         attempts=5,
         delay=0.2,
@@ -290,6 +360,41 @@ class CERuntime(RuntimeInterface):
             a mapping between task invocation ID and the available artifacts from the
                 matching task run.
         """
+        return self._get_outputs(workflow_run_id, task_inv_ids=None)
+
+    def get_outputs(
+        self,
+        workflow_run_id: WorkflowRunId,
+        task_inv_ids: Sequence[TaskInvocationId],
+    ) -> Dict[TaskInvocationId, WorkflowResult]:
+        """Returns outputs of the selected task invocations
+
+        Only the selected artifacts are downloaded. Task invocations without
+        available outputs don't have an entry in the returned dict.
+
+        Args:
+            workflow_run_id: the ID of a workflow run
+            task_inv_ids: the task invocations to get the outputs of
+
+        Raises:
+            WorkflowRunNotFound: if the workflow run cannot be found
+            UnauthorizedError: if the remote cluster rejects the token
+
+        Returns:
+            a mapping between task invocation ID and the available artifacts from the
+                matching task run.
+        """
+        return self._get_outputs(workflow_run_id, task_inv_ids=set(task_inv_ids))
+
+    def _get_outputs(
+        self,
+        workflow_run_id: WorkflowRunId,
+        task_inv_ids: Optional[Set[TaskInvocationId]],
+    ) -> Dict[TaskInvocationId, WorkflowResult]:
+        """
+        Args:
+            task_inv_ids: if None, outputs of all task invocations are downloaded.
+        """
         try:
             artifact_map = self._client.get_workflow_run_artifacts(workflow_run_id)
         except (_exceptions.InvalidWorkflowRunID, _exceptions.WorkflowRunNotFound) as e:
@@ -303,23 +408,59 @@ class CERuntime(RuntimeInterface):
                 "- the authorization token was rejected by the remote cluster."
             ) from e
 
-        artifact_vals: Dict[TaskInvocationId, WorkflowResult] = {}
-
-        for task_run_id, artifact_ids in artifact_map.items():
+        artifact_ids: Dict[TaskInvocationId, _models.WorkflowRunArtifactID] = {}
+        for task_run_id, task_artifact_ids in artifact_map.items():
             inv_id = self._invocation_id_by_task_run_id(workflow_run_id, task_run_id)
+            if task_inv_ids is not None and inv_id not in task_inv_ids:
+                continue
             assert (
-                len(artifact_ids) == 1
+                len(task_artifact_ids) == 1
             ), "Expecting a single artifact containing the packed values from the task"
+            artifact_ids[inv_id] = task_artifact_ids[0]
+
+        return self._download_artifacts(artifact_ids)
+
+    def _download_artifacts(
+        self, artifact_ids: Dict[TaskInvocationId, _models.WorkflowRunArtifactID]
+    ) -> Dict[TaskInvocationId, WorkflowResult]:
+        """
+        Downloads the artifacts in parallel, at most ``_download_concurrency`` at a
+        time. Artifacts that couldn't be downloaded are left out of the result.
+        """
+        if not artifact_ids:
+            return {}
+
+        n_workers = min(self._download_concurrency, len(artifact_ids))
+        with ThreadPoolExecutor(max_workers=n_workers) as executor:
+            futures = {
+                inv_id: executor.submit(self._download_artifact, artifact_id)
+                for inv_id, artifact_id in artifact_ids.items()
+            }
+
+        artifact_vals: Dict[TaskInvocationId, WorkflowResult] = {}
+        for inv_id, future in futures.items():
             try:
-                artifact_vals[inv_id] = self._client.get_workflow_run_artifact(
-                    artifact_ids[0]
-                )
+                artifact_vals[inv_id] = future.result()
             except Exception:
                 # If we fail for any reason, this artifact wasn't available yet
                 continue
 
         return artifact_vals
 
+    @_retry.retry(
+        attempts=3,
+        delay=0.2,
+        allowed_exceptions=(
+            _exceptions.UnknownHTTPError,
+            requests.ConnectionError,
+            requests.Timeout,
+        ),
+    )
+    def _download_artifact(
+        self, artifact_id: _models.WorkflowRunArtifactID
+    ) -> WorkflowResult:
+        return self._client.get_workflow_run_artifact(artifact_id)
+
     def _invocation_id_by_task_run_id(
         self, wf_run_id: WorkflowRunId, task_run_id: TaskRunId
     ) -> TaskInvocationId:
@@ -370,33 +511,55 @@ class CERuntime(RuntimeInterface):
         Returns:
                 A list of the workflow runs
         """
+        return list(
+            self.iter_workflow_runs(
+                limit=limit,
+                max_age=max_age,
+                state=state,
+                workspace=workspace,
+                project=project,
+            )
+        )
+
+    def iter_workflow_runs(
+        self,
+        *,
+        limit: Optional[int] = None,
+        max_age: Optional[timedelta] = None,
+        state: Optional[Union[State, List[State]]] = None,
+        workspace: Optional[WorkspaceId] = None,
+        project: Optional[ProjectId] = None,
+    ) -> Generator[WorkflowRunMinimal, None, None]:
+        """
+        Lazy version of ``list_workflow_runs()``. Pages are requested as the runs are
+        consumed. The next page is fetched in the background while the current one is
+        being consumed. Closing the generator stops fetching.
+
+        Raises:
+            UnauthorizedError: if the remote cluster rejects the token
+        """
         if max_age or state:
+            # TODO(ORQSDK-684): driver client cannot do filtering via API yet
+            # https://zapatacomputing.atlassian.net/browse/ORQSDK-684?atlOrigin=eyJpIjoiYmNiZjUyMjZiNzg5NDI2YWJmNGU5NzAxZDI1MmJlNzEiLCJwIjoiaiJ9 # noqa: E501
             warnings.warn(
                 "Filtering CE workflow runs by max age and/or state is not currently "
                 "supported. These filters will not be applied."
             )
 
-        # Calculate how many pages of what sizes we need.
         # The max_page_size should be the same as the maximum defined in
         # https://github.com/zapatacomputing/workflow-driver/blob/fc3964d37e05d9421029fe28fa844699e2f99a52/openapi/src/parameters/query/pageSize.yaml#L10 # noqa: E501
         max_page_size: int = 100
-        page_sizes: Sequence[Optional[int]] = [None]
-        if limit is not None:
-            if limit < max_page_size:
-                page_sizes = [limit]
-            else:
-                page_sizes = [max_page_size for _ in range(limit // max_page_size)] + [
-                    limit % max_page_size
-                ]
 
-        page_token: Optional[str] = None
-        runs: List[WorkflowRunMinimal] = []
+        def _page_size(n_requested: int) -> Optional[int]:
+            if limit is None:
+                return None
+            return min(max_page_size, limit - n_requested)
 
-        for page_size in page_sizes:
+        def _fetch_page(
+            page_size: Optional[int], page_token: Optional[str]
+        ) -> _client.Paginated[WorkflowRunMinimal]:
             try:
-                # TODO(ORQSDK-684): driver client cannot do filtering via API yet
-                # https://zapatacomputing.atlassian.net/browse/ORQSDK-684?atlOrigin=eyJpIjoiYmNiZjUyMjZiNzg5NDI2YWJmNGU5NzAxZDI1MmJlNzEiLCJwIjoiaiJ9 # noqa: E501
-                paginated_runs = self._client.list_workflow_runs(
+                return self._client.list_workflow_runs(
                     page_size=page_size,
                     page_token=page_token,
                     workspace=workspace,
@@ -407,37 +570,48 @@ class CERuntime(RuntimeInterface):
                     "Could not get list of workflow runs "
                     "- the authorization token was rejected by the remote cluster."
                 ) from e
-            page_token = paginated_runs.next_page_token
-            runs += paginated_runs.contents
 
-            if page_size is not None and len(paginated_runs.contents) < page_size:
-                # If we got back fewer results than we asked for, then we've exhausted
-                # the available runs given our filters and don't want to make any
-                # further requests.
-                break
-
-        return runs
-
-    def get_workflow_logs(
+        executor = ThreadPoolExecutor(max_workers=1)
+        try:
+            page_size = _page_size(0)
+            next_page: Optional[Future] = executor.submit(_fetch_page, page_size, None)
+            n_requested = page_size or 0
+            while next_page is not None:
+                page = next_page.result()
+                next_page = None
+
+                exhausted = page.next_page_token is None or (
+                    # If we got back fewer results than we asked for, then we've
+                    # exhausted the available runs given our filters.
+                    page_size is not None
+                    and len(page.contents) < page_size
+                )
+                if not exhausted and (limit is None or n_requested < limit):
+                    page_size = _page_size(n_requested)
+                    next_page = executor.submit(
+                        _fetch_page, page_size, page.next_page_token
+                    )
+                    n_requested += page_size or 0
+
+                yield from page.contents
+        finally:
+            executor.shutdown(wait=False)
+
+    def _iter_logs(
         self, wf_run_id: WorkflowRunId
-    ) -> Dict[TaskInvocationId, List[str]]:
+    ) -> Iterator[Tuple[TaskInvocationId, str]]:
         """
-        Get the workflow logs.
-
-        Args:
-            wf_run_id: the ID of a workflow run
+        Streams the log lines of a workflow run. Lines that weren't produced by a
+        task are yielded under ``UNKNOWN_TASK_INV_ID``.
 
         Raises:
             WorkflowRunNotFound: if the workflow run cannot be found
             UnauthorizedError: if the remote cluster rejects the token
-            ...
-
-        Returns:
-            A dictionary whose keys are the task invocation ids, and whose values are a
-                list of log lines corresponding to that invocation.
+            InvalidWorkflowRunLogsError: if the logs can't be decoded
         """
         try:
-            logs: List[str] = self._client.get_workflow_run_logs(wf_run_id)
+            for task_inv_id, line in self._client.iter_workflow_run_logs(wf_run_id):
+                yield task_inv_id or UNKNOWN_TASK_INV_ID, line
         except (_exceptions.InvalidWorkflowRunID, _exceptions.WorkflowRunNotFound) as e:
             raise exceptions.WorkflowRunNotFoundError(
                 f"Workflow run with id `{wf_run_id}` not found"
@@ -453,10 +627,62 @@ class CERuntime(RuntimeInterface):
                 "Please report this as a bug."
             ) from e
 
-        return {"UNKNOWN TASK INV ID": logs}
+    def get_workflow_logs(
+        self, wf_run_id: WorkflowRunId
+    ) -> Dict[TaskInvocationId, List[str]]:
+        """
+        Get the workflow logs.
 
-    def get_task_logs(self, wf_run_id: WorkflowRunId, task_inv_id: TaskInvocationId):
-        raise NotImplementedError()
+        Args:
+            wf_run_id: the ID of a workflow run
+
+        Raises:
+            WorkflowRunNotFound: if the workflow run cannot be found
+            UnauthorizedError: if the remote cluster rejects the token
+            ...
+
+        Returns:
+            A dictionary whose keys are the task invocation ids, and whose values are a
+                list of log lines corresponding to that invocation. Lines that weren't
+                produced by a task, like Ray's own output, are under
+                ``UNKNOWN_TASK_INV_ID``.
+        """
+        logs: Dict[TaskInvocationId, List[str]] = {}
+        for task_inv_id, line in self._iter_logs(wf_run_id):
+            logs.setdefault(task_inv_id, []).append(line)
+
+        return logs
+
+    def get_task_logs(
+        self, wf_run_id: WorkflowRunId, task_inv_id: TaskInvocationId
+    ) -> List[str]:
+        """
+        Get the logs of a single task invocation. Only the matching lines are kept
+        while the workflow run logs are streamed.
+
+        Raises:
+            WorkflowRunNotFound: if the workflow run cannot be found
+            UnauthorizedError: if the remote cluster rejects the token
+        """
+        return [
+            line
+            for line_inv_id, line in self._iter_logs(wf_run_id)
+            if line_inv_id == task_inv_id
+        ]
+
+    def iter_workflow_logs(
+        self, wf_run_id: WorkflowRunId, *, follow: bool = False
+    ) -> Iterator[Tuple[TaskInvocationId, str]]:
+        """
+        See RuntimeInterface.iter_workflow_logs(). The logs are streamed on each
+        poll, and only the number of lines yielded for each task invocation is kept
+        between polls.
+        """
+        return _log_follow.poll_logs(
+            lambda: self._iter_logs(wf_run_id),
+            follow=follow,
+            is_finished=lambda: _log_follow.is_finished(self, wf_run_id),
+        )
 
     def list_workspaces(self):
         try:
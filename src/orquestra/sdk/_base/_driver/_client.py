@@ -10,9 +10,20 @@ Implemented API spec:
 
 import io
 import json
+import tarfile
 import zlib
-from tarfile import TarFile
-from typing import Generic, List, Mapping, Optional, TypeVar, Union
+from contextlib import closing
+from typing import (
+    Generic,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+)
 from urllib.parse import urljoin
 
 import pydantic
@@ -20,17 +31,19 @@ import requests
 from requests import codes
 
 from orquestra.sdk import ProjectRef
-from orquestra.sdk._ray._ray_logs import WFLog
-from orquestra.sdk.schema.ir import WorkflowDef
+from orquestra.sdk._ray._ray_logs import parse_log_line
+from orquestra.sdk.schema.ir import TaskInvocationId, WorkflowDef
 from orquestra.sdk.schema.responses import ComputeEngineWorkflowResult, WorkflowResult
 from orquestra.sdk.schema.workflow_run import (
     ProjectId,
+    RunStatus,
     WorkflowRun,
     WorkflowRunMinimal,
     WorkspaceId,
 )
 
 from . import _exceptions, _models
+from ._workflow_def_cache import WorkflowDefCache, WorkflowDefCacheStats
 
 API_ACTIONS = {
     # Workflow Definitions
@@ -69,6 +82,36 @@ def _handle_common_errors(response: requests.Response):
         raise _exceptions.UnknownHTTPError(response)
 
 
+# Size of the chunks read from streamed responses, in bytes.
+_STREAM_CHUNK_SIZE = 2**16
+
+
+class _ChunksReader(io.RawIOBase):
+    """
+    Read-only file object over an iterable of byte chunks, like a streamed response.
+    Only the current chunk is kept in memory.
+    """
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks = iter(chunks)
+        self._pending = memoryview(b"")
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while not self._pending:
+            try:
+                self._pending = memoryview(next(self._chunks))
+            except StopIteration:
+                return 0
+
+        n_bytes = min(len(buffer), len(self._pending))
+        buffer[:n_bytes] = self._pending[:n_bytes]
+        self._pending = self._pending[n_bytes:]
+        return n_bytes
+
+
 T = TypeVar("T")
 
 
@@ -114,26 +157,79 @@ class Paginated(Generic[T]):
         return self._next_token
 
 
+def _parse_log_section(
+    section: bytes,
+) -> Iterator[Tuple[Optional[TaskInvocationId], str]]:
+    if not section.strip():
+        return
+
+    for _, entry in json.loads(section):
+        line: str = entry["log"]
+        # Orquestra logs are jsonable - where we can we parse these and extract the
+        # useful information. Other lines, like the ones from Ray, are returned as
+        # they are.
+        wf_log = parse_log_line(line.encode())
+        if wf_log is None:
+            yield None, line
+        else:
+            yield wf_log.task_inv_id, wf_log.message
+
+
 class DriverClient:
     """
     Client for interacting with the Workflow Driver API via HTTP.
     """
 
-    def __init__(self, base_uri: str, session: requests.Session):
+    def __init__(
+        self,
+        base_uri: str,
+        session: requests.Session,
+        workflow_def_cache: Optional[WorkflowDefCache] = None,
+    ):
+        """
+        Args:
+            base_uri: Orquestra cluster URI, like 'https://foobar.orquestra.io'.
+            session: used to make all the requests.
+            workflow_def_cache: keeps the fetched workflow definitions. Defaults to
+                an in-memory cache.
+        """
         self._base_uri = base_uri
         self._session = session
+        self._workflow_def_cache = workflow_def_cache or WorkflowDefCache()
 
     @classmethod
-    def from_token(cls, base_uri: str, token: str):
+    def from_token(
+        cls, base_uri: str, token: str, max_connections: Optional[int] = None
+    ):
         """
         Args:
             base_uri: Orquestra cluster URI, like 'https://foobar.orquestra.io'.
             token: Auth token taken from logging in.
+            max_connections: how many connections to the cluster are kept open for
+                reuse. Should match the number of threads sharing the client.
+                Defaults to the ``requests`` default.
         """
         session = requests.Session()
+        if max_connections is not None:
+            adapter = requests.adapters.HTTPAdapter(
+                pool_connections=1, pool_maxsize=max_connections
+            )
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
         session.headers["Content-Type"] = "application/json"
         session.headers["Authorization"] = f"Bearer {token}"
-        return cls(base_uri=base_uri, session=session)
+        return cls(
+            base_uri=base_uri,
+            session=session,
+            workflow_def_cache=WorkflowDefCache.from_env(base_uri),
+        )
+
+    def workflow_def_cache_stats(self) -> WorkflowDefCacheStats:
+        """
+        Hits and misses of the workflow definition cache, shared by
+        ``get_workflow_def()``, ``get_workflow_run()``, and ``list_workflow_runs()``.
+        """
+        return self._workflow_def_cache.stats()
 
     # --- helpers ---
 
@@ -142,12 +238,14 @@ class DriverClient:
         endpoint: str,
         query_params: Optional[Mapping],
         allow_redirects: bool = True,
+        stream: bool = False,
     ) -> requests.Response:
         """Helper method for GET requests"""
         response = self._session.get(
             urljoin(self._base_uri, endpoint),
             params=query_params,
             allow_redirects=allow_redirects,
+            stream=stream,
         )
 
         return response
@@ -285,8 +383,16 @@ class DriverClient:
             UnknownHTTPError: see the exception's docstring
 
         Returns:
-            a parsed WorkflowDef
+            a parsed WorkflowDef. Definitions are immutable, so each one is fetched
+            once per client.
         """
+        return self._workflow_def_cache.get(
+            workflow_def_id, lambda: self._fetch_workflow_def(workflow_def_id)
+        )
+
+    def _fetch_workflow_def(
+        self, workflow_def_id: _models.WorkflowDefID
+    ) -> _models.GetWorkflowDefResponse:
         resp = self._get(
             API_ACTIONS["get_workflow_def"].format(workflow_def_id),
             query_params=None,
@@ -316,6 +422,7 @@ class DriverClient:
             ForbiddenError: see the exception's docstring
             UnknownHTTPError: see the exception's docstring
         """
+        self._workflow_def_cache.invalidate(workflow_def_id)
         resp = self._delete(
             API_ACTIONS["delete_workflow_def"].format(workflow_def_id),
         )
@@ -443,6 +550,36 @@ class DriverClient:
 
         return parsed_response.data.to_ir(workflow_def.workflow)
 
+    def get_workflow_run_status(self, wf_run_id: _models.WorkflowRunID) -> RunStatus:
+        """
+        Gets only the status of a workflow run from the workflow driver. Unlike
+        get_workflow_run(), it doesn't need the workflow definition nor parses the
+        task runs.
+
+        Raises:
+            InvalidWorkflowRunID: see the exception's docstring
+            WorkflowRunNotFound: see the exception's docstring
+            InvalidTokenError: see the exception's docstring
+            ForbiddenError: see the exception's docstring
+            UnknownHTTPError: see the exception's docstring
+        """
+
+        resp = self._get(
+            API_ACTIONS["get_workflow_run"].format(wf_run_id),
+            query_params=None,
+        )
+
+        if resp.status_code == codes.BAD_REQUEST:
+            raise _exceptions.InvalidWorkflowRunID(wf_run_id)
+        elif resp.status_code == codes.NOT_FOUND:
+            raise _exceptions.WorkflowRunNotFound(wf_run_id)
+
+        _handle_common_errors(resp)
+
+        return _models.RunStatusResponse.parse_obj(
+            resp.json()["data"]["status"]
+        ).to_ir()
+
     def terminate_workflow_run(self, wf_run_id: _models.WorkflowRunID):
         """
         Asks the workflow driver to terminate a workflow run
@@ -630,50 +767,65 @@ class DriverClient:
             UnknownHTTPError: see the exception's docstring
             WorkflowRunLogsNotReadable: see the exception's docstring
         """
+        return [line for _, line in self.iter_workflow_run_logs(wf_run_id)]
+
+    def iter_workflow_run_logs(
+        self, wf_run_id: _models.WorkflowRunID
+    ) -> Iterator[Tuple[Optional[TaskInvocationId], str]]:
+        """
+        Streams the logs of a workflow run from the workflow driver. The archive is
+        decompressed and parsed while it's downloaded, one log section at a time.
+
+        Raises:
+            InvalidWorkflowRunID: see the exception's docstring
+            WorkflowRunNotFound: see the exception's docstring
+            InvalidTokenError: see the exception's docstring
+            ForbiddenError: see the exception's docstring
+            UnknownHTTPError: see the exception's docstring
+            WorkflowRunLogsNotReadable: see the exception's docstring
+
+        Yields:
+            (task invocation ID, log line) pairs. The ID is ``None`` for lines that
+                weren't produced by a task, like Ray's own output.
+        """
 
         resp = self._get(
             API_ACTIONS["get_workflow_run_logs"],
             query_params=_models.GetWorkflowRunLogsRequest(
                 workflowRunId=wf_run_id
             ).dict(),
+            stream=True,
         )
 
-        # Handle errors
-        if resp.status_code == codes.NOT_FOUND:
-            raise _exceptions.WorkflowRunLogsNotFound(wf_run_id)
-        elif resp.status_code == codes.BAD_REQUEST:
-            raise _exceptions.InvalidWorkflowRunID(wf_run_id)
+        with closing(resp):
+            # Handle errors
+            if resp.status_code == codes.NOT_FOUND:
+                raise _exceptions.WorkflowRunLogsNotFound(wf_run_id)
+            elif resp.status_code == codes.BAD_REQUEST:
+                raise _exceptions.InvalidWorkflowRunID(wf_run_id)
 
-        _handle_common_errors(resp)
+            _handle_common_errors(resp)
 
-        # Decompress data
-        try:
-            unzipped: bytes = zlib.decompress(resp.content, 16 + zlib.MAX_WBITS)
-        except zlib.error as e:
-            raise _exceptions.WorkflowRunLogsNotReadable(wf_run_id) from e
-
-        untarred = TarFile(fileobj=io.BytesIO(unzipped)).extractfile("step-logs")
-        assert untarred is not None
-        decoded = untarred.read().decode()
-
-        # Parse the decoded data as logs
-        # TODO: index by taskinvocationID rather than workflowrunID [ORQSDK-777]
-        logs = []
-        for section in decoded.split("\n"):
-            if len(section) < 1:
-                continue
-            for log in json.loads(section):
-                try:
-                    # Orquestra logs are jsonable - where we can we parse these and
-                    # extract the useful information
-                    interpreted_log = WFLog.parse_raw(log[1]["log"])
-                    logs.append(interpreted_log.message)
-                except pydantic.ValidationError:
-                    # If the log isn't jsonable (i.e. it comes from Ray) we just return
-                    # plain log content.
-                    logs.append(log[1]["log"])
-
-        return logs
+            # The response is a gzipped tar archive. "r|gz" reads it sequentially,
+            # decompressing only what's needed for the current member.
+            archive = io.BufferedReader(
+                _ChunksReader(resp.iter_content(chunk_size=_STREAM_CHUNK_SIZE))
+            )
+            try:
+                with tarfile.open(fileobj=archive, mode="r|gz") as tar:
+                    for member in tar:
+                        if member.name != "step-logs":
+                            continue
+                        sections = tar.extractfile(member)
+                        assert sections is not None
+                        # Each line is a JSON list of log entries.
+                        for section in sections:
+                            yield from _parse_log_section(section)
+                        return
+            except (tarfile.TarError, zlib.error, EOFError) as e:
+                raise _exceptions.WorkflowRunLogsNotReadable(wf_run_id) from e
+
+            raise _exceptions.WorkflowRunLogsNotReadable(wf_run_id)
 
     def get_task_run_logs(self, task_run_id: _models.TaskRunID) -> bytes:
         """
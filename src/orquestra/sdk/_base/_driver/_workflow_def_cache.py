@@ -0,0 +1,189 @@
+################################################################################
+# © Copyright 2023 Zapata Computing Inc.
+################################################################################
+"""
+Memo of workflow definitions fetched from the workflow driver.
+
+Every workflow run returned by the driver references its definition by ID. Listing
+runs that share a definition would fetch and parse the same, potentially large, IR
+over and over. Stored definitions are immutable, so we keep each one after the first
+fetch. Optionally, definitions are also kept on disk to be reused across processes.
+"""
+import os
+import threading
+import typing as t
+from concurrent.futures import Future
+from pathlib import Path
+from urllib.parse import urlparse
+
+from .._env import CE_WORKFLOW_DEF_CACHE_PATH_ENV
+from . import _models
+
+
+class WorkflowDefCacheStats(t.NamedTuple):
+    # Lookups served without a request to the workflow driver, including lookups
+    # that waited for a concurrent request for the same ID.
+    hits: int
+    # Lookups that made a request to the workflow driver.
+    misses: int
+    # Number of definitions kept in memory.
+    size: int
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class WorkflowDefCache:
+    """
+    Unbounded, thread-safe memo of workflow definition ID -> parsed definition.
+
+    Concurrent lookups of the same ID share a single request.
+    """
+
+    @classmethod
+    def from_env(cls, base_uri: str) -> "WorkflowDefCache":
+        """
+        Enables the on-disk layer if ``ORQ_CE_WORKFLOW_DEF_CACHE_PATH`` is set.
+        Definitions of each cluster are kept in a separate directory.
+        """
+        try:
+            path = Path(os.environ[CE_WORKFLOW_DEF_CACHE_PATH_ENV])
+        except KeyError:
+            return cls()
+
+        return cls(path=path / (urlparse(base_uri).netloc or "default"))
+
+    def __init__(self, path: t.Optional[Path] = None):
+        """
+        Args:
+            path: if set, definitions are also stored as JSON files in this directory.
+                Created on first write.
+        """
+        self._path = path
+        self._entries: t.Dict[
+            _models.WorkflowDefID, _models.GetWorkflowDefResponse
+        ] = {}
+        self._in_flight: t.Dict[_models.WorkflowDefID, Future] = {}
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get(
+        self,
+        workflow_def_id: _models.WorkflowDefID,
+        fetch: t.Callable[[], _models.GetWorkflowDefResponse],
+    ) -> _models.GetWorkflowDefResponse:
+        """
+        Returns the definition with ``workflow_def_id``. Calls ``fetch`` if it isn't
+        cached yet. Errors raised by ``fetch`` aren't cached.
+        """
+        with self._lock:
+            try:
+                entry = self._entries[workflow_def_id]
+            except KeyError:
+                pass
+            else:
+                self._hits += 1
+                return entry
+
+            in_flight = self._in_flight.get(workflow_def_id)
+            if in_flight is None:
+                future: Future = Future()
+                self._in_flight[workflow_def_id] = future
+            else:
+                self._hits += 1
+
+        if in_flight is not None:
+            return in_flight.result()
+
+        try:
+            entry = self._load(workflow_def_id) or self._fetch(workflow_def_id, fetch)
+        except BaseException as e:
+            with self._lock:
+                del self._in_flight[workflow_def_id]
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            self._entries[workflow_def_id] = entry
+            del self._in_flight[workflow_def_id]
+        future.set_result(entry)
+
+        return entry
+
+    def invalidate(self, workflow_def_id: _models.WorkflowDefID):
+        """
+        Forgets the definition, e.g. after it was deleted from the cluster.
+        """
+        with self._lock:
+            self._entries.pop(workflow_def_id, None)
+
+        if self._path is not None:
+            try:
+                self._file_path(workflow_def_id).unlink()
+            except FileNotFoundError:
+                pass
+
+    def stats(self) -> WorkflowDefCacheStats:
+        with self._lock:
+            return WorkflowDefCacheStats(
+                hits=self._hits, misses=self._misses, size=len(self._entries)
+            )
+
+    # ------------------------------ internals -------------------------------
+
+    def _fetch(
+        self,
+        workflow_def_id: _models.WorkflowDefID,
+        fetch: t.Callable[[], _models.GetWorkflowDefResponse],
+    ) -> _models.GetWorkflowDefResponse:
+        with self._lock:
+            self._misses += 1
+
+        entry = fetch()
+        self._store(workflow_def_id, entry)
+
+        return entry
+
+    def _file_path(self, workflow_def_id: _models.WorkflowDefID) -> Path:
+        assert self._path is not None
+        return self._path / f"{workflow_def_id}.json"
+
+    def _load(
+        self, workflow_def_id: _models.WorkflowDefID
+    ) -> t.Optional[_models.GetWorkflowDefResponse]:
+        if self._path is None:
+            return None
+
+        try:
+            entry = _models.GetWorkflowDefResponse.parse_file(
+                self._file_path(workflow_def_id)
+            )
+        except (OSError, ValueError):
+            # Missing or unreadable. Fetch it again.
+            return None
+
+        with self._lock:
+            self._hits += 1
+
+        return entry
+
+    def _store(
+        self,
+        workflow_def_id: _models.WorkflowDefID,
+        entry: _models.GetWorkflowDefResponse,
+    ):
+        if self._path is None:
+            return
+
+        file_path = self._file_path(workflow_def_id)
+        tmp_path = file_path.with_name(f"{file_path.name}.{os.getpid()}.tmp")
+        try:
+            self._path.mkdir(parents=True, exist_ok=True)
+            tmp_path.write_text(entry.json())
+            os.replace(tmp_path, file_path)
+        except OSError:
+            # The on-disk layer is best-effort.
+            pass
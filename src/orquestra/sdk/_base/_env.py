@@ -15,11 +15,52 @@ Example:
 
 DB_PATH_ENV = "ORQ_DB_PATH"
 """
-Used to configure the location of the `workflows.db`
+Used to configure the location of the local workflow database of older SDK versions.
+Defaults to `~/.orquestra/workflows.db`. The SDK keeps its runs in a file next to it,
+with `.v2` inserted before the extension, e.g. `/tmp/workflows.v2.db`.
 Example:
     ORQ_DB_PATH=/tmp/workflows.db
 """
 
+ARTIFACT_CACHE_PATH_ENV = "ORQ_ARTIFACT_CACHE_PATH"
+"""
+Used to configure the location of the local cache of finished workflow runs' artifacts
+Example:
+    ORQ_ARTIFACT_CACHE_PATH=/tmp/artifacts
+"""
+
+ARTIFACT_CACHE_MAX_SIZE_ENV = "ORQ_ARTIFACT_CACHE_MAX_SIZE"
+"""
+Used to configure the size limit of the local artifact cache, in bytes. Least recently
+used workflow runs are evicted first. Setting it to 0 disables the cache.
+Example:
+    ORQ_ARTIFACT_CACHE_MAX_SIZE=1000000000
+"""
+
+CE_ARTIFACT_DOWNLOAD_CONCURRENCY_ENV = "ORQ_CE_ARTIFACT_DOWNLOAD_CONCURRENCY"
+"""
+Used to configure how many task artifacts are downloaded in parallel from Compute
+Engine. Defaults to 8.
+Example:
+    ORQ_CE_ARTIFACT_DOWNLOAD_CONCURRENCY=16
+"""
+
+CE_WORKFLOW_DEF_CACHE_PATH_ENV = "ORQ_CE_WORKFLOW_DEF_CACHE_PATH"
+"""
+If set, workflow definitions fetched from Compute Engine are also cached on disk in
+this directory, and reused across processes.
+Example:
+    ORQ_CE_WORKFLOW_DEF_CACHE_PATH=/tmp/workflow_defs
+"""
+
+QE_STATUS_FETCH_CONCURRENCY_ENV = "ORQ_QE_STATUS_FETCH_CONCURRENCY"
+"""
+Used to configure how many workflow run statuses are fetched in parallel from Quantum
+Engine when listing workflow runs. Defaults to 8.
+Example:
+    ORQ_QE_STATUS_FETCH_CONCURRENCY=16
+"""
+
 PASSPORT_FILE_ENV = "ORQUESTRA_PASSPORT_FILE"
 """
 Consumed by the Workflow SDK to set auth in remote contexts
@@ -88,6 +129,33 @@ Example:
     ORQ_RAY_SET_CUSTOM_IMAGE_RESOURCES=1
 """
 
+RAY_RAW_PICKLE5_ARTIFACTS_ENV = "ORQ_RAY_RAW_PICKLE5_ARTIFACTS"
+"""
+Used to make Ray tasks serialize their outputs with the binary RAW_PICKLE5 format
+instead of base64-encoded pickles. Read when the workflow is submitted.
+Example:
+    ORQ_RAY_RAW_PICKLE5_ARTIFACTS=1
+"""
+
+RAY_PASS_RAW_VALUES_ENV = "ORQ_RAY_PASS_RAW_VALUES"
+"""
+Used to make Ray tasks pass their outputs to other tasks without serializing them.
+Ray keeps them in its object store, and NumPy arrays are passed without copying.
+Outputs are serialized only when they're requested, so their types have to be
+importable wherever the outputs are read. Read when the workflow is submitted.
+Example:
+    ORQ_RAY_PASS_RAW_VALUES=1
+"""
+
+WORKFLOW_MODEL_CACHE_PATH_ENV = "ORQ_WORKFLOW_MODEL_CACHE_PATH"
+"""
+Used to keep workflow definition models on disk, so building the model of an
+unchanged workflow again skips running the workflow function and the graph traversal.
+Disabled if not set.
+Example:
+    ORQ_WORKFLOW_MODEL_CACHE_PATH=/tmp/workflow_models
+"""
+
 
 # ------------------------------- utilities ----------------------------------
 
@@ -210,8 +210,20 @@ class InProcessRuntime(abc.RuntimeInterface):
     ) -> t.Dict[ir.TaskInvocationId, WorkflowResult]:
         wf_def = self._workflow_def_store[workflow_run_id]
 
+        return self.get_outputs(workflow_run_id, list(wf_def.task_invocations))
+
+    def get_outputs(
+        self, workflow_run_id: WfRunId, task_inv_ids: t.Sequence[ir.TaskInvocationId]
+    ) -> t.Dict[ir.TaskInvocationId, WorkflowResult]:
+        wf_def = self._workflow_def_store[workflow_run_id]
+
         inv_outputs: t.Dict[ir.TaskInvocationId, WorkflowResult] = {}
-        for inv in wf_def.task_invocations.values():
+        for inv_id in task_inv_ids:
+            try:
+                inv = wf_def.task_invocations[inv_id]
+            except KeyError:
+                continue
+
             # Assumption there's always a non-unpacked artifact. We want to return
             # whatever shape was returned from the task function so we can use the
             # "packed" artifact. For more info on artifact unpacking, see
@@ -350,5 +362,10 @@ class InProcessRuntime(abc.RuntimeInterface):
             "This functionality isn't available for 'in_process' runtime"
         )
 
+    def iter_workflow_logs(self, *args, **kwargs):
+        raise NotImplementedError(
+            "This functionality isn't available for 'in_process' runtime"
+        )
+
     def get_workflow_project(self, wf_run_id: WorkflowRunId):
         raise exceptions.WorkspacesNotSupportedError()
@@ -0,0 +1,60 @@
+################################################################################
+# © Copyright 2023 Zapata Computing Inc.
+################################################################################
+"""
+Polling helpers for runtimes that can't stream new log lines as they're produced.
+"""
+import time
+import typing as t
+
+from orquestra.sdk.schema.ir import TaskInvocationId
+from orquestra.sdk.schema.workflow_run import State, WorkflowRunId
+
+if t.TYPE_CHECKING:
+    from orquestra.sdk._base.abc import RuntimeInterface
+
+# How long to wait between reads when following the logs of a workflow run, in
+# seconds.
+LOGS_POLL_INTERVAL = 2.0
+
+_UNFINISHED_STATES = frozenset({State.WAITING, State.RUNNING})
+
+
+def is_finished(runtime: "RuntimeInterface", wf_run_id: WorkflowRunId) -> bool:
+    states = runtime.get_workflow_run_states([wf_run_id])
+    return states[wf_run_id] not in _UNFINISHED_STATES
+
+
+def poll_logs(
+    read_logs: t.Callable[[], t.Iterable[t.Tuple[TaskInvocationId, str]]],
+    *,
+    follow: bool,
+    is_finished: t.Callable[[], bool],
+) -> t.Iterator[t.Tuple[TaskInvocationId, str]]:
+    """
+    Implements ``RuntimeInterface.iter_workflow_logs()`` on top of reading all the
+    available logs.
+
+    Each read is expected to return the lines of every task invocation in the order
+    they were produced. Only the number of lines yielded for each task invocation is
+    kept between reads, and the lines past it are yielded.
+
+    Args:
+        read_logs: reads all available (task invocation ID, log line) pairs.
+        follow: if ``False``, the logs are read once.
+        is_finished: called before each read. The read after it returns ``True``
+            is the last one.
+    """
+    n_yielded: t.Dict[TaskInvocationId, int] = {}
+    while True:
+        finished = not follow or is_finished()
+        n_read: t.Dict[TaskInvocationId, int] = {}
+        for task_inv_id, line in read_logs():
+            n_read[task_inv_id] = n_read.get(task_inv_id, 0) + 1
+            if n_read[task_inv_id] > n_yielded.get(task_inv_id, 0):
+                n_yielded[task_inv_id] = n_read[task_inv_id]
+                yield task_inv_id, line
+
+        if finished:
+            return
+        time.sleep(LOGS_POLL_INTERVAL)
@@ -8,26 +8,28 @@ import base64
 import gzip
 import io
 import json
+import os
 import re
 import sqlite3
 import sys
 import tarfile
 import warnings
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Set, Tuple, Union
 
 import pydantic
 import requests
 
 from orquestra.sdk import exceptions
-from orquestra.sdk._base import serde
+from orquestra.sdk._base import _env, _log_follow, serde
 from orquestra.sdk._base._conversions._yaml_exporter import (
     pydantic_to_yaml,
     workflow_to_yaml,
 )
-from orquestra.sdk._base._db import WorkflowDB
+from orquestra.sdk._base._db import StoredWorkflowRunRow, WorkflowDB
 from orquestra.sdk._base._spaces._structs import ProjectRef
 from orquestra.sdk._base.abc import RuntimeInterface
 from orquestra.sdk.schema.configs import RuntimeConfiguration
@@ -41,6 +43,7 @@ from orquestra.sdk.schema.ir import (
 from orquestra.sdk.schema.local_database import StoredWorkflowRun
 from orquestra.sdk.schema.responses import WorkflowResult
 from orquestra.sdk.schema.workflow_run import (
+    TERMINAL_STATES,
     ProjectId,
     RunStatus,
     State,
@@ -53,6 +56,8 @@ from orquestra.sdk.schema.workflow_run import (
 
 from . import _client
 
+DEFAULT_STATUS_FETCH_CONCURRENCY = 8
+
 # From: https://pkg.go.dev/github.com/argoproj/argo/pkg/apis/workflow/v1alpha1#NodePhase
 QE_PHASE_ORQ_STATUS = {
     "Pending": State.WAITING,
@@ -72,6 +77,18 @@ QE_PHASE_ORQ_STATUS = {
 }
 
 
+def _status_fetch_concurrency() -> int:
+    value = os.getenv(_env.QE_STATUS_FETCH_CONCURRENCY_ENV)
+    if value is None:
+        return DEFAULT_STATUS_FETCH_CONCURRENCY
+    try:
+        return max(int(value), 1)
+    except ValueError as e:
+        raise exceptions.RuntimeConfigError(
+            f"Invalid {_env.QE_STATUS_FETCH_CONCURRENCY_ENV} value: `{value}`"
+        ) from e
+
+
 def parse_date_or_none(date_str: Optional[str]) -> Optional[datetime]:
     if date_str is None or date_str == "":
         return None
@@ -427,7 +444,15 @@ class QERuntime(RuntimeInterface):
                 "Invalid QE configuration. Did you login first?"
             )
 
+        self._status_fetch_concurrency = _status_fetch_concurrency()
+
         session = requests.Session()
+        # Status fetches run in parallel. Keep a connection for each thread.
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=1, pool_maxsize=self._status_fetch_concurrency
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
         session.headers["Content-Type"] = "application/json; charset=utf-8"
         session.headers["Authorization"] = f"Bearer {token}"
         self._client = _client.QEClient(session=session, base_uri=base_uri)
@@ -613,8 +638,12 @@ class QERuntime(RuntimeInterface):
         """
         try:
             with WorkflowDB.open_project_db(self._project_dir) as db:
+                if (
+                    finished := db.get_finished_workflow_run(workflow_run_id)
+                ) is not None:
+                    return finished
                 try:
-                    wf_run = db.get_workflow_run(workflow_run_id)
+                    stored_run = db.get_workflow_run(workflow_run_id)
                 except exceptions.WorkflowNotFoundError:
                     # explicit re-raise
                     raise
@@ -622,18 +651,106 @@ class QERuntime(RuntimeInterface):
         except sqlite3.OperationalError as e:
             raise exceptions.WorkflowNotFoundError(workflow_run_id) from e
 
-        wf_def = wf_run.workflow_def
+        wf_run = self._fetch_workflow_run(stored_run)
+        if wf_run.status.state in TERMINAL_STATES:
+            with WorkflowDB.open_project_db(self._project_dir) as db:
+                db.save_finished_workflow_run(wf_run)
+
+        return wf_run
+
+    def _fetch_workflow_run(self, stored_run: StoredWorkflowRun) -> WorkflowRun:
+        """
+        Gets the status of a workflow run from QE. Doesn't touch the local database.
+        """
         with _http_error_handling():
-            json_response = self._client.get_workflow(wf_id=workflow_run_id)
+            json_response = self._client.get_workflow(wf_id=stored_run.workflow_run_id)
 
         # Load the Argo representation from the response
         # TODO/FIXME: Is this a stable interface? Should it be exposed?
         representation = base64.b64decode(json_response["currentRepresentation"])
         json_representation = json.loads(representation)
         return _parse_workflow_run_representation(
-            json_representation, workflow_run_id, wf_def, json_response["status"]
+            json_representation,
+            stored_run.workflow_run_id,
+            stored_run.workflow_def,
+            json_response["status"],
         )
 
+    def get_workflow_run_states(
+        self, workflow_run_ids: Sequence[WorkflowRunId]
+    ) -> Dict[WorkflowRunId, State]:
+        """
+        States of finished runs are read from the local database. The other ones are
+        fetched from QE in parallel. Only the state reported by QE is used; the Argo
+        representation isn't decoded.
+
+        Raises:
+            orquestra.sdk.exceptions.UnauthorizedError if QE returns 401
+        """
+        with WorkflowDB.open_project_db(self._project_dir) as db:
+            states = db.get_finished_workflow_run_states(workflow_run_ids)
+
+        to_fetch = [
+            wf_run_id for wf_run_id in workflow_run_ids if wf_run_id not in states
+        ]
+        if to_fetch:
+            n_workers = min(self._status_fetch_concurrency, len(to_fetch))
+            with ThreadPoolExecutor(max_workers=n_workers) as executor:
+                fetched = executor.map(self._fetch_workflow_run_state, to_fetch)
+                states.update(zip(to_fetch, fetched))
+
+        return states
+
+    def _fetch_workflow_run_state(self, workflow_run_id: WorkflowRunId) -> State:
+        with _http_error_handling():
+            json_response = self._client.get_workflow(wf_id=workflow_run_id)
+
+        return QE_PHASE_ORQ_STATUS[json_response["status"]]
+
+    def _get_workflow_run_statuses(
+        self, stored_runs: Sequence[StoredWorkflowRunRow]
+    ) -> List[WorkflowRun]:
+        """
+        Statuses of finished runs are read from the local database. The other ones
+        are fetched from QE in parallel, at most ``_status_fetch_concurrency`` at a
+        time. Runs that have finished since are stored in the local database.
+        HTTP errors are propagated.
+
+        The workflow definitions of ``stored_runs`` are parsed only for the runs
+        fetched from QE. Finished runs come with theirs.
+        """
+        with WorkflowDB.open_project_db(self._project_dir) as db:
+            finished = db.get_finished_workflow_runs(
+                config_name=self._config.config_name
+            )
+
+        to_fetch = [
+            r.to_stored_workflow_run()
+            for r in stored_runs
+            if r.workflow_run_id not in finished
+        ]
+        fetched: Dict[WorkflowRunId, WorkflowRun] = {}
+        if to_fetch:
+            n_workers = min(self._status_fetch_concurrency, len(to_fetch))
+            with ThreadPoolExecutor(max_workers=n_workers) as executor:
+                for wf_run in executor.map(self._fetch_workflow_run, to_fetch):
+                    fetched[wf_run.id] = wf_run
+
+        newly_finished = [
+            wf_run
+            for wf_run in fetched.values()
+            if wf_run.status.state in TERMINAL_STATES
+        ]
+        if newly_finished:
+            with WorkflowDB.open_project_db(self._project_dir) as db:
+                for wf_run in newly_finished:
+                    db.save_finished_workflow_run(wf_run)
+
+        return [
+            finished.get(r.workflow_run_id) or fetched[r.workflow_run_id]
+            for r in stored_runs
+        ]
+
     def get_workflow_run_outputs_non_blocking(
         self, workflow_run_id: WorkflowRunId
     ) -> Sequence[Any]:
@@ -708,9 +825,44 @@ class QERuntime(RuntimeInterface):
              a dictionary of:
                  task invocation IDs: value returned from each invocation
         """
+        return self._get_outputs(workflow_run_id, task_inv_ids=None)
+
+    def get_outputs(
+        self,
+        workflow_run_id: WorkflowRunId,
+        task_inv_ids: Sequence[TaskInvocationId],
+    ) -> Dict[TaskInvocationId, WorkflowResult]:
+        """Returns output artifacts of the selected task invocations. Only the
+        selected artifacts are downloaded.
+
+         Args:
+             workflow_run_id: the ID of the workflow run
+             task_inv_ids: the task invocations to get the outputs of
+
+         Raises:
+             NotFoundError: if the workflow run cannot be found or is unrelated to this
+                 project
+             orquestra.sdk.exceptions.UnauthorizedError if QE returns 401
+
+         Returns:
+             a dictionary of:
+                 task invocation IDs: value returned from each invocation
+        """
+        return self._get_outputs(workflow_run_id, task_inv_ids=set(task_inv_ids))
+
+    def _get_outputs(
+        self,
+        workflow_run_id: WorkflowRunId,
+        task_inv_ids: Optional[Set[TaskInvocationId]],
+    ) -> Dict[TaskInvocationId, WorkflowResult]:
         with WorkflowDB.open_project_db(self._project_dir) as db:
             wf_run = db.get_workflow_run(workflow_run_id)
         wf_def = wf_run.workflow_def
+        invocations = [
+            inv
+            for inv in wf_def.task_invocations.values()
+            if task_inv_ids is None or inv.id in task_inv_ids
+        ]
         # Return dict contains return values for task invocation
         return_dict: Dict[str, WorkflowResult] = {}
         with _http_error_handling():
@@ -720,7 +872,7 @@ class QERuntime(RuntimeInterface):
             # see "orquestra.sdk._base._traversal".
             # If we don't have a packed artifact, then this is an older QE result that
             # was unpacked. In this case, we'll just return what we have.
-            for inv in wf_def.task_invocations.values():
+            for inv in invocations:
                 packed_id = _find_packed_artifact_id(wf_def, inv.id)
                 try:
                     if packed_id is None:
@@ -806,6 +958,23 @@ class QERuntime(RuntimeInterface):
             for task_run in workflow_run.task_runs
         }
 
+    def iter_workflow_logs(
+        self, wf_run_id: WorkflowRunId, *, follow: bool = False
+    ) -> Iterator[Tuple[TaskInvocationId, str]]:
+        """
+        See RuntimeInterface.iter_workflow_logs(). QE can't return only the new
+        lines, so all logs are read again on each poll.
+        """
+        return _log_follow.poll_logs(
+            lambda: (
+                (inv_id, line)
+                for inv_id, lines in self.get_workflow_logs(wf_run_id).items()
+                for line in lines
+            ),
+            follow=follow,
+            is_finished=lambda: _log_follow.is_finished(self, wf_run_id),
+        )
+
     def stop_workflow_run(self, run_id: WorkflowRunId) -> None:
         """Terminates a workflow run.
 
@@ -870,8 +1039,8 @@ class QERuntime(RuntimeInterface):
 
         # Grab the workflows we know about from the DB
         with WorkflowDB.open_project_db(self._project_dir) as db:
-            stored_runs = db.get_workflow_runs_list(
-                config_name=self._config.config_name
+            stored_runs = list(
+                db.iter_workflow_runs(config_name=self._config.config_name)
             )
 
         # Short circuit if we don't have any workflow runs
@@ -887,12 +1056,7 @@ class QERuntime(RuntimeInterface):
             state_list = None
 
         wf_runs = []
-        for wf_run_id in (r.workflow_run_id for r in stored_runs):
-            try:
-                wf_run = self.get_workflow_run_status(wf_run_id)
-            except exceptions.WorkflowRunNotFoundError:
-                continue
-
+        for wf_run in self._get_workflow_run_statuses(stored_runs):
             # Let's filter the workflows at this point, instead of iterating over a list
             # multiple times
             if state_list is not None and wf_run.status.state not in state_list:
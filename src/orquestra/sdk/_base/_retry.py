@@ -8,7 +8,7 @@ from typing import Optional, Tuple, Type
 def retry(
     *,
     attempts: int,
-    allowed_exceptions: Tuple[Type[Exception]],
+    allowed_exceptions: Tuple[Type[Exception], ...],
     delay: Optional[float] = None,
 ):
     """
@@ -85,6 +85,9 @@ class GraphTraversal:
     def __init__(self):
         self._secrets: t.MutableMapping[t.Hashable, ir.SecretNode] = {}
         self._constants: t.MutableMapping[t.Hashable, ir.ConstantNode] = {}
+        # Constant values in the order they were visited. They're serialized after
+        # the graph walk, once per key.
+        self._constant_values: t.MutableMapping[t.Hashable, _dsl.Constant] = {}
 
         # Running a task invocation results in values. The values are stored in
         # artifacts. Some of the values can be subscripted. Some of the values
@@ -181,10 +184,6 @@ class GraphTraversal:
         constants, and secrets.
         """
         secret_counter = 0
-        constant_counter = 0
-
-        seen_futures: t.MutableSet[_dsl.ArtifactFuture] = set()
-        seen_invocations: t.MutableSet[_dsl.TaskInvocation] = set()
 
         for n in _iter_nodes(output_nodes):
             if isinstance(n, _dsl.ArtifactFuture):
@@ -193,15 +192,12 @@ class GraphTraversal:
                 # - self._invocation_unpacked_artifacts
                 # - self._invocation_non_unpacked_artifacts
 
-                # A single future can be used in multiple places in the workflow. We
-                # only want to handle it once.
-                if n in seen_futures:
-                    continue
-
+                # "_iter_nodes()" yields each future once, even if it's used in
+                # multiple places in the workflow.
                 out_meta = n.invocation.task._output_metadata
 
                 # There can be many futures requiring to run the same task invocation.
-                if n.invocation in seen_invocations:
+                if n.invocation in self._invocation_non_unpacked_artifacts:
                     # We've already handled the invocation, but not this future. We're
                     # supposed to have artifact nodes already generated for it. We just
                     # need to point "self._future_artifacts" to it.
@@ -249,10 +245,6 @@ class GraphTraversal:
 
                     self._point_future_to_artifact(n)
 
-                # due dilligence
-                seen_futures.add(n)
-                seen_invocations.add(n.invocation)
-
             elif isinstance(n, _dsl.Secret):
                 self._secrets[_make_key(n)] = ir.SecretNode(
                     id=f"secret-{secret_counter}",
@@ -261,8 +253,27 @@ class GraphTraversal:
                 )
                 secret_counter += 1
             else:
-                self._constants[_make_key(n)] = _make_constant_node(constant_counter, n)
-                constant_counter += 1
+                self._constant_values[_make_key(n)] = n
+
+        self._make_constant_nodes()
+
+    def _make_constant_nodes(self):
+        """
+        Serializes the visited constants. Constants that serialize to the same value
+        share a single node, even if they're different objects, like two equal
+        lists.
+        """
+        nodes_by_value: t.Dict[t.Hashable, ir.ConstantNode] = {}
+        for key, value in self._constant_values.items():
+            result = _serialize_constant(value)
+            value_key = _serialized_value_key(result)
+            try:
+                node = nodes_by_value[value_key]
+            except KeyError:
+                node = _make_constant_node(len(nodes_by_value), value, result)
+                nodes_by_value[value_key] = node
+            self._constants[key] = node
+        self._constant_values.clear()
 
     @property
     def artifacts(self) -> t.Iterable[ir.ArtifactNode]:
@@ -279,7 +290,8 @@ class GraphTraversal:
 
     @property
     def constants(self) -> t.Iterable[ir.ConstantNode]:
-        return self._constants.values()
+        # Deduplicated constants are referenced by multiple keys.
+        return {node.id: node for node in self._constants.values()}.values()
 
     @property
     def invocations(self) -> t.Iterable[_dsl.TaskInvocation]:
@@ -308,31 +320,41 @@ class GraphTraversal:
         return self._secrets.values()
 
     def get_node_id(self, node: DSLDataNode) -> ir.ArgumentId:
-        key = _make_key(node)
-
         if isinstance(node, _dsl.ArtifactFuture):
             return self._future_artifacts[node].id
-
         elif isinstance(node, _dsl.Secret):
-            return self._secrets[key].id
+            return self._secrets[_make_key(node)].id
         else:
-            return self._constants[key].id
+            return self._constants[_make_key(node)].id
 
 
 def _iter_nodes(
     root_futures: t.Sequence[DSLDataNode],
 ) -> t.Iterator[t.Union[_dsl.ArtifactFuture, _dsl.Constant]]:
-    traversal_list = [*root_futures]
-    traversed_nodes = set()
+    """
+    Depth-first walk over the data nodes. Yields each node once.
+    """
+    traversal_list = list(root_futures)
+    # Futures are compared by identity, so we can use their ids directly. Other nodes
+    # need _make_key() so equal constants are treated as the same node.
+    seen_futures: t.Set[int] = set()
+    seen_keys: t.Set[t.Hashable] = set()
     while traversal_list:
         current_node = traversal_list.pop()
-        # _make_key ensures that we traverse each node only once
-        traversed_nodes.add(_make_key(current_node))
         if isinstance(current_node, _dsl.ArtifactFuture):
+            if id(current_node) in seen_futures:
+                continue
+            seen_futures.add(id(current_node))
+
             invocation = current_node.invocation
-            for arg in [*invocation.args, *[arg for _, arg in invocation.kwargs]]:
-                if _make_key(arg) not in traversed_nodes:
-                    traversal_list.append(arg)
+            traversal_list.extend(invocation.args)
+            traversal_list.extend(arg for _, arg in invocation.kwargs)
+        else:
+            key = _make_key(current_node)
+            if key in seen_keys:
+                continue
+            seen_keys.add(key)
+
         yield current_node
 
 
@@ -645,9 +667,7 @@ def _preview_constant(constant: _dsl.Constant):
     return repr(constant)[:12]
 
 
-def _make_constant_node(
-    constant_index: int, constant_value: _dsl.Constant
-) -> ir.ConstantNode:
+def _serialize_constant(constant_value: _dsl.Constant) -> responses.WorkflowResult:
     if isinstance(constant_value, _dsl.TaskDef):
         raise exceptions.WorkflowSyntaxError(
             f"`{constant_value.__name__}` is a task definition and should be called "
@@ -682,6 +702,24 @@ def _make_constant_node(
                 f"used a non-serializable object: {constant_value}"
             )
 
+    return result
+
+
+def _serialized_value_key(result: responses.WorkflowResult) -> t.Hashable:
+    if isinstance(result, responses.JSONResult):
+        return result.serialization_format, result.value
+    elif isinstance(result, responses.PickleResult):
+        return result.serialization_format, tuple(result.chunks)
+    else:
+        # Not deduplicated.
+        return id(result)
+
+
+def _make_constant_node(
+    constant_index: int,
+    constant_value: _dsl.Constant,
+    result: responses.WorkflowResult,
+) -> ir.ConstantNode:
     if isinstance(result, responses.JSONResult):
         return ir.ConstantNodeJSON(
             id=f"constant-{constant_index}",
@@ -779,18 +817,18 @@ def flatten_graph(
     # As deferred git imports are fetching repos inside model creation, this is used
     # to avoid git fetch spam for the same repos over and over.
     cached_git_import_dict: t.Dict[t.Tuple, ir.Import] = {}
-    for invocation in graph.invocations:
-        invocation.task._resolve_task_source_data(workflow_def.default_source_import)
-        default_deps = (
-            tuple(workflow_def.default_dependency_imports)
-            if workflow_def.default_dependency_imports
-            else None
-        )
-        invocation.task._resolve_task_dependencies(default_deps)
-        for imp in [
-            invocation.task._source_import,
-            *(invocation.task._dependency_imports or []),
-        ]:
+    # Many invocations can share a task. Resolving a task and building its model is
+    # only needed once.
+    dsl_tasks = list(dict.fromkeys(invocation.task for invocation in graph.invocations))
+    default_deps = (
+        tuple(workflow_def.default_dependency_imports)
+        if workflow_def.default_dependency_imports
+        else None
+    )
+    for task in dsl_tasks:
+        task._resolve_task_source_data(workflow_def.default_source_import)
+        task._resolve_task_dependencies(default_deps)
+        for imp in [task._source_import, *(task._dependency_imports or [])]:
             if imp not in import_models_dict:
                 if isinstance(imp, _dsl.DeferredGitImport):
                     cashe_key = (imp.local_repo_path, imp.git_ref)
@@ -804,8 +842,7 @@ def flatten_graph(
                     import_models_dict[imp] = _make_import_model(imp)
 
     task_models_dict: t.Dict[_dsl.TaskDef, ir.TaskDef] = {
-        invocation.task: _make_task_model(invocation.task, import_models_dict)
-        for invocation in graph.invocations
+        task: _make_task_model(task, import_models_dict) for task in dsl_tasks
     }
     # make sure we can execute tasks
     for task in task_models_dict:
@@ -30,7 +30,7 @@ from orquestra.sdk.exceptions import ConfigNameNotFoundError, WorkflowSyntaxErro
 from orquestra.sdk.schema.workflow_run import ProjectId, WorkspaceId
 
 from .. import secrets
-from . import _api, _dsl, loader
+from . import _api, _dsl, _workflow_model_cache, loader
 from ._ast import CallVisitor, NodeReference, NodeReferenceType, normalize_indents
 from ._dsl import (
     DataAggregation,
@@ -87,13 +87,34 @@ class WorkflowDef(Generic[_R]):
         self._data_aggregation = data_aggregation
         self._workflow_args = workflow_args or ()
         self._workflow_kwargs = workflow_kwargs or {}
-        self.default_source_import = default_source_import
-        self.default_dependency_imports = default_dependency_imports
+        self._default_source_import = default_source_import
+        self._default_dependency_imports = default_dependency_imports
+        # Building the model runs the workflow function and traverses the whole
+        # graph. It's kept until something it depends on is changed.
+        self._model: Optional[ir.WorkflowDef] = None
 
     @property
     def name(self) -> str:
         return self._name
 
+    @property
+    def default_source_import(self) -> Optional[Import]:
+        return self._default_source_import
+
+    @default_source_import.setter
+    def default_source_import(self, value: Optional[Import]):
+        self._default_source_import = value
+        self._model = None
+
+    @property
+    def default_dependency_imports(self) -> Optional[Iterable[Import]]:
+        return self._default_dependency_imports
+
+    @default_dependency_imports.setter
+    def default_dependency_imports(self, value: Optional[Iterable[Import]]):
+        self._default_dependency_imports = value
+        self._model = None
+
     @property
     def fn_ref(self) -> FunctionRef:
         return self._fn_ref
@@ -106,6 +127,12 @@ class WorkflowDef(Generic[_R]):
     def model(self) -> ir.WorkflowDef:
         """Serializable form of a workflow def (intermediate representation).
 
+        The model is built on first access and reused afterwards. Models with git
+        imports are built again on every access, because the git ref they point to
+        is resolved when the model is built. If ``ORQ_WORKFLOW_MODEL_CACHE_PATH`` is
+        set, models are also kept on disk and reused for the same workflow def built
+        again, e.g. by another process.
+
         Returns:
             Serializable Pydantic model.
 
@@ -116,8 +143,26 @@ class WorkflowDef(Generic[_R]):
             orquestra.sdk.exceptions.WorkflowSyntaxError: when there are no tasks
                 defined for this workflow.
         """
+        if self._model is not None:
+            return self._model
+
+        model = self._build_model()
+        # Git imports, like the ones from "GitImport.infer()", pin the commit that's
+        # checked out when the model is built. Reusing such a model would submit a
+        # stale commit after the user commits new changes.
+        if not any(isinstance(imp, ir.GitImport) for imp in model.imports.values()):
+            self._model = model
+        return model
+
+    def _build_model(self) -> ir.WorkflowDef:
         from orquestra.sdk._base import _traversal
 
+        cache = _workflow_model_cache.WorkflowModelCache.from_env()
+        key = _workflow_model_cache.cache_key(self) if cache is not None else None
+        if cache is not None and key is not None:
+            if (cached := cache.get(key)) is not None:
+                return cached
+
         futures = _traversal.extract_root_futures(self)
         model = _traversal.flatten_graph(self, futures)
 
@@ -134,6 +179,10 @@ class WorkflowDef(Generic[_R]):
                 "and retry submitting the workflow."
             )
             raise WorkflowSyntaxError(helpstr)
+
+        if cache is not None and key is not None:
+            cache.put(key, model)
+
         return model
 
     @property
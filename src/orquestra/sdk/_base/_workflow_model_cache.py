@@ -0,0 +1,180 @@
+################################################################################
+# © Copyright 2023 Zapata Computing Inc.
+################################################################################
+"""
+Opt-in, on-disk cache of workflow definition models.
+
+Building ``WorkflowDef.model`` runs the workflow function and traverses the whole
+graph. Submitting an unchanged workflow over and over, e.g. with ``orq wf submit``,
+repeats that work every time. If ``ORQ_WORKFLOW_MODEL_CACHE_PATH`` is set, models
+are stored there, keyed by a hash of everything the model is built from:
+
+- the workflow definition's name, resources, and default imports,
+- the contents of the file the workflow function is defined in,
+- the pickled workflow arguments,
+- the current working directory, and the SDK and Python versions.
+
+Each entry also records hashes of the files the tasks are defined in, and isn't
+used if any of them changed since. Workflows whose models can't be validated this
+way, e.g. ones using ``GitImport`` or inline tasks, aren't cached.
+
+Code that decides the graph shape but lives outside of the files above isn't
+tracked. Remove the cache directory after changing it.
+"""
+import hashlib
+import inspect
+import json
+import os
+import pickle
+import typing as t
+from pathlib import Path
+
+from ..packaging._versions import get_current_python_version, get_current_sdk_version
+from ..schema import ir
+from ._env import WORKFLOW_MODEL_CACHE_PATH_ENV
+
+if t.TYPE_CHECKING:
+    from ._workflow import WorkflowDef
+
+
+class WorkflowModelCache:
+    """
+    Directory of ``<key>.json`` files. The first line of each file maps task source
+    files to their hashes, the rest is the model JSON.
+    """
+
+    @classmethod
+    def from_env(cls) -> t.Optional["WorkflowModelCache"]:
+        """
+        Returns ``None`` unless ``ORQ_WORKFLOW_MODEL_CACHE_PATH`` is set.
+        """
+        try:
+            path = Path(os.environ[WORKFLOW_MODEL_CACHE_PATH_ENV])
+        except KeyError:
+            return None
+
+        return cls(path=path)
+
+    def __init__(self, path: Path):
+        """
+        Args:
+            path: directory for the cache entries. Created on first write.
+        """
+        self._path = path
+
+    def get(self, key: str) -> t.Optional[ir.WorkflowDef]:
+        """
+        Returns the model stored under ``key`` if the task source files it was built
+        from haven't changed since.
+        """
+        try:
+            with self._file_path(key).open() as f:
+                file_hashes = json.loads(f.readline())
+                model_json = f.read()
+        except (OSError, ValueError):
+            # Missing or unreadable. Build the model again.
+            return None
+
+        for file_path, file_hash in file_hashes.items():
+            if _hash_file(file_path) != file_hash:
+                return None
+
+        try:
+            return ir.WorkflowDef.parse_raw(model_json)
+        except ValueError:
+            return None
+
+    def put(self, key: str, model: ir.WorkflowDef):
+        """
+        Stores ``model`` under ``key``, unless its tasks' source files can't be
+        tracked.
+        """
+        file_hashes = {}
+        for source_path in _task_source_files(model):
+            if source_path is None or (file_hash := _hash_file(source_path)) is None:
+                return
+            file_hashes[source_path] = file_hash
+
+        file_path = self._file_path(key)
+        tmp_path = file_path.with_name(f"{file_path.name}.{os.getpid()}.tmp")
+        try:
+            self._path.mkdir(parents=True, exist_ok=True)
+            tmp_path.write_text(json.dumps(file_hashes) + "\n" + model.json())
+            os.replace(tmp_path, file_path)
+        except OSError:
+            # The cache is best-effort.
+            pass
+
+    def _file_path(self, key: str) -> Path:
+        return self._path / f"{key}.json"
+
+
+def cache_key(wf_def: "WorkflowDef") -> t.Optional[str]:
+    """
+    Hashes everything ``wf_def.model`` is built from, apart from the task source
+    files. Returns ``None`` if ``wf_def`` can't be cached, e.g. because its arguments
+    can't be pickled.
+    """
+    try:
+        source_path = inspect.getsourcefile(wf_def._fn)
+    except TypeError:
+        # Built-in or C-extension function.
+        return None
+    if source_path is None or (source_hash := _hash_file(source_path)) is None:
+        return None
+
+    try:
+        inputs = pickle.dumps(
+            (
+                wf_def._workflow_args,
+                wf_def._workflow_kwargs,
+                wf_def._resources,
+                wf_def._data_aggregation,
+                wf_def.default_source_import,
+                wf_def.default_dependency_imports,
+            ),
+            protocol=4,
+        )
+    except (pickle.PicklingError, TypeError, AttributeError):
+        return None
+
+    hasher = hashlib.sha256()
+    for part in [
+        get_current_sdk_version().original,
+        get_current_python_version().original,
+        os.getcwd(),
+        wf_def.name,
+        wf_def._fn.__qualname__,
+        source_path,
+        source_hash,
+    ]:
+        hasher.update(part.encode())
+        hasher.update(b"\0")
+    hasher.update(inputs)
+
+    return hasher.hexdigest()
+
+
+def _task_source_files(model: ir.WorkflowDef) -> t.Iterator[t.Optional[str]]:
+    """
+    Yields the source file of each task in ``model``, or ``None`` for tasks whose
+    definitions can't be validated against files on disk.
+    """
+    for imp in model.imports.values():
+        if isinstance(imp, ir.GitImport):
+            # Resolving a git import fetches the remote and warns about uncommitted
+            # changes. That has to happen on every submission.
+            yield None
+
+    for task in model.tasks.values():
+        if isinstance(task.fn_ref, (ir.ModuleFunctionRef, ir.FileFunctionRef)):
+            yield task.fn_ref.file_path
+        else:
+            yield None
+
+
+def _hash_file(path: str) -> t.Optional[str]:
+    try:
+        return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+    except OSError:
+        return None
@@ -63,6 +63,30 @@ class LogReader(t.Protocol):
         """
         ...
 
+    def iter_workflow_logs(
+        self,
+        wf_run_id: WorkflowRunId,
+        *,
+        follow: bool = False,
+        until: t.Optional[t.Callable[[], bool]] = None,
+    ) -> t.Iterator[t.Tuple[TaskInvocationId, str]]:
+        """
+        Streaming version of ``get_workflow_logs()``. Lines are yielded as they're
+        read, without keeping the whole log in memory.
+
+        Args:
+            wf_run_id: ID of the workflow run.
+            follow: if ``True``, keeps waiting for new lines after yielding the
+                available ones. New lines are yielded as they are produced.
+            until: only used with ``follow``. Called between reads; once it returns
+                ``True``, the remaining lines are yielded and the iterator stops.
+                Without it, the iterator only stops when the caller closes it.
+
+        Yields:
+            (task invocation ID, log line) pairs.
+        """
+        ...
+
 
 # A typealias that hints where we expect raw artifact values.
 ArtifactValue = t.Any
@@ -101,6 +125,23 @@ class RuntimeInterface(ABC):
         """Gets the status of a workflow run"""
         raise NotImplementedError()
 
+    def get_workflow_run_states(
+        self, workflow_run_ids: t.Sequence[WorkflowRunId]
+    ) -> t.Dict[WorkflowRunId, State]:
+        """
+        Gets only the states of many workflow runs, e.g. to wait until they finish.
+
+        The default implementation calls ``get_workflow_run_status()`` for each run.
+        Runtimes should override it if they can skip building the task runs.
+
+        Raises:
+            WorkflowRunNotFoundError: if any of the runs couldn't be found.
+        """
+        return {
+            wf_run_id: self.get_workflow_run_status(wf_run_id).status.state
+            for wf_run_id in workflow_run_ids
+        }
+
     @abstractmethod
     def get_workflow_run_outputs_non_blocking(
         self, workflow_run_id: WorkflowRunId
@@ -145,6 +186,33 @@ class RuntimeInterface(ABC):
         """
         raise NotImplementedError()
 
+    def get_outputs(
+        self,
+        workflow_run_id: WorkflowRunId,
+        task_inv_ids: t.Sequence[TaskInvocationId],
+    ) -> t.Dict[TaskInvocationId, WorkflowResult]:
+        """Returns outputs of the selected task invocations
+
+        Works like ``get_available_outputs()``, but only the artifacts of
+        ``task_inv_ids`` are retrieved. Task invocations that didn't succeed yet, or
+        that aren't a part of the workflow, don't have an entry in the returned dict.
+
+        The default implementation filters the results of
+        ``get_available_outputs()``. Runtimes that can fetch a subset of artifacts
+        should override it.
+
+        Returns:
+            A mapping with an entry for each selected task run that has outputs. The
+                key is the task's invocation ID. The value is whatever the task
+                function returned, independent of the ``@task(n_outputs=...)`` value.
+        """
+        all_outputs = self.get_available_outputs(workflow_run_id)
+        return {
+            inv_id: all_outputs[inv_id]
+            for inv_id in task_inv_ids
+            if inv_id in all_outputs
+        }
+
     @abstractmethod
     def stop_workflow_run(self, workflow_run_id: WorkflowRunId) -> None:
         """Stops a workflow run.
@@ -162,7 +230,7 @@ class RuntimeInterface(ABC):
         max_age: t.Optional[timedelta] = None,
         state: t.Optional[t.Union[State, t.List[State]]] = None,
         workspace: t.Optional[WorkspaceId] = None,
-        project: t.Optional[ProjectId] = None
+        project: t.Optional[ProjectId] = None,
     ) -> t.Sequence[WorkflowRunMinimal]:
         """
         List the workflow runs, with some filters
@@ -178,6 +246,30 @@ class RuntimeInterface(ABC):
         """
         raise NotImplementedError()
 
+    def iter_workflow_runs(
+        self,
+        *,
+        limit: t.Optional[int] = None,
+        max_age: t.Optional[timedelta] = None,
+        state: t.Optional[t.Union[State, t.List[State]]] = None,
+        workspace: t.Optional[WorkspaceId] = None,
+        project: t.Optional[ProjectId] = None,
+    ) -> t.Iterator[WorkflowRunMinimal]:
+        """
+        Lazy version of ``list_workflow_runs()``, accepting the same filters.
+
+        The default implementation iterates over ``list_workflow_runs()``. Runtimes
+        that receive workflow runs in pages should override it to yield runs as soon
+        as each page arrives.
+        """
+        yield from self.list_workflow_runs(
+            limit=limit,
+            max_age=max_age,
+            state=state,
+            workspace=workspace,
+            project=project,
+        )
+
     def get_task_logs(
         self, wf_run_id: WorkflowRunId, task_inv_id: TaskInvocationId
     ) -> t.List[str]:
@@ -194,6 +286,15 @@ class RuntimeInterface(ABC):
         """
         raise NotImplementedError()
 
+    def iter_workflow_logs(
+        self, wf_run_id: WorkflowRunId, *, follow: bool = False
+    ) -> t.Iterator[t.Tuple[TaskInvocationId, str]]:
+        """
+        See LogReader.iter_workflow_logs(). With ``follow``, the iterator stops after
+        the workflow run finishes.
+        """
+        raise NotImplementedError()
+
     @abstractmethod
     def get_workflow_project(self, wf_run_id: WorkflowRunId):
         """
@@ -248,7 +248,7 @@ class WFRunResolver:
             resolved_workspace_id = None
             resolved_project_id = None
 
-        wfs = self._wf_run_repo.list_wf_runs(
+        wfs = self._wf_run_repo.list_wf_runs_for_prompt(
             config, workspace=resolved_workspace_id, project=resolved_project_id
         )
 
@@ -273,7 +273,7 @@ class WFRunResolver:
             resolved_workspace_id = None
             resolved_project_id = None
 
-        runs = self._wf_run_repo.list_wf_runs(
+        runs = self._wf_run_repo.list_wf_runs_for_prompt(
             config, workspace=resolved_workspace_id, project=resolved_project_id
         )
 
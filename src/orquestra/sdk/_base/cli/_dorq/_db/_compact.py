@@ -0,0 +1,54 @@
+################################################################################
+# © Copyright 2023 Zapata Computing Inc.
+################################################################################
+"""
+Code for 'orq db compact'.
+"""
+import typing as t
+
+from .. import _repos
+from .._ui import _presenters, _prompts
+
+
+class Action:
+    """
+    Encapsulates app-related logic for handling ``orq db compact``.
+
+    The module is considered part of the name, so this class should be read as
+    ``_dorq._db._compact.Action``.
+    """
+
+    def __init__(
+        self,
+        presenter=_presenters.DBPresenter(),
+        prompter=_prompts.Prompter(),
+        db_repo=_repos.WorkflowDBRepo(),
+    ):
+        # data sources
+        self._db_repo = db_repo
+
+        # text IO
+        self._presenter = presenter
+        self._prompter = prompter
+
+    def on_cmd_call(
+        self, max_age: t.Optional[str], max_count: t.Optional[int], yes: bool = False
+    ):
+        try:
+            if not yes and (max_age is not None or max_count is not None):
+                n_runs = self._db_repo.count_runs_to_remove(
+                    max_age=max_age, max_count=max_count
+                )
+                if n_runs > 0 and not self._prompter.confirm(
+                    f"Remove {n_runs} workflow run(s) from the local database? "
+                    "They can't be viewed or listed anymore.",
+                    default=False,
+                ):
+                    return
+
+            result = self._db_repo.compact(max_age=max_age, max_count=max_count)
+        except Exception as e:
+            self._presenter.show_error(e)
+            return
+
+        self._presenter.show_compaction(result)
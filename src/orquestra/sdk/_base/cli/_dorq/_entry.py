@@ -186,10 +186,22 @@ def wf_results(
 @cloup.argument("wf_run_id", required=False)
 @CONFIG_OPTION
 @DOWNLOAD_DIR_OPTION
+@cloup.option(
+    "-f",
+    "--follow",
+    is_flag=True,
+    default=False,
+    help=(
+        "Keep printing new log lines as they are produced, until the workflow run "
+        "finishes."
+    ),
+)
+@cloup.constraint(cloup.constraints.mutually_exclusive, ["download_dir", "follow"])
 def wf_logs(
     wf_run_id: t.Optional[str],
     config: t.Optional[str],
     download_dir: t.Optional[Path],
+    follow: bool,
 ):
     """
     Shows logs gathered during execution of a workflow produced by all tasks.
@@ -202,6 +214,7 @@ def wf_logs(
         wf_run_id=wf_run_id,
         config=config,
         download_dir=download_dir,
+        follow=follow,
     )
 
 
@@ -329,6 +342,54 @@ def task_logs(*args, **kwargs):
     action.on_cmd_call(*args, **kwargs)
 
 
+# ----------- 'orq db' commands ----------
+
+
+@dorq.group()
+def db():
+    """
+    Commands related to the local database of workflow runs.
+    """
+    pass
+
+
+@db.command()
+@cloup.option(
+    "-t",
+    "--max-age",
+    help="Remove workflow runs submitted longer ago, e.g. '30d' or '12h'.",
+)
+@cloup.option(
+    "-l",
+    "--max-count",
+    type=click.IntRange(min=1),
+    help=(
+        "Keep at most this many of the most recent finished workflow runs for each "
+        "config. Runs that aren't known to have finished are kept."
+    ),
+)
+@cloup.option(
+    "-y",
+    "--yes",
+    is_flag=True,
+    default=False,
+    help="If passed, removes the workflow runs without confirmation.",
+)
+def compact(max_age: t.Optional[str], max_count: t.Optional[int], yes: bool):
+    """
+    Shrinks the local database of workflow runs.
+
+    Without options, only the free space is given back. Before removing workflow
+    runs, you are asked for confirmation with the number of runs to remove.
+    Removed runs can't be viewed or listed anymore. For QE, that includes runs
+    still executing if they're older than '--max-age'.
+    """
+    from ._db._compact import Action
+
+    action = Action()
+    action.on_cmd_call(max_age=max_age, max_count=max_count, yes=yes)
+
+
 # ----------- top-level 'orq' commands ----------
 
 
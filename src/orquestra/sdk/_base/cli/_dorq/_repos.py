@@ -19,7 +19,7 @@ from typing_extensions import assert_never
 
 from orquestra import sdk
 from orquestra.sdk import exceptions
-from orquestra.sdk._base import _config, _db, loader
+from orquestra.sdk._base import _api, _config, _db, loader
 from orquestra.sdk._base._driver._client import DriverClient
 from orquestra.sdk._base._jwt import check_jwt_without_signature_verification
 from orquestra.sdk._base._qe import _client
@@ -64,12 +64,18 @@ class WorkflowRunRepo:
     def list_wf_run_ids(
         self, config: ConfigName, project: ProjectRef
     ) -> t.Sequence[WorkflowRunId]:
-        return [
-            run.id
-            for run in self.list_wf_runs(
-                config, project.workspace_id, project.project_id
-            )
-        ]
+        """
+        Lists only the IDs. The status of each run isn't fetched.
+
+        Raises:
+            ConnectionError: when connection with Ray failed.
+            orquestra.sdk.exceptions.UnauthorizedError: when connection with runtime
+                failed because of an auth error.
+        """
+        wf_runs = sdk.list_workflow_runs(
+            config, workspace=project.workspace_id, project=project.project_id
+        )
+        return [run.run_id for run in wf_runs]
 
     def list_wf_runs(
         self,
@@ -102,6 +108,28 @@ class WorkflowRunRepo:
 
         return [run.get_status_model() for run in wf_runs]
 
+    def list_wf_runs_for_prompt(
+        self,
+        config: ConfigName,
+        workspace: t.Optional[WorkspaceId] = None,
+        project: t.Optional[ProjectId] = None,
+    ) -> t.List[WorkflowRun]:
+        """
+        Like ``list_wf_runs()``, but reuses the statuses the runtime returns when
+        listing the runs. Only the runs listed without a status are fetched again.
+        Enough to show the IDs and start times in a prompt.
+
+        Raises:
+            ConnectionError: when connection with Ray failed.
+            orquestra.sdk.exceptions.UnauthorizedError: when connection with runtime
+                failed because of an auth error.
+        """
+        return list(
+            _api.iter_workflow_run_statuses(
+                config, workspace=workspace, project=project
+            )
+        )
+
     def get_wf_by_run_id(
         self, wf_run_id: WorkflowRunId, config_name: t.Optional[ConfigName]
     ) -> WorkflowRun:
@@ -393,6 +421,22 @@ class WorkflowRunRepo:
         except (ConnectionError, exceptions.UnauthorizedError):
             raise
 
+    def iter_wf_logs(
+        self, wf_run_id: WorkflowRunId, config_name: ConfigName, follow: bool
+    ) -> t.Iterator[t.Tuple[TaskInvocationId, str]]:
+        """
+        Streaming version of ``get_wf_logs()``. With ``follow``, yields the new lines
+        until the workflow run finishes.
+
+        Raises:
+            ConnectionError: when connection with Ray failed.
+            orquestra.sdk.exceptions.UnauthorizedError: when connection with runtime
+                failed because of an auth error.
+        """
+        wf_run = sdk.WorkflowRun.by_id(wf_run_id, config_name)
+
+        return wf_run.iter_logs(follow=follow)
+
     def get_task_logs(
         self,
         wf_run_id: WorkflowRunId,
@@ -461,6 +505,46 @@ def _ui_model_from_wf(wf_run: WorkflowRun):
     )
 
 
+class WorkflowDBRepo:
+    """
+    Wraps access to the local workflow database.
+    """
+
+    def compact(
+        self, max_age: t.Optional[str], max_count: t.Optional[int]
+    ) -> _db.CompactionResult:
+        """
+        Removes workflow runs older than ``max_age`` and all but the ``max_count``
+        most recent finished runs of each config, then shrinks the database file.
+
+        Raises:
+            ValueError: when ``max_age`` can't be parsed or ``max_count`` is less
+                than 1.
+        """
+        with _db.WorkflowDB.open_db() as db:
+            return db.compact(
+                max_age=_api._wf_run._parse_max_age(max_age),
+                max_count_per_config=max_count,
+            )
+
+    def count_runs_to_remove(
+        self, max_age: t.Optional[str], max_count: t.Optional[int]
+    ) -> int:
+        """
+        Returns how many workflow runs ``compact()`` would remove, without removing
+        them.
+
+        Raises:
+            ValueError: when ``max_age`` can't be parsed or ``max_count`` is less
+                than 1.
+        """
+        with _db.WorkflowDB.open_db() as db:
+            return db.count_runs_to_remove(
+                max_age=_api._wf_run._parse_max_age(max_age),
+                max_count_per_config=max_count,
+            )
+
+
 class SummaryRepo:
     """
     Performs data wrangling to derive UI models that we can show to the user.
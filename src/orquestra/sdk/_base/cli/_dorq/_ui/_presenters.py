@@ -17,7 +17,7 @@ from typing import Iterable, Iterator, List, Sequence
 import click
 from tabulate import tabulate
 
-from orquestra.sdk._base import _services, serde
+from orquestra.sdk._base import _db, _services, serde
 from orquestra.sdk.schema import responses
 from orquestra.sdk.schema.ir import ArtifactFormat
 from orquestra.sdk.schema.workflow_run import (
@@ -84,6 +84,9 @@ class WrappedCorqOutputPresenter:
         )
         per_command.pretty_print_response(resp, project_dir=None)
 
+    def show_log_line(self, task_inv_id: TaskInvocationId, line: str):
+        click.echo(f"{task_inv_id}: {line}")
+
     def show_error(self, exception: Exception):
         status_code = _errors.pretty_print_exception(exception)
 
@@ -195,6 +198,19 @@ class ServicePresenter:
         sys.exit(responses.ResponseStatusCode.SERVICES_ERROR.value)
 
 
+class DBPresenter:
+    def show_compaction(self, result: _db.CompactionResult):
+        click.echo(
+            f"Removed {result.n_removed_runs} workflow run(s). Database size: "
+            f"{_format_size(result.size_before)} -> {_format_size(result.size_after)}"
+        )
+
+    def show_error(self, exception: Exception):
+        status_code = _errors.pretty_print_exception(exception)
+
+        sys.exit(status_code.value)
+
+
 class LoginPresenter:
     def prompt_for_login(self, login_url, url, ce):
         click.echo("We were unable to automatically log you in.")
@@ -225,6 +241,17 @@ def _format_datetime(dt: t.Optional[datetime]) -> str:
     return dt.astimezone().replace(tzinfo=None).ctime() if dt else ""
 
 
+def _format_size(n_bytes: int) -> str:
+    if n_bytes < 1024:
+        return f"{n_bytes} B"
+    size = n_bytes / 1024
+    for unit in ["KB", "MB"]:
+        if size < 1024:
+            return f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
 def _format_tasks_succeeded(summary: ui_models.WFRunSummary) -> str:
     return f"{summary.n_tasks_succeeded} / {summary.n_task_invocations_total}"
 
@@ -47,12 +47,14 @@ class Action:
         wf_run_id: t.Optional[WorkflowRunId],
         config: t.Optional[ConfigName],
         download_dir: t.Optional[Path],
+        follow: bool = False,
     ):
         try:
             self._on_cmd_call_with_exceptions(
                 wf_run_id=wf_run_id,
                 download_dir=download_dir,
                 config=config,
+                follow=follow,
             )
         except Exception as e:
             self._presenter.show_error(e)
@@ -62,6 +64,7 @@ class Action:
         wf_run_id: t.Optional[WorkflowRunId],
         config: t.Optional[ConfigName],
         download_dir: t.Optional[Path],
+        follow: bool = False,
     ):
         # The order of resolving config and run ID is important. It dictates the flow
         # user sees, and possible choices in the prompts.
@@ -69,6 +72,14 @@ class Action:
         resolved_wf_run_id = self._wf_run_resolver.resolve_id(
             wf_run_id, resolved_config
         )
+
+        if follow:
+            for task_inv_id, line in self._wf_run_repo.iter_wf_logs(
+                wf_run_id=resolved_wf_run_id, config_name=resolved_config, follow=True
+            ):
+                self._presenter.show_log_line(task_inv_id, line)
+            return
+
         logs = self._wf_run_repo.get_wf_logs(
             wf_run_id=resolved_wf_run_id, config_name=resolved_config
         )
@@ -125,6 +125,7 @@ SUPPORTED_FORMATS = {
     ir.ArtifactFormat.AUTO,
     ir.ArtifactFormat.JSON,
     ir.ArtifactFormat.ENCODED_PICKLE,
+    ir.ArtifactFormat.RAW_PICKLE5,
 }
 
 
@@ -286,4 +287,5 @@ def exec_task_fn(
             artifact_value=ret_val, artifact_format=ret_node.serialization_format
         )
         with open(_make_path(ret_node, __sdk_artifacts_dir), "w") as f:
-            f.write(result.json())
+            # Artifacts on QE are passed around as JSON files.
+            f.write(serde.to_text_result(result).json())
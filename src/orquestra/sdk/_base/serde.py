@@ -1,8 +1,10 @@
 ################################################################################
 # © Copyright 2021-2022 Zapata Computing Inc.
 ################################################################################
+import binascii
 import codecs
 import json
+import pickle
 import typing as t
 from contextlib import contextmanager
 from dataclasses import dataclass
@@ -17,6 +19,8 @@ from orquestra.sdk.schema import ir, responses
 CHUNK_SIZE = 40_000
 ENCODING = "base64"
 PICKLE_PROTOCOL = 4
+# Protocol 5 is the first one that supports out-of-band buffers. See PEP 574.
+RAW_PICKLE_PROTOCOL = 5
 
 
 class _JSONTupleEncoder(json.JSONEncoder):
@@ -49,6 +53,29 @@ def _serialize_json(value: t.Any):
     return json.dumps(value, cls=_JSONTupleEncoder)
 
 
+def json_result_from_parts(
+    parts: t.Sequence[responses.JSONResult], container: t.Type[t.Union[tuple, list]]
+) -> responses.JSONResult:
+    """
+    Puts together the result of serializing ``container(values)`` to JSON out of the
+    results of serializing each of the values, without decoding them.
+
+    Args:
+        parts: JSON results of the values.
+        container: ``tuple`` or ``list``.
+    """
+    values = ", ".join(part.value for part in parts)
+    if container is tuple:
+        # The layout of _JSONTupleEncoder.encode_tuple() output.
+        return responses.JSONResult(
+            value=f'{{"__tuple__": true, "__values__": [{values}]}}'
+        )
+    elif container is list:
+        return responses.JSONResult(value=f"[{values}]")
+    else:
+        raise ValueError(f"Can't put together a {container.__name__} of JSON values")
+
+
 def _chunkify(s: str) -> t.List[str]:
     """
     Yaml/JSON parsers will fail if string is too large,
@@ -66,6 +93,17 @@ def _encoded_pickle_chunks(object: t.Any) -> t.List[str]:
     )
 
 
+def _raw_pickle_result(object: t.Any) -> responses.RawPickleResult:
+    buffers: t.List[pickle.PickleBuffer] = []
+    # 'buffer_callback' makes pickle hand over large buffers to us instead of copying
+    # them into the pickle stream. For NumPy arrays these are views over the array's
+    # memory.
+    pickled = cloudpickle.dumps(
+        object, protocol=RAW_PICKLE_PROTOCOL, buffer_callback=buffers.append
+    )
+    return responses.RawPickleResult(pickle=pickled, buffers=buffers)
+
+
 @contextmanager
 def registered_module(module):
     """
@@ -112,6 +150,11 @@ def _(result: responses.PickleResult) -> t.Any:
     return deserialize_pickle(result.chunks)
 
 
+@deserialize.register
+def _(result: responses.RawPickleResult) -> t.Any:
+    return deserialize_raw_pickle(result.pickle, result.buffers)
+
+
 @deserialize.register
 def _(result: ir.ConstantNodeJSON) -> t.Any:
     return deserialize_constant(result)
@@ -126,9 +169,39 @@ def deserialize_json(serialized_value: str) -> t.Any:
     return json.loads(serialized_value, object_hook=_JSONTupleEncoder.decode_tuple)
 
 
-def deserialize_pickle(chunks: t.List[str]) -> t.Any:
-    chunks_str: str = "".join(chunks)
-    return cloudpickle.loads(codecs.decode(chunks_str.encode(), ENCODING))
+def _decode_chunks(chunks: t.Sequence[str]) -> memoryview:
+    """
+    Decodes base64 ``chunks`` one at a time into a single, preallocated buffer.
+    Joining the chunks first would make a few transient copies of the whole value.
+    """
+    # Each 4 base64 characters encode at most 3 bytes.
+    buffer = bytearray(sum(len(chunk) for chunk in chunks) // 4 * 3)
+    n_written = 0
+    leftover = ""
+    for chunk in chunks:
+        # 'codecs' splits base64 output into lines. Chunk boundaries don't have to
+        # line up with 4-character groups, so we carry the remainder over.
+        chars = leftover + chunk.replace("\n", "")
+        n_aligned = len(chars) - len(chars) % 4
+        decoded = binascii.a2b_base64(chars[:n_aligned])
+        buffer[n_written : n_written + len(decoded)] = decoded
+        n_written += len(decoded)
+        leftover = chars[n_aligned:]
+
+    if leftover:
+        raise binascii.Error(
+            f"Invalid base64 data: {len(leftover)} trailing characters"
+        )
+
+    return memoryview(buffer)[:n_written]
+
+
+def deserialize_pickle(chunks: t.Sequence[str]) -> t.Any:
+    return cloudpickle.loads(_decode_chunks(chunks))
+
+
+def deserialize_raw_pickle(pickled: bytes, buffers: t.Sequence[t.Any]) -> t.Any:
+    return cloudpickle.loads(pickled, buffers=buffers)
 
 
 def result_from_artifact(
@@ -138,6 +211,8 @@ def result_from_artifact(
         return responses.JSONResult(value=_serialize_json(artifact_value))
     elif artifact_format == ir.ArtifactFormat.ENCODED_PICKLE:
         return responses.PickleResult(chunks=_encoded_pickle_chunks(artifact_value))
+    elif artifact_format == ir.ArtifactFormat.RAW_PICKLE5:
+        return _raw_pickle_result(artifact_value)
     elif artifact_format == ir.ArtifactFormat.AUTO:
         try:
             return result_from_artifact(artifact_value, ir.ArtifactFormat.JSON)
@@ -151,11 +226,27 @@ def result_from_artifact(
             )
     else:
         raise NotImplementedError(
-            "We only support AUTO, JSON, and ENCODED_PICKLE artifact serialization at"
-            f" the moment, not {artifact_format}"
+            "We only support AUTO, JSON, ENCODED_PICKLE, and RAW_PICKLE5 artifact "
+            f"serialization at the moment, not {artifact_format}"
         )
 
 
+def to_text_result(result: responses.WorkflowResult) -> responses.WorkflowResult:
+    """
+    Makes sure ``result`` can be dumped to JSON. Binary-only results are re-encoded as
+    ``PickleResult``. Other results are returned as-is.
+
+    Use it right before passing a result to a transport that requires text, like
+    a JSON HTTP payload or a file on QE.
+    """
+    if isinstance(result, responses.RawPickleResult):
+        return result_from_artifact(
+            deserialize(result), ir.ArtifactFormat.ENCODED_PICKLE
+        )
+
+    return result
+
+
 def value_from_result_dict(result_dict: t.Mapping) -> t.Any:
     # Bug with mypy and Pydantic:
     #   Unions cannot be passed to parse_obj_as: pydantic/pydantic#1847
@@ -5,8 +5,10 @@
 Translates IR workflow def into a Ray workflow.
 """
 import os
+import sys
 import traceback
 import typing as t
+from collections import OrderedDict
 from functools import singledispatch
 from pathlib import Path
 
@@ -16,7 +18,10 @@ from .. import exceptions, secrets
 from .._base import _exec_ctx, _git_url_utils, _graphs, _log_adapter, dispatch, serde
 from .._base._env import (
     RAY_DOWNLOAD_GIT_IMPORTS_ENV,
+    RAY_PASS_RAW_VALUES_ENV,
+    RAY_RAW_PICKLE5_ARTIFACTS_ENV,
     RAY_SET_CUSTOM_IMAGE_RESOURCES_ENV,
+    flag_set,
 )
 from ..kubernetes.quantity import parse_quantity
 from ..schema import _compat, ir, responses, workflow_run
@@ -26,6 +31,14 @@ from ._wf_metadata import InvUserMetadata, pydatic_to_json_dict
 
 DEFAULT_IMAGE_TEMPLATE = "hub.nexus.orquestra.io/zapatacomputing/orquestra-sdk-base:{}"
 
+# Constants with larger serialized values are put into Ray's object store.
+# Uploading an object to Ray's workflow storage costs more than inlining small ones.
+INLINE_CONSTANT_MAX_SIZE = 64 * 1024
+
+# How many bytes of deserialized constants each Ray worker process keeps. The size of
+# a deserialized constant is estimated by the size of its serialized value.
+CONSTANTS_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
 
 def _arg_from_graph(argument_id: ir.ArgumentId, workflow_def: ir.WorkflowDef):
     try:
@@ -43,12 +56,87 @@ def _arg_from_graph(argument_id: ir.ArgumentId, workflow_def: ir.WorkflowDef):
     return workflow_def.artifact_nodes[argument_id]
 
 
-def _locate_user_fn(fn_ref: ir.FunctionRef):
+class _SourceStamp(t.NamedTuple):
+    path: str
+    mtime_ns: int
+    size: int
+
+    @classmethod
+    def of(cls, path: t.Optional[str]) -> t.Optional["_SourceStamp"]:
+        if path is None:
+            return None
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return cls(path=path, mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+
+
+def _fn_source_path(fn_ref: ir.FunctionRef) -> t.Optional[str]:
+    """
+    Path to the file ``fn_ref`` was loaded from, after it's been located.
+    """
+    if isinstance(fn_ref, ir.ModuleFunctionRef):
+        return getattr(sys.modules.get(fn_ref.module), "__file__", None)
+    elif isinstance(fn_ref, ir.FileFunctionRef):
+        return os.path.abspath(fn_ref.file_path)
+    else:
+        return None
+
+
+class _UserFnCache:
+    """
+    Task functions located in a single worker process. Ray workers are long-lived,
+    and locating a function reloads its module, which re-runs all of the module's
+    code. Functions are located again only if the file they were loaded from
+    changed since.
+    """
+
+    def __init__(self):
+        self._entries: t.Dict[
+            t.Tuple[str, str, str], t.Tuple[t.Any, t.Optional[_SourceStamp]]
+        ] = {}
+
+    def get(self, fn_ref: ir.FunctionRef, project_dir: t.Optional[Path]) -> t.Any:
+        # The same module name can point to a different file in another project.
+        # File paths are relative to the working directory.
+        key = (str(project_dir), os.getcwd(), fn_ref.json())
+        try:
+            obj, stamp = self._entries[key]
+        except KeyError:
+            pass
+        else:
+            if stamp is None or (
+                _fn_source_path(fn_ref) == stamp.path
+                and _SourceStamp.of(stamp.path) == stamp
+            ):
+                return obj
+
+        obj = dispatch.locate_fn_ref(fn_ref)
+        source_path = _fn_source_path(fn_ref)
+        stamp = _SourceStamp.of(source_path)
+        if source_path is not None and stamp is None:
+            # Can't tell if it's changed. Locate it again next time.
+            self._entries.pop(key, None)
+        else:
+            self._entries[key] = (obj, stamp)
+
+        return obj
+
+
+# Only accessed by _locate_user_fn(). Ray pickles globals used by nested functions,
+# like the Ray task in _make_ray_dag_node(), by value. Each task would get its own
+# copy.
+_user_fns = _UserFnCache()
+
+
+def _locate_user_fn(fn_ref: ir.FunctionRef, project_dir: t.Optional[Path] = None):
     """
     Dereferences 'fn_ref', loads the module attribute, and extracts the
-    underlying user function if it was a TaskDef.
+    underlying user function if it was a TaskDef. Located functions are reused
+    until their source file changes.
     """
-    obj: t.Any = dispatch.locate_fn_ref(fn_ref)
+    obj: t.Any = _user_fns.get(fn_ref, project_dir)
 
     # dsl.task() wraps a callable in a TaskDef object. We need to locate the
     # underlying user function, not the Task object.
@@ -64,9 +152,229 @@ def _aggregate_outputs(*args):
     return args
 
 
-class TaskResult(t.NamedTuple):
+class RawValue(t.NamedTuple):
+    """
+    A task output that's passed to other tasks as is. Ray serializes it like any
+    other object, so e.g. NumPy arrays are read from Ray's object store without
+    copying. It's serialized into a ``WorkflowResult`` only when the output is
+    requested, see ``serialize_output()``.
+    """
+
+    value: t.Any
+    # Format to serialize the value with when it's requested.
+    artifact_format: ir.ArtifactFormat
+
+
+class OutputPart(t.NamedTuple):
+    """
+    Stands in for a pickled output of a task with multiple outputs. Only the whole
+    returned value is pickled and stored. The parts of a ``TaskResult`` refer to the
+    same ``packed`` object, so it's stored once when Ray pickles the result. The
+    output is taken out of the whole value when it's read, see ``_output_value()``
+    and ``serialize_output()``. This unpickles the whole value.
+    """
+
     packed: responses.WorkflowResult
-    unpacked: t.Tuple[responses.WorkflowResult, ...]
+    # Position of the output in the value returned by the task.
+    artifact_index: int
+
+
+TaskOutput = t.Union[responses.WorkflowResult, RawValue, OutputPart]
+
+_PICKLE_FORMATS = (ir.ArtifactFormat.ENCODED_PICKLE, ir.ArtifactFormat.RAW_PICKLE5)
+
+
+class PackedOutputs(t.NamedTuple):
+    """
+    Stands in for ``TaskResult.packed`` of a task with multiple outputs. Instead of
+    serializing and storing the whole returned value next to its parts, it's put
+    together from ``TaskResult.unpacked`` when it's needed, see ``packed_output()``.
+    Only used for JSON outputs and raw values, see ``_pack_outputs()``. Pickled
+    outputs are taken out of the whole value instead, see ``OutputPart``.
+    """
+
+    # Type of the value returned by the task, tuple or list.
+    container: t.Type[t.Union[tuple, list]]
+
+
+class TaskResult(t.NamedTuple):
+    packed: t.Union[TaskOutput, PackedOutputs]
+    unpacked: t.Tuple[TaskOutput, ...]
+
+
+def serialize_output(output: TaskOutput) -> responses.WorkflowResult:
+    if isinstance(output, RawValue):
+        return serde.result_from_artifact(output.value, output.artifact_format)
+    if isinstance(output, OutputPart):
+        return serde.result_from_artifact(
+            _output_value(output), output.packed.serialization_format
+        )
+    return output
+
+
+def _output_value(output: TaskOutput) -> t.Any:
+    if isinstance(output, RawValue):
+        return output.value
+    if isinstance(output, OutputPart):
+        return serde.deserialize(output.packed)[output.artifact_index]
+    return serde.deserialize(output)
+
+
+def _pack_outputs(
+    value: t.Any, unpacked: t.Sequence[TaskOutput]
+) -> t.Optional[PackedOutputs]:
+    """
+    Returns the envelope for ``value`` if it can be put together from ``unpacked``
+    without changing the result. Otherwise, ``value`` has to be serialized as a whole.
+    """
+    if type(value) not in (tuple, list) or len(value) != len(unpacked):
+        return None
+
+    output_types = {type(output) for output in unpacked}
+    # With AUTO, some outputs might be serialized as JSON and others pickled.
+    # Pickling the whole value would keep e.g. non-string dict keys that JSON turns
+    # into strings.
+    # Pickled outputs can't be put together without unpickling them, which would
+    # require the user's types wherever the whole value is read, e.g. on the
+    # client. Separate pickles also lose objects shared between the outputs.
+    if output_types not in ({responses.JSONResult}, {RawValue}):
+        return None
+
+    return PackedOutputs(container=type(value))
+
+
+def _serialize_outputs(
+    value: t.Any,
+    n_outputs: int,
+    artifact_format: ir.ArtifactFormat,
+    pass_raw_values: bool,
+) -> TaskResult:
+    """
+    Serializes the value returned by a task with multiple outputs. Each output is
+    stored once: the whole value is put together from JSON outputs and raw values,
+    and pickled outputs are taken out of the pickled whole value.
+    """
+    if pass_raw_values:
+        raw_values = tuple(
+            RawValue(value=value[i], artifact_format=artifact_format)
+            for i in range(n_outputs)
+        )
+        envelope = _pack_outputs(value, raw_values)
+        return TaskResult(
+            packed=envelope
+            if envelope is not None
+            else RawValue(value=value, artifact_format=artifact_format),
+            unpacked=raw_values,
+        )
+
+    if artifact_format in _PICKLE_FORMATS:
+        # Every output would be pickled. There's no need to pickle them separately.
+        packed = serde.result_from_artifact(value, artifact_format)
+        return TaskResult(
+            packed=packed,
+            unpacked=tuple(
+                OutputPart(packed=packed, artifact_index=i) for i in range(n_outputs)
+            ),
+        )
+
+    unpacked = tuple(
+        serde.result_from_artifact(value[i], artifact_format) for i in range(n_outputs)
+    )
+    if (envelope := _pack_outputs(value, unpacked)) is not None:
+        return TaskResult(packed=envelope, unpacked=unpacked)
+
+    packed = serde.result_from_artifact(value, artifact_format)
+    return TaskResult(
+        packed=packed,
+        unpacked=tuple(
+            OutputPart(packed=packed, artifact_index=i)
+            if output.serialization_format in _PICKLE_FORMATS
+            and output.serialization_format == packed.serialization_format
+            else output
+            for i, output in enumerate(unpacked)
+        ),
+    )
+
+
+def packed_output(result: TaskResult) -> TaskOutput:
+    """
+    Returns the whole value returned by the task, as opposed to a single one of its
+    outputs.
+    """
+    packed = result.packed
+    if not isinstance(packed, PackedOutputs):
+        return packed
+
+    parts = result.unpacked
+    first = parts[0]
+    if isinstance(first, RawValue):
+        return RawValue(
+            value=packed.container(_output_value(part) for part in parts),
+            artifact_format=first.artifact_format,
+        )
+    else:
+        return serde.json_result_from_parts(
+            t.cast(t.Sequence[responses.JSONResult], parts), packed.container
+        )
+
+
+class ConstantRef(t.NamedTuple):
+    """
+    A large constant node put into Ray's object store once per workflow run, instead
+    of being serialized into the arguments of each task that uses it. Ray resolves
+    object refs passed directly as task arguments, so tasks get this wrapper and
+    fetch the node themselves. This lets them reuse constants they've already
+    deserialized.
+    """
+
+    # Unique per workflow run and constant node.
+    key: str
+    ref: "_client.ObjectRef"
+    # Size of the serialized constant, in bytes.
+    size: int
+
+
+class _ConstantsCache:
+    """
+    Deserialized constants, shared by the tasks run in a single worker process.
+    Tasks that get the same constant get the same object, like with the in-process
+    runtime. A task that mutates such a constant changes it for the other tasks run
+    by the same worker. Constants smaller than ``INLINE_CONSTANT_MAX_SIZE`` aren't
+    shared, each task gets its own copy.
+
+    Holds up to ``max_bytes`` of constants, as estimated by ``ConstantRef.size``.
+    Least recently used constants are dropped first. Constants larger than
+    ``max_bytes`` aren't kept.
+    """
+
+    def __init__(self, max_bytes: int):
+        self._max_bytes = max_bytes
+        self._n_bytes = 0
+        self._values: "OrderedDict[str, t.Tuple[t.Any, int]]" = OrderedDict()
+
+    def get(self, client: RayClient, constant: ConstantRef) -> t.Any:
+        try:
+            self._values.move_to_end(constant.key)
+        except KeyError:
+            pass
+        else:
+            return self._values[constant.key][0]
+
+        value = serde.deserialize(client.get(constant.ref))
+        if constant.size > self._max_bytes:
+            return value
+
+        self._values[constant.key] = (value, constant.size)
+        self._n_bytes += constant.size
+        while self._n_bytes > self._max_bytes:
+            _, (_, size) = self._values.popitem(last=False)
+            self._n_bytes -= size
+
+        return value
+
+
+# Only accessed by ArgumentUnwrapper. See the comment about _user_fns.
+_constants_cache = _ConstantsCache(max_bytes=CONSTANTS_CACHE_MAX_BYTES)
 
 
 class ArgumentUnwrapper:
@@ -80,6 +388,7 @@ class ArgumentUnwrapper:
         args_artifact_nodes: t.Mapping[int, ir.ArtifactNode],
         kwargs_artifact_nodes: t.Mapping[str, ir.ArtifactNode],
         deserialize: bool,
+        client: RayClient,
     ):
         """
         Args:
@@ -95,11 +404,13 @@ class ArgumentUnwrapper:
                 the underlying task function. This is used to avoid the deserialization
                 problem of having the Python dependencies for Pickles when aggregating
                 the outputs of a workflow.
+            client: Ray API facade, used to fetch constants from Ray's object store.
         """
         self._user_fn = user_fn
         self._args_artifact_nodes = args_artifact_nodes
         self._kwargs_artifact_nodes = kwargs_artifact_nodes
         self._deserialize = deserialize
+        self._client = client
 
     def _get_metadata(self, key: t.Union[int, str]) -> t.Optional[ir.ArtifactNode]:
         if isinstance(key, int):
@@ -111,10 +422,16 @@ class ArgumentUnwrapper:
 
     def _unpack_argument(
         self,
-        arg: t.Union[ir.ConstantNode, ir.SecretNode, TaskResult],
+        arg: t.Union[ConstantRef, ir.ConstantNode, ir.SecretNode, TaskResult],
         meta_key: t.Union[int, str],
     ):
-        if isinstance(arg, (ir.ConstantNodeJSON, ir.ConstantNodePickle)):
+        if isinstance(arg, ConstantRef):
+            return (
+                _constants_cache.get(self._client, arg)
+                if self._deserialize
+                else self._client.get(arg.ref)
+            )
+        elif isinstance(arg, (ir.ConstantNodeJSON, ir.ConstantNodePickle)):
             return serde.deserialize(arg) if self._deserialize else arg
         elif isinstance(arg, ir.SecretNode):
             return (
@@ -125,15 +442,16 @@ class ArgumentUnwrapper:
         elif isinstance(arg, TaskResult):
             meta = self._get_metadata(meta_key)
             if meta is None or meta.artifact_index is None:
-                return (
-                    serde.deserialize(arg.packed) if self._deserialize else arg.packed
-                )
+                if isinstance(arg.packed, PackedOutputs) and self._deserialize:
+                    # No need to put the serialized value together first.
+                    return arg.packed.container(
+                        _output_value(part) for part in arg.unpacked
+                    )
+                output = packed_output(arg)
             else:
-                return (
-                    serde.deserialize(arg.unpacked[meta.artifact_index])
-                    if self._deserialize
-                    else arg.unpacked[meta.artifact_index]
-                )
+                output = arg.unpacked[meta.artifact_index]
+
+            return _output_value(output) if self._deserialize else output
         else:
             assert_never(arg)
 
@@ -160,6 +478,8 @@ def _make_ray_dag_node(
     n_outputs: t.Optional[int],
     project_dir: t.Optional[Path],
     user_fn_ref: t.Optional[ir.FunctionRef],
+    artifact_format: ir.ArtifactFormat = ir.ArtifactFormat.AUTO,
+    pass_raw_values: bool = False,
 ) -> _client.FunctionNode:
     """
     Prepares a Ray task that fits a single ir.TaskInvocation. The result is a
@@ -168,8 +488,8 @@ def _make_ray_dag_node(
     Args:
         client: Ray API facade
         ray_options: dict passed to RayClient.add_options()
-        ray_args: constants or futures required to build the DAG
-        ray_kwargs: constants or futures required to build the DAG
+        ray_args: constant refs or futures required to build the DAG
+        ray_kwargs: constant refs or futures required to build the DAG
         args_artifact_nodes: a map of positional arg index to artifact node
             see ArgumentUnwrapper
         kwargs_artifact_nodes: a map of keyword arg name to artifact node
@@ -178,8 +498,17 @@ def _make_ray_dag_node(
         project_dir: the working directory the workflow was submitted from
         user_fn_ref: function reference for a function to be executed by Ray.
             if None - executes data aggregation step
+        artifact_format: how to serialize the task's outputs.
+        pass_raw_values: if True, the task's outputs are passed to other tasks as
+            RawValues, and serialized with ``artifact_format`` only when they're
+            requested.
     """
 
+    def _output(value) -> TaskOutput:
+        if pass_raw_values:
+            return RawValue(value=value, artifact_format=artifact_format)
+        return serde.result_from_artifact(value, artifact_format)
+
     @client.remote
     def _ray_remote(*inner_args, **inner_kwargs):
         if project_dir is not None:
@@ -190,13 +519,14 @@ def _make_ray_dag_node(
             user_fn = _aggregate_outputs
         else:
             serialization = True
-            user_fn = _locate_user_fn(user_fn_ref)
+            user_fn = _locate_user_fn(user_fn_ref, project_dir)
 
         wrapped = ArgumentUnwrapper(
             user_fn=user_fn,
             args_artifact_nodes=args_artifact_nodes,
             kwargs_artifact_nodes=kwargs_artifact_nodes,
             deserialize=serialization,
+            client=client,
         )
 
         with _exec_ctx.ray():
@@ -204,23 +534,23 @@ def _make_ray_dag_node(
             try:
                 wrapped_return = wrapped(*inner_args, **inner_kwargs)
 
-                packed: responses.WorkflowResult = (
-                    serde.result_from_artifact(wrapped_return, ir.ArtifactFormat.AUTO)
-                    if serialization
-                    else wrapped_return
-                )
-                unpacked: t.Tuple[responses.WorkflowResult, ...]
+                packed: t.Union[TaskOutput, PackedOutputs]
+                unpacked: t.Tuple[TaskOutput, ...]
 
                 if n_outputs is not None and n_outputs > 1:
-                    unpacked = tuple(
-                        serde.result_from_artifact(
-                            wrapped_return[i], ir.ArtifactFormat.AUTO
+                    if serialization:
+                        return _serialize_outputs(
+                            wrapped_return, n_outputs, artifact_format, pass_raw_values
                         )
-                        if serialization
-                        else wrapped_return[i]
-                        for i in range(n_outputs)
-                    )
+                    # Outputs of the data aggregation step aren't serialized. Pickle
+                    # keeps a single copy of objects shared by 'packed' and
+                    # 'unpacked'.
+                    packed = wrapped_return
+                    unpacked = tuple(wrapped_return[i] for i in range(n_outputs))
                 else:
+                    packed = (
+                        _output(wrapped_return) if serialization else wrapped_return
+                    )
                     unpacked = (packed,)
 
                 return TaskResult(
@@ -291,7 +621,25 @@ def _import_pip_env(ir_invocation: ir.TaskInvocation, wf: ir.WorkflowDef):
     return [chunk for imp in imports for chunk in _pip_string(imp)]
 
 
-def _gather_args(arg_ids, workflow_def, ray_futures):
+def _constant_arg(
+    client: RayClient,
+    workflow_run_id: workflow_run.WorkflowRunId,
+    node: ir.ConstantNode,
+) -> t.Union[ConstantRef, ir.ConstantNode]:
+    if isinstance(node, ir.ConstantNodeJSON):
+        size = len(node.value)
+    else:
+        size = sum(len(chunk) for chunk in node.chunks)
+
+    if size <= INLINE_CONSTANT_MAX_SIZE:
+        return node
+
+    return ConstantRef(
+        key=f"{workflow_run_id}@{node.id}", ref=client.put(node), size=size
+    )
+
+
+def _gather_args(arg_ids, workflow_def, ray_futures, constant_args):
     ray_args = []
     ray_args_artifact_nodes: t.Dict[int, t.Optional[ir.ArtifactNode]] = {}
     for i, arg_id in enumerate(arg_ids):
@@ -299,6 +647,9 @@ def _gather_args(arg_ids, workflow_def, ray_futures):
         if isinstance(ir_node, ir.ArtifactNode):
             ray_args.append(ray_futures[arg_id])
             ray_args_artifact_nodes[i] = ir_node
+        elif isinstance(ir_node, (ir.ConstantNodeJSON, ir.ConstantNodePickle)):
+            ray_args.append(constant_args[arg_id])
+            ray_args_artifact_nodes[i] = None
         else:
             ray_args.append(ir_node)
             ray_args_artifact_nodes[i] = None
@@ -306,7 +657,7 @@ def _gather_args(arg_ids, workflow_def, ray_futures):
     return tuple(ray_args), ray_args_artifact_nodes
 
 
-def _gather_kwargs(kwargs, workflow_def, ray_futures):
+def _gather_kwargs(kwargs, workflow_def, ray_futures, constant_args):
     ray_kwargs = {}
     ray_kwargs_artifact_nodes: t.Dict[str, t.Optional[ir.ArtifactNode]] = {}
     for name, kwarg_id in kwargs.items():
@@ -314,6 +665,9 @@ def _gather_kwargs(kwargs, workflow_def, ray_futures):
         if isinstance(ir_node, ir.ArtifactNode):
             ray_kwargs[name] = ray_futures[kwarg_id]
             ray_kwargs_artifact_nodes[name] = ir_node
+        elif isinstance(ir_node, (ir.ConstantNodeJSON, ir.ConstantNodePickle)):
+            ray_kwargs[name] = constant_args[kwarg_id]
+            ray_kwargs_artifact_nodes[name] = None
         else:
             ray_kwargs[name] = ir_node
             ray_kwargs_artifact_nodes[name] = None
@@ -340,13 +694,29 @@ def make_ray_dag(
     # a mapping of "artifact ID" <-> "the ray Future needed to get the value"
     ray_futures: t.Dict[ir.ArtifactNodeId, t.Any] = {}
 
+    # Each large constant is put into Ray's object store once, no matter how many
+    # tasks use it.
+    constant_args = {
+        node_id: _constant_arg(client, workflow_run_id, node)
+        for node_id, node in workflow_def.constant_nodes.items()
+    }
+
+    # Task outputs are passed between tasks by Ray, so we can keep them binary if the
+    # user opted in.
+    artifact_format = (
+        ir.ArtifactFormat.RAW_PICKLE5
+        if flag_set(RAY_RAW_PICKLE5_ARTIFACTS_ENV)
+        else ir.ArtifactFormat.AUTO
+    )
+    pass_raw_values = flag_set(RAY_PASS_RAW_VALUES_ENV)
+
     for invocation in _graphs.iter_invocations_topologically(workflow_def):
         user_task = workflow_def.tasks[invocation.task_id]
         pos_args, pos_args_artifact_nodes = _gather_args(
-            invocation.args_ids, workflow_def, ray_futures
+            invocation.args_ids, workflow_def, ray_futures, constant_args
         )
         kwargs, kwargs_artifact_nodes = _gather_kwargs(
-            invocation.kwargs_ids, workflow_def, ray_futures
+            invocation.kwargs_ids, workflow_def, ray_futures, constant_args
         )
         # We want to store both the TaskInvocation.id and TaskRun.id. We use
         # TaskInvocation.id to refer to Ray tasks later. Solution: Ray task
@@ -420,6 +790,8 @@ def make_ray_dag(
             n_outputs=_compat.n_outputs(task_def=user_task, task_inv=invocation),
             project_dir=project_dir,
             user_fn_ref=user_task.fn_ref,
+            artifact_format=artifact_format,
+            pass_raw_values=pass_raw_values,
         )
 
         for output_id in invocation.output_ids:
@@ -427,7 +799,7 @@ def make_ray_dag(
 
     # Gather futures for the last, fake task, and decide what args we need to unwrap.
     pos_args, pos_args_artifact_nodes = _gather_args(
-        workflow_def.output_ids, workflow_def, ray_futures
+        workflow_def.output_ids, workflow_def, ray_futures, constant_args
     )
     last_future = _make_ray_dag_node(
         client=client,
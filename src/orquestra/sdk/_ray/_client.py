@@ -10,9 +10,12 @@ try:
     import ray
     import ray._private.node
     import ray._private.ray_constants
+    import ray._private.storage
     import ray._private.utils
     import ray.runtime_env
     import ray.workflow
+    import ray.workflow.api
+    import ray.workflow.workflow_storage
     from ray import exceptions  # noqa: F401
     from ray.workflow import exceptions as workflow_exceptions  # noqa: F401
 except ModuleNotFoundError:
@@ -40,6 +43,75 @@ else:
     LogPrefixActorName = ray._private.ray_constants.LOG_PREFIX_ACTOR_NAME
     LogPrefixTaskName = ray._private.ray_constants.LOG_PREFIX_TASK_NAME
 
+    # Private parts of Ray's workflow storage used by _load_workflow_runs_metadata().
+    # They aren't covered by Ray's API guarantees, so we check that they're still
+    # there before using them.
+    _STORAGE_INTERNALS = (
+        "_scan",
+        "_get",
+        "_key_task_input_metadata",
+        "_key_task_prerun_metadata",
+        "_key_task_postrun_metadata",
+    )
+
+    def _has_storage_internals() -> bool:
+        return hasattr(ray.workflow.workflow_storage, "STEPS_DIR") and all(
+            hasattr(ray.workflow.workflow_storage.WorkflowStorage, name)
+            for name in _STORAGE_INTERNALS
+        )
+
+    @ray.workflow.api.client_mode_wrap
+    def _load_workflow_runs_metadata(
+        workflow_ids: t.Sequence[str],
+    ) -> t.Dict[str, t.Tuple[t.Dict[str, t.Any], t.Dict[str, t.Dict[str, t.Any]]]]:
+        # 'ray.workflow.get_metadata()' reads a single workflow or task at a time.
+        # Each call looks up the workflow management actor and scans the storage to
+        # check if the task exists. Here, the actor is looked up once per batch and
+        # the task IDs come from a single scan per workflow. The metadata is
+        # assembled the same way as in 'WorkflowStorage.load_task_metadata()'.
+        runs = {}
+        for workflow_id in workflow_ids:
+            store = ray.workflow.workflow_storage.WorkflowStorage(workflow_id)
+            try:
+                wf_meta = store.load_workflow_metadata()
+            except ValueError:
+                # No such workflow.
+                continue
+
+            task_metas = {}
+            task_ids = store._scan(
+                ray.workflow.workflow_storage.STEPS_DIR, ignore_errors=True
+            )
+            for task_id in task_ids:
+                input_meta, _ = store._get(
+                    store._key_task_input_metadata(task_id), True, True
+                )
+                prerun_meta, _ = store._get(
+                    store._key_task_prerun_metadata(task_id), True, True
+                )
+                postrun_meta, _ = store._get(
+                    store._key_task_postrun_metadata(task_id), True, True
+                )
+                task_meta = input_meta or {}
+                task_meta["stats"] = {**(prerun_meta or {}), **(postrun_meta or {})}
+                task_metas[task_id] = task_meta
+
+            runs[workflow_id] = (wf_meta, task_metas)
+
+        return runs
+
+    # Directory in Ray's storage for files written by the SDK. Ray keeps workflows in
+    # a sibling directory.
+    STORAGE_PREFIX = "orquestra"
+
+    @ray.workflow.api.client_mode_wrap
+    def _put_storage_blob(key: str, value: bytes):
+        ray._private.storage.get_client(STORAGE_PREFIX).put(key, value)
+
+    @ray.workflow.api.client_mode_wrap
+    def _get_storage_blob(key: str) -> t.Optional[bytes]:
+        return ray._private.storage.get_client(STORAGE_PREFIX).get(key)
+
     class RayClient:
         """
         Layer of abstraction between our Orquestra-specific RayRuntime code and
@@ -75,10 +147,15 @@ else:
             ray.shutdown()
 
         def get(
-            self, obj_refs: t.List[ray.ObjectRef], timeout: t.Optional[float] = None
+            self,
+            obj_refs: t.Union[ray.ObjectRef, t.List[ray.ObjectRef]],
+            timeout: t.Optional[float] = None,
         ):
             return ray.get(obj_refs, timeout=timeout)
 
+        def put(self, value: t.Any) -> ray.ObjectRef:
+            return ray.put(value)
+
         def remote(self, fn):
             return ray.remote(fn)
 
@@ -149,6 +226,30 @@ else:
         def get_task_metadata(self, workflow_id: str, name: str):
             return ray.workflow.get_metadata(workflow_id, name)
 
+        def can_batch_metadata_reads(self) -> bool:
+            """
+            Tells if get_workflow_runs_metadata() can be used with the installed Ray
+            version. It relies on Ray's storage internals, which can change between
+            releases.
+            """
+            return _has_storage_internals()
+
+        def get_workflow_runs_metadata(
+            self, workflow_ids: t.Sequence[str]
+        ) -> t.Dict[str, t.Tuple[t.Dict[str, t.Any], t.Dict[str, t.Dict[str, t.Any]]]]:
+            """
+            Batched version of get_workflow_metadata() and get_task_metadata().
+            Reads the metadata of the workflows and of all their tasks in a single
+            pass over Ray's workflow storage.
+
+            Check can_batch_metadata_reads() before calling it.
+
+            Returns:
+                Mapping of workflow ID -> (workflow metadata, task ID -> task
+                metadata). Workflows that weren't found are skipped.
+            """
+            return _load_workflow_runs_metadata(list(workflow_ids))
+
         def get_workflow_output(self, workflow_id: str) -> t.Any:
             """
             Get values computed by the the whole workflow, using Ray Workflow API.
@@ -186,3 +287,20 @@ else:
 
         def get_current_task_id(self):
             return ray.workflow.workflow_context.get_current_task_id()
+
+        # ----- Ray Storage -----
+
+        def put_storage_blob(self, key: str, value: bytes):
+            """
+            Writes ``value`` to the storage Ray was initialized with, next to the
+            workflows. Overwrites existing blobs.
+            """
+            _put_storage_blob(key, value)
+
+        def get_storage_blob(self, key: str) -> t.Optional[bytes]:
+            """
+            Returns:
+                The blob written with ``put_storage_blob()``, or None if there's no
+                blob with this key.
+            """
+            return _get_storage_blob(key)
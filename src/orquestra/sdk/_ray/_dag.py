@@ -11,6 +11,8 @@ import dataclasses
 import logging
 import os
 import re
+import threading
+import time
 import typing as t
 import warnings
 from datetime import datetime, timedelta, timezone
@@ -21,7 +23,7 @@ import pydantic
 from orquestra.sdk.schema.responses import WorkflowResult
 
 from .. import exceptions
-from .._base import _services, serde
+from .._base import _log_follow, _services, serde
 from .._base._db import WorkflowDB
 from .._base._env import RAY_GLOBAL_WF_RUN_ID_ENV
 from .._base._spaces._structs import ProjectRef
@@ -30,6 +32,7 @@ from ..schema import ir
 from ..schema.configs import RuntimeConfiguration
 from ..schema.local_database import StoredWorkflowRun
 from ..schema.workflow_run import (
+    TERMINAL_STATES,
     ProjectId,
     RunStatus,
     State,
@@ -41,8 +44,9 @@ from ..schema.workflow_run import (
     WorkspaceId,
 )
 from . import _client, _id_gen, _ray_logs
-from ._build_workflow import TaskResult, make_ray_dag
+from ._build_workflow import TaskResult, make_ray_dag, packed_output, serialize_output
 from ._client import RayClient
+from ._wf_def_store import WorkflowDefStore
 from ._wf_metadata import InvUserMetadata, WfUserMetadata, pydatic_to_json_dict
 
 
@@ -165,6 +169,85 @@ def _workflow_status_from_ray_meta(
     )
 
 
+def _workflow_run_from_ray_meta(
+    wf_run_id: WorkflowRunId,
+    wf_status: _client.WorkflowStatus,
+    wf_def: ir.WorkflowDef,
+    wf_meta: t.Mapping[str, t.Any],
+    task_metas: t.Mapping[str, t.Mapping[str, t.Any]],
+) -> WorkflowRun:
+    # We assume that:
+    # - create_workflow_run() created a separate Ray Task for each IR's
+    #   TaskInvocation
+    # - each Ray Task's name was set to TaskInvocation.id
+    # Tasks that Ray hasn't stored yet are skipped.
+    ray_task_metas = [
+        task_metas[inv_id]
+        for inv_id in wf_def.task_invocations.keys()
+        if "user_metadata" in task_metas.get(inv_id, {})
+    ]
+
+    return WorkflowRun(
+        id=wf_run_id,
+        workflow_def=wf_def,
+        task_runs=[
+            TaskRun(
+                id=task_meta["user_metadata"]["task_run_id"],
+                invocation_id=task_meta["user_metadata"]["task_invocation_id"],
+                status=_task_status_from_ray_meta(
+                    wf_status=wf_status,
+                    start_time=task_meta["stats"].get("start_time"),
+                    end_time=task_meta["stats"].get("end_time"),
+                ),
+                message=None,
+            )
+            for task_meta in ray_task_metas
+        ],
+        status=_workflow_status_from_ray_meta(
+            wf_status=wf_status,
+            start_time=wf_meta["stats"].get("start_time"),
+            end_time=wf_meta["stats"].get("end_time"),
+        ),
+    )
+
+
+class _FinishedRunsMemo:
+    """
+    Thread-safe memo of workflow runs that reached a terminal state. Their status
+    doesn't change anymore, so there's no need to query Ray again. Entries expire
+    after ``ttl`` seconds to pick up runs that were removed from Ray's storage.
+    """
+
+    def __init__(self, ttl: float):
+        self._ttl = ttl
+        self._entries: t.Dict[WorkflowRunId, t.Tuple[float, WorkflowRun]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, wf_run_id: WorkflowRunId) -> t.Optional[WorkflowRun]:
+        with self._lock:
+            try:
+                expires_at, wf_run = self._entries[wf_run_id]
+            except KeyError:
+                return None
+
+            if expires_at <= time.monotonic():
+                del self._entries[wf_run_id]
+                return None
+
+            return wf_run
+
+    def put(self, wf_run_id: WorkflowRunId, wf_run: WorkflowRun):
+        if self._ttl <= 0:
+            return
+
+        with self._lock:
+            self._entries[wf_run_id] = (time.monotonic() + self._ttl, wf_run)
+
+    def invalidate(self, wf_run_id: WorkflowRunId):
+        with self._lock:
+            self._entries.pop(wf_run_id, None)
+
+
 @dataclasses.dataclass(frozen=True)
 class RayParams:
     """Parameters we pass to Ray. See Ray documentation for reference of what values are
@@ -184,6 +267,9 @@ class RayParams:
 # Sometimes, Ray behaves unintuitively.
 JUST_IN_CASE_TIMEOUT = 10.0
 
+# How long, in seconds, the status of a finished workflow run is kept in memory.
+FINISHED_RUN_STATUS_TTL = 60.0
+
 
 class RayRuntime(RuntimeInterface):
     def __init__(
@@ -199,6 +285,8 @@ class RayRuntime(RuntimeInterface):
         self._log_reader: LogReader = _ray_logs.DirectRayReader(
             _services.ray_temp_path()
         )
+        self._finished_runs = _FinishedRunsMemo(ttl=FINISHED_RUN_STATUS_TTL)
+        self._wf_def_store = WorkflowDefStore(client)
 
     @classmethod
     def from_runtime_configuration(
@@ -295,7 +383,11 @@ class RayRuntime(RuntimeInterface):
             workflow_run_id=wf_run_id,
             project_dir=self._project_dir,
         )
-        wf_user_metadata = WfUserMetadata(workflow_def=workflow_def)
+        # The definition is kept out of the run's metadata. Ray reads the whole
+        # metadata document on each status check.
+        wf_user_metadata = WfUserMetadata(
+            workflow_def_hash=self._wf_def_store.put(workflow_def)
+        )
 
         # Unfortunately, Ray doesn't validate uniqueness of workflow IDs. Let's
         # hope we won't get a collision.
@@ -320,49 +412,157 @@ class RayRuntime(RuntimeInterface):
         Raises:
             orquestra.sdk.exceptions.WorkflowRunNotFoundError
         """
+        if (memoized := self._finished_runs.get(workflow_run_id)) is not None:
+            return memoized
+
         try:
             wf_status = self._client.get_workflow_status(workflow_id=workflow_run_id)
-            wf_meta = self._client.get_workflow_metadata(workflow_id=workflow_run_id)
         except (_client.workflow_exceptions.WorkflowNotFoundError, ValueError) as e:
             raise exceptions.WorkflowRunNotFoundError(
                 f"Workflow run {workflow_run_id} wasn't found"
             ) from e
 
-        wf_user_metadata = WfUserMetadata.parse_obj(wf_meta["user_metadata"])
-        wf_def = wf_user_metadata.workflow_def
-
-        inv_ids = wf_def.task_invocations.keys()
-        # We assume that:
-        # - create_workflow_run() created a separate Ray Task for each IR's
-        #   TaskInvocation
-        # - each Ray Task's name was set to TaskInvocation.id
-        ray_task_metas = [
-            self._client.get_task_metadata(workflow_id=workflow_run_id, name=inv_id)
-            for inv_id in inv_ids
-        ]
+        wf_runs = self._collect_workflow_runs([(workflow_run_id, wf_status)])
+        if not wf_runs:
+            raise exceptions.WorkflowRunNotFoundError(
+                f"Workflow run {workflow_run_id} wasn't found"
+            )
+
+        return wf_runs[0]
+
+    def get_workflow_run_states(
+        self, workflow_run_ids: t.Sequence[WorkflowRunId]
+    ) -> t.Dict[WorkflowRunId, State]:
+        """
+        Reads only the workflow's status and metadata. Task metadata isn't read.
+
+        Raises:
+            orquestra.sdk.exceptions.WorkflowRunNotFoundError
+        """
+        states: t.Dict[WorkflowRunId, State] = {}
+        for wf_run_id in workflow_run_ids:
+            if (memoized := self._finished_runs.get(wf_run_id)) is not None:
+                states[wf_run_id] = memoized.status.state
+                continue
 
-        return WorkflowRun(
-            id=workflow_run_id,
-            workflow_def=wf_def,
-            task_runs=[
-                TaskRun(
-                    id=task_meta["user_metadata"]["task_run_id"],
-                    invocation_id=task_meta["user_metadata"]["task_invocation_id"],
-                    status=_task_status_from_ray_meta(
-                        wf_status=wf_status,
-                        start_time=task_meta["stats"].get("start_time"),
-                        end_time=task_meta["stats"].get("end_time"),
-                    ),
-                    message=None,
-                )
-                for task_meta in ray_task_metas
-            ],
-            status=_workflow_status_from_ray_meta(
+            try:
+                wf_status = self._client.get_workflow_status(workflow_id=wf_run_id)
+                wf_meta = self._client.get_workflow_metadata(workflow_id=wf_run_id)
+            except (
+                _client.workflow_exceptions.WorkflowNotFoundError,
+                ValueError,
+            ) as e:
+                raise exceptions.WorkflowRunNotFoundError(
+                    f"Workflow run {wf_run_id} wasn't found"
+                ) from e
+
+            states[wf_run_id] = _workflow_state_from_ray_meta(
                 wf_status=wf_status,
                 start_time=wf_meta["stats"].get("start_time"),
                 end_time=wf_meta["stats"].get("end_time"),
-            ),
-        )
+            )
+
+        return states
+
+    def _collect_workflow_runs(
+        self,
+        wf_statuses: t.Sequence[t.Tuple[WorkflowRunId, _client.WorkflowStatus]],
+    ) -> t.List[WorkflowRun]:
+        """
+        Builds the workflow run models. Finished runs are served from memory. The
+        metadata of the other runs is read from Ray in a single batch.
+
+        Runs that weren't found are skipped.
+        """
+        memoized: t.Dict[WorkflowRunId, WorkflowRun] = {}
+        to_query: t.Dict[WorkflowRunId, _client.WorkflowStatus] = {}
+        for wf_run_id, wf_status in wf_statuses:
+            if (wf_run := self._finished_runs.get(wf_run_id)) is not None:
+                memoized[wf_run_id] = wf_run
+            else:
+                to_query[wf_run_id] = wf_status
+
+        if not to_query:
+            ray_metas = {}
+        elif self._client.can_batch_metadata_reads():
+            ray_metas = self._client.get_workflow_runs_metadata(list(to_query))
+        else:
+            ray_metas = self._read_workflow_runs_metadata(list(to_query))
+
+        wf_runs = []
+        for wf_run_id, _ in wf_statuses:
+            if wf_run_id in memoized:
+                wf_runs.append(memoized[wf_run_id])
+                continue
+
+            try:
+                wf_meta, task_metas = ray_metas[wf_run_id]
+            except KeyError:
+                continue
+
+            wf_def = self._workflow_def_from_ray_meta(wf_meta["user_metadata"])
+            if wf_def is None:
+                continue
+
+            wf_run = _workflow_run_from_ray_meta(
+                wf_run_id=wf_run_id,
+                wf_status=to_query[wf_run_id],
+                wf_def=wf_def,
+                wf_meta=wf_meta,
+                task_metas=task_metas,
+            )
+            if wf_run.status.state in TERMINAL_STATES:
+                self._finished_runs.put(wf_run_id, wf_run)
+            wf_runs.append(wf_run)
+
+        return wf_runs
+
+    def _read_workflow_runs_metadata(
+        self, wf_run_ids: t.Sequence[WorkflowRunId]
+    ) -> t.Dict[
+        WorkflowRunId, t.Tuple[t.Dict[str, t.Any], t.Dict[str, t.Dict[str, t.Any]]]
+    ]:
+        """
+        Unbatched fallback for RayClient.get_workflow_runs_metadata(). Uses only
+        Ray's public API, reading the metadata of one workflow or task at a time.
+        Task IDs come from the workflow definitions.
+        """
+        metas = {}
+        for wf_run_id in wf_run_ids:
+            try:
+                wf_meta = self._client.get_workflow_metadata(workflow_id=wf_run_id)
+            except ValueError:
+                continue
+
+            wf_def = self._workflow_def_from_ray_meta(wf_meta["user_metadata"])
+            if wf_def is None:
+                continue
+
+            task_metas = {}
+            for inv_id in wf_def.task_invocations:
+                try:
+                    task_metas[inv_id] = self._client.get_task_metadata(
+                        workflow_id=wf_run_id, name=inv_id
+                    )
+                except ValueError:
+                    # Ray hasn't stored this task yet.
+                    continue
+
+            metas[wf_run_id] = (wf_meta, task_metas)
+
+        return metas
+
+    def _workflow_def_from_ray_meta(
+        self, user_metadata: t.Mapping[str, t.Any]
+    ) -> t.Optional[ir.WorkflowDef]:
+        """
+        Returns None if the definition is missing from Ray's storage.
+        """
+        if (def_hash := user_metadata.get("workflow_def_hash")) is not None:
+            return self._wf_def_store.get(def_hash)
+
+        # Runs submitted with SDK versions that kept the definition in the metadata.
+        return WfUserMetadata.parse_obj(user_metadata).workflow_def
 
     def get_workflow_run_outputs_non_blocking(
         self, workflow_run_id: WorkflowRunId
@@ -387,7 +587,8 @@ class RayRuntime(RuntimeInterface):
             # If we have a TaskResult, we're a >=0.47.0 result
             # We can assume this is pre-seralised in the form:
             # tuple(WorkflowResult, ...)
-            return ray_result.unpacked
+            # unless the tasks passed raw values.
+            return tuple(serialize_output(output) for output in ray_result.unpacked)
         else:
             # If we have anything else, this should be a tuple of objects
             # These are returned values from workflow tasks
@@ -407,6 +608,27 @@ class RayRuntime(RuntimeInterface):
             orquestra.sdk.exceptions.WorkflowRunNotFoundError: if no run
                 with `workflow_run_id` was found.
         """
+        return self._get_outputs(workflow_run_id, task_inv_ids=None)
+
+    def get_outputs(
+        self,
+        workflow_run_id: WorkflowRunId,
+        task_inv_ids: t.Sequence[ir.TaskInvocationId],
+    ) -> t.Dict[ir.TaskInvocationId, WorkflowResult]:
+        """
+        Only the outputs of the selected task invocations are retrieved from Ray.
+
+        Raises:
+            orquestra.sdk.exceptions.WorkflowRunNotFoundError: if no run
+                with `workflow_run_id` was found.
+        """
+        return self._get_outputs(workflow_run_id, task_inv_ids=set(task_inv_ids))
+
+    def _get_outputs(
+        self,
+        workflow_run_id: WorkflowRunId,
+        task_inv_ids: t.Optional[t.Set[ir.TaskInvocationId]],
+    ) -> t.Dict[ir.TaskInvocationId, WorkflowResult]:
         # The approach is based on two steps:
         # 1. Get task run status.
         # 2. Ask Ray for outputs of only the succeeded ones.
@@ -427,6 +649,7 @@ class RayRuntime(RuntimeInterface):
             run.invocation_id
             for run in wf_run.task_runs
             if run.status.state == State.SUCCEEDED
+            and (task_inv_ids is None or run.invocation_id in task_inv_ids)
         ]
 
         succeeded_obj_refs: t.List[_client.ObjectRef] = [
@@ -447,11 +670,12 @@ class RayRuntime(RuntimeInterface):
 
         # We need to check if the task output was a TaskResult or any other value.
         # A TaskResult means this is a >=0.47.0 workflow and there is a serialized
-        # value (WorkflowResult) in TaskResult.packed
+        # value (WorkflowResult) or a RawValue in TaskResult.packed, or the packed
+        # value has to be put together from TaskResult.unpacked.
         # Anything else is a <0.47.0 workflow and the value should be serialized
 
         serialized_succeeded_values = [
-            v.packed
+            serialize_output(packed_output(v))
             if isinstance(v, TaskResult)
             else serde.result_from_artifact(v, ir.ArtifactFormat.AUTO)
             for v in succeeded_values
@@ -474,6 +698,8 @@ class RayRuntime(RuntimeInterface):
                 f"Workflow run {workflow_run_id} wasn't found"
             ) from e
         self._client.cancel(workflow_run_id)
+        # Ray marks cancelled runs as such even if they had already finished.
+        self._finished_runs.invalidate(workflow_run_id)
 
     def get_workflow_logs(self, wf_run_id: WorkflowRunId):
         return self._log_reader.get_workflow_logs(wf_run_id)
@@ -481,6 +707,13 @@ class RayRuntime(RuntimeInterface):
     def get_task_logs(self, wf_run_id: WorkflowRunId, task_inv_id: TaskInvocationId):
         return self._log_reader.get_task_logs(wf_run_id, task_inv_id)
 
+    def iter_workflow_logs(self, wf_run_id: WorkflowRunId, *, follow: bool = False):
+        return self._log_reader.iter_workflow_logs(
+            wf_run_id,
+            follow=follow,
+            until=lambda: _log_follow.is_finished(self, wf_run_id),
+        )
+
     def list_workflow_runs(
         self,
         *,
@@ -524,12 +757,7 @@ class RayRuntime(RuntimeInterface):
         all_workflows = self._client.list_all()
 
         wf_runs = []
-        for wf_run_id, _ in all_workflows:
-            try:
-                wf_run = self.get_workflow_run_status(wf_run_id)
-            except exceptions.NotFoundError:
-                continue
-
+        for wf_run in self._collect_workflow_runs(all_workflows):
             # Let's filter the workflows at this point, instead of iterating over a list
             # multiple times
             if state_list is not None and wf_run.status.state not in state_list:
@@ -0,0 +1,238 @@
+################################################################################
+# © Copyright 2023 Zapata Computing Inc.
+################################################################################
+"""
+Persistent index of the workflow log lines in Ray's worker log files.
+
+Reading every log file of every Ray session on each log query gets slow when Ray has
+been used for a while. The index keeps the location of each indexed log line, by
+workflow run ID and task invocation ID, and remembers how far each file was read.
+Updating it only reads what was appended since the last update.
+"""
+import sqlite3
+import typing as t
+from contextlib import closing
+from pathlib import Path
+
+from orquestra.sdk.schema.ir import TaskInvocationId
+from orquestra.sdk.schema.workflow_run import WorkflowRunId
+
+from . import _ray_logs
+
+INDEX_FILE_NAME = "orquestra_log_index.db"
+
+# Stored in the index file as "PRAGMA user_version". The index is rebuilt from the log
+# files if the version doesn't match.
+_INDEX_VERSION = 1
+
+# How long to wait for another process that updates the index, in seconds.
+_BUSY_TIMEOUT = 30.0
+
+
+class LogRange(t.NamedTuple):
+    """
+    Consecutive log lines of a single task invocation, as a byte range of a log file.
+    """
+
+    path: Path
+    start: int
+    end: int
+
+
+def _create_tables(db: sqlite3.Connection):
+    (version,) = db.execute("PRAGMA user_version").fetchone()
+    if version == _INDEX_VERSION:
+        return
+
+    db.execute("BEGIN IMMEDIATE")
+    try:
+        (version,) = db.execute("PRAGMA user_version").fetchone()
+        if version != _INDEX_VERSION:
+            # It's only a cache of the log files.
+            db.execute("DROP TABLE IF EXISTS log_files")
+            db.execute("DROP TABLE IF EXISTS log_ranges")
+            # "offset" is the end of the last complete line that was read. "inode"
+            # tells if the file was replaced.
+            db.execute(
+                "CREATE TABLE log_files "
+                "(path TEXT PRIMARY KEY, inode INTEGER, offset INTEGER)"
+            )
+            db.execute(
+                "CREATE TABLE log_ranges (wf_run_id TEXT, task_inv_id TEXT, "
+                "path TEXT, start INTEGER, end INTEGER)"
+            )
+            db.execute(
+                "CREATE INDEX log_ranges_ids ON log_ranges(wf_run_id, task_inv_id)"
+            )
+            db.execute("CREATE INDEX log_ranges_path ON log_ranges(path)")
+            db.execute(f"PRAGMA user_version={_INDEX_VERSION}")
+        db.execute("COMMIT")
+    except BaseException:
+        db.execute("ROLLBACK")
+        raise
+
+
+def _scan_file(
+    path: Path, offset: int
+) -> t.Tuple[t.List[t.Tuple[WorkflowRunId, t.Optional[str], int, int]], int]:
+    """
+    Reads the complete lines appended after ``offset``.
+
+    Returns:
+        Ranges of consecutive lines with the same IDs, as (wf_run_id, task_inv_id,
+            start, end) tuples, and the offset after the last complete line.
+    """
+    ranges: t.List[t.Tuple[WorkflowRunId, t.Optional[str], int, int]] = []
+    with path.open("rb") as f:
+        f.seek(offset)
+        position = offset
+        for line in f:
+            # The worker might be in the middle of writing the last line. It's read
+            # again by the next update.
+            if not line.endswith(b"\n"):
+                break
+            start = position
+            position += len(line)
+
+            parsed = _ray_logs.parse_raw_log(line)
+            if parsed is None or parsed.wf_run_id is None:
+                continue
+
+            if (
+                ranges
+                and ranges[-1][0] == parsed.wf_run_id
+                and ranges[-1][1] == parsed.task_inv_id
+                and ranges[-1][3] == start
+            ):
+                ranges[-1] = (
+                    parsed.wf_run_id,
+                    parsed.task_inv_id,
+                    ranges[-1][2],
+                    position,
+                )
+            else:
+                ranges.append((parsed.wf_run_id, parsed.task_inv_id, start, position))
+
+    return ranges, position
+
+
+class LogIndex:
+    """
+    Sidecar index of the workflow log lines, stored in an SQLite file. Safe to use
+    from many processes at once.
+    """
+
+    def __init__(self, index_path: Path):
+        self._index_path = index_path
+
+    def _connect(self) -> sqlite3.Connection:
+        # Transactions are managed explicitly.
+        db = sqlite3.connect(
+            self._index_path, timeout=_BUSY_TIMEOUT, isolation_level=None
+        )
+        db.execute("PRAGMA journal_mode=WAL")
+        _create_tables(db)
+        return db
+
+    def update(self, paths: t.Iterable[Path]) -> t.Dict[Path, int]:
+        """
+        Indexes the lines appended to the log files since the last update. Files that
+        were replaced are indexed again. Files that aren't in ``paths`` anymore are
+        removed from the index.
+
+        Returns:
+            How far each file is indexed, as the offset after the last indexed line.
+        """
+        stats = {str(path): path.stat() for path in paths}
+
+        with closing(self._connect()) as db:
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                self._update(db, stats)
+                offsets = {
+                    Path(path): offset
+                    for path, offset in db.execute("SELECT path, offset FROM log_files")
+                }
+                db.execute("COMMIT")
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+
+        return offsets
+
+    @staticmethod
+    def _update(db: sqlite3.Connection, stats: t.Mapping[str, t.Any]):
+        indexed = {
+            row[0]: (row[1], row[2])
+            for row in db.execute("SELECT path, inode, offset FROM log_files")
+        }
+
+        for path in indexed.keys() - stats.keys():
+            db.execute("DELETE FROM log_ranges WHERE path=?", (path,))
+            db.execute("DELETE FROM log_files WHERE path=?", (path,))
+
+        for path, stat in stats.items():
+            inode, offset = indexed.get(path, (None, 0))
+            if inode != stat.st_ino or stat.st_size < offset:
+                db.execute("DELETE FROM log_ranges WHERE path=?", (path,))
+                offset = 0
+            elif stat.st_size == offset:
+                continue
+
+            ranges, offset = _scan_file(Path(path), offset)
+            db.executemany(
+                "INSERT INTO log_ranges VALUES (?, ?, ?, ?, ?)",
+                [
+                    (wf_run_id, inv_id, path, start, end)
+                    for wf_run_id, inv_id, start, end in ranges
+                ],
+            )
+            db.execute(
+                "INSERT OR REPLACE INTO log_files VALUES (?, ?, ?)",
+                (path, stat.st_ino, offset),
+            )
+
+    def find(
+        self,
+        wf_run_id: WorkflowRunId,
+        task_inv_id: t.Optional[TaskInvocationId] = None,
+    ) -> t.List[LogRange]:
+        """
+        Returns:
+            Locations of the indexed log lines of the workflow run, or of a single
+                task invocation if ``task_inv_id`` is passed. Ordered by file and
+                position in the file.
+        """
+        query = "SELECT path, start, end FROM log_ranges WHERE wf_run_id=?"
+        params: t.List[str] = [wf_run_id]
+        if task_inv_id is not None:
+            query += " AND task_inv_id=?"
+            params.append(task_inv_id)
+        query += " ORDER BY path, start"
+
+        with closing(self._connect()) as db:
+            return [
+                LogRange(path=Path(row[0]), start=row[1], end=row[2])
+                for row in db.execute(query, params)
+            ]
+
+
+def read_ranges(ranges: t.Iterable[LogRange]) -> t.Iterator[bytes]:
+    """
+    Reads the log lines from the byte ranges returned by ``LogIndex.find()``.
+    """
+    current_path: t.Optional[Path] = None
+    f: t.Optional[t.BinaryIO] = None
+    try:
+        for log_range in ranges:
+            if log_range.path != current_path:
+                if f is not None:
+                    f.close()
+                f = log_range.path.open("rb")
+                current_path = log_range.path
+            assert f is not None
+            f.seek(log_range.start)
+            yield from f.read(log_range.end - log_range.start).splitlines(keepends=True)
+    finally:
+        if f is not None:
+            f.close()
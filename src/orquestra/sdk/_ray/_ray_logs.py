@@ -5,6 +5,8 @@
 Class to get logs from Ray for particular Workflow, both historical and live.
 """
 import json
+import sqlite3
+import time
 import typing as t
 
 # from dataclasses import dataclass
@@ -16,7 +18,10 @@ import pydantic
 from orquestra.sdk.schema.ir import TaskInvocationId
 from orquestra.sdk.schema.workflow_run import TaskRunId, WorkflowRunId
 
-from . import _client
+from . import _ray_log_index
+
+# How long to wait between reads of the log files when following the logs, in seconds.
+FOLLOW_POLL_INTERVAL = 0.5
 
 
 class WFLog(pydantic.BaseModel):
@@ -47,15 +52,38 @@ def _parse_obj_or_none(model_class, json_dict):
         return None
 
 
-def parse_log_line(raw_line: bytes) -> t.Optional[WFLog]:
-    line = raw_line.decode("utf-8", "replace").rstrip("\r\n")
-    if line.startswith(_client.LogPrefixActorName) or line.startswith(
-        _client.LogPrefixTaskName
-    ):
+class RawLog(t.NamedTuple):
+    """
+    Log line that looks like a ``WFLog``, before validating it. Cheap to create for
+    every line of the log files. ``WFLog`` is only built for the lines that are
+    returned.
+    """
+
+    wf_run_id: t.Optional[WorkflowRunId]
+    task_inv_id: t.Optional[TaskInvocationId]
+    # The decoded JSON object.
+    fields: t.Dict[str, t.Any]
+
+    def to_model(self) -> t.Optional[WFLog]:
+        return _parse_obj_or_none(WFLog, self.fields)
+
+
+def parse_raw_log(
+    raw_line: bytes, wf_run_id: t.Optional[WorkflowRunId] = None
+) -> t.Optional[RawLog]:
+    """
+    Decodes the log line if it can be a ``WFLog``. Lines that can't be are rejected
+    before decoding them, like Ray's own output, or the lines of other workflow runs
+    if ``wf_run_id`` is passed.
+    """
+    # Log lines produced in a task run are JSON objects, with the IDs as strings.
+    if not raw_line.lstrip().startswith(b"{"):
+        return None
+    if wf_run_id is not None and wf_run_id.encode() not in raw_line:
         return None
 
     try:
-        json_obj = json.loads(line)
+        json_obj = json.loads(raw_line.decode("utf-8", "replace"))
     except (ValueError, TypeError):
         return None
 
@@ -63,7 +91,27 @@ def parse_log_line(raw_line: bytes) -> t.Optional[WFLog]:
     if not isinstance(json_obj, dict):
         return None
 
-    return _parse_obj_or_none(WFLog, json_obj)
+    return RawLog(
+        wf_run_id=json_obj.get("wf_run_id"),
+        task_inv_id=json_obj.get("task_inv_id"),
+        fields=json_obj,
+    )
+
+
+def parse_log_line(
+    raw_line: bytes, wf_run_id: t.Optional[WorkflowRunId] = None
+) -> t.Optional[WFLog]:
+    """
+    Args:
+        raw_line: a line read from a log file.
+        wf_run_id: if passed, lines of other workflow runs might be rejected early.
+            Callers should still check the ID of the returned log.
+    """
+    raw_log = parse_raw_log(raw_line, wf_run_id)
+    if raw_log is None:
+        return None
+
+    return raw_log.to_model()
 
 
 def _iter_log_paths(ray_temp: Path) -> t.Iterator[Path]:
@@ -84,6 +132,40 @@ def _iter_log_lines(paths: t.Iterable[Path]) -> t.Iterator[bytes]:
             yield from f
 
 
+def _tail_log_lines(
+    paths: t.Iterable[Path], offsets: t.Dict[Path, int]
+) -> t.Iterator[bytes]:
+    """
+    Reads the complete lines appended to the files after the offsets, and moves the
+    offsets past the lines that were read. Files that aren't in ``offsets`` are read
+    from the start.
+    """
+    for path in paths:
+        try:
+            size = path.stat().st_size
+        except OSError:
+            # Removed in the meantime.
+            continue
+
+        offset = offsets.get(path, 0)
+        if size == offset:
+            continue
+        if size < offset:
+            # The file was truncated or replaced.
+            offset = 0
+
+        with path.open("rb") as f:
+            f.seek(offset)
+            for line in f:
+                # The worker might be in the middle of writing the last line. It's
+                # read again on the next call.
+                if not line.endswith(b"\n"):
+                    break
+                offset += len(line)
+                offsets[path] = offset
+                yield line
+
+
 class DirectRayReader:
     """
     Directly reads log files produced by Ray, bypassing the fluent-bit service.
@@ -99,27 +181,48 @@ class DirectRayReader:
     the ``ray_temp`` needs to be ``~/.orquestra/ray``.
     """
 
-    def __init__(self, ray_temp: Path):
+    def __init__(self, ray_temp: Path, index_path: t.Optional[Path] = None):
         """
         Args:
             ray_temp: directory where Ray keeps its data, like ``~/.orquestra/ray``.
+            index_path: where to keep the index of workflow log lines. Defaults to a
+                file inside ``ray_temp``.
         """
         self._ray_temp = ray_temp
-
-    def _get_parsed_logs(self) -> t.Iterable[WFLog]:
-        log_paths = _iter_log_paths(self._ray_temp)
-        log_line_bytes = _iter_log_lines(log_paths)
+        self._index = _ray_log_index.LogIndex(
+            index_path or ray_temp / _ray_log_index.INDEX_FILE_NAME
+        )
+
+    def _get_parsed_logs(
+        self,
+        wf_run_id: WorkflowRunId,
+        task_inv_id: t.Optional[TaskInvocationId] = None,
+    ) -> t.Iterable[WFLog]:
+        """
+        Reads the log lines of the workflow run, or of a single task invocation. Only
+        the files appended since the last call are read in full. The lines are found
+        with the index, and other lines aren't read.
+        """
+        try:
+            self._index.update(_iter_log_paths(self._ray_temp))
+            log_ranges = self._index.find(wf_run_id, task_inv_id)
+        except (OSError, sqlite3.Error):
+            # The index can't be used, e.g. because "ray_temp" is read-only. Fall
+            # back to reading all log files.
+            log_line_bytes = _iter_log_lines(_iter_log_paths(self._ray_temp))
+        else:
+            log_line_bytes = _ray_log_index.read_ranges(log_ranges)
 
         return [
             parsed_log
             for log_line in log_line_bytes
-            if (parsed_log := parse_log_line(raw_line=log_line)) is not None
+            if (parsed_log := parse_log_line(log_line, wf_run_id)) is not None
         ]
 
     def get_task_logs(
         self, wf_run_id: WorkflowRunId, task_inv_id: TaskInvocationId
     ) -> t.List[str]:
-        parsed_logs = self._get_parsed_logs()
+        parsed_logs = self._get_parsed_logs(wf_run_id, task_inv_id)
 
         task_logs = [
             log
@@ -131,7 +234,7 @@ class DirectRayReader:
     def get_workflow_logs(
         self, wf_run_id: WorkflowRunId
     ) -> t.Dict[TaskInvocationId, t.List[str]]:
-        parsed_logs = self._get_parsed_logs()
+        parsed_logs = self._get_parsed_logs(wf_run_id)
 
         logs_dict: t.Dict[TaskInvocationId, t.List[str]] = {}
         for log in parsed_logs:
@@ -144,3 +247,57 @@ class DirectRayReader:
             logs_dict.setdefault(log.task_inv_id, []).append(log.json())
 
         return logs_dict
+
+    def iter_workflow_logs(
+        self,
+        wf_run_id: WorkflowRunId,
+        *,
+        follow: bool = False,
+        until: t.Optional[t.Callable[[], bool]] = None,
+    ) -> t.Iterator[t.Tuple[TaskInvocationId, str]]:
+        """
+        Yields the indexed lines first, then tails the log files from where the index
+        stopped. Only the offset of each file is kept between reads.
+        """
+        try:
+            offsets = self._index.update(_iter_log_paths(self._ray_temp))
+            # Another process might have indexed more lines in the meantime. These are
+            # read when tailing the files.
+            log_ranges = [
+                log_range
+                for log_range in self._index.find(wf_run_id)
+                if log_range.end <= offsets.get(log_range.path, 0)
+            ]
+        except (OSError, sqlite3.Error):
+            # The index can't be used, e.g. because "ray_temp" is read-only. All
+            # files are read when tailing them.
+            offsets = {}
+            log_ranges = []
+
+        yield from self._iter_wf_logs(_ray_log_index.read_ranges(log_ranges), wf_run_id)
+        yield from self._iter_wf_logs(
+            _tail_log_lines(_iter_log_paths(self._ray_temp), offsets), wf_run_id
+        )
+
+        if not follow:
+            return
+
+        while True:
+            time.sleep(FOLLOW_POLL_INTERVAL)
+            finished = until is not None and until()
+            yield from self._iter_wf_logs(
+                _tail_log_lines(_iter_log_paths(self._ray_temp), offsets), wf_run_id
+            )
+            if finished:
+                return
+
+    @staticmethod
+    def _iter_wf_logs(
+        log_lines: t.Iterable[bytes], wf_run_id: WorkflowRunId
+    ) -> t.Iterator[t.Tuple[TaskInvocationId, str]]:
+        for log_line in log_lines:
+            log = parse_log_line(log_line, wf_run_id)
+            if log is None or log.wf_run_id != wf_run_id or log.task_inv_id is None:
+                continue
+
+            yield log.task_inv_id, log.json()
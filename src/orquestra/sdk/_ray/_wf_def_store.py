@@ -0,0 +1,102 @@
+################################################################################
+# © Copyright 2023 Zapata Computing Inc.
+################################################################################
+"""
+Content-addressed storage of workflow definitions, next to Ray's workflow storage.
+
+Ray keeps a workflow run's metadata as a single JSON document. With the definition
+inlined there, every status check parsed and validated the whole IR again. Instead,
+the metadata refers to the definition by a hash of its JSON. Each definition is
+written to Ray's storage once, and the most recently used ones are kept parsed in
+memory.
+"""
+import hashlib
+import threading
+import typing as t
+import zlib
+from collections import OrderedDict
+
+from ..schema import ir
+from ._client import RayClient
+
+# Key prefix for the definitions in Ray's storage.
+_STORAGE_DIR = "workflow_defs"
+
+# Number of parsed definitions kept in memory by each process. Least recently used
+# definitions are dropped first.
+PARSED_CACHE_SIZE = 64
+
+
+def workflow_def_hash(workflow_def_json: str) -> str:
+    return hashlib.sha256(workflow_def_json.encode()).hexdigest()
+
+
+class WorkflowDefStore:
+    """
+    Reads and writes workflow definitions in Ray's storage. Parsed definitions are
+    shared by all stores in the process, because runtime objects are often
+    short-lived.
+    """
+
+    # Definitions are immutable, so entries never go stale. Runs of the same
+    # workflow share an entry.
+    _parsed: "OrderedDict[str, ir.WorkflowDef]" = OrderedDict()
+    _lock = threading.Lock()
+
+    def __init__(self, client: RayClient):
+        self._client = client
+
+    def put(self, workflow_def: ir.WorkflowDef) -> str:
+        """
+        Stores ``workflow_def``. Definitions with the same contents are stored once.
+
+        Returns:
+            The hash to pass to ``get()``.
+        """
+        workflow_def_json = workflow_def.json()
+        def_hash = workflow_def_hash(workflow_def_json)
+        # Written even if it's been parsed already. This process might've been
+        # connected to a cluster with another storage.
+        self._client.put_storage_blob(
+            _blob_key(def_hash), zlib.compress(workflow_def_json.encode())
+        )
+        with self._lock:
+            self._remember(def_hash, workflow_def)
+
+        return def_hash
+
+    def get(self, def_hash: str) -> t.Optional[ir.WorkflowDef]:
+        """
+        Returns:
+            The definition stored with ``put()``, or None if it isn't in Ray's
+            storage.
+        """
+        with self._lock:
+            try:
+                self._parsed.move_to_end(def_hash)
+            except KeyError:
+                pass
+            else:
+                return self._parsed[def_hash]
+
+        blob = self._client.get_storage_blob(_blob_key(def_hash))
+        if blob is None:
+            return None
+
+        workflow_def = ir.WorkflowDef.parse_raw(zlib.decompress(blob))
+        with self._lock:
+            # Another thread might've parsed it in the meantime. Keep a single copy.
+            return self._remember(def_hash, workflow_def)
+
+    def _remember(self, def_hash: str, workflow_def: ir.WorkflowDef) -> ir.WorkflowDef:
+        # Must be called with self._lock held.
+        workflow_def = self._parsed.setdefault(def_hash, workflow_def)
+        self._parsed.move_to_end(def_hash)
+        if len(self._parsed) > PARSED_CACHE_SIZE:
+            self._parsed.popitem(last=False)
+
+        return workflow_def
+
+
+def _blob_key(def_hash: str) -> str:
+    return f"{_STORAGE_DIR}/{def_hash}.json.zlib"
@@ -14,8 +14,13 @@ class WfUserMetadata(pydantic.BaseModel):
     set (i.e. it has proper fields).
     """
 
-    # Full definition of the workflow that's being run.
-    workflow_def: ir.WorkflowDef
+    # Hash of the definition of the workflow that's being run. The definition is
+    # kept in the WorkflowDefStore.
+    workflow_def_hash: t.Optional[str] = None
+
+    # Full definition of the workflow that's being run. Only set for runs submitted
+    # with SDK versions that didn't use the WorkflowDefStore.
+    workflow_def: t.Optional[ir.WorkflowDef] = None
 
 
 class InvUserMetadata(pydantic.BaseModel):
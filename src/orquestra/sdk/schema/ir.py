@@ -251,6 +251,12 @@ class ArtifactFormat(str, enum.Enum):
     # Pickle -> Base64 string
     ENCODED_PICKLE = "ENCODED_PICKLE"
 
+    # Pickle protocol 5 with out-of-band buffers kept as raw bytes. Avoids the base64
+    # overhead and extra copies for large binary values, like NumPy arrays. Only usable
+    # with transports that can carry binary data, e.g. Ray's object store. Text-only
+    # transports fall back to ENCODED_PICKLE.
+    RAW_PICKLE5 = "RAW_PICKLE5"
+
     # The artifact is serialized to a JSON string. Artifact value must be
     # JSON-serializable.
     JSON = "JSON"
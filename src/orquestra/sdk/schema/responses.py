@@ -161,8 +161,24 @@ class PickleResult(BaseModel):
     ] = ArtifactFormat.ENCODED_PICKLE
 
 
+class RawPickleResult(BaseModel):
+    # Output value dumped with pickle protocol 5. Large buffers (e.g. NumPy array data)
+    # aren't copied into the pickle stream; they're kept aside as "out-of-band"
+    # buffers. This model isn't JSON-serializable. Use
+    # ``orquestra.sdk._base.serde.to_text_result()`` before passing it to text-only
+    # transports.
+    pickle: bytes
+    # Each entry supports the buffer protocol: ``pickle.PickleBuffer``, ``bytes``, or
+    # ``memoryview``. Order is significant.
+    buffers: t.List[t.Any]
+    serialization_format: t.Literal[
+        ArtifactFormat.RAW_PICKLE5
+    ] = ArtifactFormat.RAW_PICKLE5
+
+
 WorkflowResult = Annotated[
-    t.Union[JSONResult, PickleResult], Field(discriminator="serialization_format")
+    t.Union[JSONResult, PickleResult, RawPickleResult],
+    Field(discriminator="serialization_format"),
 ]
 
 
@@ -30,6 +30,10 @@ class State(enum.Enum):
     ERROR = "ERROR"
 
 
+# Workflow runs in these states won't change anymore.
+TERMINAL_STATES = frozenset({State.SUCCEEDED, State.FAILED, State.TERMINATED})
+
+
 class RunStatus(BaseModel):
     state: State
     start_time: t.Optional[datetime]
@@ -0,0 +1,116 @@
+################################################################################
+# © Copyright 2023 Zapata Computing Inc.
+################################################################################
+"""
+Unit tests for ``orq db compact`` CLI action.
+"""
+from unittest.mock import Mock
+
+import pytest
+
+from orquestra.sdk._base.cli._dorq._db import _compact
+
+
+class TestAction:
+    """
+    Test boundaries::
+        [_compact.Action]->[repos]
+                         ->[prompter]
+                         ->[presenter]
+    """
+
+    @staticmethod
+    def test_data_passing():
+        # Given
+        presenter = Mock()
+        prompter = Mock()
+        prompter.confirm.return_value = True
+        db_repo = Mock()
+        db_repo.count_runs_to_remove.return_value = 3
+
+        action = _compact.Action(
+            presenter=presenter, prompter=prompter, db_repo=db_repo
+        )
+
+        # When
+        action.on_cmd_call(max_age="30d", max_count=10)
+
+        # Then
+        db_repo.count_runs_to_remove.assert_called_with(max_age="30d", max_count=10)
+        assert "3 workflow run(s)" in prompter.confirm.call_args.args[0]
+        assert prompter.confirm.call_args.kwargs["default"] is False
+        db_repo.compact.assert_called_with(max_age="30d", max_count=10)
+        presenter.show_compaction.assert_called_with(db_repo.compact.return_value)
+
+    @staticmethod
+    def test_declined():
+        # Given
+        presenter = Mock()
+        prompter = Mock()
+        prompter.confirm.return_value = False
+        db_repo = Mock()
+        db_repo.count_runs_to_remove.return_value = 3
+
+        action = _compact.Action(
+            presenter=presenter, prompter=prompter, db_repo=db_repo
+        )
+
+        # When
+        action.on_cmd_call(max_age="30d", max_count=None)
+
+        # Then
+        db_repo.compact.assert_not_called()
+        presenter.show_compaction.assert_not_called()
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "max_age,max_count,yes,n_runs",
+        [
+            # Only the free space is given back.
+            (None, None, False, 0),
+            # Nothing to remove.
+            ("30d", None, False, 0),
+            # Confirmed up front.
+            ("30d", 10, True, 3),
+        ],
+    )
+    def test_without_confirmation(max_age, max_count, yes, n_runs):
+        # Given
+        presenter = Mock()
+        prompter = Mock()
+        db_repo = Mock()
+        db_repo.count_runs_to_remove.return_value = n_runs
+
+        action = _compact.Action(
+            presenter=presenter, prompter=prompter, db_repo=db_repo
+        )
+
+        # When
+        action.on_cmd_call(max_age=max_age, max_count=max_count, yes=yes)
+
+        # Then
+        prompter.confirm.assert_not_called()
+        db_repo.compact.assert_called_with(max_age=max_age, max_count=max_count)
+        presenter.show_compaction.assert_called_with(db_repo.compact.return_value)
+
+    @staticmethod
+    def test_handling_errors():
+        # Given
+        presenter = Mock()
+        prompter = Mock()
+        db_repo = Mock()
+        exc = ValueError("invalid age")
+        db_repo.count_runs_to_remove.side_effect = exc
+
+        action = _compact.Action(
+            presenter=presenter, prompter=prompter, db_repo=db_repo
+        )
+
+        # When
+        action.on_cmd_call(max_age="soon", max_count=None)
+
+        # Then
+        presenter.show_error.assert_called_with(exc)
+        prompter.confirm.assert_not_called()
+        db_repo.compact.assert_not_called()
+        presenter.show_compaction.assert_not_called()
@@ -496,7 +496,7 @@ class TestWFRunResolver:
             wf_run_repo = Mock()
             time_delta = 1000
             listed_runs = [return_wf("1", 0), return_wf("2", time_delta)]
-            wf_run_repo.list_wf_runs.return_value = listed_runs
+            wf_run_repo.list_wf_runs_for_prompt.return_value = listed_runs
 
             prompter = create_autospec(_prompts.Prompter)
 
@@ -525,11 +525,11 @@ class TestWFRunResolver:
             # Then
             # We should pass config value to wf_run_repo.
             if runtime_supports_workspaces:
-                wf_run_repo.list_wf_runs.assert_called_with(
+                wf_run_repo.list_wf_runs_for_prompt.assert_called_with(
                     config, workspace=fake_ws, project=fake_project
                 )
             else:
-                wf_run_repo.list_wf_runs.assert_called_with(
+                wf_run_repo.list_wf_runs_for_prompt.assert_called_with(
                     config, workspace=None, project=None
                 )
 
@@ -609,7 +609,7 @@ class TestWFRunResolver:
             wf_run_repo = create_autospec(_repos.WorkflowRunRepo)
             time_delta = 1000
             listed_runs = [return_wf("1", 0), return_wf("2", time_delta)]
-            wf_run_repo.list_wf_runs.return_value = listed_runs
+            wf_run_repo.list_wf_runs_for_prompt.return_value = listed_runs
 
             prompter = create_autospec(_prompts.Prompter)
             selected_run = listed_runs[0]
@@ -627,11 +627,11 @@ class TestWFRunResolver:
             # Then
             # We should pass config value to wf_run_repo.
             if runtime_supports_workspaces:
-                wf_run_repo.list_wf_runs.assert_called_with(
+                wf_run_repo.list_wf_runs_for_prompt.assert_called_with(
                     config, workspace="wake ws", project="fake project"
                 )
             else:
-                wf_run_repo.list_wf_runs.assert_called_with(
+                wf_run_repo.list_wf_runs_for_prompt.assert_called_with(
                     config,
                     workspace=None,
                     project=None,
@@ -54,6 +54,8 @@ class TestCommandTreeAssembly:
             ["task"],
             ["task", "results"],
             ["task", "logs"],
+            ["db"],
+            ["db", "compact"],
             ["up"],
             ["down"],
             ["status"],
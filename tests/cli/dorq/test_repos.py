@@ -28,6 +28,7 @@ from orquestra.sdk._base.cli._dorq._ui import _models as ui_models
 from orquestra.sdk._ray import _dag
 from orquestra.sdk.schema import ir
 from orquestra.sdk.schema.configs import RuntimeName
+from orquestra.sdk.schema.local_database import StoredWorkflowRun
 from orquestra.sdk.schema.workflow_run import RunStatus, State
 from orquestra.sdk.schema.workflow_run import TaskRun as TaskRunModel
 from orquestra.sdk.schema.workflow_run import WorkflowRun as WorkflowRunModel
@@ -753,6 +754,24 @@ class TestWorkflowRunRepo:
                     # When
                     _ = repo.get_wf_logs(wf_run_id, config)
 
+        class TestIterWFLogs:
+            @staticmethod
+            def test_passing_values(mock_by_id, mock_wf_run):
+                # Given
+                config = "<config sentinel>"
+                wf_run_id = "<id sentinel>"
+                mock_wf_run.iter_logs.return_value = iter([("inv1", "my_log")])
+
+                repo = _repos.WorkflowRunRepo()
+
+                # When
+                logs = list(repo.iter_wf_logs(wf_run_id, config, follow=True))
+
+                # Then
+                assert logs == [("inv1", "my_log")]
+                mock_by_id.assert_called_with(wf_run_id, config)
+                mock_wf_run.iter_logs.assert_called_with(follow=True)
+
         class TestGetTaskLogs:
             @staticmethod
             def test_passing_values(mock_by_id, mock_wf_run):
@@ -872,7 +891,6 @@ class TestWorkflowRunRepo:
             ws = "ws"
             proj = "proj"
             stub_run_ids = ["wf.1", "wf.2"]
-            state = State("RUNNING")
 
             # Make RayRuntime return the IDs we want. We don't want to submit real
             # workflows and wait for their completion because it takes forever. It's
@@ -880,12 +898,7 @@ class TestWorkflowRunRepo:
             mock_wf_runs = []
             for stub_id in stub_run_ids:
                 wf_run = Mock()
-                wf_run.get_status_model.return_value = WorkflowRunModel(
-                    id=stub_id,
-                    workflow_def=create_autospec(ir.WorkflowDef),
-                    task_runs=[],
-                    status=RunStatus(state=state, start_time=None, end_time=None),
-                )
+                wf_run.run_id = stub_id
                 mock_wf_runs.append(wf_run)
 
             monkeypatch.setattr(
@@ -904,6 +917,30 @@ class TestWorkflowRunRepo:
 
             # Then
             assert run_ids == stub_run_ids
+            # Only the IDs are needed.
+            for wf_run in mock_wf_runs:
+                wf_run.get_status_model.assert_not_called()
+
+        @staticmethod
+        def test_list_wf_runs_for_prompt(monkeypatch):
+            # Given
+            config = "ce"
+            run_statuses = [Mock(), Mock()]
+            iter_statuses = Mock(return_value=iter(run_statuses))
+            monkeypatch.setattr(
+                _repos._api, "iter_workflow_run_statuses", iter_statuses
+            )
+
+            repo = _repos.WorkflowRunRepo()
+
+            # When
+            runs = repo.list_wf_runs_for_prompt(config, "ws", "proj")
+
+            # Then
+            iter_statuses.assert_called_once_with(
+                config, workspace="ws", project="proj"
+            )
+            assert runs == run_statuses
 
         class TestWithInProcess:
             """
@@ -973,6 +1010,70 @@ class TestWorkflowRunRepo:
                 assert len(inv_ids) == 2
 
 
+class TestWorkflowDBRepo:
+    @staticmethod
+    def test_compact(mock_workflow_db_location):
+        # Given
+        with _db.WorkflowDB.open_db() as db:
+            for wf_run_id in ["wf.1", "wf.2"]:
+                db.save_workflow_run(
+                    StoredWorkflowRun(
+                        workflow_run_id=wf_run_id,
+                        config_name="hello",
+                        workflow_def=_example_wfs.my_workflow.model,
+                    )
+                )
+                db.save_finished_workflow_run(
+                    WorkflowRunModel(
+                        id=wf_run_id,
+                        workflow_def=_example_wfs.my_workflow.model,
+                        task_runs=[],
+                        status=RunStatus(
+                            state=State.SUCCEEDED, start_time=None, end_time=None
+                        ),
+                    )
+                )
+
+        repo = _repos.WorkflowDBRepo()
+
+        # When
+        result = repo.compact(max_age="1d", max_count=1)
+
+        # Then
+        assert result.n_removed_runs == 1
+        with _db.WorkflowDB.open_db() as db:
+            assert [run.workflow_run_id for run in db.iter_workflow_runs()] == ["wf.2"]
+
+    @staticmethod
+    def test_count_runs_to_remove(mock_workflow_db_location):
+        # Given
+        with _db.WorkflowDB.open_db() as db:
+            db.save_workflow_run(
+                StoredWorkflowRun(
+                    workflow_run_id="wf.1",
+                    config_name="hello",
+                    workflow_def=_example_wfs.my_workflow.model,
+                )
+            )
+
+        repo = _repos.WorkflowDBRepo()
+
+        # When
+        n_runs = repo.count_runs_to_remove(max_age="0s", max_count=None)
+
+        # Then
+        assert n_runs == 1
+        with _db.WorkflowDB.open_db() as db:
+            assert [run.workflow_run_id for run in db.iter_workflow_runs()] == ["wf.1"]
+
+    @staticmethod
+    def test_invalid_max_age(mock_workflow_db_location):
+        repo = _repos.WorkflowDBRepo()
+
+        with pytest.raises(ValueError):
+            repo.compact(max_age="soon", max_count=None)
+
+
 class TestSummaryRepo:
     @staticmethod
     @pytest.mark.parametrize(
@@ -10,7 +10,7 @@ from unittest.mock import Mock
 import pytest
 
 from orquestra import sdk
-from orquestra.sdk._base import serde
+from orquestra.sdk._base import _db, serde
 from orquestra.sdk._base.cli._dorq._ui import _errors
 from orquestra.sdk._base.cli._dorq._ui import _models as ui_models
 from orquestra.sdk._base.cli._dorq._ui import _presenters
@@ -113,6 +113,18 @@ class TestWrappedCorqOutputPresenter:
             captured = capsys.readouterr()
             assert f"Workflow logs saved at {dummy_path}" in captured.out
 
+        @staticmethod
+        def test_show_log_line(capsys):
+            # Given
+            presenter = _presenters.WrappedCorqOutputPresenter()
+
+            # When
+            presenter.show_log_line("inv1", "my log")
+
+            # Then
+            captured = capsys.readouterr()
+            assert captured.out == "inv1: my log\n"
+
     @staticmethod
     def test_handling_error(monkeypatch, sys_exit_mock):
         # Given
@@ -302,6 +314,24 @@ class TestServicesPresenter:
         sys_exit_mock.assert_called_with(ResponseStatusCode.SERVICES_ERROR.value)
 
 
+class TestDBPresenter:
+    @staticmethod
+    def test_show_compaction(capsys):
+        # Given
+        presenter = _presenters.DBPresenter()
+        result = _db.CompactionResult(
+            n_removed_runs=3, size_before=3 * 1024 * 1024, size_after=512
+        )
+
+        # When
+        presenter.show_compaction(result)
+
+        # Then
+        captured = capsys.readouterr()
+        assert "Removed 3 workflow run(s)" in captured.out
+        assert "3.0 MB -> 512 B" in captured.out
+
+
 class TestLoginPresenter:
     @pytest.mark.parametrize("ce", [True, False])
     def test_prompt_for_login(self, capsys, ce):
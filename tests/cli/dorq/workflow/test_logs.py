@@ -146,3 +146,39 @@ class TestAction:
 
             # Expect info presented to the user abouyt the dump
             action._presenter.show_dumped_wf_logs.assert_called_with(dumped_path)
+
+        @staticmethod
+        def test_follow(action):
+            # Given
+            # CLI inputs
+            wf_run_id = "<wf run ID sentinel>"
+            config = "<config sentinel>"
+
+            # Custom mocks
+            action._wf_run_repo.iter_wf_logs.return_value = iter(
+                [("task_inv1", "my_log_1"), ("task_inv2", "log3")]
+            )
+
+            # When
+            action.on_cmd_call(
+                wf_run_id=wf_run_id, config=config, download_dir=None, follow=True
+            )
+
+            # Then
+            action._presenter.show_error.assert_not_called()
+
+            # We should pass resolved values to run repo.
+            resolved_config = action._config_resolver.resolve.return_value
+            resolved_wf_run_id = action._wf_run_resolver.resolve_id.return_value
+            action._wf_run_repo.iter_wf_logs.assert_called_with(
+                wf_run_id=resolved_wf_run_id,
+                config_name=resolved_config,
+                follow=True,
+            )
+
+            # We expect printing each line as it arrives.
+            assert [
+                call.args for call in action._presenter.show_log_line.mock_calls
+            ] == [("task_inv1", "my_log_1"), ("task_inv2", "log3")]
+            action._wf_run_repo.get_wf_logs.assert_not_called()
+            action._presenter.show_logs.assert_not_called()
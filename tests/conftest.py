@@ -13,6 +13,17 @@ import orquestra.sdk._base._config
 from orquestra.sdk._base import _db
 
 
+@pytest.fixture(autouse=True)
+def artifact_cache_location(tmp_path_factory, monkeypatch):
+    """
+    Keeps artifacts cached by the tests out of the user's home directory. Each test
+    gets an empty cache.
+    """
+    cache_location = tmp_path_factory.mktemp("artifacts")
+    monkeypatch.setenv("ORQ_ARTIFACT_CACHE_PATH", str(cache_location))
+    return cache_location
+
+
 @pytest.fixture
 def patch_config_location(tmp_path, monkeypatch):
     """
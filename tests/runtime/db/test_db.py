@@ -1,12 +1,19 @@
 ################################################################################
 # © Copyright 2022 Zapata Computing Inc.
 ################################################################################
+import sqlite3
+import threading
+import typing as t
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from unittest.mock import MagicMock
 
 import pytest
 
 import orquestra.sdk._base._db._db as _db
+from orquestra.sdk._base._testing._example_wfs import my_workflow
+from orquestra.sdk.schema.local_database import StoredWorkflowRun
+from orquestra.sdk.schema.workflow_run import RunStatus, State, WorkflowRun
 
 
 class TestDBLocation:
@@ -14,7 +21,7 @@ class TestDBLocation:
         # When
         location = _db._get_default_db_location()
         # Then
-        assert location == Path.home() / ".orquestra" / "workflows.db"
+        assert location == Path.home() / ".orquestra" / "workflows.v2.db"
 
     def test_with_environment_variable(
         self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
@@ -24,7 +31,26 @@ class TestDBLocation:
         # When
         location = _db._get_default_db_location()
         # Then
-        assert location == tmp_path / "workflows.db"
+        assert location == tmp_path / "workflows.v2.db"
+        assert _db._get_legacy_db_location(location) == tmp_path / "workflows.db"
+
+    @pytest.mark.parametrize(
+        "name", ["workflows.db", "runs", "runs.v2.db", "runs.tar.gz", "db.db"]
+    )
+    def test_legacy_location_round_trip(self, tmp_path: Path, name: str):
+        # Given
+        legacy_location = tmp_path / name
+
+        # When
+        location = _db._get_versioned_db_location(legacy_location)
+
+        # Then
+        assert location != legacy_location
+        assert _db._get_legacy_db_location(location) == legacy_location
+
+    @pytest.mark.parametrize("name", ["workflows.db", "runs.v2x", ".v2"])
+    def test_no_legacy_location(self, tmp_path: Path, name: str):
+        assert _db._get_legacy_db_location(tmp_path / name) is None
 
     def test_open_project_db_in_default_location(
         self,
@@ -52,3 +78,691 @@ class TestDBLocation:
 
         # Then
         migrate_fn.assert_not_called()
+
+    def test_open_project_db_next_to_legacy_db(
+        self, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+    ):
+        # The shared database of older SDK versions isn't a project database.
+
+        # Given
+        monkeypatch.setattr(
+            _db,
+            "_get_default_db_location",
+            lambda: tmp_path / ".orquestra" / "workflows.v2.db",
+        )
+        migrate_fn = MagicMock()
+        monkeypatch.setattr(_db, "migrate_project_db_to_shared_db", migrate_fn)
+
+        # When
+        _db.WorkflowDB.open_project_db(tmp_path)
+
+        # Then
+        migrate_fn.assert_not_called()
+
+
+class TestOpenDB:
+    @staticmethod
+    def _stored_run(wf_run_id: str, config_name: str = "hello") -> StoredWorkflowRun:
+        return StoredWorkflowRun(
+            workflow_run_id=wf_run_id,
+            config_name=config_name,
+            workflow_def=my_workflow.model,
+        )
+
+    def test_connection_is_reused(self, mock_workflow_db_location: Path):
+        # Given
+        with _db.WorkflowDB.open_db() as db:
+            db.save_workflow_run(self._stored_run("wf.1"))
+            first = db._db
+
+        # When
+        with _db.WorkflowDB.open_db() as db:
+            stored_run = db.get_workflow_run("wf.1")
+
+        # Then
+        assert db._db is first
+        assert stored_run == self._stored_run("wf.1")
+
+    def test_threads_use_separate_connections(self, mock_workflow_db_location: Path):
+        # Given
+        with _db.WorkflowDB.open_db() as db:
+            main_connection = db._db
+        connections = []
+
+        def _save(wf_run_id):
+            with _db.WorkflowDB.open_db() as db:
+                db.save_workflow_run(self._stored_run(wf_run_id))
+                connections.append(db._db)
+
+        # When
+        threads = [threading.Thread(target=_save, args=(f"wf.{i}",)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # Then
+        assert len({id(c) for c in connections + [main_connection]}) == 5
+        with _db.WorkflowDB.open_db() as db:
+            assert len(db.get_workflow_runs_list()) == 4
+
+    def test_removed_database_is_recreated(self, mock_workflow_db_location: Path):
+        # Given
+        with _db.WorkflowDB.open_db() as db:
+            db.save_workflow_run(self._stored_run("wf.1"))
+        mock_workflow_db_location.unlink()
+
+        # When
+        with _db.WorkflowDB.open_db() as db:
+            db.save_workflow_run(self._stored_run("wf.2"))
+
+        # Then
+        assert mock_workflow_db_location.exists()
+        with _db.WorkflowDB.open_db() as db:
+            assert [r.workflow_run_id for r in db.get_workflow_runs_list()] == ["wf.2"]
+
+    def test_uses_wal(self, mock_workflow_db_location: Path):
+        with _db.WorkflowDB.open_db() as db:
+            (journal_mode,) = db._db.execute("PRAGMA journal_mode").fetchone()
+
+        assert journal_mode == "wal"
+
+    def test_project_db_is_migrated_once(
+        self,
+        monkeypatch: pytest.MonkeyPatch,
+        tmp_path: Path,
+        mock_workflow_db_location: Path,
+    ):
+        # Given
+        migrate_fn = MagicMock()
+        monkeypatch.setattr(_db, "migrate_project_db_to_shared_db", migrate_fn)
+
+        # When
+        for _ in range(3):
+            with _db.WorkflowDB.open_project_db(tmp_path / "project"):
+                pass
+
+        # Then
+        migrate_fn.assert_called_once_with(tmp_path / "project")
+
+    def test_list_filters_are_parameters(self, mock_workflow_db_location: Path):
+        # Given
+        with _db.WorkflowDB.open_db() as db:
+            db.save_workflow_run(self._stored_run("wf.1", config_name='"quoted"'))
+            db.save_workflow_run(self._stored_run("wf.2", config_name="other"))
+
+        # When
+        with _db.WorkflowDB.open_db() as db:
+            runs = db.get_workflow_runs_list(prefix="wf", config_name='"quoted"')
+
+        # Then
+        assert [r.workflow_run_id for r in runs] == ["wf.1"]
+
+
+class TestSchema:
+    @staticmethod
+    def _stored_run(wf_run_id: str, config_name: str = "hello") -> StoredWorkflowRun:
+        return StoredWorkflowRun(
+            workflow_run_id=wf_run_id,
+            config_name=config_name,
+            workflow_def=my_workflow.model,
+        )
+
+    def test_upgrades_v0_database(self, mock_workflow_db_location: Path):
+        # Given
+        # The schema of older SDK versions
+        wf_def_json = my_workflow.model.json()
+        db = sqlite3.connect(mock_workflow_db_location)
+        with db:
+            db.execute(
+                "CREATE TABLE workflow_runs "
+                "(workflow_run_id, config_name, workflow_def)"
+            )
+            db.execute(
+                "CREATE UNIQUE INDEX workflow_runs_id ON workflow_runs(workflow_run_id)"
+            )
+            db.executemany(
+                "INSERT INTO workflow_runs VALUES (?, ?, ?)",
+                [(f"wf.{i}", "hello", wf_def_json) for i in range(3)],
+            )
+        db.close()
+
+        # When
+        with _db.WorkflowDB.open_db() as workflow_db:
+            runs = workflow_db.get_workflow_runs_list()
+            (n_defs,) = workflow_db._db.execute(
+                "SELECT COUNT(*) FROM workflow_defs"
+            ).fetchone()
+            (version,) = workflow_db._db.execute("PRAGMA user_version").fetchone()
+
+        # Then
+        assert runs == [self._stored_run(f"wf.{i}") for i in range(3)]
+        assert n_defs == 1
+        assert version == _db._SCHEMA_VERSION
+
+    def test_definitions_are_stored_once(self, mock_workflow_db_location: Path):
+        # When
+        with _db.WorkflowDB.open_db() as db:
+            for i in range(3):
+                db.save_workflow_run(self._stored_run(f"wf.{i}"))
+            (n_defs,) = db._db.execute("SELECT COUNT(*) FROM workflow_defs").fetchone()
+            row = db._db.execute(
+                "SELECT workflow_name, submitted_at FROM workflow_runs"
+            ).fetchone()
+
+        # Then
+        assert n_defs == 1
+        assert row[0] == my_workflow.model.name
+        assert row[1] is not None
+
+    def test_definitions_are_parsed_on_request(
+        self, mock_workflow_db_location: Path, monkeypatch: pytest.MonkeyPatch
+    ):
+        # Given
+        with _db.WorkflowDB.open_db() as db:
+            for i in range(3):
+                db.save_workflow_run(self._stored_run(f"wf.{i}"))
+        parse_raw = MagicMock(wraps=_db.WorkflowDef.parse_raw)
+        monkeypatch.setattr(_db.WorkflowDef, "parse_raw", parse_raw)
+
+        # When
+        with _db.WorkflowDB.open_db() as db:
+            rows = list(db.iter_workflow_runs())
+        ids = [row.workflow_run_id for row in rows]
+
+        # Then
+        assert ids == ["wf.0", "wf.1", "wf.2"]
+        parse_raw.assert_not_called()
+        assert [row.get_workflow_def() for row in rows] == [my_workflow.model] * 3
+        # Runs with the same definition share the parsed one.
+        parse_raw.assert_called_once()
+
+    def test_listed_runs_share_parsed_definitions(
+        self, mock_workflow_db_location: Path, monkeypatch: pytest.MonkeyPatch
+    ):
+        # Given
+        with _db.WorkflowDB.open_db() as db:
+            for i in range(3):
+                db.save_workflow_run(self._stored_run(f"wf.{i}"))
+        parse_raw = MagicMock(wraps=_db.WorkflowDef.parse_raw)
+        monkeypatch.setattr(_db.WorkflowDef, "parse_raw", parse_raw)
+
+        # When
+        with _db.WorkflowDB.open_db() as db:
+            runs = db.get_workflow_runs_list()
+
+        # Then
+        assert runs == [self._stored_run(f"wf.{i}") for i in range(3)]
+        assert all(type(run) is StoredWorkflowRun for run in runs)
+        parse_raw.assert_called_once()
+
+    def test_row_to_stored_run(self, mock_workflow_db_location: Path):
+        # Given
+        with _db.WorkflowDB.open_db() as db:
+            db.save_workflow_run(self._stored_run("wf.1"))
+
+        # When
+        with _db.WorkflowDB.open_db() as db:
+            (row,) = db.iter_workflow_runs()
+            stored_run = db.get_workflow_run("wf.1")
+
+        # Then
+        assert row.to_stored_workflow_run() == stored_run == self._stored_run("wf.1")
+
+
+class TestLegacyDB:
+    @staticmethod
+    @pytest.fixture
+    def db_location(
+        tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> t.Iterator[Path]:
+        location = tmp_path / ".orquestra" / "workflows.v2.db"
+        location.parent.mkdir()
+        monkeypatch.setattr(_db, "_get_default_db_location", lambda: location)
+        yield location
+        _db._pool.clear()
+
+    @staticmethod
+    def _create_legacy_db(location: Path, wf_run_ids: t.Sequence[str]):
+        # The schema of older SDK versions
+        db = sqlite3.connect(location)
+        with db:
+            db.execute(
+                "CREATE TABLE workflow_runs "
+                "(workflow_run_id, config_name, workflow_def)"
+            )
+            db.execute(
+                "CREATE UNIQUE INDEX workflow_runs_id ON workflow_runs(workflow_run_id)"
+            )
+            db.executemany(
+                "INSERT INTO workflow_runs VALUES (?, ?, ?)",
+                [
+                    (wf_run_id, "hello", my_workflow.model.json())
+                    for wf_run_id in wf_run_ids
+                ],
+            )
+        db.close()
+
+    def test_runs_are_copied_once(self, db_location: Path):
+        # Given
+        legacy_location = db_location.with_name("workflows.db")
+        self._create_legacy_db(legacy_location, ["wf.1", "wf.2"])
+
+        # When
+        with _db.WorkflowDB.open_db() as db:
+            runs = db.get_workflow_runs_list()
+        # An older SDK version keeps using its database.
+        db = sqlite3.connect(legacy_location)
+        with db:
+            db.execute(
+                "INSERT INTO workflow_runs VALUES (?, ?, ?)",
+                ("wf.3", "hello", my_workflow.model.json()),
+            )
+        db.close()
+        _db._pool.clear()
+        with _db.WorkflowDB.open_db() as db:
+            reopened_ids = [row.workflow_run_id for row in db.iter_workflow_runs()]
+
+        # Then
+        assert [run.workflow_run_id for run in runs] == ["wf.1", "wf.2"]
+        assert runs[0].workflow_def == my_workflow.model
+        # Runs saved by older SDK versions later aren't copied again.
+        assert reopened_ids == ["wf.1", "wf.2"]
+
+    def test_legacy_db_is_readable_by_older_sdks(self, db_location: Path):
+        # Given
+        legacy_location = db_location.with_name("workflows.db")
+        self._create_legacy_db(legacy_location, ["wf.1"])
+
+        # When
+        with _db.WorkflowDB.open_db() as db:
+            db.save_workflow_run(self._stored_run("wf.2"))
+
+        # Then
+        db = sqlite3.connect(legacy_location)
+        rows = db.execute("SELECT * FROM workflow_runs").fetchall()
+        (version,) = db.execute("PRAGMA user_version").fetchone()
+        db.close()
+        assert rows == [("wf.1", "hello", my_workflow.model.json())]
+        assert version == 0
+
+    def test_runs_are_copied_from_env_var_location(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ):
+        # Given
+        legacy_location = tmp_path / "custom.db"
+        self._create_legacy_db(legacy_location, ["wf.1"])
+        monkeypatch.setenv("ORQ_DB_PATH", str(legacy_location))
+        _db._pool.clear()
+
+        # When
+        with _db.WorkflowDB.open_db() as db:
+            db.save_workflow_run(self._stored_run("wf.2"))
+            ids = [row.workflow_run_id for row in db.iter_workflow_runs()]
+        _db._pool.clear()
+
+        # Then
+        assert ids == ["wf.1", "wf.2"]
+        assert (tmp_path / "custom.v2.db").exists()
+        db = sqlite3.connect(legacy_location)
+        rows = db.execute("SELECT workflow_run_id FROM workflow_runs").fetchall()
+        (version,) = db.execute("PRAGMA user_version").fetchone()
+        db.close()
+        assert rows == [("wf.1",)]
+        assert version == 0
+
+    def test_without_legacy_db(self, db_location: Path):
+        with _db.WorkflowDB.open_db() as db:
+            assert list(db.iter_workflow_runs()) == []
+        assert not db_location.with_name("workflows.db").exists()
+
+    @staticmethod
+    def _stored_run(wf_run_id: str) -> StoredWorkflowRun:
+        return StoredWorkflowRun(
+            workflow_run_id=wf_run_id,
+            config_name="hello",
+            workflow_def=my_workflow.model,
+        )
+
+
+class TestIterWorkflowRuns:
+    @staticmethod
+    def _save(db: _db.WorkflowDB, wf_run_id: str, config_name: str = "hello"):
+        db.save_workflow_run(
+            StoredWorkflowRun(
+                workflow_run_id=wf_run_id,
+                config_name=config_name,
+                workflow_def=my_workflow.model,
+            )
+        )
+
+    @staticmethod
+    def _ids(runs) -> t.List[str]:
+        return [run.workflow_run_id for run in runs]
+
+    @pytest.fixture
+    def db(self, mock_workflow_db_location: Path):
+        with _db.WorkflowDB.open_db() as db:
+            for wf_run_id, config_name in [
+                ("wf.a.1", "hello"),
+                ("wf.b.1", "other"),
+                ("wf_a.1", "hello"),
+                ("wf.a.2", "other"),
+            ]:
+                self._save(db, wf_run_id, config_name)
+            yield db
+
+    def test_no_filters(self, db: _db.WorkflowDB):
+        assert self._ids(db.iter_workflow_runs()) == [
+            "wf.a.1",
+            "wf.b.1",
+            "wf_a.1",
+            "wf.a.2",
+        ]
+
+    def test_prefix_has_no_wildcards(self, db: _db.WorkflowDB):
+        assert self._ids(db.iter_workflow_runs(prefix="wf.a")) == ["wf.a.1", "wf.a.2"]
+
+    def test_prefix_ignores_case(self, db: _db.WorkflowDB):
+        assert self._ids(db.iter_workflow_runs(prefix="WF.A")) == ["wf.a.1", "wf.a.2"]
+
+    def test_prefix_with_like_special_characters(self, db: _db.WorkflowDB):
+        # Given
+        self._save(db, "wf%\\.1")
+
+        # Then
+        assert self._ids(db.iter_workflow_runs(prefix="wf%\\")) == ["wf%\\.1"]
+        assert self._ids(db.iter_workflow_runs(prefix="wf%")) == ["wf%\\.1"]
+        assert self._ids(db.iter_workflow_runs(prefix="wf_")) == ["wf_a.1"]
+
+    def test_config_name(self, db: _db.WorkflowDB):
+        runs = db.iter_workflow_runs(prefix="wf.", config_name="other")
+
+        assert self._ids(runs) == ["wf.b.1", "wf.a.2"]
+
+    def test_reads_pages_lazily(
+        self, db: _db.WorkflowDB, monkeypatch: pytest.MonkeyPatch
+    ):
+        # Given
+        monkeypatch.setattr(_db, "_PAGE_SIZE", 1)
+        runs = db.iter_workflow_runs()
+
+        # When
+        first = next(runs)
+        self._save(db, "wf.c.1")
+
+        # Then
+        assert first.workflow_run_id == "wf.a.1"
+        assert first.get_workflow_def() == my_workflow.model
+        assert self._ids(runs) == ["wf.b.1", "wf_a.1", "wf.a.2", "wf.c.1"]
+
+    def test_uses_indexes(self, db: _db.WorkflowDB):
+        plan = db._db.execute(
+            "EXPLAIN QUERY PLAN SELECT workflow_run_id FROM workflow_runs "
+            "WHERE config_name=?",
+            ("hello",),
+        ).fetchall()
+
+        assert "workflow_runs_config_name" in str(plan)
+
+
+class TestCompression:
+    def test_definitions_are_compressed(self, mock_workflow_db_location: Path):
+        # Given
+        stored_run = StoredWorkflowRun(
+            workflow_run_id="wf.1", config_name="hello", workflow_def=my_workflow.model
+        )
+
+        # When
+        with _db.WorkflowDB.open_db() as db:
+            db.save_workflow_run(stored_run)
+            (stored,) = db._db.execute(
+                "SELECT workflow_def FROM workflow_defs"
+            ).fetchone()
+            loaded = db.get_workflow_run("wf.1")
+
+        # Then
+        assert isinstance(stored, bytes)
+        assert len(stored) < len(my_workflow.model.json())
+        assert loaded == stored_run
+
+    def test_upgrades_uncompressed_definitions(self, mock_workflow_db_location: Path):
+        # Given
+        # A version 2 database, with the definition stored as text.
+        wf_def_json = my_workflow.model.json()
+        db = sqlite3.connect(mock_workflow_db_location)
+        _db._create_workflow_table(db)
+        with db:
+            db.execute(
+                "INSERT INTO workflow_defs VALUES (?, ?)",
+                (_db._workflow_def_hash(wf_def_json), wf_def_json),
+            )
+            db.execute(
+                "INSERT INTO workflow_runs (workflow_run_id, config_name, "
+                "workflow_def_hash) VALUES (?, ?, ?)",
+                ("wf.1", "hello", _db._workflow_def_hash(wf_def_json)),
+            )
+            db.execute("PRAGMA user_version=2")
+        db.close()
+
+        # When
+        with _db.WorkflowDB.open_db() as workflow_db:
+            (stored,) = workflow_db._db.execute(
+                "SELECT workflow_def FROM workflow_defs"
+            ).fetchone()
+            loaded = workflow_db.get_workflow_run("wf.1")
+
+        # Then
+        assert isinstance(stored, bytes)
+        assert loaded.workflow_def == my_workflow.model
+
+
+class TestCompact:
+    @staticmethod
+    def _save(db: _db.WorkflowDB, wf_run_id: str, config_name: str, submitted_at):
+        db.save_workflow_run(
+            StoredWorkflowRun(
+                workflow_run_id=wf_run_id,
+                config_name=config_name,
+                workflow_def=my_workflow.model,
+            )
+        )
+        with db._db:
+            db._db.execute(
+                "UPDATE workflow_runs SET submitted_at=? WHERE workflow_run_id=?",
+                (submitted_at, wf_run_id),
+            )
+
+    @pytest.fixture
+    def db(self, mock_workflow_db_location: Path):
+        now = datetime.now(timezone.utc)
+        with _db.WorkflowDB.open_db() as db:
+            for i, config_name in enumerate(["hello", "other", "hello", "hello"]):
+                self._save(
+                    db,
+                    f"wf.{i}",
+                    config_name,
+                    (now - timedelta(days=4 - i)).isoformat(),
+                )
+            # Stored by SDK versions that didn't record the submission time.
+            self._save(db, "wf.old", "other", None)
+            # "wf.3" is still running.
+            for wf_run_id in ["wf.0", "wf.1", "wf.2"]:
+                db.save_finished_workflow_run(
+                    WorkflowRun(
+                        id=wf_run_id,
+                        workflow_def=my_workflow.model,
+                        task_runs=[],
+                        status=RunStatus(
+                            state=State.SUCCEEDED, start_time=None, end_time=None
+                        ),
+                    )
+                )
+            yield db
+
+    @staticmethod
+    def _ids(db: _db.WorkflowDB) -> t.List[str]:
+        return [run.workflow_run_id for run in db.iter_workflow_runs()]
+
+    def test_without_retention(self, db: _db.WorkflowDB):
+        result = db.compact()
+
+        assert result.n_removed_runs == 0
+        assert self._ids(db) == ["wf.0", "wf.1", "wf.2", "wf.3", "wf.old"]
+
+    def test_max_age(self, db: _db.WorkflowDB):
+        # When
+        result = db.compact(max_age=timedelta(days=2, hours=12))
+
+        # Then
+        assert result.n_removed_runs == 2
+        assert self._ids(db) == ["wf.2", "wf.3", "wf.old"]
+        assert list(db.get_finished_workflow_runs()) == ["wf.2"]
+
+    def test_max_count_per_config(self, db: _db.WorkflowDB):
+        # When
+        result = db.compact(max_count_per_config=1)
+
+        # Then
+        # Unfinished runs are neither counted nor removed.
+        assert result.n_removed_runs == 1
+        assert self._ids(db) == ["wf.1", "wf.2", "wf.3", "wf.old"]
+
+    @pytest.mark.parametrize("max_count", [0, -1])
+    def test_max_count_must_be_positive(self, db: _db.WorkflowDB, max_count: int):
+        with pytest.raises(ValueError):
+            _ = db.compact(max_count_per_config=max_count)
+
+        assert len(self._ids(db)) == 5
+
+    def test_count_runs_to_remove(self, db: _db.WorkflowDB):
+        # When
+        n_runs = db.count_runs_to_remove(
+            max_age=timedelta(days=2, hours=12), max_count_per_config=1
+        )
+
+        # Then
+        assert n_runs == 2
+        assert len(self._ids(db)) == 5
+
+    def test_removes_unused_definitions(self, db: _db.WorkflowDB):
+        # Given
+        ten_days_ago = (datetime.now(timezone.utc) - timedelta(days=10)).isoformat()
+        other_def = my_workflow.model.copy(update={"name": "other_workflow"})
+        with db._db:
+            _db._insert_workflow_runs(
+                db._db, [("wf.other", "hello", other_def.json(), ten_days_ago)]
+            )
+
+        # When
+        result = db.compact(max_age=timedelta(days=5))
+
+        # Then
+        assert result.n_removed_runs == 1
+        (n_defs,) = db._db.execute("SELECT COUNT(*) FROM workflow_defs").fetchone()
+        assert n_defs == 1
+
+    def test_shrinks_the_file(self, db: _db.WorkflowDB):
+        # Given
+        wf_def_json = my_workflow.model.json()
+        ten_days_ago = (datetime.now(timezone.utc) - timedelta(days=10)).isoformat()
+        with db._db:
+            _db._insert_workflow_runs(
+                db._db,
+                [
+                    (f"wf.many.{i}", "many", wf_def_json, ten_days_ago)
+                    for i in range(500)
+                ],
+            )
+
+        # When
+        result = db.compact(max_age=timedelta(days=5))
+
+        # Then
+        assert result.n_removed_runs == 500
+        assert result.size_after < result.size_before
+
+
+class TestFinishedWorkflowRuns:
+    @staticmethod
+    def _wf_run(wf_run_id: str, state: State = State.SUCCEEDED) -> WorkflowRun:
+        return WorkflowRun(
+            id=wf_run_id,
+            workflow_def=my_workflow.model,
+            task_runs=[],
+            status=RunStatus(state=state, start_time=None, end_time=None),
+        )
+
+    @staticmethod
+    def _save_stored_run(db: _db.WorkflowDB, wf_run_id: str, config_name: str):
+        db.save_workflow_run(
+            StoredWorkflowRun(
+                workflow_run_id=wf_run_id,
+                config_name=config_name,
+                workflow_def=my_workflow.model,
+            )
+        )
+
+    def test_roundtrip(self, mock_project_workflow_db: _db.WorkflowDB):
+        # Given
+        db = mock_project_workflow_db
+        self._save_stored_run(db, "wf.1", "hello")
+        wf_run = self._wf_run("wf.1")
+
+        # When
+        db.save_finished_workflow_run(wf_run)
+
+        # Then
+        assert db.get_finished_workflow_run("wf.1") == wf_run
+        assert db.get_finished_workflow_run("wf.2") is None
+
+    def test_replaces_previous_status(self, mock_project_workflow_db: _db.WorkflowDB):
+        # Given
+        db = mock_project_workflow_db
+        self._save_stored_run(db, "wf.1", "hello")
+        db.save_finished_workflow_run(self._wf_run("wf.1", State.FAILED))
+
+        # When
+        db.save_finished_workflow_run(self._wf_run("wf.1", State.TERMINATED))
+
+        # Then
+        wf_run = db.get_finished_workflow_run("wf.1")
+        assert wf_run is not None
+        assert wf_run.status.state == State.TERMINATED
+
+    def test_list_by_config(self, mock_project_workflow_db: _db.WorkflowDB):
+        # Given
+        db = mock_project_workflow_db
+        self._save_stored_run(db, "wf.1", "hello")
+        self._save_stored_run(db, "wf.2", "hello")
+        self._save_stored_run(db, "wf.3", "other")
+        for wf_run_id in ["wf.1", "wf.3"]:
+            db.save_finished_workflow_run(self._wf_run(wf_run_id))
+
+        # When
+        finished = db.get_finished_workflow_runs(config_name="hello")
+
+        # Then
+        assert finished == {"wf.1": self._wf_run("wf.1")}
+        assert set(db.get_finished_workflow_runs()) == {"wf.1", "wf.3"}
+
+    def test_states(
+        self, mock_project_workflow_db: _db.WorkflowDB, monkeypatch: pytest.MonkeyPatch
+    ):
+        # Given
+        db = mock_project_workflow_db
+        # Make sure the IDs are split into several queries
+        monkeypatch.setattr(_db, "_MAX_QUERY_PARAMS", 2)
+        for i, state in enumerate([State.SUCCEEDED, State.FAILED, State.TERMINATED]):
+            self._save_stored_run(db, f"wf.{i}", "hello")
+            db.save_finished_workflow_run(self._wf_run(f"wf.{i}", state))
+
+        # When
+        states = db.get_finished_workflow_run_states(["wf.0", "wf.2", "wf.1", "wf.9"])
+
+        # Then
+        assert states == {
+            "wf.0": State.SUCCEEDED,
+            "wf.1": State.FAILED,
+            "wf.2": State.TERMINATED,
+        }
@@ -5,6 +5,8 @@ import signal
 
 import pytest
 
+from orquestra.sdk._base._testing import _connections
+
 
 class TimeoutError(Exception):
     pass
@@ -40,3 +42,19 @@ def pytest_runtest_call(item):
         signal.setitimer(signal.ITIMER_REAL, 0)
         if failed:
             raise TimeoutError(f"Test timed out after {timeout}s.")
+
+
+@pytest.fixture(scope="session")
+def ray_storage_path(tmp_path_factory: pytest.TempPathFactory):
+    """
+    Starts a local Ray cluster shared by the tests. Yields the path to its storage.
+    """
+    tmp_path = tmp_path_factory.mktemp("ray")
+    mp = pytest.MonkeyPatch()
+    mp.setenv("ORQ_DB_LOCATION", str(tmp_path / "workflows.db"))
+    storage_path = tmp_path / "ray_storage"
+    try:
+        with _connections.make_ray_conn(storage_path=str(storage_path)):
+            yield storage_path
+    finally:
+        mp.undo()
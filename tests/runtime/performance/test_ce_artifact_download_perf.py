@@ -0,0 +1,150 @@
+################################################################################
+# © Copyright 2023 Zapata Computing Inc.
+################################################################################
+"""
+Measures downloading task artifacts from Compute Engine.
+
+The cluster is stood in for by a local HTTP server that adds a fixed latency to every
+response.
+"""
+import json
+import threading
+import time
+import typing as t
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+import pytest
+
+from orquestra.sdk._base._driver import _ce_runtime
+from orquestra.sdk.schema.configs import RuntimeConfiguration, RuntimeName
+from orquestra.sdk.schema.responses import JSONResult
+
+LATENCY = 0.05
+N_ARTIFACTS = 32
+WF_RUN_ID = "wf.perf.1"
+
+
+class _FakeArtifactServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, failures_per_artifact: int = 0):
+        super().__init__(("127.0.0.1", 0), _ArtifactHandler)
+        self.failures_per_artifact = failures_per_artifact
+        self.requests: t.Dict[str, int] = {}
+        self.lock = threading.Lock()
+
+    @property
+    def uri(self) -> str:
+        return f"http://127.0.0.1:{self.server_port}"
+
+
+class _ArtifactHandler(BaseHTTPRequestHandler):
+    server: _FakeArtifactServer
+
+    def do_GET(self):
+        time.sleep(LATENCY)
+        path = urlparse(self.path).path
+
+        if path == "/api/artifacts":
+            body: t.Any = {
+                "data": {
+                    f"{WF_RUN_ID}@invocation-{i}": [f"artifact-{i}"]
+                    for i in range(N_ARTIFACTS)
+                }
+            }
+        else:
+            artifact_id = path.rsplit("/", 1)[-1]
+            with self.server.lock:
+                n_requests = self.server.requests.get(artifact_id, 0) + 1
+                self.server.requests[artifact_id] = n_requests
+            if n_requests <= self.server.failures_per_artifact:
+                self._respond(503, {})
+                return
+            body = JSONResult(value=json.dumps(artifact_id)).dict()
+
+        self._respond(200, body)
+
+    def _respond(self, status: int, body):
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _serve(failures_per_artifact: int = 0):
+    server = _FakeArtifactServer(failures_per_artifact)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+def _runtime(uri: str) -> _ce_runtime.CERuntime:
+    return _ce_runtime.CERuntime(
+        RuntimeConfiguration(
+            config_name="perf",
+            runtime_name=RuntimeName.CE_REMOTE,
+            runtime_options={"uri": uri, "token": "shouldn't matter"},
+        )
+    )
+
+
+@pytest.fixture
+def server():
+    server = _serve()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _time_download(monkeypatch, uri: str, concurrency: int) -> float:
+    monkeypatch.setenv("ORQ_CE_ARTIFACT_DOWNLOAD_CONCURRENCY", str(concurrency))
+    runtime = _runtime(uri)
+
+    start = time.perf_counter()
+    outputs = runtime.get_available_outputs(WF_RUN_ID)
+    elapsed = time.perf_counter() - start
+
+    assert len(outputs) == N_ARTIFACTS
+    return elapsed
+
+
+@pytest.mark.expect_under(30)
+def test_concurrent_vs_serial_downloads(monkeypatch, server: _FakeArtifactServer):
+    # When
+    serial = _time_download(monkeypatch, server.uri, concurrency=1)
+    concurrent = _time_download(
+        monkeypatch,
+        server.uri,
+        concurrency=_ce_runtime.DEFAULT_ARTIFACT_DOWNLOAD_CONCURRENCY,
+    )
+
+    # Then
+    print(
+        f"{N_ARTIFACTS} artifacts with {LATENCY * 1000:.0f}ms latency: "
+        f"serial {serial:.2f}s, concurrent {concurrent:.2f}s"
+    )
+    # Serial downloads take at least N_ARTIFACTS * LATENCY.
+    assert concurrent * 3 < serial
+
+
+@pytest.mark.expect_under(30)
+def test_retries_unavailable_artifacts(monkeypatch):
+    # Given
+    server = _serve(failures_per_artifact=2)
+    monkeypatch.setenv("ORQ_CE_ARTIFACT_DOWNLOAD_CONCURRENCY", "8")
+    try:
+        # When
+        outputs = _runtime(server.uri).get_available_outputs(WF_RUN_ID)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    # Then
+    assert len(outputs) == N_ARTIFACTS
+    assert set(server.requests.values()) == {3}
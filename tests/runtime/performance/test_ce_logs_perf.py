@@ -0,0 +1,151 @@
+################################################################################
+# © Copyright 2023 Zapata Computing Inc.
+################################################################################
+"""
+Measures reading the logs of a single task from a large Compute Engine logs archive.
+
+The cluster is stood in for by a local HTTP server.
+"""
+import gzip
+import io
+import json
+import tarfile
+import threading
+import time
+import tracemalloc
+import typing as t
+import zlib
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from orquestra.sdk._base._driver import _ce_runtime
+from orquestra.sdk._ray._ray_logs import WFLog
+from orquestra.sdk.schema.configs import RuntimeConfiguration, RuntimeName
+
+MB = 1024 * 1024
+N_TASKS = 100
+LINES_PER_SECTION = 1000
+WF_RUN_ID = "wf.perf.1"
+
+
+def _make_archive(size: int) -> t.Tuple[bytes, int]:
+    timestamp = datetime(2023, 3, 14, tzinfo=timezone.utc)
+    lines = []
+    content_size = 0
+    line_i = 0
+    while content_size < size:
+        section = []
+        for _ in range(LINES_PER_SECTION):
+            inv_id = f"invocation-{line_i % N_TASKS}-task-step"
+            log = WFLog(
+                timestamp=timestamp,
+                level="INFO",
+                filename="tasks.py:42",
+                message=f"step {line_i}",
+                wf_run_id=WF_RUN_ID,
+                task_inv_id=inv_id,
+                task_run_id=f"{WF_RUN_ID}@{inv_id}",
+            ).json()
+            section.append([1678804402.0, {"tag": "workflow.logs.ray", "log": log}])
+            line_i += 1
+        line = json.dumps(section) + "\n"
+        lines.append(line)
+        content_size += len(line)
+
+    content = "".join(lines).encode()
+    tar_buffer = io.BytesIO()
+    with tarfile.open(fileobj=tar_buffer, mode="w") as tar:
+        info = tarfile.TarInfo("step-logs")
+        info.size = len(content)
+        tar.addfile(info, io.BytesIO(content))
+
+    return gzip.compress(tar_buffer.getvalue(), compresslevel=1), line_i
+
+
+class _LogsHandler(BaseHTTPRequestHandler):
+    archive: bytes = b""
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(self.archive)))
+        self.end_headers()
+        self.wfile.write(self.archive)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _read_whole_archive(uri: str, task_inv_id: str) -> t.List[str]:
+    # What DriverClient.get_workflow_run_logs() used to do.
+    resp = requests.get(f"{uri}/api/workflow-run-logs")
+    unzipped = zlib.decompress(resp.content, 16 + zlib.MAX_WBITS)
+    untarred = tarfile.TarFile(fileobj=io.BytesIO(unzipped)).extractfile("step-logs")
+    assert untarred is not None
+    decoded = untarred.read().decode()
+    lines = []
+    for section in decoded.split("\n"):
+        if len(section) < 1:
+            continue
+        for log in json.loads(section):
+            wf_log = WFLog.parse_raw(log[1]["log"])
+            if wf_log.task_inv_id == task_inv_id:
+                lines.append(wf_log.message)
+    return lines
+
+
+def _measure(fn) -> t.Tuple[t.Any, float, int]:
+    tracemalloc.start()
+    try:
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, elapsed, peak
+
+
+@pytest.mark.expect_under(300)
+def test_task_logs_from_large_archive():
+    # Given
+    content_size = 50 * MB
+    archive, n_lines = _make_archive(content_size)
+    _LogsHandler.archive = archive
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _LogsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    uri = f"http://127.0.0.1:{server.server_port}"
+    runtime = _ce_runtime.CERuntime(
+        RuntimeConfiguration(
+            config_name="perf",
+            runtime_name=RuntimeName.CE_REMOTE,
+            runtime_options={"uri": uri, "token": "shouldn't matter"},
+        )
+    )
+    inv_id = "invocation-0-task-step"
+
+    # When
+    try:
+        old_lines, old_time, old_peak = _measure(
+            lambda: _read_whole_archive(uri, inv_id)
+        )
+        lines, new_time, new_peak = _measure(
+            lambda: runtime.get_task_logs(WF_RUN_ID, inv_id)
+        )
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    # Then
+    print(
+        f"Task logs out of {n_lines} lines ({len(archive) / MB:.1f}MB compressed, "
+        f"{content_size / MB:.0f}MB uncompressed): whole archive in memory "
+        f"{old_time:.1f}s, peak {old_peak / MB:.0f}MB; streamed {new_time:.1f}s, "
+        f"peak {new_peak / MB:.1f}MB"
+    )
+    assert lines == old_lines
+    assert len(lines) == n_lines // N_TASKS
+    # Only a chunk of the response and a single section are kept in memory.
+    assert new_peak < content_size / 20
@@ -0,0 +1,76 @@
+################################################################################
+# © Copyright 2023 Zapata Computing Inc.
+################################################################################
+"""
+Measures running a workflow on a local Ray cluster, where many task invocations
+share a large constant.
+"""
+import os
+import time
+import typing as t
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+import orquestra.sdk as sdk
+from orquestra.sdk._ray import _client, _dag
+from orquestra.sdk.schema import configs
+from orquestra.sdk.schema.workflow_run import State
+
+MB = 1024 * 1024
+N_INVOCATIONS = 50
+CONSTANT_SIZE = 2 * MB
+VALUES = np.ones(CONSTANT_SIZE // 8)
+
+
+@sdk.task
+def total(values, offset):
+    return float(values.sum()) + offset
+
+
+@sdk.workflow
+def shared_constant():
+    return [total(VALUES, i) for i in range(N_INVOCATIONS)]
+
+
+def _dir_size(path: Path) -> int:
+    return sum(f.stat().st_size for f in path.rglob("*") if f.is_file())
+
+
+@pytest.mark.expect_under(300)
+@pytest.mark.filterwarnings("ignore::pytest.PytestUnraisableExceptionWarning")
+def test_shared_constant(ray_storage_path: Path):
+    # Given
+    runtime = _dag.RayRuntime(
+        client=_client.RayClient(),
+        config=configs.RuntimeConfiguration(
+            config_name="perf", runtime_name=configs.RuntimeName.RAY_LOCAL
+        ),
+        project_dir=Path(os.getcwd()),
+    )
+    wf_def = shared_constant().model
+
+    # When
+    start = time.perf_counter()
+    wf_run_id = runtime.create_workflow_run(wf_def, project=None)
+    outputs: t.Sequence[t.Any] = ()
+    while not outputs:
+        state = runtime.get_workflow_run_status(wf_run_id).status.state
+        assert state in (State.WAITING, State.RUNNING, State.SUCCEEDED)
+        if state == State.SUCCEEDED:
+            outputs = runtime.get_workflow_run_outputs_non_blocking(wf_run_id)
+        else:
+            time.sleep(0.1)
+    elapsed = time.perf_counter() - start
+
+    # Then
+    run_storage_size = _dir_size(ray_storage_path / "workflows" / wf_run_id)
+    print(
+        f"{N_INVOCATIONS} invocations sharing a {CONSTANT_SIZE / MB:.0f}MB constant: "
+        f"{elapsed:.1f}s, {run_storage_size / MB:.1f}MB of workflow storage"
+    )
+    assert [output.value for output in outputs] == [
+        str(CONSTANT_SIZE // 8 + i) + ".0" for i in range(N_INVOCATIONS)
+    ]
+    assert run_storage_size < 5 * CONSTANT_SIZE
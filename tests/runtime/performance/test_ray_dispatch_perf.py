@@ -0,0 +1,130 @@
+################################################################################
+# © Copyright 2023 Zapata Computing Inc.
+################################################################################
+"""
+Measures the latency of starting tasks in long-lived Ray workers, when the module
+with the task functions takes a while to import.
+"""
+import importlib
+import sys
+import time
+import typing as t
+from pathlib import Path
+from types import ModuleType
+
+import pytest
+
+import orquestra.sdk as sdk
+from orquestra.sdk._base import dispatch
+from orquestra.sdk._ray import _build_workflow, _client, _dag
+from orquestra.sdk.schema import configs, ir
+from orquestra.sdk.schema.workflow_run import State
+
+MODULE_NAME = "_orq_perf_heavy_tasks"
+IMPORT_TIME = 0.05
+N_TASKS = 100
+
+TASKS_SOURCE = f"""
+import time
+
+import orquestra.sdk as sdk
+
+# Stands in for heavy imports, like numpy or torch.
+time.sleep({IMPORT_TIME})
+
+
+@sdk.task
+def step(value):
+    return value + 1
+"""
+
+
+@pytest.fixture
+def tasks_module(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    project_dir = tmp_path / "project"
+    project_dir.mkdir()
+    (project_dir / f"{MODULE_NAME}.py").write_text(TASKS_SOURCE)
+    monkeypatch.syspath_prepend(str(project_dir))
+    yield importlib.import_module(MODULE_NAME)
+    sys.modules.pop(MODULE_NAME, None)
+
+
+def _chain(tasks_module: ModuleType, n_tasks: int) -> ir.WorkflowDef:
+    @sdk.workflow
+    def chain():
+        value = 0
+        for _ in range(n_tasks):
+            value = tasks_module.step(value)
+        return [value]
+
+    return chain().model
+
+
+def _module_dir(module: ModuleType) -> Path:
+    assert module.__file__ is not None
+    return Path(module.__file__).parent
+
+
+def _per_call(fn: t.Callable[[], t.Any]) -> float:
+    start = time.perf_counter()
+    for _ in range(N_TASKS):
+        fn()
+    return (time.perf_counter() - start) / N_TASKS
+
+
+@pytest.mark.expect_under(60)
+def test_locating_task_fn(tasks_module: ModuleType, monkeypatch: pytest.MonkeyPatch):
+    # Given
+    monkeypatch.setattr(_build_workflow, "_user_fns", _build_workflow._UserFnCache())
+    project_dir = _module_dir(tasks_module)
+    (task_def,) = _chain(tasks_module, 1).tasks.values()
+
+    def _dispatch():
+        # What each Ray task does before running the user function.
+        dispatch.ensure_sys_paths([str(project_dir)])
+        return _build_workflow._locate_user_fn(task_def.fn_ref, project_dir)
+
+    # When
+    reload_time = _per_call(lambda: dispatch.locate_fn_ref(task_def.fn_ref))
+    cached_time = _per_call(_dispatch)
+
+    # Then
+    print(
+        f"Locating a task function: reloading the module {reload_time * 1000:.1f}ms, "
+        f"cached {cached_time * 1000:.3f}ms"
+    )
+    assert cached_time < IMPORT_TIME / 10
+
+
+@pytest.mark.expect_under(300)
+@pytest.mark.filterwarnings("ignore::pytest.PytestUnraisableExceptionWarning")
+def test_chain_of_tasks(tasks_module: ModuleType, ray_storage_path: Path):
+    # Given
+    runtime = _dag.RayRuntime(
+        client=_client.RayClient(),
+        config=configs.RuntimeConfiguration(
+            config_name="perf", runtime_name=configs.RuntimeName.RAY_LOCAL
+        ),
+        project_dir=_module_dir(tasks_module),
+    )
+    wf_def = _chain(tasks_module, N_TASKS)
+
+    # When
+    start = time.perf_counter()
+    wf_run_id = runtime.create_workflow_run(wf_def, project=None)
+    outputs: t.Sequence[t.Any] = ()
+    while not outputs:
+        state = runtime.get_workflow_run_status(wf_run_id).status.state
+        assert state in (State.WAITING, State.RUNNING, State.SUCCEEDED)
+        if state == State.SUCCEEDED:
+            outputs = runtime.get_workflow_run_outputs_non_blocking(wf_run_id)
+        else:
+            time.sleep(0.1)
+    elapsed = time.perf_counter() - start
+
+    # Then
+    print(
+        f"Chain of {N_TASKS} tasks, {IMPORT_TIME * 1000:.0f}ms to import their "
+        f"module: {elapsed / N_TASKS * 1000:.0f}ms per task"
+    )
+    assert outputs[0].value == str(N_TASKS)
@@ -0,0 +1,185 @@
+################################################################################
+# © Copyright 2023 Zapata Computing Inc.
+################################################################################
+"""
+Measures reading the logs of a single task from a Ray temp directory with many
+sessions, like after weeks of using a local Ray cluster.
+"""
+import json
+import os
+import time
+import typing as t
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pydantic
+import pytest
+
+from orquestra.sdk._ray import _ray_logs
+
+N_SESSIONS = 30
+N_WORKERS = 10
+N_RUNS_PER_WORKER = 20
+LINES_PER_TASK = 25
+# Ray's own output, written to the same files.
+NOISE_LINES_PER_TASK = 25
+
+
+def _write_ray_temp(ray_temp: Path):
+    timestamp = datetime(2023, 2, 9, tzinfo=timezone.utc)
+    for session_i in range(N_SESSIONS):
+        logs_dir = ray_temp / f"session_{session_i}" / "logs"
+        logs_dir.mkdir(parents=True)
+        for worker_i in range(N_WORKERS):
+            lines = []
+            for run_i in range(N_RUNS_PER_WORKER):
+                wf_run_id = f"wf.{session_i}.{worker_i}.{run_i}"
+                lines.append(f":task_name:{wf_run_id}")
+                for line_i in range(LINES_PER_TASK):
+                    lines.append(
+                        _ray_logs.WFLog(
+                            timestamp=timestamp,
+                            level="INFO",
+                            filename="tasks.py:42",
+                            message=f"step {line_i}",
+                            wf_run_id=wf_run_id,
+                            task_inv_id="invocation-0-task-step",
+                            task_run_id=f"{wf_run_id}@invocation-0-task-step",
+                        ).json()
+                    )
+                lines.extend(
+                    f"2023-02-09 12:00:00,000\tINFO worker.py:{i} -- {wf_run_id}"
+                    for i in range(NOISE_LINES_PER_TASK)
+                )
+            (logs_dir / f"worker-{worker_i}.err").write_text("\n".join(lines) + "\n")
+
+
+@pytest.mark.expect_under(300)
+def test_task_logs_from_many_sessions(tmp_path: Path):
+    # Given
+    ray_temp = tmp_path / "ray_temp"
+    _write_ray_temp(ray_temp)
+    wf_run_id = f"wf.{N_SESSIONS - 1}.0.0"
+    inv_id = "invocation-0-task-step"
+
+    # When
+    start = time.perf_counter()
+    full_scan = [
+        log
+        for line in _ray_logs._iter_log_lines(_ray_logs._iter_log_paths(ray_temp))
+        if (log := _ray_logs.parse_log_line(line)) is not None
+        and log.wf_run_id == wf_run_id
+        and log.task_inv_id == inv_id
+    ]
+    full_scan_time = time.perf_counter() - start
+
+    reader = _ray_logs.DirectRayReader(ray_temp)
+    start = time.perf_counter()
+    first = reader.get_task_logs(wf_run_id, inv_id)
+    first_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    again = reader.get_task_logs(wf_run_id, inv_id)
+    again_time = time.perf_counter() - start
+
+    # Then
+    n_lines = (
+        N_SESSIONS
+        * N_WORKERS
+        * N_RUNS_PER_WORKER
+        * (1 + LINES_PER_TASK + NOISE_LINES_PER_TASK)
+    )
+    print(
+        f"Task logs out of {n_lines} lines: reading all files "
+        f"{full_scan_time * 1000:.0f}ms, building the index {first_time * 1000:.0f}ms, "
+        f"with the index {again_time * 1000:.0f}ms"
+    )
+    assert first == again == [log.json() for log in full_scan]
+    assert len(again) == LINES_PER_TASK
+    assert again_time < full_scan_time / 10
+
+
+# The size of the synthetic log directory. Set ORQ_PERF_RAY_LOGS_MB=1024 to measure
+# with 1GB of logs.
+LOGS_MB = int(os.environ.get("ORQ_PERF_RAY_LOGS_MB", "100"))
+FILE_MB = 10
+
+
+def _write_large_ray_temp(ray_temp: Path):
+    logs_dir = ray_temp / "session_large" / "logs"
+    logs_dir.mkdir(parents=True)
+    timestamp = datetime(2023, 2, 9, tzinfo=timezone.utc)
+    for file_i in range(LOGS_MB // FILE_MB):
+        lines = []
+        size = 0
+        run_i = 0
+        while size < FILE_MB * 2**20:
+            wf_run_id = f"wf.{file_i}.{run_i}"
+            block = [f":task_name:{wf_run_id}"]
+            block.extend(
+                f"2023-02-09 12:00:00,000\tINFO worker.py:{i} -- {wf_run_id}"
+                for i in range(5)
+            )
+            block.extend(
+                _ray_logs.WFLog(
+                    timestamp=timestamp,
+                    level="INFO",
+                    filename="tasks.py:42",
+                    message=f"step {i}",
+                    wf_run_id=wf_run_id,
+                    task_inv_id="invocation-0-task-step",
+                    task_run_id=f"{wf_run_id}@invocation-0-task-step",
+                ).json()
+                for i in range(5)
+            )
+            lines.extend(block)
+            size += sum(len(line) + 1 for line in block)
+            run_i += 1
+        (logs_dir / f"worker-{file_i}.err").write_text("\n".join(lines) + "\n")
+
+
+def _parse_without_prefilter(raw_line: bytes):
+    # What parse_log_line() used to do for every line.
+    try:
+        json_obj = json.loads(raw_line.decode("utf-8", "replace").rstrip("\r\n"))
+    except ValueError:
+        return None
+    if not isinstance(json_obj, dict):
+        return None
+    try:
+        return _ray_logs.WFLog.parse_obj(json_obj)
+    except pydantic.ValidationError:
+        return None
+
+
+def _time_scan(ray_temp: Path, parse) -> t.Tuple[float, int]:
+    start = time.perf_counter()
+    n_found = sum(
+        1
+        for line in _ray_logs._iter_log_lines(_ray_logs._iter_log_paths(ray_temp))
+        if (log := parse(line)) is not None and log.wf_run_id == "wf.0.0"
+    )
+    return time.perf_counter() - start, n_found
+
+
+@pytest.mark.expect_under(1800)
+def test_prefilter(tmp_path: Path):
+    # Given
+    ray_temp = tmp_path / "ray_temp"
+    _write_large_ray_temp(ray_temp)
+
+    # When
+    full_time, full_found = _time_scan(ray_temp, _parse_without_prefilter)
+    prefiltered_time, prefiltered_found = _time_scan(
+        ray_temp, lambda line: _ray_logs.parse_log_line(line, "wf.0.0")
+    )
+    raw_time, raw_found = _time_scan(ray_temp, _ray_logs.parse_raw_log)
+
+    # Then
+    print(
+        f"Scanning {LOGS_MB}MB of logs for a workflow run: json.loads and pydantic "
+        f"for every line {full_time:.1f}s, with the prefilter {prefiltered_time:.1f}s; "
+        f"RawLog for every line (used for indexing) {raw_time:.1f}s"
+    )
+    assert full_found == prefiltered_found == raw_found == 5
+    assert prefiltered_time < full_time / 2
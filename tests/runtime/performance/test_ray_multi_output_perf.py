@@ -0,0 +1,100 @@
+################################################################################
+# © Copyright 2023 Zapata Computing Inc.
+################################################################################
+"""
+Measures storing the result of a Ray task with multiple outputs, with the whole
+returned value serialized next to its parts and put together from the parts.
+
+Ray's workflow storage keeps the pickled TaskResult of each task. Outputs
+serialized as JSON are put together from the parts. Pickled outputs are stored
+once, inside the pickled whole value, and are taken out of it when read.
+"""
+import random
+import time
+import typing as t
+
+import cloudpickle  # type: ignore
+import numpy as np
+import pytest
+
+from orquestra.sdk._base import serde
+from orquestra.sdk._ray import _build_workflow
+from orquestra.sdk.schema import ir
+
+MB = 1024 * 1024
+# Number of floats in each output.
+OUTPUT_LEN = 1_000_000
+N_OUTPUTS = 2
+
+
+def _serialized_twice(value) -> _build_workflow.TaskResult:
+    # What tasks with multiple outputs used to return.
+    return _build_workflow.TaskResult(
+        packed=serde.result_from_artifact(value, ir.ArtifactFormat.AUTO),
+        unpacked=tuple(
+            serde.result_from_artifact(v, ir.ArtifactFormat.AUTO) for v in value
+        ),
+    )
+
+
+def _put_together(value) -> _build_workflow.TaskResult:
+    unpacked = tuple(
+        serde.result_from_artifact(v, ir.ArtifactFormat.AUTO) for v in value
+    )
+    packed = _build_workflow._pack_outputs(value, unpacked)
+    assert packed is not None
+    return _build_workflow.TaskResult(packed=packed, unpacked=unpacked)
+
+
+def _store(make_result, value) -> t.Tuple[_build_workflow.TaskResult, float, int]:
+    start = time.perf_counter()
+    result = make_result(value)
+    stored = cloudpickle.dumps(result)
+    return result, time.perf_counter() - start, len(stored)
+
+
+@pytest.mark.expect_under(60)
+def test_task_with_multiple_json_outputs():
+    # Given
+    value = tuple(
+        [random.random() for _ in range(OUTPUT_LEN)] for _ in range(N_OUTPUTS)
+    )
+
+    # When
+    old_result, old_time, old_size = _store(_serialized_twice, value)
+    new_result, new_time, new_size = _store(_put_together, value)
+
+    # Then
+    print(
+        f"Task returning {N_OUTPUTS} lists of {OUTPUT_LEN} floats: serialized "
+        f"twice {old_time:.2f}s, {old_size / MB:.0f}MB stored; put together from "
+        f"parts {new_time:.2f}s, {new_size / MB:.0f}MB stored"
+    )
+    assert new_size < old_size * 0.6
+    packed = _build_workflow.packed_output(new_result)
+    assert packed == old_result.packed
+
+
+@pytest.mark.expect_under(60)
+def test_task_with_multiple_pickled_outputs():
+    # Given
+    value = tuple(np.random.rand(OUTPUT_LEN) for _ in range(N_OUTPUTS))
+
+    # When
+    old_result, old_time, old_size = _store(_serialized_twice, value)
+    new_result, new_time, new_size = _store(
+        lambda v: _build_workflow._serialize_outputs(
+            v, N_OUTPUTS, ir.ArtifactFormat.AUTO, False
+        ),
+        value,
+    )
+
+    # Then
+    print(
+        f"Task returning {N_OUTPUTS} arrays of {OUTPUT_LEN} floats: serialized "
+        f"twice {old_time:.2f}s, {old_size / MB:.0f}MB stored; stored once "
+        f"{new_time:.2f}s, {new_size / MB:.0f}MB stored"
+    )
+    assert new_size < old_size * 0.6
+    for i, output in enumerate(new_result.unpacked):
+        np.testing.assert_array_equal(_build_workflow._output_value(output), value[i])
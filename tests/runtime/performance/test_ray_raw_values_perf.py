@@ -0,0 +1,92 @@
+################################################################################
+# © Copyright 2023 Zapata Computing Inc.
+################################################################################
+"""
+Measures a chain of Ray tasks passing a large NumPy array, with outputs serialized
+by each task and passed as raw values.
+
+The array is sized so that the serialized chain still fits in the memory of a
+small machine.
+"""
+import time
+import typing as t
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+import orquestra.sdk as sdk
+from orquestra.sdk._ray import _client, _dag
+from orquestra.sdk.schema import configs
+from orquestra.sdk.schema.workflow_run import State
+
+MB = 1024 * 1024
+ARRAY_SIZE = 200 * MB
+CHAIN_LENGTH = 3
+
+
+@sdk.task
+def make_array(size: int):
+    return np.ones(size // 8)
+
+
+@sdk.task
+def scale(array):
+    return array * 2
+
+
+@sdk.task
+def total(array):
+    return float(array.sum())
+
+
+@sdk.workflow
+def chain():
+    array = make_array(ARRAY_SIZE)
+    for _ in range(CHAIN_LENGTH):
+        array = scale(array)
+    return [total(array)]
+
+
+def _run(runtime: _dag.RayRuntime) -> t.Tuple[float, t.Sequence[t.Any]]:
+    start = time.perf_counter()
+    wf_run_id = runtime.create_workflow_run(chain().model, project=None)
+    outputs: t.Sequence[t.Any] = ()
+    while not outputs:
+        state = runtime.get_workflow_run_status(wf_run_id).status.state
+        assert state in (State.WAITING, State.RUNNING, State.SUCCEEDED)
+        if state == State.SUCCEEDED:
+            outputs = runtime.get_workflow_run_outputs_non_blocking(wf_run_id)
+        else:
+            time.sleep(0.1)
+    return time.perf_counter() - start, outputs
+
+
+@pytest.mark.expect_under(600)
+@pytest.mark.filterwarnings("ignore::pytest.PytestUnraisableExceptionWarning")
+def test_chain_passing_large_array(
+    ray_storage_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    # Given
+    runtime = _dag.RayRuntime(
+        client=_client.RayClient(),
+        config=configs.RuntimeConfiguration(
+            config_name="perf", runtime_name=configs.RuntimeName.RAY_LOCAL
+        ),
+        project_dir=Path.cwd(),
+    )
+
+    # When
+    serialized_time, serialized_outputs = _run(runtime)
+    monkeypatch.setenv("ORQ_RAY_PASS_RAW_VALUES", "1")
+    raw_time, raw_outputs = _run(runtime)
+
+    # Then
+    print(
+        f"Chain of {CHAIN_LENGTH + 2} tasks passing a {ARRAY_SIZE / MB:.0f}MB array: "
+        f"serialized outputs {serialized_time:.1f}s, raw values {raw_time:.1f}s"
+    )
+    expected = str(float(ARRAY_SIZE // 8 * 2**CHAIN_LENGTH))
+    assert [o.value for o in serialized_outputs] == [expected]
+    assert [o.value for o in raw_outputs] == [expected]
+    assert raw_time < serialized_time
@@ -0,0 +1,107 @@
+################################################################################
+# © Copyright 2023 Zapata Computing Inc.
+################################################################################
+"""
+Measures polling the status of a large workflow run on Ray.
+
+Ray is stood in for by a mocked client that decodes the run's metadata from JSON on
+every call, like Ray does when reading it from its storage.
+"""
+import json
+import time
+import typing as t
+from collections import OrderedDict
+from unittest.mock import create_autospec
+
+import pytest
+
+import orquestra.sdk as sdk
+from orquestra.sdk._base._config import RuntimeConfiguration, RuntimeName
+from orquestra.sdk._ray import _client, _dag
+from orquestra.sdk._ray._wf_def_store import WorkflowDefStore
+from orquestra.sdk._ray._wf_metadata import WfUserMetadata, pydatic_to_json_dict
+from orquestra.sdk.schema import ir
+
+N_TASKS = 5000
+N_POLLS = 10
+WF_RUN_ID = "wf.perf.1"
+
+
+@sdk.task
+def add(a, b):
+    return a + b
+
+
+@sdk.workflow
+def wide():
+    return [add(i, 1) for i in range(N_TASKS)]
+
+
+def _metadata_json(wf_def: ir.WorkflowDef, user_metadata: WfUserMetadata) -> str:
+    wf_meta = {"user_metadata": pydatic_to_json_dict(user_metadata), "stats": {}}
+    task_metas = {
+        inv_id: {
+            "user_metadata": {
+                "task_run_id": f"{WF_RUN_ID}@{inv_id}",
+                "task_invocation_id": inv_id,
+            },
+            "stats": {"start_time": time.time()},
+        }
+        for inv_id in wf_def.task_invocations
+    }
+    return json.dumps([wf_meta, task_metas])
+
+
+def _runtime(tmp_path, metadata_json: str, storage: t.Dict[str, bytes]):
+    client = create_autospec(_dag.RayClient)
+    client.get_workflow_status.return_value = _client.WorkflowStatus.RUNNING
+    client.get_workflow_runs_metadata.side_effect = lambda ids: {
+        WF_RUN_ID: tuple(json.loads(metadata_json))
+    }
+    client.put_storage_blob.side_effect = storage.__setitem__
+    client.get_storage_blob.side_effect = storage.get
+    config = RuntimeConfiguration(
+        config_name="perf", runtime_name=RuntimeName.RAY_LOCAL, runtime_options={}
+    )
+    return _dag.RayRuntime(client=client, config=config, project_dir=tmp_path)
+
+
+def _measure(runtime) -> float:
+    start = time.perf_counter()
+    for _ in range(N_POLLS):
+        wf_run = runtime.get_workflow_run_status(WF_RUN_ID)
+    elapsed = (time.perf_counter() - start) / N_POLLS
+    assert len(wf_run.task_runs) == N_TASKS
+    return elapsed
+
+
+@pytest.mark.expect_under(120)
+def test_status_of_large_run(tmp_path, monkeypatch):
+    # Given
+    monkeypatch.setattr(WorkflowDefStore, "_parsed", OrderedDict())
+    wf_def = wide().model
+    storage: t.Dict[str, bytes] = {}
+    submitting_client = create_autospec(_dag.RayClient)
+    submitting_client.put_storage_blob.side_effect = storage.__setitem__
+    def_hash = WorkflowDefStore(submitting_client).put(wf_def)
+    # Status is usually polled from another process than the one that submitted.
+    WorkflowDefStore._parsed.clear()
+    inline_runtime = _runtime(
+        tmp_path, _metadata_json(wf_def, WfUserMetadata(workflow_def=wf_def)), storage
+    )
+    hashed_runtime = _runtime(
+        tmp_path,
+        _metadata_json(wf_def, WfUserMetadata(workflow_def_hash=def_hash)),
+        storage,
+    )
+
+    # When
+    inline_time = _measure(inline_runtime)
+    hashed_time = _measure(hashed_runtime)
+
+    # Then
+    print(
+        f"Status of a {N_TASKS}-task run: definition in metadata "
+        f"{inline_time * 1000:.0f}ms, hash in metadata {hashed_time * 1000:.0f}ms"
+    )
+    assert hashed_time < inline_time / 2
@@ -0,0 +1,83 @@
+################################################################################
+# © Copyright 2023 Zapata Computing Inc.
+################################################################################
+"""
+Measures building the IR of very wide and very deep workflows.
+"""
+import time
+import tracemalloc
+import typing as t
+
+import pytest
+
+import orquestra.sdk as sdk
+from orquestra.sdk._base import _traversal
+
+MB = 1024 * 1024
+
+
+@sdk.task
+def make_root():
+    return 0
+
+
+@sdk.task
+def add(a, b):
+    return a + b
+
+
+@sdk.workflow
+def wide(n_invocations: int):
+    root = make_root()
+    return [add(root, i) for i in range(n_invocations)]
+
+
+@sdk.workflow
+def deep(n_invocations: int):
+    value = make_root()
+    for _ in range(n_invocations):
+        value = add(value, 1)
+    return [value]
+
+
+def _measure(wf_def) -> t.Tuple[float, int]:
+    futures = _traversal.extract_root_futures(wf_def)
+
+    start = time.perf_counter()
+    model = _traversal.flatten_graph(wf_def, futures)
+    elapsed = time.perf_counter() - start
+    del model
+
+    tracemalloc.start()
+    try:
+        _ = _traversal.flatten_graph(wf_def, futures)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return elapsed, peak
+
+
+@pytest.mark.expect_under(300)
+@pytest.mark.parametrize(
+    "workflow,n_invocations",
+    [
+        (wide, 100_000),
+        (deep, 10_000),
+    ],
+)
+def test_traversal(workflow, n_invocations: int):
+    # When
+    small_time, small_peak = _measure(workflow(n_invocations // 10))
+    elapsed, peak = _measure(workflow(n_invocations))
+
+    # Then
+    print(
+        f"{workflow.__name__} workflow with {n_invocations} invocations: "
+        f"{elapsed:.1f}s, peak {peak / MB:.0f}MB; with {n_invocations // 10} "
+        f"invocations: {small_time:.2f}s, peak {small_peak / MB:.0f}MB"
+    )
+    # Time and memory grow linearly with the number of invocations. With some slack
+    # for noise.
+    assert elapsed < small_time * 20
+    assert peak < small_peak * 15
@@ -0,0 +1,198 @@
+################################################################################
+# © Copyright 2023 Zapata Computing Inc.
+################################################################################
+"""
+Measures saving workflow runs to the local database with concurrent writers, like
+parallel submissions from one process or many ``orq`` processes at once.
+"""
+import multiprocessing
+import sqlite3
+import time
+import typing as t
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from orquestra import sdk
+from orquestra.sdk._base._db import _db
+from orquestra.sdk._base._testing._example_wfs import my_workflow
+from orquestra.sdk.schema.local_database import StoredWorkflowRun
+
+N_WRITERS = 8
+SUBMITS_PER_WRITER = 50
+# Building the model isn't part of saving a run.
+WF_DEF = my_workflow.model
+
+
+def _stored_run(wf_run_id: str) -> StoredWorkflowRun:
+    return StoredWorkflowRun(
+        workflow_run_id=wf_run_id,
+        config_name="perf",
+        workflow_def=WF_DEF,
+    )
+
+
+def _submit_pooled(db_path: Path, wf_run_id: str):
+    # The DB location is patched by the test.
+    with _db.WorkflowDB.open_db() as db:
+        db.save_workflow_run(_stored_run(wf_run_id))
+
+
+def _submit_fresh_connection(db_path: Path, wf_run_id: str):
+    # What open_db() used to do on every call.
+    db = sqlite3.connect(db_path, isolation_level="EXCLUSIVE", timeout=30)
+    _db._create_workflow_table(db)
+    with _db.WorkflowDB(db) as workflow_db:
+        workflow_db.save_workflow_run(_stored_run(wf_run_id))
+
+
+def _writer(
+    submit: t.Callable[[Path, str], None], db_path: Path, writer_i: int
+) -> float:
+    start = time.perf_counter()
+    for submit_i in range(SUBMITS_PER_WRITER):
+        submit(db_path, f"wf.{writer_i}.{submit_i}")
+    return time.perf_counter() - start
+
+
+def _submits_per_sec(
+    executor: Executor, submit: t.Callable[[Path, str], None], db_path: Path
+) -> float:
+    start = time.perf_counter()
+    futures = [
+        executor.submit(_writer, submit, db_path, writer_i)
+        for writer_i in range(N_WRITERS)
+    ]
+    for future in futures:
+        future.result()
+    elapsed = time.perf_counter() - start
+
+    with _db.WorkflowDB(sqlite3.connect(db_path)) as db:
+        assert len(db.get_workflow_runs_list()) == N_WRITERS * SUBMITS_PER_WRITER
+
+    return N_WRITERS * SUBMITS_PER_WRITER / elapsed
+
+
+def _executor(kind: str) -> Executor:
+    if kind == "threads":
+        return ThreadPoolExecutor(max_workers=N_WRITERS)
+    return ProcessPoolExecutor(
+        max_workers=N_WRITERS, mp_context=multiprocessing.get_context("fork")
+    )
+
+
+@pytest.mark.expect_under(60)
+@pytest.mark.parametrize("kind", ["threads", "processes"])
+def test_concurrent_writers(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, kind: str):
+    # Given
+    # Forked writer processes inherit the patch.
+    monkeypatch.setattr(_db, "_get_default_db_location", lambda: tmp_path / "pooled.db")
+
+    # When
+    with _executor(kind) as executor:
+        fresh = _submits_per_sec(
+            executor, _submit_fresh_connection, tmp_path / "fresh.db"
+        )
+    with _executor(kind) as executor:
+        pooled = _submits_per_sec(executor, _submit_pooled, tmp_path / "pooled.db")
+
+    # Then
+    print(
+        f"{N_WRITERS} writer {kind}: fresh connections {fresh:.0f} submits/s, "
+        f"pooled connections with WAL {pooled:.0f} submits/s"
+    )
+    assert pooled > fresh
+
+
+N_STORED_RUNS = 50_000
+
+
+@pytest.mark.expect_under(60)
+def test_list_many_stored_runs(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    # Given
+    monkeypatch.setattr(_db, "_get_default_db_location", lambda: tmp_path / "list.db")
+    wf_def_json = WF_DEF.json()
+    with _db.WorkflowDB.open_db() as db:
+        with db._db:
+            _db._insert_workflow_runs(
+                db._db,
+                [
+                    (f"wf.{i}", "perf" if i % 2 else "other", wf_def_json, None)
+                    for i in range(N_STORED_RUNS)
+                ],
+            )
+
+    # When
+    start = time.perf_counter()
+    with _db.WorkflowDB.open_db() as db:
+        rows = list(db.iter_workflow_runs(config_name="perf"))
+    run_ids = [row.workflow_run_id for row in rows]
+    elapsed = time.perf_counter() - start
+
+    # Then
+    print(
+        f"Listed {len(run_ids)} of {N_STORED_RUNS} stored runs in "
+        f"{elapsed * 1000:.0f}ms"
+    )
+    assert len(run_ids) == N_STORED_RUNS // 2
+    assert rows[0].get_workflow_def() == WF_DEF
+
+
+N_LARGE_DEFS = 20
+
+
+@sdk.task
+def _echo(value):
+    return value
+
+
+def _large_wf_def(seed: int):
+    # Pickled constants are embedded in the definition as base64 chunks.
+    @sdk.workflow
+    def large_workflow():
+        return _echo(np.arange(seed, seed + 100_000, dtype=np.float64))
+
+    return large_workflow.model
+
+
+def _store_and_read(db_path: Path, wf_defs) -> t.Tuple[int, float]:
+    with _db.WorkflowDB(sqlite3.connect(db_path)) as db:
+        _db._create_workflow_table(db._db)
+        with db._db:
+            _db._insert_workflow_runs(
+                db._db,
+                [
+                    (f"wf.{i}", "perf", wf_def.json(), None)
+                    for i, wf_def in enumerate(wf_defs)
+                ],
+            )
+        db._db.execute("VACUUM")
+        size = db.size()
+
+    start = time.perf_counter()
+    with _db.WorkflowDB(sqlite3.connect(db_path)) as db:
+        for i in range(len(wf_defs)):
+            _ = db.get_workflow_run(f"wf.{i}").workflow_def
+    return size, (time.perf_counter() - start) / len(wf_defs)
+
+
+@pytest.mark.expect_under(60)
+def test_compressed_definitions(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    # Given
+    wf_defs = [_large_wf_def(i) for i in range(N_LARGE_DEFS)]
+
+    # When
+    compressed_size, compressed_read = _store_and_read(tmp_path / "zlib.db", wf_defs)
+    # How version 2 databases stored the definitions.
+    monkeypatch.setattr(_db, "_compress_workflow_def", lambda wf_def_json: wf_def_json)
+    plain_size, plain_read = _store_and_read(tmp_path / "plain.db", wf_defs)
+
+    # Then
+    print(
+        f"{N_LARGE_DEFS} definitions of {len(wf_defs[0].json()) / 2**20:.1f}MB: "
+        f"plain text {plain_size / 2**20:.1f}MB, {plain_read * 1000:.0f}ms per read; "
+        f"zlib {compressed_size / 2**20:.1f}MB, {compressed_read * 1000:.0f}ms per read"
+    )
+    assert compressed_size < plain_size / 2
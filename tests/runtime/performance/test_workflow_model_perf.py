@@ -0,0 +1,64 @@
+################################################################################
+# © Copyright 2023 Zapata Computing Inc.
+################################################################################
+"""
+Measures building the model of an unchanged workflow again, like on each
+``orq wf submit``.
+"""
+import importlib
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+N_INVOCATIONS = 2000
+
+WF_MODULE = """
+import orquestra.sdk as sdk
+
+@sdk.task
+def add(a, b):
+    return a + b
+
+@sdk.workflow
+def wf(n):
+    results = [add(i, i) for i in range(n)]
+    return [add(results[i], results[i + 1]) for i in range(0, n - 1, 2)]
+"""
+
+
+@pytest.mark.expect_under(120)
+def test_model_of_unchanged_workflow(monkeypatch, tmp_path: Path):
+    # Given
+    (tmp_path / "perf_wf_module.py").write_text(WF_MODULE)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.setenv("ORQ_WORKFLOW_MODEL_CACHE_PATH", str(tmp_path / "models"))
+    module = importlib.import_module("perf_wf_module")
+
+    try:
+        # When
+        wf_def = module.wf(N_INVOCATIONS)
+        start = time.perf_counter()
+        built = wf_def.model
+        build_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        memoized = wf_def.model
+        memo_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        from_disk = module.wf(N_INVOCATIONS).model
+        disk_time = time.perf_counter() - start
+    finally:
+        sys.modules.pop("perf_wf_module", None)
+
+    # Then
+    print(
+        f"Model of a workflow with {len(built.task_invocations)} task invocations: "
+        f"built {build_time * 1000:.0f}ms, memoized {memo_time * 1000:.3f}ms, "
+        f"from the on-disk cache {disk_time * 1000:.0f}ms"
+    )
+    assert memoized is built
+    assert from_disk == built
+    assert disk_time < build_time / 2
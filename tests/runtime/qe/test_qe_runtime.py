@@ -7,6 +7,7 @@ import gzip
 import io
 import json
 import tarfile
+import threading
 import typing as t
 from pathlib import Path
 from unittest.mock import MagicMock, Mock, PropertyMock
@@ -16,7 +17,7 @@ import responses
 
 import orquestra.sdk as sdk
 from orquestra.sdk import exceptions
-from orquestra.sdk._base import _db, serde
+from orquestra.sdk._base import _db, _log_follow, serde
 from orquestra.sdk._base._conversions._yaml_exporter import (
     pydantic_to_yaml,
     workflow_to_yaml,
@@ -668,6 +669,37 @@ class TestGetAvailableOutputs:
         assert result["invocation-0-task-make-greeting-message"] == expected_inv_0
 
 
+class TestGetOutputs:
+    def test_downloads_selected_artifacts_only(
+        self, monkeypatch, runtime, mocked_responses
+    ):
+        wf_run_id = "hello-there-abc123-r000"
+        _get_workflow_run = Mock(
+            return_value=StoredWorkflowRun(
+                workflow_run_id=wf_run_id,
+                config_name="hello",
+                workflow_def=TEST_WORKFLOW,
+            )
+        )
+        monkeypatch.setattr(_db.WorkflowDB, "get_workflow_run", _get_workflow_run)
+
+        # Requests for other artifacts would fail because they aren't mocked.
+        expected_inv_1 = _make_pickle_result(artifact_value=("hello", "there"))
+        _mock_artifact_resp(
+            mocked_responses,
+            wf_run_id=wf_run_id,
+            inv_id="invocation-1-task-multi-output-test",
+            art_id="artifact-3-multi-output-test",
+            result_model=expected_inv_1,
+        )
+
+        result = runtime.get_outputs(
+            wf_run_id, ["invocation-1-task-multi-output-test", "not-an-invocation"]
+        )
+
+        assert result == {"invocation-1-task-multi-output-test": expected_inv_1}
+
+
 class TestGetWorkflowRunStatus:
     def test_happy_path(self, monkeypatch, runtime, mocked_responses):
         _get_workflow_run = Mock(
@@ -882,6 +914,59 @@ class TestGetWorkflowRunStatus:
             ),
         )
 
+    class TestFinishedRunsCache:
+        @staticmethod
+        @pytest.fixture
+        def stored_run(runtime):
+            stored_run = StoredWorkflowRun(
+                workflow_run_id="hello-there-abc123-r000",
+                config_name="hello",
+                workflow_def=TEST_WORKFLOW,
+            )
+            with _db.WorkflowDB.open_db() as db:
+                db.save_workflow_run(stored_run)
+            return stored_run
+
+        @staticmethod
+        @pytest.mark.parametrize("response", ["status", "status_terminated"])
+        def test_finished_run_is_fetched_once(
+            runtime, mocked_responses, stored_run, response
+        ):
+            # Given
+            mocked_responses.add(
+                responses.GET,
+                "http://localhost/v1/workflow",
+                json=QE_RESPONSES[response],
+            )
+
+            # When
+            results = [
+                runtime.get_workflow_run_status(stored_run.workflow_run_id)
+                for _ in range(3)
+            ]
+
+            # Then
+            assert results[0] == results[1] == results[2]
+            assert len(mocked_responses.calls) == 1
+
+        @staticmethod
+        def test_unfinished_run_is_fetched_every_time(
+            runtime, mocked_responses, stored_run
+        ):
+            # Given
+            mocked_responses.add(
+                responses.GET,
+                "http://localhost/v1/workflow",
+                json=QE_RESPONSES["status_running"],
+            )
+
+            # When
+            for _ in range(3):
+                _ = runtime.get_workflow_run_status(stored_run.workflow_run_id)
+
+            # Then
+            assert len(mocked_responses.calls) == 3
+
 
 class TestGetWorkflowRunOutputsNonBlocking:
     def test_happy_path(self, monkeypatch, runtime, mocked_responses):
@@ -1066,6 +1151,35 @@ class TestGetWorkflowLogs:
             runtime.get_workflow_logs("notvalidqetask")
 
 
+class TestIterWorkflowLogs:
+    def test_follow_polls_until_finished(self, monkeypatch, runtime):
+        # Given
+        monkeypatch.setattr(_log_follow, "LOGS_POLL_INTERVAL", 0)
+        monkeypatch.setattr(
+            runtime,
+            "get_workflow_logs",
+            Mock(
+                side_effect=[
+                    {"inv1": ["line 1"]},
+                    {"inv1": ["line 1", "line 2"], "inv2": ["line 3"]},
+                ]
+            ),
+        )
+        monkeypatch.setattr(
+            runtime,
+            "get_workflow_run_states",
+            Mock(
+                side_effect=[{"wf.1": State.RUNNING}, {"wf.1": State.SUCCEEDED}],
+            ),
+        )
+
+        # When
+        logs = list(runtime.iter_workflow_logs("wf.1", follow=True))
+
+        # Then
+        assert logs == [("inv1", "line 1"), ("inv1", "line 2"), ("inv2", "line 3")]
+
+
 class TestGetTaskLogs:
     def test_plain_string_logs(self, monkeypatch, runtime, mocked_responses):
         # Given
@@ -1231,34 +1345,18 @@ class TestStopWorkflowRun:
 class TestListWorkflowRuns:
     @pytest.fixture
     def mock_local_db(self, monkeypatch):
-        get_workflow_runs_list = Mock(
+        iter_workflow_runs = Mock(
             return_value=[
-                StoredWorkflowRun(
+                _db.StoredWorkflowRunRow(
                     workflow_run_id="hello-there-abc123-r000",
                     config_name="hello",
-                    workflow_def=TEST_WORKFLOW,
-                ),
-                StoredWorkflowRun(
-                    workflow_run_id="hello-there-abc123-r000",
-                    config_name="hello",
-                    workflow_def=TEST_WORKFLOW,
-                ),
-                StoredWorkflowRun(
-                    workflow_run_id="hello-there-abc123-r000",
-                    config_name="hello",
-                    workflow_def=TEST_WORKFLOW,
-                ),
-                StoredWorkflowRun(
-                    workflow_run_id="hello-there-abc123-r000",
-                    config_name="hello",
-                    workflow_def=TEST_WORKFLOW,
-                ),
+                    _load_workflow_def=lambda: TEST_WORKFLOW,
+                )
+                for _ in range(4)
             ]
         )
-        monkeypatch.setattr(
-            _db.WorkflowDB, "get_workflow_runs_list", get_workflow_runs_list
-        )
-        return get_workflow_runs_list
+        monkeypatch.setattr(_db.WorkflowDB, "iter_workflow_runs", iter_workflow_runs)
+        return iter_workflow_runs
 
     def test_happy_path(
         self, runtime, mock_workflow_db_location, mock_local_db, monkeypatch
@@ -1266,7 +1364,9 @@ class TestListWorkflowRuns:
         # Given
         mock_status = MagicMock()
         monkeypatch.setattr(
-            runtime, "get_workflow_run_status", MagicMock(return_value=mock_status)
+            runtime,
+            "_get_workflow_run_statuses",
+            MagicMock(return_value=[mock_status] * 4),
         )
         # When
         runs = runtime.list_workflow_runs()
@@ -1275,10 +1375,8 @@ class TestListWorkflowRuns:
 
     def test_missing_wf_in_db(self, runtime, mock_workflow_db_location, monkeypatch):
         # Given
-        get_workflow_runs_list = Mock(return_value=[])
-        monkeypatch.setattr(
-            _db.WorkflowDB, "get_workflow_runs_list", get_workflow_runs_list
-        )
+        iter_workflow_runs = Mock(return_value=[])
+        monkeypatch.setattr(_db.WorkflowDB, "iter_workflow_runs", iter_workflow_runs)
         # When
         runs = runtime.list_workflow_runs()
         # Then
@@ -1290,8 +1388,8 @@ class TestListWorkflowRuns:
         # Given
         monkeypatch.setattr(
             runtime,
-            "get_workflow_run_status",
-            MagicMock(side_effect=exceptions.WorkflowRunNotFoundError),
+            "_get_workflow_run_statuses",
+            MagicMock(return_value=[]),
         )
         # When
         runs = runtime.list_workflow_runs()
@@ -1312,7 +1410,9 @@ class TestListWorkflowRuns:
             ]
         )
         monkeypatch.setattr(
-            runtime, "get_workflow_run_status", MagicMock(return_value=mock_status)
+            runtime,
+            "_get_workflow_run_statuses",
+            MagicMock(return_value=[mock_status] * 4),
         )
         # When
         runs = runtime.list_workflow_runs(state=State.RUNNING)
@@ -1336,7 +1436,9 @@ class TestListWorkflowRuns:
             ]
         )
         monkeypatch.setattr(
-            runtime, "get_workflow_run_status", MagicMock(return_value=mock_status)
+            runtime,
+            "_get_workflow_run_statuses",
+            MagicMock(return_value=[mock_status] * 4),
         )
         # When
         runs = runtime.list_workflow_runs(max_age=datetime.timedelta(minutes=2))
@@ -1360,7 +1462,9 @@ class TestListWorkflowRuns:
             ]
         )
         monkeypatch.setattr(
-            runtime, "get_workflow_run_status", MagicMock(return_value=mock_status)
+            runtime,
+            "_get_workflow_run_statuses",
+            MagicMock(return_value=[mock_status] * 4),
         )
         # When
         runs = runtime.list_workflow_runs(limit=2)
@@ -1382,6 +1486,134 @@ class TestListWorkflowRuns:
         with pytest.raises(exceptions.WorkspacesNotSupportedError):
             runtime.list_workflow_runs(**kwargs)
 
+    class TestFanOut:
+        N_RUNS = 4
+
+        @pytest.fixture
+        def stored_runs(self, runtime):
+            stored_runs = [
+                StoredWorkflowRun(
+                    workflow_run_id=f"hello-there-abc123-r00{i}",
+                    config_name="hello",
+                    workflow_def=TEST_WORKFLOW,
+                )
+                for i in range(self.N_RUNS)
+            ]
+            with _db.WorkflowDB.open_db() as db:
+                for stored_run in stored_runs:
+                    db.save_workflow_run(stored_run)
+            return stored_runs
+
+        def test_runs_are_fetched_in_parallel(self, runtime, stored_runs, monkeypatch):
+            # Given
+            # Each request waits until all of them are in flight.
+            barrier = threading.Barrier(self.N_RUNS, timeout=5)
+
+            def _get_workflow(wf_id):
+                barrier.wait()
+                return QE_RESPONSES["status_running"]
+
+            monkeypatch.setattr(runtime._client, "get_workflow", _get_workflow)
+
+            # When
+            runs = runtime.list_workflow_runs()
+
+            # Then
+            assert [run.id for run in runs] == [r.workflow_run_id for r in stored_runs]
+
+        def test_finished_runs_are_fetched_once(
+            self, runtime, stored_runs, monkeypatch
+        ):
+            # Given
+            responses_by_id = {
+                r.workflow_run_id: QE_RESPONSES["status_running"] for r in stored_runs
+            }
+            responses_by_id[stored_runs[0].workflow_run_id] = QE_RESPONSES["status"]
+            get_workflow = Mock(side_effect=lambda wf_id: responses_by_id[wf_id])
+            monkeypatch.setattr(runtime._client, "get_workflow", get_workflow)
+            _ = runtime.list_workflow_runs()
+            get_workflow.reset_mock()
+
+            # When
+            runs = runtime.list_workflow_runs()
+
+            # Then
+            assert [run.id for run in runs] == [r.workflow_run_id for r in stored_runs]
+            assert runs[0].status.state == State.SUCCEEDED
+            fetched_ids = {c.kwargs["wf_id"] for c in get_workflow.call_args_list}
+            assert fetched_ids == {r.workflow_run_id for r in stored_runs[1:]}
+            # Also reused by get_workflow_run_status()
+            assert runtime.get_workflow_run_status(runs[0].id) == runs[0]
+            assert get_workflow.call_count == self.N_RUNS - 1
+
+        def test_finished_runs_defs_arent_parsed_again(
+            self, runtime, stored_runs, monkeypatch
+        ):
+            # Given
+            responses_by_id = {
+                r.workflow_run_id: QE_RESPONSES["status_running"] for r in stored_runs
+            }
+            responses_by_id[stored_runs[0].workflow_run_id] = QE_RESPONSES["status"]
+            monkeypatch.setattr(
+                runtime._client,
+                "get_workflow",
+                lambda wf_id: responses_by_id[wf_id],
+            )
+            _ = runtime.list_workflow_runs()
+            to_stored_workflow_run = Mock(
+                wraps=_db.StoredWorkflowRunRow.to_stored_workflow_run
+            )
+            monkeypatch.setattr(
+                _db.StoredWorkflowRunRow,
+                "to_stored_workflow_run",
+                lambda row: to_stored_workflow_run(row),
+            )
+
+            # When
+            runs = runtime.list_workflow_runs()
+
+            # Then
+            assert runs[0].workflow_def == TEST_WORKFLOW
+            loaded_ids = [
+                c.args[0].workflow_run_id for c in to_stored_workflow_run.call_args_list
+            ]
+            assert loaded_ids == [r.workflow_run_id for r in stored_runs[1:]]
+
+        def test_states(self, runtime, stored_runs, monkeypatch):
+            # Given
+            finished_id = stored_runs[0].workflow_run_id
+            responses_by_id = {
+                r.workflow_run_id: QE_RESPONSES["status_running"] for r in stored_runs
+            }
+            responses_by_id[finished_id] = QE_RESPONSES["status"]
+            monkeypatch.setattr(
+                runtime._client,
+                "get_workflow",
+                lambda wf_id: responses_by_id[wf_id],
+            )
+            _ = runtime.get_workflow_run_status(finished_id)
+            get_workflow = Mock(side_effect=lambda wf_id: responses_by_id[wf_id])
+            monkeypatch.setattr(runtime._client, "get_workflow", get_workflow)
+            run_ids = [r.workflow_run_id for r in stored_runs]
+
+            # When
+            states = runtime.get_workflow_run_states(run_ids)
+
+            # Then
+            assert states == {
+                run_id: State.SUCCEEDED if run_id == finished_id else State.RUNNING
+                for run_id in run_ids
+            }
+            # The finished run is read from the DB
+            fetched_ids = {c.kwargs["wf_id"] for c in get_workflow.call_args_list}
+            assert fetched_ids == set(run_ids[1:])
+
+        def test_invalid_concurrency(self, monkeypatch):
+            monkeypatch.setenv("ORQ_QE_STATUS_FETCH_CONCURRENCY", "many")
+
+            with pytest.raises(exceptions.RuntimeConfigError):
+                _qe_runtime.QERuntime(HELLO_CONFIG, Path("shouldnt_matter"))
+
 
 @pytest.mark.parametrize(
     "error_code, expected_exception, telltales",
@@ -1456,30 +1688,18 @@ class TestHTTPErrors:
         # DB read 1: getting list of stored wf run IDs
         monkeypatch.setattr(
             _db.WorkflowDB,
-            "get_workflow_runs_list",
+            "iter_workflow_runs",
             Mock(
                 return_value=[
-                    StoredWorkflowRun(
+                    _db.StoredWorkflowRunRow(
                         workflow_run_id="hello-there-abc123-r000",
                         config_name="hello",
-                        workflow_def=TEST_WORKFLOW,
+                        _load_workflow_def=lambda: TEST_WORKFLOW,
                     )
                 ]
             ),
         )
-        # DB read 2: get the workflow def from the DB. The current implementation
-        # suffers from the "n+1 Queries Problem" but we don't plan to fix it for QE.
-        monkeypatch.setattr(
-            _db.WorkflowDB,
-            "get_workflow_run",
-            Mock(
-                return_value=StoredWorkflowRun(
-                    workflow_run_id="hello-there-abc123-r000",
-                    config_name="hello",
-                    workflow_def=TEST_WORKFLOW,
-                )
-            ),
-        )
+        # DB read 2: statuses of finished runs. There aren't any.
         mocked_responses.add(
             responses.GET,
             "http://localhost/v1/workflow",
@@ -4,21 +4,25 @@
 """
 Unit tests for RayLogs.
 """
+import shutil
 from datetime import datetime, timezone
 from pathlib import Path
 from unittest.mock import Mock
 
 import pytest
 
-from orquestra.sdk._ray import _ray_logs
+from orquestra.sdk._ray import _ray_log_index, _ray_logs
+
+WF_RUN_ID = "wf.orquestra_basic_demo.3fcba90"
+TASK_INV_ID = "invocation-0-task-generate-data"
 
 INFO_LOG = _ray_logs.WFLog(
     timestamp=datetime(2023, 2, 9, 11, 26, 7, 98413, tzinfo=timezone.utc),
     level="INFO",
     filename="_log_adapter.py:184",
     message="hello there!",
-    wf_run_id="wf.orquestra_basic_demo.3fcba90",
-    task_inv_id="invocation-0-task-generate-data",
+    wf_run_id=WF_RUN_ID,
+    task_inv_id=TASK_INV_ID,
     task_run_id="wf.orquestra_basic_demo.3fcba90@invocation-0-task-generate-data.d0751",
 )
 
@@ -28,8 +32,8 @@ ERROR_LOG = _ray_logs.WFLog(
     level="ERROR",
     filename="_dag.py:196",
     message='Traceback (most recent call last):\n  File "/Users/alex/Code/zapata/evangelism-workflows/vendor/orquestra-workflow-sdk/src/orquestra/sdk/_ray/_dag.py", line 193, in _ray_remote\n    return wrapped(*inner_args, **inner_kwargs)\n  File "/Users/alex/Code/zapata/evangelism-workflows/vendor/orquestra-workflow-sdk/src/orquestra/sdk/_ray/_dag.py", line 148, in __call__\n    return self._fn(*unpacked_args, **unpacked_kwargs)\n  File "/Users/alex/Code/zapata/evangelism-workflows/demos/basic/tasks.py", line 42, in generate_data\n    foo = 1 / 0\nZeroDivisionError: division by zero\n',  # noqa: E501
-    wf_run_id="wf.orquestra_basic_demo.3fcba90",
-    task_inv_id="invocation-0-task-generate-data",
+    wf_run_id=WF_RUN_ID,
+    task_inv_id=TASK_INV_ID,
     task_run_id="wf.orquestra_basic_demo.3fcba90@invocation-0-task-generate-data.d0751",
 )
 
@@ -162,6 +166,54 @@ class TestParseLogLine:
         assert parsed == expected
 
 
+class TestParseRawLog:
+    @staticmethod
+    def test_ids_without_validation():
+        # Given
+        raw_line = b'{"wf_run_id": "wf.1", "task_inv_id": "inv", "message": 42}\n'
+
+        # When
+        raw_log = _ray_logs.parse_raw_log(raw_line)
+
+        # Then
+        assert raw_log is not None
+        assert (raw_log.wf_run_id, raw_log.task_inv_id) == ("wf.1", "inv")
+        # The line isn't a valid WFLog.
+        assert raw_log.to_model() is None
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "raw_line",
+        [
+            b":task_name:create_ray_workflow\n",
+            b"2023-01-31 12:44:48,991\tINFO workflow_executor.py:86 -- wf.1\n",
+            b'{"wf_run_id": "wf.2", "task_inv_id": "inv"}\n',
+        ],
+    )
+    def test_rejects_before_decoding(monkeypatch, raw_line: bytes):
+        # Given
+        loads = Mock()
+        monkeypatch.setattr(_ray_logs.json, "loads", loads)
+
+        # When
+        raw_log = _ray_logs.parse_raw_log(raw_line, wf_run_id="wf.1")
+
+        # Then
+        assert raw_log is None
+        loads.assert_not_called()
+
+    @staticmethod
+    def test_matching_wf_run_id():
+        # Given
+        raw_line = INFO_LOG.json().encode()
+
+        # When
+        parsed = _ray_logs.parse_log_line(raw_line, wf_run_id=INFO_LOG.wf_run_id)
+
+        # Then
+        assert parsed == INFO_LOG
+
+
 class TestIterLogPaths:
     """
     Test boundary::
@@ -397,3 +449,204 @@ class TestDirectRayReader:
 
             # Then
             assert result_logs == expected
+
+
+def _log_line(message: str, wf_run_id: str = "wf.1", task_inv_id="inv1") -> bytes:
+    return (
+        _ray_logs.WFLog(
+            timestamp=SAMPLE_TIMESTAMP,
+            level="INFO",
+            filename="_log_adapter.py:138",
+            message=message,
+            wf_run_id=wf_run_id,
+            task_inv_id=task_inv_id,
+            task_run_id=f"{wf_run_id}@{task_inv_id}",
+        ).json()
+        + "\n"
+    ).encode()
+
+
+class TestLogIndex:
+    """
+    Test boundary::
+        [FS]->[LogIndex]
+    """
+
+    @staticmethod
+    @pytest.fixture
+    def ray_temp(tmp_path: Path) -> Path:
+        ray_temp = tmp_path / "ray_temp"
+        shutil.copytree(TEST_RAY_TEMP_PATH, ray_temp, symlinks=True)
+        return ray_temp
+
+    @staticmethod
+    @pytest.fixture
+    def index(tmp_path: Path) -> _ray_log_index.LogIndex:
+        return _ray_log_index.LogIndex(tmp_path / "index.db")
+
+    @staticmethod
+    def _read(index, wf_run_id, task_inv_id=None):
+        lines = _ray_log_index.read_ranges(index.find(wf_run_id, task_inv_id))
+        return [_ray_logs.parse_log_line(line) for line in lines]
+
+    def test_with_real_files(self, ray_temp: Path, index):
+        # When
+        index.update(_ray_logs._iter_log_paths(ray_temp))
+
+        # Then
+        wf_run_id = INFO_LOG.wf_run_id
+        assert self._read(index, wf_run_id) == [INFO_LOG, ERROR_LOG]
+        assert self._read(index, wf_run_id, INFO_LOG.task_inv_id) == [
+            INFO_LOG,
+            ERROR_LOG,
+        ]
+        assert self._read(index, wf_run_id, "other-inv") == []
+        # Consecutive lines of the same task are kept as a single range.
+        assert len(index.find(wf_run_id)) == 1
+
+    def test_reads_only_appended_lines(
+        self, ray_temp: Path, index, monkeypatch: pytest.MonkeyPatch
+    ):
+        # Given
+        log_path = ray_temp / "session_latest" / "logs" / "worker2.err"
+        index.update(_ray_logs._iter_log_paths(ray_temp))
+        parse_raw_log = Mock(wraps=_ray_logs.parse_raw_log)
+        monkeypatch.setattr(_ray_logs, "parse_raw_log", parse_raw_log)
+
+        # When
+        with log_path.open("ab") as f:
+            f.write(_log_line("hello") + _log_line("other", task_inv_id="inv2"))
+        index.update(_ray_logs._iter_log_paths(ray_temp))
+
+        # Then
+        assert parse_raw_log.call_count == 2
+        assert [log.message for log in self._read(index, "wf.1")] == [
+            "hello",
+            "other",
+        ]
+        assert [log.message for log in self._read(index, "wf.1", "inv2")] == ["other"]
+
+    def test_incomplete_line_is_indexed_later(self, ray_temp: Path, index):
+        # Given
+        log_path = ray_temp / "session_latest" / "logs" / "worker2.err"
+        line = _log_line("hello")
+        with log_path.open("ab") as f:
+            f.write(line[:10])
+
+        # When
+        index.update(_ray_logs._iter_log_paths(ray_temp))
+        found_before = self._read(index, "wf.1")
+        with log_path.open("ab") as f:
+            f.write(line[10:])
+        index.update(_ray_logs._iter_log_paths(ray_temp))
+
+        # Then
+        assert found_before == []
+        assert [log.message for log in self._read(index, "wf.1")] == ["hello"]
+
+    def test_replaced_and_removed_files(self, ray_temp: Path, index):
+        # Given
+        logs_dir = ray_temp / "session_latest" / "logs"
+        (logs_dir / "worker1.err").write_bytes(_log_line("first"))
+        index.update(_ray_logs._iter_log_paths(ray_temp))
+
+        # When
+        (logs_dir / "worker1.err").unlink()
+        (logs_dir / "worker1.err").write_bytes(_log_line("second"))
+        (logs_dir / "worker3.err").unlink()
+        index.update(_ray_logs._iter_log_paths(ray_temp))
+
+        # Then
+        assert [log.message for log in self._read(index, "wf.1")] == ["second"]
+        assert index.find(INFO_LOG.wf_run_id) == []
+
+
+class TestDirectRayReaderWithIndex:
+    """
+    Test boundary::
+        [FS]->[DirectRayReader]
+    """
+
+    @staticmethod
+    def test_index_in_ray_temp(tmp_path: Path):
+        # Given
+        ray_temp = tmp_path / "ray_temp"
+        shutil.copytree(TEST_RAY_TEMP_PATH, ray_temp, symlinks=True)
+        reader = _ray_logs.DirectRayReader(ray_temp)
+
+        # When
+        logs = reader.get_workflow_logs(WF_RUN_ID)
+
+        # Then
+        assert logs == {INFO_LOG.task_inv_id: [INFO_LOG.json(), ERROR_LOG.json()]}
+        assert (ray_temp / _ray_log_index.INDEX_FILE_NAME).exists()
+
+    @staticmethod
+    def test_falls_back_without_index(tmp_path: Path):
+        # Given
+        reader = _ray_logs.DirectRayReader(
+            TEST_RAY_TEMP_PATH, index_path=tmp_path / "missing" / "index.db"
+        )
+
+        # When
+        logs = reader.get_task_logs(WF_RUN_ID, TASK_INV_ID)
+
+        # Then
+        assert logs == [INFO_LOG.json(), ERROR_LOG.json()]
+
+    class TestIterWorkflowLogs:
+        @staticmethod
+        @pytest.fixture
+        def ray_temp(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+            monkeypatch.setattr(_ray_logs, "FOLLOW_POLL_INTERVAL", 0)
+            ray_temp = tmp_path / "ray_temp"
+            shutil.copytree(TEST_RAY_TEMP_PATH, ray_temp, symlinks=True)
+            return ray_temp
+
+        @staticmethod
+        def test_same_lines_as_get_workflow_logs(ray_temp: Path):
+            # Given
+            reader = _ray_logs.DirectRayReader(ray_temp)
+
+            # When
+            lines = list(reader.iter_workflow_logs(WF_RUN_ID))
+
+            # Then
+            assert lines == [
+                (INFO_LOG.task_inv_id, INFO_LOG.json()),
+                (ERROR_LOG.task_inv_id, ERROR_LOG.json()),
+            ]
+
+        @staticmethod
+        @pytest.mark.parametrize("use_index", [True, False])
+        def test_follow(ray_temp: Path, tmp_path: Path, use_index: bool):
+            # Given
+            log_path = ray_temp / "session_latest" / "logs" / "worker2.err"
+            with log_path.open("ab") as f:
+                f.write(_log_line("first"))
+            index_path = (
+                tmp_path / "index.db" if use_index else tmp_path / "missing" / "x.db"
+            )
+            reader = _ray_logs.DirectRayReader(ray_temp, index_path=index_path)
+
+            def _write_lines():
+                # Appends another line on every read. The workflow run finishes
+                # after the second one.
+                with log_path.open("ab") as f:
+                    f.write(_log_line(f"line {until.call_count}", task_inv_id="inv2"))
+                return until.call_count >= 2
+
+            until = Mock(side_effect=_write_lines)
+
+            # When
+            lines = reader.iter_workflow_logs("wf.1", follow=True, until=until)
+
+            # Then
+            first = next(lines)
+            assert until.call_count == 0
+            rest = list(lines)
+            assert [
+                (inv_id, _ray_logs.WFLog.parse_raw(line).message)
+                for inv_id, line in [first, *rest]
+            ] == [("inv1", "first"), ("inv2", "line 1"), ("inv2", "line 2")]
+            assert until.call_count == 2
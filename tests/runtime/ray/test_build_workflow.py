@@ -2,19 +2,138 @@
 # © Copyright 2023 Zapata Computing Inc.
 ################################################################################
 
+import json
+import os
+import sys
+from pathlib import Path
 from typing import Dict, Optional, Union
 from unittest.mock import ANY, Mock, call, create_autospec
 
+import cloudpickle  # type: ignore
+import numpy as np
 import pytest
 
+import orquestra.sdk as sdk
+from orquestra.sdk._base import serde
 from orquestra.sdk._base._testing._example_wfs import (
     workflow_parametrised_with_resources,
 )
-from orquestra.sdk._ray import _build_workflow
+from orquestra.sdk._ray import _build_workflow, _client
 from orquestra.sdk.schema import ir
 from orquestra.sdk.schema.responses import WorkflowResult
 
 
+class TestLocateUserFn:
+    MODULE_NAME = "_orq_test_locate_user_fn_tasks"
+
+    @pytest.fixture
+    def project_dir(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+        monkeypatch.syspath_prepend(str(tmp_path))
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setattr(
+            _build_workflow, "_user_fns", _build_workflow._UserFnCache()
+        )
+        yield tmp_path
+        sys.modules.pop(self.MODULE_NAME, None)
+
+    @staticmethod
+    def _write_tasks(path: Path, return_value: str):
+        path.write_text(
+            "import orquestra.sdk as sdk\n"
+            "LOADED = object()\n"
+            "@sdk.task\n"
+            f"def get():\n    return {return_value!r}\n"
+        )
+
+    @pytest.fixture
+    def module_ref(self, project_dir: Path):
+        self._write_tasks(project_dir / f"{self.MODULE_NAME}.py", "first")
+        return ir.ModuleFunctionRef(
+            module=self.MODULE_NAME,
+            function_name="get",
+            file_path=f"{self.MODULE_NAME}.py",
+            type="MODULE_FUNCTION_REF",
+        )
+
+    @pytest.fixture
+    def file_ref(self, project_dir: Path):
+        self._write_tasks(project_dir / "file_tasks.py", "first")
+        return ir.FileFunctionRef(
+            file_path="file_tasks.py", function_name="get", type="FILE_FUNCTION_REF"
+        )
+
+    @pytest.mark.parametrize("fn_ref_fixture", ["module_ref", "file_ref"])
+    def test_located_once(self, project_dir: Path, fn_ref_fixture, request):
+        # Given
+        fn_ref = request.getfixturevalue(fn_ref_fixture)
+
+        # When
+        fns = [_build_workflow._locate_user_fn(fn_ref, project_dir) for _ in range(3)]
+
+        # Then
+        assert fns[0]() == "first"
+        # The module wasn't executed again.
+        assert fns[0] is fns[1] is fns[2]
+        assert fns[0].__globals__["LOADED"] is fns[2].__globals__["LOADED"]
+
+    @pytest.mark.parametrize(
+        "fn_ref_fixture,file_name",
+        [("module_ref", f"{MODULE_NAME}.py"), ("file_ref", "file_tasks.py")],
+    )
+    def test_located_again_after_change(
+        self, project_dir: Path, fn_ref_fixture, file_name, request
+    ):
+        # Given
+        fn_ref = request.getfixturevalue(fn_ref_fixture)
+        _ = _build_workflow._locate_user_fn(fn_ref, project_dir)
+        self._write_tasks(project_dir / file_name, "second")
+        # Make sure the modification time changes, even on coarse-grained filesystems.
+        stat = os.stat(project_dir / file_name)
+        os.utime(
+            project_dir / file_name, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9)
+        )
+
+        # When
+        fn = _build_workflow._locate_user_fn(fn_ref, project_dir)
+
+        # Then
+        assert fn() == "second"
+
+    def test_located_again_after_reload_elsewhere(self, project_dir: Path, module_ref):
+        # Given
+        fn = _build_workflow._locate_user_fn(module_ref, project_dir)
+        # Another project's module with the same name.
+        other_dir = project_dir / "other"
+        other_dir.mkdir()
+        self._write_tasks(other_dir / f"{self.MODULE_NAME}.py", "other")
+        sys.path.insert(0, str(other_dir))
+        try:
+            assert _build_workflow._locate_user_fn(module_ref, other_dir)() == "other"
+        finally:
+            sys.path.remove(str(other_dir))
+
+        # When
+        fn = _build_workflow._locate_user_fn(module_ref, project_dir)
+
+        # Then
+        assert fn() == "first"
+
+    def test_inline_fn(self):
+        # Given
+        fn_ref = ir.InlineFunctionRef(
+            function_name="get",
+            encoded_function=serde.serialize_pickle(lambda: "inline"),
+            type="INLINE_FUNCTION_REF",
+        )
+
+        # When
+        fns = [_build_workflow._locate_user_fn(fn_ref, None) for _ in range(2)]
+
+        # Then
+        assert fns[0]() == "inline"
+        assert fns[0] is fns[1]
+
+
 class TestPipString:
     class TestPythonImports:
         def test_empty(self):
@@ -257,6 +376,310 @@ class TestResourcesInMakeDag:
             )
 
 
+class TestArtifactFormatInMakeDag:
+    @pytest.fixture
+    def make_node(self, monkeypatch: pytest.MonkeyPatch):
+        make_node = create_autospec(_build_workflow._make_ray_dag_node)
+        monkeypatch.setattr(_build_workflow, "_make_ray_dag_node", make_node)
+        return make_node
+
+    @staticmethod
+    def _user_task_formats(make_node: Mock):
+        return [
+            node_call.kwargs["artifact_format"]
+            for node_call in make_node.call_args_list
+            if node_call.kwargs["user_fn_ref"] is not None
+        ]
+
+    def test_with_env_set(self, make_node: Mock, monkeypatch: pytest.MonkeyPatch):
+        # Given
+        monkeypatch.setenv("ORQ_RAY_RAW_PICKLE5_ARTIFACTS", "1")
+        client = create_autospec(_build_workflow.RayClient)
+        workflow = workflow_parametrised_with_resources().model
+
+        # When
+        _ = _build_workflow.make_ray_dag(client, workflow, "mocked_wf_run_id", None)
+
+        # Then
+        formats = self._user_task_formats(make_node)
+        assert formats == [ir.ArtifactFormat.RAW_PICKLE5]
+
+    def test_with_env_not_set(self, make_node: Mock):
+        # Given
+        client = create_autospec(_build_workflow.RayClient)
+        workflow = workflow_parametrised_with_resources().model
+
+        # When
+        _ = _build_workflow.make_ray_dag(client, workflow, "mocked_wf_run_id", None)
+
+        # Then
+        formats = self._user_task_formats(make_node)
+        assert formats == [ir.ArtifactFormat.AUTO]
+
+
+@sdk.task
+def _add(a, b):
+    return a + b
+
+
+@sdk.workflow
+def _wf_with_shared_constant():
+    big = list(range(20000))
+    return [_add(big, [i]) for i in range(3)]
+
+
+class TestPassRawValuesInMakeDag:
+    @pytest.fixture
+    def make_node(self, monkeypatch: pytest.MonkeyPatch):
+        make_node = create_autospec(_build_workflow._make_ray_dag_node)
+        monkeypatch.setattr(_build_workflow, "_make_ray_dag_node", make_node)
+        return make_node
+
+    @pytest.mark.parametrize("env_value,expected", [("1", True), (None, False)])
+    def test_env(
+        self, make_node: Mock, monkeypatch: pytest.MonkeyPatch, env_value, expected
+    ):
+        # Given
+        if env_value is not None:
+            monkeypatch.setenv("ORQ_RAY_PASS_RAW_VALUES", env_value)
+        client = create_autospec(_build_workflow.RayClient)
+        workflow = workflow_parametrised_with_resources().model
+
+        # When
+        _ = _build_workflow.make_ray_dag(client, workflow, "mocked_wf_run_id", None)
+
+        # Then
+        user_task_calls = [
+            node_call
+            for node_call in make_node.call_args_list
+            if node_call.kwargs["user_fn_ref"] is not None
+        ]
+        assert [c.kwargs["pass_raw_values"] for c in user_task_calls] == [expected]
+
+
+def test_serialize_output():
+    # Given
+    raw = _build_workflow.RawValue(
+        value=np.eye(3), artifact_format=ir.ArtifactFormat.RAW_PICKLE5
+    )
+    serialized = serde.result_from_artifact("a", ir.ArtifactFormat.AUTO)
+    part = _build_workflow.OutputPart(
+        packed=serde.result_from_artifact(
+            ("b", np.eye(2)), ir.ArtifactFormat.RAW_PICKLE5
+        ),
+        artifact_index=1,
+    )
+
+    # When
+    results = [_build_workflow.serialize_output(o) for o in [raw, serialized, part]]
+
+    # Then
+    assert results[0].serialization_format == ir.ArtifactFormat.RAW_PICKLE5
+    np.testing.assert_array_equal(serde.deserialize(results[0]), np.eye(3))
+    assert results[1] is serialized
+    assert results[2].serialization_format == ir.ArtifactFormat.RAW_PICKLE5
+    np.testing.assert_array_equal(serde.deserialize(results[2]), np.eye(2))
+
+
+class TestPackedOutputs:
+    @staticmethod
+    def _task_result(value, artifact_format: ir.ArtifactFormat):
+        unpacked = tuple(serde.result_from_artifact(v, artifact_format) for v in value)
+        packed = _build_workflow._pack_outputs(value, unpacked)
+        assert isinstance(packed, _build_workflow.PackedOutputs)
+        return _build_workflow.TaskResult(packed=packed, unpacked=unpacked)
+
+    @pytest.mark.parametrize(
+        "value, artifact_format",
+        [
+            (("a", (1, 2)), ir.ArtifactFormat.AUTO),
+            (["a", {"b": None}], ir.ArtifactFormat.JSON),
+        ],
+    )
+    def test_same_as_serializing_whole_value(self, value, artifact_format):
+        # Given
+        task_result = self._task_result(value, artifact_format)
+
+        # When
+        packed = _build_workflow.packed_output(task_result)
+
+        # Then
+        assert packed == serde.result_from_artifact(value, artifact_format)
+
+    def test_raw_values(self):
+        # Given
+        value = [np.eye(2), "a"]
+        unpacked = tuple(
+            _build_workflow.RawValue(value=v, artifact_format=ir.ArtifactFormat.AUTO)
+            for v in value
+        )
+        packed = _build_workflow._pack_outputs(value, unpacked)
+        assert packed is not None
+
+        # When
+        output = _build_workflow.packed_output(
+            _build_workflow.TaskResult(packed=packed, unpacked=unpacked)
+        )
+
+        # Then
+        assert isinstance(output, _build_workflow.RawValue)
+        assert output.artifact_format == ir.ArtifactFormat.AUTO
+        assert output.value[0] is value[0]
+        assert output.value == value
+
+    @pytest.mark.parametrize(
+        "value, artifact_format",
+        [
+            # The first output is serialized to JSON, the other one is pickled.
+            (({1: "a"}, np.eye(2)), ir.ArtifactFormat.AUTO),
+            # Not a tuple or a list.
+            (np.array([1, 2]), ir.ArtifactFormat.AUTO),
+            # Pickles can't be put together without unpickling them.
+            ((np.eye(2), 1), ir.ArtifactFormat.ENCODED_PICKLE),
+            ([np.eye(2), np.eye(3)], ir.ArtifactFormat.AUTO),
+            ((np.eye(2), np.eye(3)), ir.ArtifactFormat.RAW_PICKLE5),
+        ],
+    )
+    def test_serialized_whole(self, value, artifact_format):
+        unpacked = tuple(serde.result_from_artifact(v, artifact_format) for v in value)
+
+        assert _build_workflow._pack_outputs(value, unpacked) is None
+
+    def test_legacy_result(self):
+        # Given
+        packed = serde.result_from_artifact(("a", "b"), ir.ArtifactFormat.AUTO)
+        task_result = _build_workflow.TaskResult(
+            packed=packed,
+            unpacked=tuple(
+                serde.result_from_artifact(v, ir.ArtifactFormat.AUTO) for v in "ab"
+            ),
+        )
+
+        # Then
+        assert _build_workflow.packed_output(task_result) is packed
+
+
+class TestSerializeOutputs:
+    @staticmethod
+    def _serialize(value, artifact_format: ir.ArtifactFormat, pass_raw_values=False):
+        return _build_workflow._serialize_outputs(
+            value, len(value), artifact_format, pass_raw_values
+        )
+
+    @pytest.mark.parametrize(
+        "artifact_format",
+        [
+            ir.ArtifactFormat.AUTO,
+            ir.ArtifactFormat.ENCODED_PICKLE,
+            ir.ArtifactFormat.RAW_PICKLE5,
+        ],
+    )
+    def test_pickled_outputs_are_stored_once(self, artifact_format):
+        # Given
+        value = (np.arange(100_000), np.arange(100_000))
+
+        # When
+        task_result = self._serialize(value, artifact_format)
+
+        # Then
+        assert task_result.unpacked == (
+            _build_workflow.OutputPart(packed=task_result.packed, artifact_index=0),
+            _build_workflow.OutputPart(packed=task_result.packed, artifact_index=1),
+        )
+        # The whole value is stored once.
+        packed_size = len(cloudpickle.dumps(task_result.packed))
+        assert packed_size > value[0].nbytes * 2
+        assert len(cloudpickle.dumps(task_result)) < packed_size * 1.01
+        for i, output in enumerate(task_result.unpacked):
+            serialized = _build_workflow.serialize_output(output)
+            assert serialized.serialization_format == (
+                ir.ArtifactFormat.ENCODED_PICKLE
+                if artifact_format == ir.ArtifactFormat.AUTO
+                else artifact_format
+            )
+            np.testing.assert_array_equal(serde.deserialize(serialized), value[i])
+
+    def test_json_outputs_are_kept(self):
+        # Given
+        # The first output is serialized to JSON, the other one is pickled.
+        value = ({1: "a"}, np.eye(2))
+
+        # When
+        task_result = self._serialize(value, ir.ArtifactFormat.AUTO)
+
+        # Then
+        assert task_result.packed == serde.result_from_artifact(
+            value, ir.ArtifactFormat.AUTO
+        )
+        json_output, pickled_output = task_result.unpacked
+        assert json_output == serde.result_from_artifact(
+            value[0], ir.ArtifactFormat.AUTO
+        )
+        assert pickled_output == _build_workflow.OutputPart(
+            packed=task_result.packed, artifact_index=1
+        )
+
+    def test_json_outputs_are_put_together(self):
+        # When
+        task_result = self._serialize(("a", [1]), ir.ArtifactFormat.AUTO)
+
+        # Then
+        assert task_result.packed == _build_workflow.PackedOutputs(container=tuple)
+        assert task_result.unpacked == tuple(
+            serde.result_from_artifact(v, ir.ArtifactFormat.AUTO) for v in ("a", [1])
+        )
+
+    def test_raw_values(self):
+        # Given
+        value = np.eye(2)
+
+        # When
+        task_result = self._serialize(
+            value, ir.ArtifactFormat.AUTO, pass_raw_values=True
+        )
+
+        # Then
+        assert isinstance(task_result.packed, _build_workflow.RawValue)
+        assert task_result.packed.value is value
+        for i, output in enumerate(task_result.unpacked):
+            assert isinstance(output, _build_workflow.RawValue)
+            np.testing.assert_array_equal(output.value, value[i])
+
+
+class TestConstantsInMakeDag:
+    @pytest.fixture
+    def make_node(self, monkeypatch: pytest.MonkeyPatch):
+        make_node = create_autospec(_build_workflow._make_ray_dag_node)
+        monkeypatch.setattr(_build_workflow, "_make_ray_dag_node", make_node)
+        return make_node
+
+    def test_large_constants_are_put_once(self, make_node: Mock):
+        # Given
+        client = create_autospec(_build_workflow.RayClient)
+        workflow = _wf_with_shared_constant().model
+
+        # When
+        _ = _build_workflow.make_ray_dag(client, workflow, "mocked_wf_run_id", None)
+
+        # Then
+        (put_call,) = client.put.call_args_list
+        assert put_call.args[0].value == json.dumps(list(range(20000)))
+        user_task_args = [
+            node_call.kwargs["ray_args"]
+            for node_call in make_node.call_args_list
+            if node_call.kwargs["user_fn_ref"] is not None
+        ]
+        assert len(user_task_args) == 3
+        for large, small in user_task_args:
+            assert large == _build_workflow.ConstantRef(
+                key=f"mocked_wf_run_id@{put_call.args[0].id}",
+                ref=client.put.return_value,
+                size=len(put_call.args[0].value),
+            )
+            # Small constants are passed directly.
+            assert isinstance(small, ir.ConstantNodeJSON)
+
+
 class TestArgumentUnwrapper:
     @pytest.fixture
     def mock_secret_get(self, monkeypatch: pytest.MonkeyPatch):
@@ -284,6 +707,7 @@ class TestArgumentUnwrapper:
                 args_artifact_nodes={},
                 kwargs_artifact_nodes={},
                 deserialize=True,
+                client=create_autospec(_build_workflow.RayClient),
             )
 
             # When
@@ -304,6 +728,7 @@ class TestArgumentUnwrapper:
                 args_artifact_nodes={},
                 kwargs_artifact_nodes={},
                 deserialize=False,
+                client=create_autospec(_build_workflow.RayClient),
             )
 
             # When
@@ -313,6 +738,263 @@ class TestArgumentUnwrapper:
             mock_deserialize.assert_not_called()
             fn.assert_called_with(constant_node)
 
+    class TestConstantRef:
+        @pytest.fixture
+        def constants_cache(self, monkeypatch: pytest.MonkeyPatch):
+            cache = _build_workflow._ConstantsCache(max_bytes=2)
+            monkeypatch.setattr(_build_workflow, "_constants_cache", cache)
+            return cache
+
+        @pytest.fixture
+        def client(self):
+            client = create_autospec(_build_workflow.RayClient)
+            client.get.side_effect = lambda ref: ir.ConstantNodeJSON(
+                id=ref.hex(),
+                value=f'"{ref.hex()}"',
+                serialization_format=ir.ArtifactFormat.JSON,
+                value_preview=ref.hex(),
+            )
+            return client
+
+        @staticmethod
+        def _constant(name: str, size: int = 1) -> _build_workflow.ConstantRef:
+            ref = Mock(spec=_client.ObjectRef)
+            ref.hex.return_value = f"ref-{name}"
+            return _build_workflow.ConstantRef(
+                key=f"wf.1@constant-{name}", ref=ref, size=size
+            )
+
+        @staticmethod
+        def _fetched(client: Mock):
+            return [get_call.args[0].hex() for get_call in client.get.call_args_list]
+
+        @staticmethod
+        def _unwrapper(client, deserialize: bool):
+            return _build_workflow.ArgumentUnwrapper(
+                user_fn=lambda *args, **kwargs: (args, kwargs),
+                args_artifact_nodes={},
+                kwargs_artifact_nodes={},
+                deserialize=deserialize,
+                client=client,
+            )
+
+        @pytest.mark.usefixtures("constants_cache")
+        def test_deserialized_once_per_process(
+            self, client: Mock, mock_deserialize: Mock
+        ):
+            # Given
+            mock_deserialize.side_effect = lambda node: [node.value]
+            constant = self._constant("0")
+
+            # When
+            results = [
+                self._unwrapper(client, deserialize=True)(constant, c=constant)
+                for _ in range(2)
+            ]
+
+            # Then
+            (args1, kwargs1), (args2, kwargs2) = results
+            assert args1 == (['"ref-0"'],)
+            assert args1[0] is kwargs1["c"] is args2[0] is kwargs2["c"]
+            client.get.assert_called_once_with(constant.ref)
+            mock_deserialize.assert_called_once()
+
+        @pytest.mark.usefixtures("constants_cache")
+        def test_least_recently_used_are_dropped(self, client: Mock):
+            # Given
+            unwrapper = self._unwrapper(client, deserialize=True)
+            constants = [self._constant(str(i)) for i in range(3)]
+            _ = unwrapper(constants[0])
+            _ = unwrapper(constants[1])
+            _ = unwrapper(constants[0])
+
+            # When
+            _ = unwrapper(constants[2])
+            _ = unwrapper(constants[0])
+            _ = unwrapper(constants[1])
+
+            # Then
+            assert self._fetched(client) == ["ref-0", "ref-1", "ref-2", "ref-1"]
+
+        @pytest.mark.usefixtures("constants_cache")
+        def test_limited_by_size(self, client: Mock):
+            # Given
+            unwrapper = self._unwrapper(client, deserialize=True)
+            small, large, too_large = (
+                self._constant(str(size), size=size) for size in (1, 2, 3)
+            )
+            _ = unwrapper(small)
+
+            # When
+            _ = unwrapper(large)
+            _ = unwrapper(large)
+            _ = unwrapper(small)
+            _ = unwrapper(too_large)
+            _ = unwrapper(too_large)
+
+            # Then
+            assert self._fetched(client) == [
+                "ref-1",
+                "ref-2",
+                "ref-1",
+                "ref-3",
+                "ref-3",
+            ]
+
+        def test_no_deserialize(self, client: Mock, mock_deserialize: Mock):
+            # Given
+            constant = self._constant("0")
+
+            # When
+            (arg,), _ = self._unwrapper(client, deserialize=False)(constant)
+
+            # Then
+            assert arg == client.get(constant.ref)
+            mock_deserialize.assert_not_called()
+
+    class TestRawValue:
+        @pytest.fixture
+        def task_result(self):
+            return _build_workflow.TaskResult(
+                packed=_build_workflow.RawValue(
+                    value=("a", "b"), artifact_format=ir.ArtifactFormat.AUTO
+                ),
+                unpacked=tuple(
+                    _build_workflow.RawValue(
+                        value=value, artifact_format=ir.ArtifactFormat.AUTO
+                    )
+                    for value in ["a", "b"]
+                ),
+            )
+
+        def test_deserialize(self, mock_deserialize, task_result):
+            # Given
+            fn = Mock()
+            arg_unwrapper = _build_workflow.ArgumentUnwrapper(
+                user_fn=fn,
+                args_artifact_nodes={1: ir.ArtifactNode(id="mocked", artifact_index=1)},
+                kwargs_artifact_nodes={},
+                deserialize=True,
+                client=create_autospec(_build_workflow.RayClient),
+            )
+
+            # When
+            _ = arg_unwrapper(task_result, task_result)
+
+            # Then
+            fn.assert_called_with(("a", "b"), "b")
+            mock_deserialize.assert_not_called()
+
+        def test_no_deserialize(self, mock_deserialize, task_result):
+            # Given
+            fn = Mock()
+            arg_unwrapper = _build_workflow.ArgumentUnwrapper(
+                user_fn=fn,
+                args_artifact_nodes={},
+                kwargs_artifact_nodes={},
+                deserialize=False,
+                client=create_autospec(_build_workflow.RayClient),
+            )
+
+            # When
+            _ = arg_unwrapper(task_result)
+
+            # Then
+            fn.assert_called_with(task_result.packed)
+            mock_deserialize.assert_not_called()
+
+    class TestPackedOutputs:
+        @pytest.fixture
+        def task_result(self):
+            return _build_workflow.TaskResult(
+                packed=_build_workflow.PackedOutputs(container=tuple),
+                unpacked=tuple(
+                    serde.result_from_artifact(value, ir.ArtifactFormat.AUTO)
+                    for value in ["a", "b"]
+                ),
+            )
+
+        @staticmethod
+        def _unwrapper(fn, deserialize: bool):
+            return _build_workflow.ArgumentUnwrapper(
+                user_fn=fn,
+                args_artifact_nodes={1: ir.ArtifactNode(id="mocked", artifact_index=1)},
+                kwargs_artifact_nodes={},
+                deserialize=deserialize,
+                client=create_autospec(_build_workflow.RayClient),
+            )
+
+        def test_deserialize(self, task_result):
+            # Given
+            fn = Mock()
+
+            # When
+            _ = self._unwrapper(fn, deserialize=True)(task_result, task_result)
+
+            # Then
+            fn.assert_called_with(("a", "b"), "b")
+
+        def test_no_deserialize(self, task_result):
+            # Given
+            fn = Mock()
+
+            # When
+            _ = self._unwrapper(fn, deserialize=False)(task_result, task_result)
+
+            # Then
+            fn.assert_called_with(
+                serde.result_from_artifact(("a", "b"), ir.ArtifactFormat.AUTO),
+                task_result.unpacked[1],
+            )
+
+    class TestOutputPart:
+        @pytest.fixture
+        def task_result(self):
+            packed = serde.result_from_artifact(
+                ("a", np.eye(2)), ir.ArtifactFormat.ENCODED_PICKLE
+            )
+            return _build_workflow.TaskResult(
+                packed=packed,
+                unpacked=tuple(
+                    _build_workflow.OutputPart(packed=packed, artifact_index=i)
+                    for i in (0, 1)
+                ),
+            )
+
+        @staticmethod
+        def _unwrapper(fn, deserialize: bool):
+            return _build_workflow.ArgumentUnwrapper(
+                user_fn=fn,
+                args_artifact_nodes={1: ir.ArtifactNode(id="mocked", artifact_index=1)},
+                kwargs_artifact_nodes={},
+                deserialize=deserialize,
+                client=create_autospec(_build_workflow.RayClient),
+            )
+
+        def test_deserialize(self, task_result):
+            # Given
+            fn = Mock()
+
+            # When
+            _ = self._unwrapper(fn, deserialize=True)(task_result, task_result)
+
+            # Then
+            (whole, part), _ = fn.call_args
+            assert whole[0] == "a"
+            np.testing.assert_array_equal(whole[1], np.eye(2))
+            np.testing.assert_array_equal(part, np.eye(2))
+
+        def test_no_deserialize(self, task_result):
+            # Given
+            fn = Mock()
+
+            # When
+            _ = self._unwrapper(fn, deserialize=False)(task_result, task_result)
+
+            # Then
+            # The data aggregation step passes the output on without unpickling it.
+            fn.assert_called_with(task_result.packed, task_result.unpacked[1])
+
     class TestSecretNode:
         def test_deserialize(self, mock_secret_get):
             # Given
@@ -325,6 +1007,7 @@ class TestArgumentUnwrapper:
                 args_artifact_nodes={},
                 kwargs_artifact_nodes={},
                 deserialize=True,
+                client=create_autospec(_build_workflow.RayClient),
             )
 
             # When
@@ -345,6 +1028,7 @@ class TestArgumentUnwrapper:
                 args_artifact_nodes={},
                 kwargs_artifact_nodes={},
                 deserialize=False,
+                client=create_autospec(_build_workflow.RayClient),
             )
 
             # When
@@ -391,7 +1075,11 @@ class TestArgumentUnwrapper:
         ):
             fn = Mock()
             arg_unwrapper = _build_workflow.ArgumentUnwrapper(
-                fn, args_artifact_nodes, {}, True
+                fn,
+                args_artifact_nodes,
+                {},
+                True,
+                create_autospec(_build_workflow.RayClient),
             )
             _ = arg_unwrapper(task_result, task_result, task_result)
 
@@ -403,7 +1091,11 @@ class TestArgumentUnwrapper:
         ):
             fn = Mock()
             arg_unwrapper = _build_workflow.ArgumentUnwrapper(
-                fn, {}, kwargs_artifact_nodes, True
+                fn,
+                {},
+                kwargs_artifact_nodes,
+                True,
+                create_autospec(_build_workflow.RayClient),
             )
             _ = arg_unwrapper(a=task_result, b=task_result, c=task_result)
 
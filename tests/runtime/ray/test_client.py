@@ -5,7 +5,9 @@
 from unittest.mock import Mock
 
 import pytest
+import ray.workflow.workflow_storage
 
+from orquestra.sdk._ray import _client
 from orquestra.sdk._ray._client import RayClient
 
 
@@ -94,3 +96,26 @@ class TestClient:
                 max_retries=required_kwargs["max_retries"],
                 **expected_overrides,
             )
+
+    class TestCanBatchMetadataReads:
+        @staticmethod
+        def test_supported_ray_version():
+            # The batched reads rely on Ray's storage internals. If this fails after
+            # bumping the Ray version in setup.cfg, every status check falls back to
+            # reading the metadata of each task separately. Update
+            # _load_workflow_runs_metadata() for the new Ray version.
+            assert ray.__version__ == "2.3.0"
+            assert RayClient().can_batch_metadata_reads()
+
+        @staticmethod
+        @pytest.mark.parametrize("attr", _client._STORAGE_INTERNALS)
+        def test_missing_storage_internals(monkeypatch, attr):
+            monkeypatch.delattr(ray.workflow.workflow_storage.WorkflowStorage, attr)
+
+            assert not RayClient().can_batch_metadata_reads()
+
+        @staticmethod
+        def test_missing_steps_dir(monkeypatch):
+            monkeypatch.delattr(ray.workflow.workflow_storage, "STEPS_DIR")
+
+            assert not RayClient().can_batch_metadata_reads()
@@ -5,23 +5,60 @@
 Unit tests for orquestra.sdk._ray._dag. If you need a test against a live
 Ray connection, see tests/ray/test_integration.py instead.
 """
+import typing as t
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from unittest.mock import Mock, PropertyMock, create_autospec
+from unittest.mock import Mock, PropertyMock, call, create_autospec
 
 import pytest
 
+import orquestra.sdk as sdk
 from orquestra.sdk import exceptions
 from orquestra.sdk._base._config import RuntimeConfiguration, RuntimeName
 from orquestra.sdk._base._db import WorkflowDB
 from orquestra.sdk._base._spaces._structs import ProjectRef
 from orquestra.sdk._ray import _client, _dag, _ray_logs
+from orquestra.sdk._ray._wf_def_store import WorkflowDefStore
+from orquestra.sdk._ray._wf_metadata import WfUserMetadata, pydatic_to_json_dict
 from orquestra.sdk.schema.local_database import StoredWorkflowRun
 from orquestra.sdk.schema.workflow_run import State
 
 TEST_TIME = datetime.now(timezone.utc)
 
 
+@sdk.task
+def _add(a, b):
+    return a + b
+
+
+@sdk.workflow
+def _wf():
+    return [_add(1, 2), _add(3, 4)]
+
+
+def _ray_metas(wf_run_id: str):
+    """
+    Fake workflow and task metadata, shaped like Ray's.
+    """
+    wf_def = _wf().model
+    wf_meta = {
+        "user_metadata": pydatic_to_json_dict(WfUserMetadata(workflow_def=wf_def)),
+        "stats": {"start_time": TEST_TIME.timestamp()},
+    }
+    task_metas = {
+        inv_id: {
+            "user_metadata": {
+                "task_run_id": f"{wf_run_id}@{inv_id}",
+                "task_invocation_id": inv_id,
+            },
+            "stats": {"start_time": TEST_TIME.timestamp()},
+        }
+        for inv_id in wf_def.task_invocations
+    }
+    return wf_meta, task_metas
+
+
 @pytest.fixture
 def wf_run_id():
     return "mocked_wf_run_id"
@@ -203,6 +240,40 @@ class TestRayRuntime:
                 assert result_list == logs_list
                 get_task_logs.assert_called_with(wf_run_id, task_inv_id)
 
+        class TestIterWorkflowLogs:
+            @staticmethod
+            def test_follow_until_finished(
+                monkeypatch,
+                tmp_path: Path,
+                runtime_config: RuntimeConfiguration,
+            ):
+                # Given
+                rt = _dag.RayRuntime(
+                    client=Mock(),
+                    config=runtime_config,
+                    project_dir=tmp_path,
+                )
+                iter_workflow_logs = Mock(return_value=iter([("inv_id1", "hello")]))
+                monkeypatch.setattr(
+                    _ray_logs.DirectRayReader, "iter_workflow_logs", iter_workflow_logs
+                )
+                get_workflow_run_states = Mock(return_value={"wf.1": State.SUCCEEDED})
+                monkeypatch.setattr(
+                    rt, "get_workflow_run_states", get_workflow_run_states
+                )
+
+                # When
+                lines = list(rt.iter_workflow_logs("wf.1", follow=True))
+
+                # Then
+                assert lines == [("inv_id1", "hello")]
+                iter_workflow_logs.assert_called_once()
+                assert iter_workflow_logs.call_args.kwargs["follow"] is True
+                # The reader stops once the workflow run finished.
+                until = iter_workflow_logs.call_args.kwargs["until"]
+                assert until() is True
+                get_workflow_run_states.assert_called_with(["wf.1"])
+
     class TestCreateWorkflowRun:
         def test_project_raises_warning(
             self, client, runtime_config, tmp_path, monkeypatch
@@ -210,6 +281,7 @@ class TestRayRuntime:
             monkeypatch.setattr(_dag, "make_ray_dag", Mock())
             monkeypatch.setattr(_dag, "WfUserMetadata", Mock())
             monkeypatch.setattr(_dag, "pydatic_to_json_dict", Mock())
+            monkeypatch.setattr(_dag, "WorkflowDefStore", Mock())
             monkeypatch.setattr(StoredWorkflowRun, "__init__", lambda *_, **__: None)
             monkeypatch.setattr(WorkflowDB, "save_workflow_run", Mock())
 
@@ -223,7 +295,308 @@ class TestRayRuntime:
                     Mock(), project=ProjectRef(workspace_id="", project_id="")
                 )
 
+    class TestGetWorkflowRunStatus:
+        @staticmethod
+        @pytest.fixture
+        def runtime(client, runtime_config, tmp_path):
+            return _dag.RayRuntime(
+                client=client,
+                config=runtime_config,
+                project_dir=tmp_path,
+            )
+
+        @staticmethod
+        def test_reads_metadata_in_one_batch(client, runtime, wf_run_id):
+            # Given
+            client.get_workflow_status.return_value = _client.WorkflowStatus.RUNNING
+            client.get_workflow_runs_metadata.return_value = {
+                wf_run_id: _ray_metas(wf_run_id)
+            }
+
+            # When
+            wf_run = runtime.get_workflow_run_status(wf_run_id)
+
+            # Then
+            client.get_workflow_runs_metadata.assert_called_once_with([wf_run_id])
+            client.get_task_metadata.assert_not_called()
+            assert wf_run.id == wf_run_id
+            assert wf_run.status.state == State.RUNNING
+            assert len(wf_run.task_runs) == 2
+            assert {task_run.status.state for task_run in wf_run.task_runs} == {
+                State.RUNNING
+            }
+
+        @staticmethod
+        def test_skips_tasks_without_metadata(client, runtime, wf_run_id):
+            # Given
+            wf_meta, task_metas = _ray_metas(wf_run_id)
+            client.get_workflow_status.return_value = _client.WorkflowStatus.RUNNING
+            client.get_workflow_runs_metadata.return_value = {
+                wf_run_id: (wf_meta, dict(list(task_metas.items())[:1]))
+            }
+
+            # When
+            wf_run = runtime.get_workflow_run_status(wf_run_id)
+
+            # Then
+            assert len(wf_run.task_runs) == 1
+
+        @staticmethod
+        def test_falls_back_to_public_ray_api(client, runtime, wf_run_id):
+            # Given
+            wf_meta, task_metas = _ray_metas(wf_run_id)
+            first_inv_id = next(iter(task_metas))
+            client.can_batch_metadata_reads.return_value = False
+            client.get_workflow_status.return_value = _client.WorkflowStatus.RUNNING
+            client.get_workflow_metadata.return_value = wf_meta
+
+            def _get_task_metadata(workflow_id, name):
+                if name != first_inv_id:
+                    raise ValueError(f"No such task '{name}'")
+                return task_metas[name]
+
+            client.get_task_metadata.side_effect = _get_task_metadata
+
+            # When
+            wf_run = runtime.get_workflow_run_status(wf_run_id)
+
+            # Then
+            client.get_workflow_runs_metadata.assert_not_called()
+            client.get_workflow_metadata.assert_called_once_with(workflow_id=wf_run_id)
+            assert client.get_task_metadata.call_count == len(task_metas)
+            assert [task_run.invocation_id for task_run in wf_run.task_runs] == [
+                first_inv_id
+            ]
+
+        @staticmethod
+        @pytest.mark.parametrize(
+            "ray_status",
+            [
+                _client.WorkflowStatus.SUCCESSFUL,
+                _client.WorkflowStatus.FAILED,
+                _client.WorkflowStatus.CANCELED,
+            ],
+        )
+        def test_finished_runs_are_queried_once(client, runtime, wf_run_id, ray_status):
+            # Given
+            client.get_workflow_status.return_value = ray_status
+            client.get_workflow_runs_metadata.return_value = {
+                wf_run_id: _ray_metas(wf_run_id)
+            }
+
+            # When
+            wf_runs = [runtime.get_workflow_run_status(wf_run_id) for _ in range(3)]
+
+            # Then
+            assert wf_runs[0] == wf_runs[1] == wf_runs[2]
+            client.get_workflow_status.assert_called_once()
+            client.get_workflow_runs_metadata.assert_called_once()
+
+        @staticmethod
+        def test_running_runs_are_queried_every_time(client, runtime, wf_run_id):
+            # Given
+            client.get_workflow_status.return_value = _client.WorkflowStatus.RUNNING
+            client.get_workflow_runs_metadata.return_value = {
+                wf_run_id: _ray_metas(wf_run_id)
+            }
+
+            # When
+            for _ in range(3):
+                _ = runtime.get_workflow_run_status(wf_run_id)
+
+            # Then
+            assert client.get_workflow_runs_metadata.call_count == 3
+
+        @staticmethod
+        def test_memo_expires(client, runtime, wf_run_id, monkeypatch):
+            # Given
+            monotonic = Mock(return_value=0.0)
+            monkeypatch.setattr(_dag.time, "monotonic", monotonic)
+            client.get_workflow_status.return_value = _client.WorkflowStatus.SUCCESSFUL
+            client.get_workflow_runs_metadata.return_value = {
+                wf_run_id: _ray_metas(wf_run_id)
+            }
+            _ = runtime.get_workflow_run_status(wf_run_id)
+
+            # When
+            monotonic.return_value = _dag.FINISHED_RUN_STATUS_TTL + 1
+            _ = runtime.get_workflow_run_status(wf_run_id)
+
+            # Then
+            assert client.get_workflow_runs_metadata.call_count == 2
+
+        @staticmethod
+        def test_stopping_forgets_memoized_run(client, runtime, wf_run_id):
+            # Given
+            client.get_workflow_status.return_value = _client.WorkflowStatus.SUCCESSFUL
+            client.get_workflow_runs_metadata.return_value = {
+                wf_run_id: _ray_metas(wf_run_id)
+            }
+            _ = runtime.get_workflow_run_status(wf_run_id)
+
+            # When
+            runtime.stop_workflow_run(wf_run_id)
+            client.get_workflow_status.return_value = _client.WorkflowStatus.CANCELED
+            wf_run = runtime.get_workflow_run_status(wf_run_id)
+
+            # Then
+            assert wf_run.status.state == State.TERMINATED
+
+        @staticmethod
+        def test_missing_metadata(client, runtime, wf_run_id):
+            # Given
+            client.get_workflow_status.return_value = _client.WorkflowStatus.RUNNING
+            client.get_workflow_runs_metadata.return_value = {}
+
+            # Then
+            with pytest.raises(exceptions.WorkflowRunNotFoundError):
+                _ = runtime.get_workflow_run_status(wf_run_id)
+
+        @staticmethod
+        def test_missing_status(client, runtime, wf_run_id):
+            # Given
+            client.get_workflow_status.side_effect = ValueError
+
+            # Then
+            with pytest.raises(exceptions.WorkflowRunNotFoundError):
+                _ = runtime.get_workflow_run_status(wf_run_id)
+
+        class TestWorkflowDefHash:
+            @staticmethod
+            @pytest.fixture(autouse=True)
+            def storage(client, monkeypatch):
+                monkeypatch.setattr(WorkflowDefStore, "_parsed", OrderedDict())
+                blobs: t.Dict[str, bytes] = {}
+                client.put_storage_blob.side_effect = blobs.__setitem__
+                client.get_storage_blob.side_effect = blobs.get
+                return blobs
+
+            @staticmethod
+            def _hashed_metas(client, wf_run_id):
+                wf_meta, task_metas = _ray_metas(wf_run_id)
+                def_hash = WorkflowDefStore(client).put(_wf().model)
+                wf_meta["user_metadata"] = pydatic_to_json_dict(
+                    WfUserMetadata(workflow_def_hash=def_hash)
+                )
+                return wf_meta, task_metas
+
+            def test_reads_definition_from_store(self, client, runtime, wf_run_id):
+                # Given
+                client.get_workflow_status.return_value = _client.WorkflowStatus.RUNNING
+                client.get_workflow_runs_metadata.return_value = {
+                    wf_run_id: self._hashed_metas(client, wf_run_id)
+                }
+
+                # When
+                wf_run = runtime.get_workflow_run_status(wf_run_id)
+
+                # Then
+                assert wf_run.workflow_def == _wf().model
+                assert len(wf_run.task_runs) == 2
+                # Parsed definitions are reused.
+                client.get_storage_blob.assert_not_called()
+
+            def test_missing_definition(self, client, runtime, wf_run_id, storage):
+                # Given
+                client.get_workflow_status.return_value = _client.WorkflowStatus.RUNNING
+                client.get_workflow_runs_metadata.return_value = {
+                    wf_run_id: self._hashed_metas(client, wf_run_id)
+                }
+                storage.clear()
+                WorkflowDefStore._parsed.clear()
+
+                # Then
+                with pytest.raises(exceptions.WorkflowRunNotFoundError):
+                    _ = runtime.get_workflow_run_status(wf_run_id)
+
+    class TestGetWorkflowRunStates:
+        @staticmethod
+        @pytest.fixture
+        def runtime(client, runtime_config, tmp_path):
+            return _dag.RayRuntime(
+                client=client,
+                config=runtime_config,
+                project_dir=tmp_path,
+            )
+
+        @staticmethod
+        def test_doesnt_read_task_metadata(client, runtime):
+            # Given
+            ray_statuses = {
+                "wf.1": _client.WorkflowStatus.RUNNING,
+                "wf.2": _client.WorkflowStatus.FAILED,
+            }
+            client.get_workflow_status.side_effect = lambda workflow_id: ray_statuses[
+                workflow_id
+            ]
+            client.get_workflow_metadata.return_value = _ray_metas("wf.1")[0]
+
+            # When
+            states = runtime.get_workflow_run_states(["wf.1", "wf.2"])
+
+            # Then
+            assert states == {"wf.1": State.RUNNING, "wf.2": State.FAILED}
+            client.get_workflow_runs_metadata.assert_not_called()
+            client.get_task_metadata.assert_not_called()
+
+        @staticmethod
+        def test_uses_memoized_runs(client, runtime, wf_run_id):
+            # Given
+            client.get_workflow_status.return_value = _client.WorkflowStatus.SUCCESSFUL
+            client.get_workflow_runs_metadata.return_value = {
+                wf_run_id: _ray_metas(wf_run_id)
+            }
+            _ = runtime.get_workflow_run_status(wf_run_id)
+            client.get_workflow_status.reset_mock()
+
+            # When
+            states = runtime.get_workflow_run_states([wf_run_id])
+
+            # Then
+            assert states == {wf_run_id: State.SUCCEEDED}
+            client.get_workflow_status.assert_not_called()
+
+        @staticmethod
+        def test_missing_run(client, runtime, wf_run_id):
+            # Given
+            client.get_workflow_status.side_effect = ValueError
+
+            # Then
+            with pytest.raises(exceptions.WorkflowRunNotFoundError):
+                _ = runtime.get_workflow_run_states([wf_run_id])
+
     class TestListWorkflowRuns:
+        def test_reads_metadata_of_all_runs_in_one_batch(
+            self, client, runtime_config, tmp_path
+        ):
+            # Given
+            run_ids = ["wf.1", "wf.2", "wf.3"]
+            client.list_all.return_value = [
+                (run_id, _client.WorkflowStatus.SUCCESSFUL) for run_id in run_ids
+            ]
+            client.get_workflow_runs_metadata.return_value = {
+                run_id: _ray_metas(run_id) for run_id in run_ids[:2]
+            }
+            runtime = _dag.RayRuntime(
+                client=client,
+                config=runtime_config,
+                project_dir=tmp_path,
+            )
+
+            # When
+            runs = runtime.list_workflow_runs()
+            _ = runtime.list_workflow_runs()
+
+            # Then
+            assert [run.id for run in runs] == run_ids[:2]
+            # Statuses come from 'list_all()'.
+            client.get_workflow_status.assert_not_called()
+            # Finished runs aren't read again. The missing one is.
+            assert client.get_workflow_runs_metadata.call_args_list == [
+                call(run_ids),
+                call(run_ids[2:]),
+            ]
+
         def test_happy_path(self, client, runtime_config, monkeypatch, tmp_path):
             # Given
             client.list_all.return_value = [("mocked", Mock())]
@@ -234,7 +607,7 @@ class TestRayRuntime:
             )
             mock_status = Mock()
             monkeypatch.setattr(
-                runtime, "get_workflow_run_status", Mock(return_value=mock_status)
+                runtime, "_collect_workflow_runs", Mock(return_value=[mock_status])
             )
             # When
             runs = runtime.list_workflow_runs()
@@ -254,8 +627,8 @@ class TestRayRuntime:
             )
             monkeypatch.setattr(
                 runtime,
-                "get_workflow_run_status",
-                Mock(side_effect=exceptions.WorkflowRunNotFoundError),
+                "_collect_workflow_runs",
+                Mock(return_value=[]),
             )
             # When
             runs = runtime.list_workflow_runs()
@@ -281,7 +654,7 @@ class TestRayRuntime:
                 ]
             )
             monkeypatch.setattr(
-                runtime, "get_workflow_run_status", Mock(return_value=mock_status)
+                runtime, "_collect_workflow_runs", Mock(return_value=[mock_status] * 4)
             )
             # When
             runs = runtime.list_workflow_runs(state=State.RUNNING)
@@ -307,7 +680,7 @@ class TestRayRuntime:
                 ]
             )
             monkeypatch.setattr(
-                runtime, "get_workflow_run_status", Mock(return_value=mock_status)
+                runtime, "_collect_workflow_runs", Mock(return_value=[mock_status] * 4)
             )
             # When
             runs = runtime.list_workflow_runs(state=[State.SUCCEEDED, State.FAILED])
@@ -332,7 +705,7 @@ class TestRayRuntime:
                 ]
             )
             monkeypatch.setattr(
-                runtime, "get_workflow_run_status", Mock(return_value=mock_status)
+                runtime, "_collect_workflow_runs", Mock(return_value=[mock_status] * 4)
             )
             # When
             runs = runtime.list_workflow_runs(max_age=timedelta(minutes=2))
@@ -357,7 +730,7 @@ class TestRayRuntime:
                 ]
             )
             monkeypatch.setattr(
-                runtime, "get_workflow_run_status", Mock(return_value=mock_status)
+                runtime, "_collect_workflow_runs", Mock(return_value=[mock_status] * 4)
             )
             # When
             runs = runtime.list_workflow_runs(limit=2)
@@ -239,6 +239,27 @@ class TestRayRuntimeMethods:
             assert _count_task_runs(wf_run, State.SUCCEEDED) == 1
             assert _count_task_runs(wf_run, State.WAITING) == 1
 
+        def test_batched_metadata_matches_ray(self, runtime: _dag.RayRuntime):
+            """
+            Status is built from metadata read in a single pass over Ray's workflow
+            storage. It should be the same as what Ray's API returns task by task.
+            """
+            # Given
+            wf_def = _example_wfs.greet_wf.model
+            run_id = runtime.create_workflow_run(wf_def, None)
+            _wait_to_finish_wf(run_id, runtime)
+            client = _client.RayClient()
+
+            # When
+            batched = client.get_workflow_runs_metadata([run_id, "wf.not.found"])
+
+            # Then
+            assert list(batched) == [run_id]
+            wf_meta, task_metas = batched[run_id]
+            assert wf_meta == client.get_workflow_metadata(run_id)
+            for inv_id in wf_def.task_invocations:
+                assert task_metas[inv_id] == client.get_task_metadata(run_id, inv_id)
+
     class TestListWorkflowRuns:
         """
         Tests that validate .list_workflow_runs().
@@ -462,6 +483,24 @@ class TestRayRuntimeMethods:
             for trigger in triggers:
                 trigger.close()
 
+    class TestGetOutputs:
+        def test_selected_invocations(self, runtime: _dag.RayRuntime):
+            # Given
+            wf_def = _example_wfs.exception_wf_with_multiple_values().model
+            run_id = runtime.create_workflow_run(wf_def, None)
+            _wait_to_finish_wf(run_id, runtime)
+            all_outputs = runtime.get_available_outputs(run_id)
+            inv_ids = list(wf_def.task_invocations)
+
+            # When
+            outputs = runtime.get_outputs(run_id, inv_ids)
+            no_outputs = runtime.get_outputs(run_id, [])
+
+            # Then
+            # Only the first task succeeded.
+            assert outputs == all_outputs
+            assert no_outputs == {}
+
 
 @pytest.mark.slow
 # Ray mishandles log file handlers and we get "_io.FileIO [closed]"
@@ -578,13 +617,22 @@ class TestRayRuntimeMethods:
         ),
     ],
 )
+@pytest.mark.parametrize("pass_raw_values", [False, True])
 def test_run_and_get_output(
-    runtime: _dag.RayRuntime, wf, expected_outputs, expected_intermediate
+    runtime: _dag.RayRuntime,
+    wf,
+    expected_outputs,
+    expected_intermediate,
+    pass_raw_values: bool,
+    monkeypatch: pytest.MonkeyPatch,
 ):
     """
     Verifies methods for getting outputs, both the "final" and "intermediate".
+    Outputs passed between tasks as raw values are serialized the same way.
     """
     # Given
+    if pass_raw_values:
+        monkeypatch.setenv("ORQ_RAY_PASS_RAW_VALUES", "1")
     run_id = runtime.create_workflow_run(wf.model, None)
     _wait_to_finish_wf(run_id, runtime)
 
@@ -768,6 +816,29 @@ class TestDirectRayReader:
         lines_joined = "\n".join(log_lines)
         assert tell_tale in lines_joined
 
+    def test_follow_workflow_logs(
+        self, shared_ray_conn, runtime, wf: ir.WorkflowDef, tell_tale: str
+    ):
+        """
+        Submit a workflow, follow its logs while it's running, look for the test
+        message.
+        """
+        # Given
+        ray_params = shared_ray_conn
+        reader = _ray_logs.DirectRayReader(Path(ray_params._temp_dir))
+        wf_run_id = runtime.create_workflow_run(wf, None)
+
+        def _finished():
+            state = runtime.get_workflow_run_status(wf_run_id).status.state
+            return state not in {State.WAITING, State.RUNNING}
+
+        # When
+        lines = list(reader.iter_workflow_logs(wf_run_id, follow=True, until=_finished))
+
+        # Then
+        assert _finished()
+        assert tell_tale in "\n".join(line for _, line in lines)
+
 
 @pytest.mark.slow
 # Ray mishandles log file handlers and we get "_io.FileIO [closed]"
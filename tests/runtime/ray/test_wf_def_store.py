@@ -0,0 +1,98 @@
+################################################################################
+# © Copyright 2023 Zapata Computing Inc.
+################################################################################
+from collections import OrderedDict
+from unittest.mock import create_autospec
+
+import pytest
+
+import orquestra.sdk as sdk
+from orquestra.sdk._ray import _wf_def_store
+from orquestra.sdk._ray._client import RayClient
+from orquestra.sdk._ray._wf_def_store import WorkflowDefStore
+
+
+@sdk.task
+def _add(a, b):
+    return a + b
+
+
+@sdk.workflow
+def _wf():
+    return [_add(1, 2), _add(3, 4)]
+
+
+@pytest.fixture(autouse=True)
+def parsed(monkeypatch):
+    parsed: OrderedDict = OrderedDict()
+    monkeypatch.setattr(WorkflowDefStore, "_parsed", parsed)
+    return parsed
+
+
+@pytest.fixture
+def storage():
+    return {}
+
+
+@pytest.fixture
+def client(storage):
+    client = create_autospec(RayClient)
+    client.put_storage_blob.side_effect = storage.__setitem__
+    client.get_storage_blob.side_effect = storage.get
+    return client
+
+
+class TestWorkflowDefStore:
+    def test_roundtrip(self, client, parsed):
+        # Given
+        wf_def = _wf().model
+        def_hash = WorkflowDefStore(client).put(wf_def)
+        parsed.clear()
+
+        # When
+        stored = WorkflowDefStore(client).get(def_hash)
+
+        # Then
+        assert stored == wf_def
+
+    def test_parsed_once(self, client):
+        # Given
+        def_hash = WorkflowDefStore(client).put(_wf().model)
+
+        # When
+        stored = [WorkflowDefStore(client).get(def_hash) for _ in range(3)]
+
+        # Then
+        assert stored[0] is stored[1] is stored[2]
+        client.get_storage_blob.assert_not_called()
+
+    def test_same_contents_same_hash(self, client, storage):
+        # When
+        hashes = {WorkflowDefStore(client).put(_wf().model) for _ in range(2)}
+
+        # Then
+        assert len(hashes) == 1
+        assert len(storage) == 1
+
+    def test_missing(self, client):
+        assert WorkflowDefStore(client).get("doesn't exist") is None
+        client.get_storage_blob.assert_called_once()
+
+    def test_least_recently_used_dropped(self, client, parsed, monkeypatch):
+        # Given
+        monkeypatch.setattr(_wf_def_store, "PARSED_CACHE_SIZE", 2)
+        store = WorkflowDefStore(client)
+        first, second, third = (
+            store.put(_wf().with_resources(cpu=cpu).model) for cpu in ("1", "2", "3")
+        )
+
+        # Then
+        assert list(parsed) == [second, third]
+
+        # When
+        store.get(second)
+        store.get(first)
+
+        # Then
+        assert list(parsed) == [second, first]
+        client.get_storage_blob.assert_called_once()
@@ -219,10 +219,14 @@ class TestTaskRun:
         def test_get_output_finished(wf_def_model, inv_id: str, exp_output):
             # Given
             runtime = create_autospec(RuntimeInterface)
-            runtime.get_available_outputs.return_value = {
-                "inv1": serde.result_from_artifact(42, ir.ArtifactFormat.AUTO),
-                "inv2": serde.result_from_artifact((21, 38), ir.ArtifactFormat.AUTO),
-            }
+            runtime.get_outputs.side_effect = _outputs_subset(
+                {
+                    "inv1": serde.result_from_artifact(42, ir.ArtifactFormat.AUTO),
+                    "inv2": serde.result_from_artifact(
+                        (21, 38), ir.ArtifactFormat.AUTO
+                    ),
+                }
+            )
 
             task_run = _api.TaskRun(
                 task_run_id="a_run",
@@ -237,12 +241,15 @@ class TestTaskRun:
 
             # Then
             assert output == exp_output
+            # Only the selected artifact is fetched.
+            runtime.get_outputs.assert_called_once_with("wf.1", [inv_id])
+            runtime.get_available_outputs.assert_not_called()
 
         @staticmethod
         def test_get_outputs_not_all_finished(wf_def_model):
             runtime = create_autospec(RuntimeInterface)
             # No outputs available
-            runtime.get_available_outputs.return_value = {}
+            runtime.get_outputs.return_value = {}
 
             task_run = _api.TaskRun(
                 task_run_id="a_run",
@@ -461,7 +468,7 @@ class TestTaskRun:
                 first_inv_id: serde.result_from_artifact(15, ir.ArtifactFormat.AUTO),
                 second_inv_2: serde.result_from_artifact(25, ir.ArtifactFormat.AUTO),
             }
-            runtime.get_available_outputs.return_value = runtime_outputs
+            runtime.get_outputs.side_effect = _outputs_subset(runtime_outputs)
             wf_run_id = "wf.3"
 
             task_runs = [
@@ -508,7 +515,7 @@ class TestTaskRun:
                 ),
                 second_inv_id: serde.result_from_artifact(25, ir.ArtifactFormat.AUTO),
             }
-            runtime.get_available_outputs.return_value = runtime_outputs
+            runtime.get_outputs.side_effect = _outputs_subset(runtime_outputs)
 
             task_run = _api.TaskRun(
                 task_run_id=f"run_{second_inv_id}",
@@ -524,6 +531,23 @@ class TestTaskRun:
             # then
             assert task_input.args == [21]
             assert task_input.kwargs == {}
+            # Only the parent's outputs are fetched.
+            runtime.get_outputs.assert_called_once_with(wf_run_id, [first_inv_id])
+
+
+def _outputs_subset(all_outputs):
+    """
+    Mimics RuntimeInterface.get_outputs() with a fixed set of available outputs.
+    """
+
+    def _get_outputs(wf_run_id, task_inv_ids):
+        return {
+            inv_id: all_outputs[inv_id]
+            for inv_id in task_inv_ids
+            if inv_id in all_outputs
+        }
+
+    return _get_outputs
 
 
 # region: fixtures
@@ -0,0 +1,224 @@
+################################################################################
+# © Copyright 2023 Zapata Computing Inc.
+################################################################################
+"""
+Tests for orquestra.sdk._base._api._waiting.
+"""
+import itertools
+import time
+import typing as t
+from unittest.mock import MagicMock, Mock, create_autospec
+
+import pytest
+
+from orquestra.sdk import exceptions
+from orquestra.sdk._base import _api
+from orquestra.sdk._base._api import _waiting
+from orquestra.sdk._base.abc import RuntimeInterface
+from orquestra.sdk.schema import ir
+from orquestra.sdk.schema.configs import RuntimeName
+from orquestra.sdk.schema.workflow_run import State
+
+
+def _runtime(states: t.Dict[str, t.Iterator[State]]) -> Mock:
+    """
+    A runtime that reports the next state from ``states[run_id]`` on each poll.
+    """
+    runtime = create_autospec(RuntimeInterface)
+    runtime.get_workflow_run_states.side_effect = lambda run_ids: {
+        run_id: next(states[run_id]) for run_id in run_ids
+    }
+    return runtime
+
+
+def _states(n_running: int, final: State = State.SUCCEEDED) -> t.Iterator[State]:
+    return itertools.chain(
+        itertools.repeat(State.RUNNING, n_running), itertools.repeat(final)
+    )
+
+
+def _run(run_id: str, runtime: Mock, config=None) -> _api.WorkflowRun:
+    return _api.WorkflowRun(
+        run_id=run_id, wf_def=Mock(spec=ir.WorkflowDef), runtime=runtime, config=config
+    )
+
+
+@pytest.fixture
+def sleep(monkeypatch):
+    sleep = MagicMock()
+    monkeypatch.setattr(time, "sleep", sleep)
+    return sleep
+
+
+class TestBackoff:
+    @staticmethod
+    def test_doubles_up_to_max(monkeypatch):
+        monkeypatch.setattr(_waiting, "_JITTER", 0.0)
+
+        sleep_times = list(itertools.islice(_waiting._backoff(0.5, 3.0), 5))
+
+        assert sleep_times == [0.5, 1.0, 2.0, 3.0, 3.0]
+
+    @staticmethod
+    def test_jitter_bounds():
+        sleep_times = list(itertools.islice(_waiting._backoff(1.0, 4.0), 100))
+
+        assert all(0.8 <= s <= 1.2 for s in sleep_times[:1])
+        assert all(3.2 <= s <= 4.0 for s in sleep_times[2:])
+        # Clients shouldn't poll in lockstep.
+        assert len(set(sleep_times)) > 1
+
+
+class TestWaitAll:
+    @staticmethod
+    def test_returns_states_in_input_order(sleep):
+        # Given
+        runtime = _runtime(
+            {
+                "wf.1": _states(3, State.FAILED),
+                "wf.2": _states(0, State.SUCCEEDED),
+                "wf.3": _states(1, State.TERMINATED),
+            }
+        )
+        runs = [_run(run_id, runtime) for run_id in ["wf.1", "wf.2", "wf.3"]]
+
+        # When
+        states = _api.wait_all(runs)
+
+        # Then
+        assert states == [State.FAILED, State.SUCCEEDED, State.TERMINATED]
+        assert sleep.call_count == 3
+
+    @staticmethod
+    def test_polls_each_runtime_once_per_iteration(sleep):
+        # Given
+        config = _api.RuntimeConfig.ray()
+        runtime = _runtime({f"wf.{i}": _states(min(i, 2)) for i in range(4)})
+        runs = [_run(f"wf.{i}", runtime, config) for i in range(3)]
+        # Another instance of the runtime, created for the same config
+        other_runtime = create_autospec(RuntimeInterface)
+        runs.append(_run("wf.3", other_runtime, config))
+
+        # When
+        _ = _api.wait_all(runs)
+
+        # Then
+        assert [c.args[0] for c in runtime.get_workflow_run_states.call_args_list] == [
+            ["wf.0", "wf.1", "wf.2", "wf.3"],
+            ["wf.1", "wf.2", "wf.3"],
+            ["wf.2", "wf.3"],
+        ]
+        other_runtime.get_workflow_run_states.assert_not_called()
+
+    @staticmethod
+    def test_in_process_runtimes_are_polled_separately(sleep):
+        # Given
+        config = _api.RuntimeConfig.in_process()
+        assert config._runtime_name == RuntimeName.IN_PROCESS
+        runtimes = [_runtime({f"wf.{i}": _states(0)}) for i in range(2)]
+        runs = [_run(f"wf.{i}", runtimes[i], config) for i in range(2)]
+
+        # When
+        states = _api.wait_all(runs)
+
+        # Then
+        assert states == [State.SUCCEEDED] * 2
+        for i, runtime in enumerate(runtimes):
+            runtime.get_workflow_run_states.assert_called_once_with([f"wf.{i}"])
+
+    @staticmethod
+    def test_empty():
+        assert _api.wait_all([]) == []
+
+    @staticmethod
+    def test_timeout(monkeypatch):
+        # Given
+        clock = itertools.count(step=10.0)
+        monkeypatch.setattr(time, "monotonic", lambda: next(clock))
+        monkeypatch.setattr(time, "sleep", MagicMock())
+        runtime = _runtime({"wf.1": _states(100), "wf.2": _states(0)})
+        runs = [_run("wf.1", runtime), _run("wf.2", runtime)]
+
+        # Then
+        with pytest.raises(TimeoutError):
+            # When
+            _ = _api.wait_all(runs, timeout=25.0)
+
+    @staticmethod
+    def test_sleep_doesnt_overshoot_timeout(monkeypatch, sleep):
+        # Given
+        monkeypatch.setattr(time, "monotonic", Mock(side_effect=[0.0, 0.1, 100.0]))
+        runtime = _runtime({"wf.1": _states(100)})
+
+        # Then
+        with pytest.raises(TimeoutError):
+            # When
+            _ = _api.wait_all([_run("wf.1", runtime)], timeout=0.3)
+
+        sleep.assert_called_once_with(pytest.approx(0.2))
+
+    @staticmethod
+    def test_unrecognised_state(sleep):
+        runtime = _runtime({"wf.1": _states(1, State.ERROR)})
+
+        with pytest.raises(NotImplementedError):
+            _ = _api.wait_all([_run("wf.1", runtime)])
+
+    @staticmethod
+    def test_missing_state(sleep):
+        # Given
+        runtime = _runtime({"wf.1": _states(1)})
+        runtime.get_workflow_run_states.side_effect = lambda run_ids: {
+            "wf.1": State.RUNNING
+        }
+        runs = [_run("wf.1", runtime), _run("wf.2", runtime)]
+
+        # Then
+        with pytest.raises(exceptions.WorkflowRunNotFoundError, match="wf.2"):
+            _ = _api.wait_all(runs, verbose=True)
+
+    @staticmethod
+    def test_verbose(monkeypatch, sleep, capsys):
+        # Given
+        monkeypatch.setattr(_waiting, "_JITTER", 0.0)
+        runtime = _runtime({"wf.1": _states(1), "wf.2": _states(2)})
+        runs = [_run("wf.1", runtime), _run("wf.2", runtime)]
+
+        # When
+        _ = _api.wait_all(runs, verbose=True)
+
+        # Then
+        captured = capsys.readouterr()
+        assert captured.err == (
+            "0/2 finished. Sleeping for 0.5s...\n"
+            "1/2 finished. Sleeping for 1.0s...\n"
+            "wf.1 is SUCCEEDED\n"
+            "wf.2 is SUCCEEDED\n"
+        )
+
+
+class TestWaitAny:
+    @staticmethod
+    def test_returns_first_finished(sleep):
+        # Given
+        runtime = _runtime({"wf.1": _states(5), "wf.2": _states(2)})
+        runs = [_run("wf.1", runtime), _run("wf.2", runtime)]
+
+        # When
+        finished = _api.wait_any(runs)
+
+        # Then
+        assert finished is runs[1]
+        assert sleep.call_count == 2
+
+    @staticmethod
+    def test_ties_are_broken_by_input_order(sleep):
+        runtime = _runtime({"wf.1": _states(1), "wf.2": _states(1)})
+        runs = [_run("wf.1", runtime), _run("wf.2", runtime)]
+
+        assert _api.wait_any(runs) is runs[0]
+
+    @staticmethod
+    def test_empty():
+        with pytest.raises(ValueError):
+            _ = _api.wait_any([])
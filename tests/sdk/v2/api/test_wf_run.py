@@ -16,6 +16,7 @@ from unittest.mock import DEFAULT, MagicMock, Mock, PropertyMock, create_autospe
 import pytest
 
 from orquestra.sdk._base import _api, _workflow, serde
+from orquestra.sdk._base._api import _waiting
 from orquestra.sdk._base._env import CURRENT_PROJECT_ENV, CURRENT_WORKSPACE_ENV
 from orquestra.sdk._base._in_process_runtime import InProcessRuntime
 from orquestra.sdk._base._spaces._api import list_projects, list_workspaces
@@ -33,6 +34,8 @@ from orquestra.sdk.schema.configs import RuntimeName
 from orquestra.sdk.schema.local_database import StoredWorkflowRun
 from orquestra.sdk.schema.workflow_run import RunStatus, State
 from orquestra.sdk.schema.workflow_run import TaskRun as TaskRunModel
+from orquestra.sdk.schema.workflow_run import WorkflowRun as WorkflowRunModel
+from orquestra.sdk.schema.workflow_run import WorkflowRunMinimal
 
 from ..data.complex_serialization.workflow_defs import (
     capitalize,
@@ -150,6 +153,10 @@ class TestWorkflowRun:
             ),
             itertools.repeat(DEFAULT),
         )
+        runtime.get_workflow_run_states.side_effect = lambda run_ids: {
+            run_id: runtime.get_workflow_run_status(run_id).status.state
+            for run_id in run_ids
+        }
 
         # got getting task run artifacts
         runtime.get_available_outputs.return_value = {
@@ -375,6 +382,7 @@ class TestWorkflowRun:
             def test_verbose(monkeypatch, run, mock_runtime, capsys):
                 # Given
                 monkeypatch.setattr(time, "sleep", MagicMock())
+                monkeypatch.setattr(_waiting, "_JITTER", 0.0)
 
                 # When
                 run.wait_until_finished()
@@ -390,8 +398,8 @@ class TestWorkflowRun:
                 captured = capsys.readouterr()
                 assert captured.out == ""
                 assert captured.err == (
-                    "wf_pass_tuple-1 is RUNNING. Sleeping for 4.0s...\n"
-                    "wf_pass_tuple-1 is RUNNING. Sleeping for 4.0s...\n"
+                    "wf_pass_tuple-1 is RUNNING. Sleeping for 0.5s...\n"
+                    "wf_pass_tuple-1 is RUNNING. Sleeping for 1.0s...\n"
                     "wf_pass_tuple-1 is SUCCEEDED\n"
                 )
 
@@ -415,6 +423,31 @@ class TestWorkflowRun:
                 assert captured.out == ""
                 assert captured.err == ""
 
+            @staticmethod
+            def test_backs_off_up_to_frequency(monkeypatch, run, mock_runtime):
+                # Given
+                sleep = MagicMock()
+                monkeypatch.setattr(time, "sleep", sleep)
+                monkeypatch.setattr(_waiting, "_JITTER", 0.0)
+                running_wf_run_model = Mock()
+                running_wf_run_model.status.state = State.RUNNING
+                mock_runtime.get_workflow_run_status.side_effect = itertools.chain(
+                    itertools.repeat(running_wf_run_model, 5),
+                    itertools.repeat(DEFAULT),
+                )
+
+                # When
+                run.wait_until_finished(frequency=1.0, verbose=False)
+
+                # Then
+                assert [c.args[0] for c in sleep.call_args_list] == [
+                    0.5,
+                    1.0,
+                    1.0,
+                    1.0,
+                    1.0,
+                ]
+
     class TestGetResults:
         @staticmethod
         def test_raises_exception_if_workflow_not_finished(run):
@@ -451,6 +484,34 @@ class TestWorkflowRun:
             assert results == "woohoo!"
             assert mock_runtime.get_workflow_run_status.call_count == 1
 
+        @staticmethod
+        @pytest.mark.parametrize(
+            "runtime_name, n_fetches", [("RAY_LOCAL", 1), ("IN_PROCESS", 2)]
+        )
+        def test_cached_for_runtimes_outliving_the_process(
+            tmp_path, monkeypatch: pytest.MonkeyPatch, runtime_name, n_fetches
+        ):
+            # Given
+            monkeypatch.setenv("ORQ_ARTIFACT_CACHE_PATH", str(tmp_path))
+            runtime = create_autospec(RuntimeInterface)
+            runtime.get_workflow_run_status.return_value.status.state = State.SUCCEEDED
+            runtime.get_workflow_run_outputs_non_blocking.return_value = (
+                serde.result_from_artifact("woohoo!", ir.ArtifactFormat.AUTO),
+            )
+            run = _api.WorkflowRun(
+                run_id="wf.1",
+                wf_def=create_autospec(ir.WorkflowDef),
+                runtime=runtime,
+                config=_api.RuntimeConfig(runtime_name, "test", True),
+            )
+
+            # When
+            results = [run.get_results() for _ in range(2)]
+
+            # Then
+            assert results == ["woohoo!"] * 2
+            assert runtime.get_workflow_run_outputs_non_blocking.call_count == n_fetches
+
     class TestGetArtifacts:
         @staticmethod
         def test_handling_n_outputs():
@@ -532,6 +593,22 @@ class TestWorkflowRun:
             assert len(logs[expected_inv]) == 1
             assert logs[expected_inv][0] == "woohoo!\n"
 
+    class TestIterLogs:
+        @staticmethod
+        @pytest.mark.parametrize("follow", [True, False])
+        def test_passes_follow(run, mock_runtime, follow: bool):
+            # Given
+            mock_runtime.iter_workflow_logs.return_value = iter([("inv", "line")])
+
+            # When
+            logs = list(run.iter_logs(follow=follow))
+
+            # Then
+            assert logs == [("inv", "line")]
+            mock_runtime.iter_workflow_logs.assert_called_once_with(
+                run.run_id, follow=follow
+            )
+
     class TestGetConfig:
         @staticmethod
         def test_happy_path():
@@ -611,7 +688,7 @@ class TestListWorkflows:
         type(run).id = PropertyMock(side_effect=["wf0", "wf1", "wf2"])
         runtime = Mock(RuntimeInterface)
         # For getting workflow ID
-        runtime.list_workflow_runs.return_value = [run, run, run]
+        runtime.iter_workflow_runs.return_value = iter([run, run, run])
         mock_config = MagicMock(_api.RuntimeConfig)
         mock_config._get_runtime.return_value = runtime
         monkeypatch.setattr(
@@ -630,6 +707,57 @@ class TestListWorkflows:
         assert runs[1].run_id == "wf1"
         assert runs[2].run_id == "wf2"
 
+    def test_iter_yields_runs_as_they_arrive(self, mock_config_runtime):
+        # Given
+        received = []
+
+        def _runs(**kwargs):
+            for run_id in ["wf0", "wf1"]:
+                run = Mock()
+                run.id = run_id
+                received.append(run_id)
+                yield run
+
+        mock_config_runtime.iter_workflow_runs.side_effect = _runs
+
+        # When
+        runs = _api.iter_workflow_runs("mocked_config")
+        first = next(runs)
+
+        # Then
+        assert first.run_id == "wf0"
+        assert received == ["wf0"]
+        assert [run.run_id for run in runs] == ["wf1"]
+
+    def test_iter_statuses_reuses_listed_statuses(self, mock_config_runtime):
+        # Given
+        listed_with_status = WorkflowRunModel(
+            id="wf.1",
+            workflow_def=create_autospec(ir.WorkflowDef),
+            task_runs=[],
+            status=RunStatus(state=State.RUNNING, start_time=None, end_time=None),
+        )
+        listed_without_status = WorkflowRunMinimal(
+            id="wf.2", workflow_def=create_autospec(ir.WorkflowDef)
+        )
+        mock_config_runtime.iter_workflow_runs.return_value = iter(
+            [listed_with_status, listed_without_status]
+        )
+
+        # When
+        statuses = list(_api.iter_workflow_run_statuses("mocked_config"))
+
+        # Then
+        assert statuses == [
+            listed_with_status,
+            mock_config_runtime.get_workflow_run_status.return_value,
+        ]
+        mock_config_runtime.get_workflow_run_status.assert_called_once_with("wf.2")
+
+    def test_iter_raises_on_call(self, mock_config_runtime):
+        with pytest.raises(ProjectInvalidError):
+            _ = _api.iter_workflow_runs("mocked_config", project="<project sentinel>")
+
     def test_invalid_max_age(self, mock_config_runtime):
         # Given
         # When
@@ -652,7 +780,7 @@ class TestListWorkflows:
         # When
         _ = _api.list_workflow_runs("mocked_config", max_age=max_age)
         # Then
-        mock_config_runtime.list_workflow_runs.assert_called_once_with(
+        mock_config_runtime.iter_workflow_runs.assert_called_once_with(
             limit=None,
             max_age=delta,
             state=None,
@@ -665,7 +793,7 @@ class TestListWorkflows:
         # When
         _ = _api.list_workflow_runs("mocked_config", limit=10)
         # Then
-        mock_config_runtime.list_workflow_runs.assert_called_once_with(
+        mock_config_runtime.iter_workflow_runs.assert_called_once_with(
             limit=10,
             max_age=None,
             state=None,
@@ -678,7 +806,7 @@ class TestListWorkflows:
         # When
         _ = _api.list_workflow_runs("mocked_config", state=State.SUCCEEDED)
         # Then
-        mock_config_runtime.list_workflow_runs.assert_called_once_with(
+        mock_config_runtime.iter_workflow_runs.assert_called_once_with(
             limit=None,
             max_age=None,
             state=State.SUCCEEDED,
@@ -694,7 +822,7 @@ class TestListWorkflows:
         )
 
         # THEN
-        mock_config_runtime.list_workflow_runs.assert_called_once_with(
+        mock_config_runtime.iter_workflow_runs.assert_called_once_with(
             limit=None,
             max_age=None,
             state=None,
@@ -712,7 +840,7 @@ class TestListWorkflows:
         )
 
         # THEN
-        mock_config_runtime.list_workflow_runs.assert_called_once_with(
+        mock_config_runtime.iter_workflow_runs.assert_called_once_with(
             limit=None,
             max_age=None,
             state=None,
@@ -748,7 +876,7 @@ class TestListWorkflows:
         )
 
         # THEN
-        mock_config_runtime.list_workflow_runs.assert_called_once_with(
+        mock_config_runtime.iter_workflow_runs.assert_called_once_with(
             limit=None,
             max_age=None,
             state=None,
@@ -775,7 +903,7 @@ class TestListWorkflows:
         )
 
         # THEN
-        mock_config_runtime.list_workflow_runs.assert_called_once_with(
+        mock_config_runtime.iter_workflow_runs.assert_called_once_with(
             limit=None,
             max_age=None,
             state=None,
@@ -1,12 +1,17 @@
 # © Copyright 2022-2023 Zapata Computing Inc.
 ################################################################################
+import threading
+import time
+import typing as t
 from datetime import timedelta
 from pathlib import Path
-from unittest.mock import DEFAULT, MagicMock, Mock, call, create_autospec
+from unittest.mock import MagicMock, Mock, call, create_autospec
 
 import pytest
+import requests
 
 from orquestra.sdk import Project, Workspace, exceptions
+from orquestra.sdk._base import _log_follow
 from orquestra.sdk._base._driver import _ce_runtime, _client, _exceptions, _models
 from orquestra.sdk._base._testing._example_wfs import (
     my_workflow,
@@ -69,6 +74,21 @@ def mocked_client(monkeypatch: pytest.MonkeyPatch):
     return mocked_client
 
 
+def _artifacts_by_id(artifacts: dict):
+    """
+    Side effect for ``get_workflow_run_artifact`` that doesn't depend on the order of
+    the calls. Exceptions are raised.
+    """
+
+    def _get_artifact(artifact_id):
+        artifact = artifacts[artifact_id]
+        if isinstance(artifact, Exception):
+            raise artifact
+        return artifact
+
+    return _get_artifact
+
+
 @pytest.fixture
 def workflow_def_id():
     return "00000000-0000-0000-0000-000000000000"
@@ -412,6 +432,50 @@ class TestGetWorkflowRunStatus:
             _ = runtime.get_workflow_run_status(workflow_run_id)
 
 
+class TestGetWorkflowRunStates:
+    def test_happy_path(self, mocked_client: MagicMock, runtime: _ce_runtime.CERuntime):
+        # Given
+        states = {"wf.1": State.RUNNING, "wf.2": State.SUCCEEDED}
+        mocked_client.get_workflow_run_status.side_effect = lambda run_id: RunStatus(
+            state=states[run_id], start_time=None, end_time=None
+        )
+
+        # When
+        result = runtime.get_workflow_run_states(["wf.1", "wf.2"])
+
+        # Then
+        assert result == states
+        mocked_client.get_workflow_run.assert_not_called()
+
+    def test_empty(self, mocked_client: MagicMock, runtime: _ce_runtime.CERuntime):
+        assert runtime.get_workflow_run_states([]) == {}
+
+    @pytest.mark.parametrize(
+        "failure_exc, expected_exc",
+        [
+            (
+                _exceptions.WorkflowRunNotFound("wf.1"),
+                exceptions.WorkflowRunNotFoundError,
+            ),
+            (_exceptions.InvalidTokenError, exceptions.UnauthorizedError),
+        ],
+    )
+    def test_failure(
+        self,
+        mocked_client: MagicMock,
+        runtime: _ce_runtime.CERuntime,
+        failure_exc: Exception,
+        expected_exc: t.Type[Exception],
+    ):
+        # Given
+        mocked_client.get_workflow_run_status.side_effect = failure_exc
+
+        # Then
+        with pytest.raises(expected_exc):
+            # When
+            _ = runtime.get_workflow_run_states(["wf.1"])
+
+
 class TestGetWorkflowRunResultsNonBlocking:
     def test_happy_path(
         self,
@@ -637,7 +701,7 @@ class TestGetAvailableOutputs:
             workflow_run_id
         )
         mocked_client.get_workflow_run_artifact.assert_has_calls(
-            [call("wf-art-1"), call("wf-art-3")]
+            [call("wf-art-1"), call("wf-art-3")], any_order=True
         )
         assert results == {
             "task-inv-1": JSONResult(value="1"),
@@ -744,7 +808,7 @@ class TestGetAvailableOutputs:
                 workflow_run_id
             )
             mocked_client.get_workflow_run_artifact.assert_has_calls(
-                [call("wf-art-1"), call("wf-art-3")]
+                [call("wf-art-1"), call("wf-art-3")], any_order=True
             )
             assert results == {}
 
@@ -755,10 +819,11 @@ class TestGetAvailableOutputs:
             workflow_run_id: str,
         ):
             # Given
-            mocked_client.get_workflow_run_artifact.return_value = JSONResult(value="1")
-            mocked_client.get_workflow_run_artifact.side_effect = (
-                DEFAULT,
-                Exception,
+            mocked_client.get_workflow_run_artifact.side_effect = _artifacts_by_id(
+                {
+                    "wf-art-1": JSONResult(value="1"),
+                    "wf-art-3": Exception(),
+                }
             )
 
             # When
@@ -769,7 +834,7 @@ class TestGetAvailableOutputs:
                 workflow_run_id
             )
             mocked_client.get_workflow_run_artifact.assert_has_calls(
-                [call("wf-art-1"), call("wf-art-3")]
+                [call("wf-art-1"), call("wf-art-3")], any_order=True
             )
             assert results == {"task-inv-1": JSONResult(value="1")}
 
@@ -780,10 +845,11 @@ class TestGetAvailableOutputs:
             workflow_run_id: str,
         ):
             # Given
-            mocked_client.get_workflow_run_artifact.return_value = JSONResult(value="1")
-            mocked_client.get_workflow_run_artifact.side_effect = (
-                Exception,
-                DEFAULT,
+            mocked_client.get_workflow_run_artifact.side_effect = _artifacts_by_id(
+                {
+                    "wf-art-1": Exception(),
+                    "wf-art-3": JSONResult(value="1"),
+                }
             )
 
             # When
@@ -794,7 +860,7 @@ class TestGetAvailableOutputs:
                 workflow_run_id
             )
             mocked_client.get_workflow_run_artifact.assert_has_calls(
-                [call("wf-art-1"), call("wf-art-3")]
+                [call("wf-art-1"), call("wf-art-3")], any_order=True
             )
             assert results == {
                 "task-inv-2": JSONResult(value="1"),
@@ -802,6 +868,7 @@ class TestGetAvailableOutputs:
 
         def test_unknown_http(
             self,
+            monkeypatch: pytest.MonkeyPatch,
             mocked_client: MagicMock,
             runtime: _ce_runtime.CERuntime,
             workflow_run_id: str,
@@ -810,6 +877,7 @@ class TestGetAvailableOutputs:
             mocked_client.get_workflow_run_artifact.side_effect = (
                 _exceptions.UnknownHTTPError(MagicMock())
             )
+            monkeypatch.setattr(_ce_runtime._retry.time, "sleep", Mock())
 
             # When
             results = runtime.get_available_outputs(workflow_run_id)
@@ -819,7 +887,7 @@ class TestGetAvailableOutputs:
                 workflow_run_id
             )
             mocked_client.get_workflow_run_artifact.assert_has_calls(
-                [call("wf-art-1"), call("wf-art-3")]
+                [call("wf-art-1"), call("wf-art-3")], any_order=True
             )
             assert results == {}
 
@@ -844,10 +912,199 @@ class TestGetAvailableOutputs:
                 workflow_run_id
             )
             mocked_client.get_workflow_run_artifact.assert_has_calls(
-                [call("wf-art-1"), call("wf-art-3")]
+                [call("wf-art-1"), call("wf-art-3")], any_order=True
             )
             assert results == {}
 
+            # Auth errors aren't retried
+            assert mocked_client.get_workflow_run_artifact.call_count == 2
+
+        @pytest.mark.parametrize(
+            "failure_exc",
+            [
+                _exceptions.UnknownHTTPError(MagicMock()),
+                requests.ConnectionError(),
+                requests.Timeout(),
+            ],
+        )
+        def test_retries_transient_failures(
+            self,
+            monkeypatch: pytest.MonkeyPatch,
+            mocked_client: MagicMock,
+            runtime: _ce_runtime.CERuntime,
+            workflow_run_id: str,
+            failure_exc: Exception,
+        ):
+            # Given
+            attempts = {"wf-art-1": 0, "wf-art-3": 0}
+
+            def _flaky_get_artifact(artifact_id):
+                attempts[artifact_id] += 1
+                if attempts[artifact_id] < 3:
+                    raise failure_exc
+                return JSONResult(value=artifact_id)
+
+            mocked_client.get_workflow_run_artifact.side_effect = _flaky_get_artifact
+            monkeypatch.setattr(_ce_runtime._retry.time, "sleep", Mock())
+
+            # When
+            results = runtime.get_available_outputs(workflow_run_id)
+
+            # Then
+            assert results == {
+                "task-inv-1": JSONResult(value="wf-art-1"),
+                "task-inv-2": JSONResult(value="wf-art-3"),
+            }
+            assert attempts == {"wf-art-1": 3, "wf-art-3": 3}
+
+    class TestConcurrentDownloads:
+        @pytest.fixture
+        def mocked_client(self, mocked_client: MagicMock, workflow_run_id):
+            mocked_client.get_workflow_run_artifacts.return_value = {
+                f"{workflow_run_id}@task-inv-{i}": [f"wf-art-{i}"] for i in range(20)
+            }
+            return mocked_client
+
+        @staticmethod
+        def _track_concurrency(mocked_client: MagicMock):
+            lock = threading.Lock()
+            in_flight = []
+            max_in_flight = []
+
+            def _get_artifact(artifact_id):
+                with lock:
+                    in_flight.append(artifact_id)
+                    max_in_flight.append(len(in_flight))
+                time.sleep(0.01)
+                with lock:
+                    in_flight.remove(artifact_id)
+                return JSONResult(value=artifact_id)
+
+            mocked_client.get_workflow_run_artifact.side_effect = _get_artifact
+            return max_in_flight
+
+        def test_results_dont_depend_on_completion_order(
+            self,
+            mocked_client: MagicMock,
+            runtime: _ce_runtime.CERuntime,
+            workflow_run_id: str,
+        ):
+            # Given
+            def _get_artifact(artifact_id):
+                # Later artifacts finish first
+                time.sleep((20 - int(artifact_id.split("-")[-1])) / 1000)
+                return JSONResult(value=artifact_id)
+
+            mocked_client.get_workflow_run_artifact.side_effect = _get_artifact
+
+            # When
+            results = runtime.get_available_outputs(workflow_run_id)
+
+            # Then
+            assert results == {
+                f"task-inv-{i}": JSONResult(value=f"wf-art-{i}") for i in range(20)
+            }
+            assert list(results) == [f"task-inv-{i}" for i in range(20)]
+
+        def test_default_limit(
+            self,
+            mocked_client: MagicMock,
+            runtime: _ce_runtime.CERuntime,
+            workflow_run_id: str,
+        ):
+            # Given
+            max_in_flight = self._track_concurrency(mocked_client)
+
+            # When
+            results = runtime.get_available_outputs(workflow_run_id)
+
+            # Then
+            assert len(results) == 20
+            assert (
+                1
+                < max(max_in_flight)
+                <= _ce_runtime.DEFAULT_ARTIFACT_DOWNLOAD_CONCURRENCY
+            )
+
+        @pytest.mark.parametrize("limit", [1, 3])
+        def test_configured_limit(
+            self,
+            monkeypatch: pytest.MonkeyPatch,
+            mocked_client: MagicMock,
+            workflow_run_id: str,
+            limit: int,
+        ):
+            # Given
+            monkeypatch.setenv("ORQ_CE_ARTIFACT_DOWNLOAD_CONCURRENCY", str(limit))
+            runtime = _ce_runtime.CERuntime(
+                RuntimeConfiguration(
+                    config_name="hello",
+                    runtime_name=RuntimeName.CE_REMOTE,
+                    runtime_options={"uri": "http://localhost", "token": "blah"},
+                )
+            )
+            max_in_flight = self._track_concurrency(mocked_client)
+
+            # When
+            results = runtime.get_available_outputs(workflow_run_id)
+
+            # Then
+            assert len(results) == 20
+            assert max(max_in_flight) <= limit
+            mocked_client.from_token.assert_called_with(
+                base_uri="http://localhost", token="blah", max_connections=limit
+            )
+
+        def test_invalid_limit(self, monkeypatch: pytest.MonkeyPatch):
+            # Given
+            monkeypatch.setenv("ORQ_CE_ARTIFACT_DOWNLOAD_CONCURRENCY", "many")
+
+            # Then
+            with pytest.raises(exceptions.RuntimeConfigError):
+                _ = _ce_runtime.CERuntime(
+                    RuntimeConfiguration(
+                        config_name="hello",
+                        runtime_name=RuntimeName.CE_REMOTE,
+                        runtime_options={"uri": "http://localhost", "token": "blah"},
+                    )
+                )
+
+
+class TestGetOutputs:
+    def test_downloads_selected_artifacts_only(
+        self,
+        mocked_client: MagicMock,
+        runtime: _ce_runtime.CERuntime,
+        workflow_run_id: str,
+    ):
+        # Given
+        mocked_client.get_workflow_run_artifacts.return_value = {
+            f"{workflow_run_id}@task-inv-1": ["wf-art-1"],
+            f"{workflow_run_id}@task-inv-2": ["wf-art-3"],
+        }
+        mocked_client.get_workflow_run_artifact.return_value = JSONResult(value="1")
+
+        # When
+        results = runtime.get_outputs(workflow_run_id, ["task-inv-2", "task-inv-4"])
+
+        # Then
+        mocked_client.get_workflow_run_artifact.assert_called_once_with("wf-art-3")
+        assert results == {"task-inv-2": JSONResult(value="1")}
+
+    def test_workflow_run_not_found(
+        self,
+        mocked_client: MagicMock,
+        runtime: _ce_runtime.CERuntime,
+        workflow_run_id: str,
+    ):
+        # Given
+        mocked_client.get_workflow_run_artifacts.side_effect = (
+            _exceptions.WorkflowRunNotFound(workflow_run_id)
+        )
+        # When
+        with pytest.raises(exceptions.WorkflowRunNotFoundError):
+            _ = runtime.get_outputs(workflow_run_id, ["task-inv-1"])
+
 
 class TestStopWorkflowRun:
     def test_happy_path(
@@ -1043,6 +1300,98 @@ class TestListWorkflowRuns:
         # Then
         mocked_client.list_workflow_runs.assert_has_calls(expected_requests)
 
+    def test_follows_pages_without_limit(
+        self,
+        mocked_client: MagicMock,
+        runtime: _ce_runtime.CERuntime,
+    ):
+        # Given
+        pages = [[Mock() for _ in range(3)] for _ in range(3)]
+        mocked_client.list_workflow_runs.side_effect = [
+            _client.Paginated(contents=pages[0], next_page_token="<token 0>"),
+            _client.Paginated(contents=pages[1], next_page_token="<token 1>"),
+            _client.Paginated(contents=pages[2]),
+        ]
+
+        # When
+        runs = runtime.list_workflow_runs()
+
+        # Then
+        assert runs == pages[0] + pages[1] + pages[2]
+        mocked_client.list_workflow_runs.assert_has_calls(
+            [
+                call(page_size=None, page_token=None, workspace=None, project=None),
+                call(
+                    page_size=None, page_token="<token 0>", workspace=None, project=None
+                ),
+                call(
+                    page_size=None, page_token="<token 1>", workspace=None, project=None
+                ),
+            ]
+        )
+
+    def test_limit_multiple_of_page_size(
+        self,
+        mocked_client: MagicMock,
+        runtime: _ce_runtime.CERuntime,
+    ):
+        # Given
+        mocked_client.list_workflow_runs.side_effect = [
+            _client.Paginated(
+                contents=[Mock() for _ in range(100)],
+                next_page_token=f"<token sentinel {i}>",
+            )
+            for i in range(3)
+        ]
+
+        # When
+        runs = runtime.list_workflow_runs(limit=200)
+
+        # Then
+        assert len(runs) == 200
+        # No request for an empty page.
+        assert mocked_client.list_workflow_runs.call_count == 2
+
+    def test_iter_prefetches_one_page(
+        self,
+        mocked_client: MagicMock,
+        runtime: _ce_runtime.CERuntime,
+    ):
+        # Given
+        mocked_client.list_workflow_runs.side_effect = [
+            _client.Paginated(
+                contents=[Mock() for _ in range(10)],
+                next_page_token=f"<token sentinel {i}>",
+            )
+            for i in range(5)
+        ]
+
+        # When
+        runs = runtime.iter_workflow_runs()
+        _ = next(runs)
+        # The next page is fetched in the background.
+        for _ in range(100):
+            if mocked_client.list_workflow_runs.call_count == 2:
+                break
+            time.sleep(0.01)
+        runs.close()
+
+        # Then
+        # Nothing else is fetched after the consumer stops.
+        time.sleep(0.05)
+        assert mocked_client.list_workflow_runs.call_count == 2
+
+    def test_iter_is_lazy(
+        self,
+        mocked_client: MagicMock,
+        runtime: _ce_runtime.CERuntime,
+    ):
+        # When
+        _ = runtime.iter_workflow_runs()
+
+        # Then
+        mocked_client.list_workflow_runs.assert_not_called()
+
     @pytest.mark.xfail(reason="Filtering not available in CE runtime yet")
     def test_filter_args_passed_to_client(
         self,
@@ -1092,9 +1441,6 @@ class TestListWorkflowRuns:
 
 
 class TestGetWorkflowLogs:
-    @pytest.mark.xfail(
-        reason="Until ORQSDK-777 is done, we're ignoring task invocation ids to avoid splitting up sdk and ray logs."  # noqa: E501
-    )
     def test_happy_path(
         self,
         mocked_client: MagicMock,
@@ -1102,54 +1448,24 @@ class TestGetWorkflowLogs:
         workflow_run_id: str,
     ):
         # Given
-        wf_logs = [
-            Mock(wf_run_id="<wf id sentinel 1>", message="<message sentinel 1>"),
-            Mock(wf_run_id="<wf id sentinel 1>", message="<message sentinel 2>"),
-            Mock(wf_run_id="<wf id sentinel 2>", message="<message sentinel 3>"),
-        ]
-        mocked_client.get_workflow_run_logs.return_value = wf_logs
-
-        # When
-        logs = runtime.get_workflow_logs(workflow_run_id)
-
-        # Then
-        mocked_client.get_workflow_run_logs.assert_called_once_with(workflow_run_id)
-        assert logs == {
-            "<wf id sentinel 1>": ["<message sentinel 1>", "<message sentinel 2>"],
-            "<wf id sentinel 2>": ["<message sentinel 3>"],
-        }
-
-    def test_ignore_task_inv_id(
-        self,
-        mocked_client: MagicMock,
-        runtime: _ce_runtime.CERuntime,
-        workflow_run_id: str,
-    ):
-        """
-        TODO: This test covers a stopgap measure that will no longer be needed after
-        ORQSDK-777. Remove it as soon as possible.
-        """
-        # Given
-        wf_logs = [
-            "<message sentinel 1>",
-            "<message sentinel 2>",
-            "<message sentinel 3>",
-            "<message sentinel 4>",
-        ]
-        mocked_client.get_workflow_run_logs.return_value = wf_logs
+        mocked_client.iter_workflow_run_logs.return_value = iter(
+            [
+                ("inv1", "<message sentinel 1>"),
+                (None, "<ray message sentinel>"),
+                ("inv2", "<message sentinel 2>"),
+                ("inv1", "<message sentinel 3>"),
+            ]
+        )
 
         # When
         logs = runtime.get_workflow_logs(workflow_run_id)
 
         # Then
-        mocked_client.get_workflow_run_logs.assert_called_once_with(workflow_run_id)
+        mocked_client.iter_workflow_run_logs.assert_called_once_with(workflow_run_id)
         assert logs == {
-            "UNKNOWN TASK INV ID": [
-                "<message sentinel 1>",
-                "<message sentinel 2>",
-                "<message sentinel 3>",
-                "<message sentinel 4>",
-            ]
+            "inv1": ["<message sentinel 1>", "<message sentinel 3>"],
+            _ce_runtime.UNKNOWN_TASK_INV_ID: ["<ray message sentinel>"],
+            "inv2": ["<message sentinel 2>"],
         }
 
     @pytest.mark.parametrize(
@@ -1175,12 +1491,104 @@ class TestGetWorkflowLogs:
         expected_exception,
     ):
         # Given
-        mocked_client.get_workflow_run_logs.side_effect = exception(MagicMock())
+        mocked_client.iter_workflow_run_logs.side_effect = exception(MagicMock())
 
         # When
         with pytest.raises(expected_exception):
             runtime.get_workflow_logs(workflow_run_id)
 
+    def test_exception_while_streaming(
+        self,
+        mocked_client: MagicMock,
+        runtime: _ce_runtime.CERuntime,
+        workflow_run_id: str,
+    ):
+        # Given
+        def _logs():
+            yield "inv1", "<message sentinel>"
+            raise _exceptions.WorkflowRunLogsNotReadable(workflow_run_id)
+
+        mocked_client.iter_workflow_run_logs.return_value = _logs()
+
+        # When
+        with pytest.raises(exceptions.InvalidWorkflowRunLogsError):
+            runtime.get_workflow_logs(workflow_run_id)
+
+
+class TestGetTaskLogs:
+    def test_happy_path(
+        self,
+        mocked_client: MagicMock,
+        runtime: _ce_runtime.CERuntime,
+        workflow_run_id: str,
+    ):
+        # Given
+        mocked_client.iter_workflow_run_logs.return_value = iter(
+            [
+                ("inv1", "<message sentinel 1>"),
+                (None, "<ray message sentinel>"),
+                ("inv2", "<message sentinel 2>"),
+                ("inv1", "<message sentinel 3>"),
+            ]
+        )
+
+        # When
+        logs = runtime.get_task_logs(workflow_run_id, "inv1")
+
+        # Then
+        assert logs == ["<message sentinel 1>", "<message sentinel 3>"]
+
+
+class TestIterWorkflowLogs:
+    @staticmethod
+    @pytest.fixture
+    def no_sleep(monkeypatch: pytest.MonkeyPatch):
+        monkeypatch.setattr(_log_follow, "LOGS_POLL_INTERVAL", 0)
+
+    def test_snapshot(
+        self,
+        mocked_client: MagicMock,
+        runtime: _ce_runtime.CERuntime,
+        workflow_run_id: str,
+    ):
+        # Given
+        mocked_client.iter_workflow_run_logs.return_value = iter(
+            [("inv1", "line 1"), (None, "line 2")]
+        )
+
+        # When
+        logs = list(runtime.iter_workflow_logs(workflow_run_id))
+
+        # Then
+        assert logs == [("inv1", "line 1"), (_ce_runtime.UNKNOWN_TASK_INV_ID, "line 2")]
+        mocked_client.get_workflow_run_status.assert_not_called()
+
+    @pytest.mark.usefixtures("no_sleep")
+    def test_follow_yields_only_new_lines(
+        self,
+        mocked_client: MagicMock,
+        runtime: _ce_runtime.CERuntime,
+        workflow_run_id: str,
+    ):
+        # Given
+        mocked_client.iter_workflow_run_logs.side_effect = [
+            iter([("inv1", "line 1")]),
+            iter([("inv1", "line 1")]),
+            iter([("inv1", "line 1"), ("inv2", "line 2"), ("inv1", "line 3")]),
+        ]
+        mocked_client.get_workflow_run_status.side_effect = [
+            Mock(state=State.WAITING),
+            Mock(state=State.RUNNING),
+            Mock(state=State.SUCCEEDED),
+        ]
+
+        # When
+        logs = list(runtime.iter_workflow_logs(workflow_run_id, follow=True))
+
+        # Then
+        assert logs == [("inv1", "line 1"), ("inv2", "line 2"), ("inv1", "line 3")]
+        assert mocked_client.iter_workflow_run_logs.call_count == 3
+
 
 class TestListWorkspaces:
     def test_happy_path(
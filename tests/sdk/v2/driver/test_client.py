@@ -4,6 +4,7 @@
 """
 Tests for orquestra.sdk._base._driver._client.
 """
+from datetime import datetime, timezone
 from typing import Any, Dict
 from unittest.mock import create_autospec
 
@@ -16,6 +17,7 @@ from orquestra.sdk._base._driver import _exceptions
 from orquestra.sdk._base._driver._client import DriverClient, Paginated
 from orquestra.sdk._base._driver._models import GetWorkflowDefResponse, Resources
 from orquestra.sdk._base._spaces._structs import ProjectRef
+from orquestra.sdk._ray._ray_logs import WFLog
 from orquestra.sdk.schema.ir import WorkflowDef
 from orquestra.sdk.schema.responses import JSONResult, PickleResult
 from orquestra.sdk.schema.workflow_run import RunStatus, State, TaskRun
@@ -67,6 +69,17 @@ class TestClient:
     def client(self, base_uri, token):
         return DriverClient.from_token(base_uri=base_uri, token=token)
 
+    @staticmethod
+    def test_max_connections(base_uri, token):
+        # When
+        client = DriverClient.from_token(
+            base_uri=base_uri, token=token, max_connections=16
+        )
+
+        # Then
+        adapter = client._session.get_adapter(base_uri)
+        assert adapter._pool_maxsize == 16  # type: ignore
+
     @pytest.fixture
     def workflow_def_id(self):
         return "00000000-0000-0000-0000-000000000000"
@@ -137,6 +150,53 @@ class TestClient:
                 assert returned_wf_def.project == "emiliano's project"
                 assert returned_wf_def.sdkVersion == "0x859"
 
+            @staticmethod
+            def test_fetched_once(
+                endpoint_mocker,
+                mocked_responses,
+                client: DriverClient,
+                workflow_def_id: str,
+                workflow_def: WorkflowDef,
+            ):
+                # Given
+                endpoint_mocker(
+                    json=resp_mocks.make_get_wf_def_response(
+                        id_=workflow_def_id, wf_def=workflow_def
+                    ),
+                )
+
+                # When
+                defs = [client.get_workflow_def(workflow_def_id) for _ in range(3)]
+
+                # Then
+                assert len(mocked_responses.calls) == 1
+                assert all(wf_def is defs[0] for wf_def in defs)
+                stats = client.workflow_def_cache_stats()
+                assert (stats.hits, stats.misses) == (2, 1)
+
+            @staticmethod
+            def test_errors_are_not_cached(
+                endpoint_mocker,
+                client: DriverClient,
+                workflow_def_id: str,
+                workflow_def: WorkflowDef,
+            ):
+                # Given
+                endpoint_mocker(status=500)
+                endpoint_mocker(
+                    json=resp_mocks.make_get_wf_def_response(
+                        id_=workflow_def_id, wf_def=workflow_def
+                    ),
+                )
+                with pytest.raises(_exceptions.UnknownHTTPError):
+                    _ = client.get_workflow_def(workflow_def_id)
+
+                # When
+                returned_wf_def = client.get_workflow_def(workflow_def_id)
+
+                # Then
+                assert returned_wf_def.workflow == workflow_def
+
             @staticmethod
             def test_sets_auth(
                 endpoint_mocker,
@@ -639,6 +699,7 @@ class TestClient:
                 function_mock = create_autospec(client.get_workflow_def)
                 function_mock.return_value = mock
                 monkeypatch.setattr(client, "get_workflow_def", function_mock)
+                return function_mock
 
             @staticmethod
             def test_invalid_wf_run_id(
@@ -756,6 +817,42 @@ class TestClient:
                 with pytest.raises(_exceptions.UnknownHTTPError):
                     _ = client.get_workflow_run(workflow_run_id)
 
+            @staticmethod
+            def test_status_only(
+                endpoint_mocker,
+                mock_get_workflow_def,
+                client: DriverClient,
+                workflow_run_id,
+                workflow_def_id,
+                workflow_run_status,
+                workflow_run_tasks,
+            ):
+                # Given
+                endpoint_mocker(
+                    json=resp_mocks.make_get_wf_run_response(
+                        id_=workflow_run_id,
+                        workflow_def_id=workflow_def_id,
+                        status=workflow_run_status,
+                        task_runs=workflow_run_tasks,
+                    ),
+                )
+
+                # When
+                status = client.get_workflow_run_status(workflow_run_id)
+
+                # Then
+                assert status == workflow_run_status
+                mock_get_workflow_def.assert_not_called()
+
+            @staticmethod
+            def test_status_of_missing_wf_run(
+                endpoint_mocker, client: DriverClient, workflow_run_id: str
+            ):
+                endpoint_mocker(status=404)
+
+                with pytest.raises(_exceptions.WorkflowRunNotFound):
+                    _ = client.get_workflow_run_status(workflow_run_id)
+
         class TestList:
             @staticmethod
             @pytest.fixture
@@ -808,6 +905,40 @@ class TestClient:
                 assert defs.next_page_token is None
                 assert defs.prev_page_token is None
 
+            @staticmethod
+            def test_shared_workflow_def_is_fetched_once(
+                endpoint_mocker,
+                mocked_responses,
+                base_uri: str,
+                client: DriverClient,
+                workflow_run_id: str,
+                workflow_def_id: str,
+                workflow_def: WorkflowDef,
+            ):
+                # Given
+                endpoint_mocker(
+                    json=resp_mocks.make_list_wf_run_response(
+                        ids=[workflow_run_id] * 10,
+                        workflow_def_ids=[workflow_def_id] * 10,
+                    )
+                )
+                mocked_responses.add(
+                    responses.GET,
+                    f"{base_uri}/api/workflow-definitions/{workflow_def_id}",
+                    json=resp_mocks.make_get_wf_def_response(
+                        id_=workflow_def_id, wf_def=workflow_def
+                    ),
+                )
+
+                # When
+                runs = client.list_workflow_runs()
+
+                # Then
+                assert len(runs.contents) == 10
+                # One request for the list and one for the workflow def
+                assert len(mocked_responses.calls) == 2
+                assert client.workflow_def_cache_stats().hit_rate == 0.9
+
             @staticmethod
             def test_list_workflow_runs_with_pagination(
                 endpoint_mocker,
@@ -1691,6 +1822,65 @@ class TestClient:
                     ":actor_name:WorkflowManagementActor",
                 ]
 
+            @staticmethod
+            def test_groups_by_task_inv_id(
+                endpoint_mocker, client: DriverClient, workflow_run_id: str
+            ):
+                # Given
+                def _wf_log(message: str, task_inv_id: str) -> str:
+                    return WFLog(
+                        timestamp=datetime(2023, 3, 14, tzinfo=timezone.utc),
+                        level="INFO",
+                        filename="tasks.py:42",
+                        message=message,
+                        wf_run_id=workflow_run_id,
+                        task_inv_id=task_inv_id,
+                        task_run_id=f"{workflow_run_id}@{task_inv_id}",
+                    ).json()
+
+                endpoint_mocker(
+                    body=resp_mocks.make_wf_run_logs_archive(
+                        [
+                            [_wf_log("hello", "inv1"), ":task_name:foo"],
+                            [_wf_log("there", "inv2"), _wf_log("again", "inv1")],
+                        ]
+                    ),
+                )
+
+                # When
+                logs = list(client.iter_workflow_run_logs(workflow_run_id))
+
+                # Then
+                assert logs == [
+                    ("inv1", "hello"),
+                    (None, ":task_name:foo"),
+                    ("inv2", "there"),
+                    ("inv1", "again"),
+                ]
+
+            @staticmethod
+            def test_missing_step_logs(
+                endpoint_mocker, client: DriverClient, workflow_run_id: str
+            ):
+                endpoint_mocker(
+                    body=resp_mocks.make_wf_run_logs_archive(
+                        [["hello"]], member_name="other"
+                    ),
+                )
+
+                with pytest.raises(_exceptions.WorkflowRunLogsNotReadable):
+                    _ = client.get_workflow_run_logs(workflow_run_id)
+
+            @staticmethod
+            def test_truncated_archive(
+                endpoint_mocker, client: DriverClient, workflow_run_id: str
+            ):
+                archive = resp_mocks.make_wf_run_logs_archive([["hello"] * 1000])
+                endpoint_mocker(body=archive[: len(archive) // 2])
+
+                with pytest.raises(_exceptions.WorkflowRunLogsNotReadable):
+                    _ = client.get_workflow_run_logs(workflow_run_id)
+
             @staticmethod
             def test_params_encoding(
                 endpoint_mocker, client: DriverClient, workflow_run_id: str
@@ -0,0 +1,174 @@
+################################################################################
+# © Copyright 2023 Zapata Computing Inc.
+################################################################################
+"""
+Tests for orquestra.sdk._base._driver._workflow_def_cache.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+
+import orquestra.sdk as sdk
+from orquestra.sdk._base._driver._models import GetWorkflowDefResponse
+from orquestra.sdk._base._driver._workflow_def_cache import WorkflowDefCache
+
+
+@sdk.task
+def _task():
+    return 1
+
+
+@sdk.workflow
+def _workflow():
+    return _task()
+
+
+WF_DEF_ID = "00000000-0000-0000-0000-000000000000"
+
+
+@pytest.fixture
+def wf_def_response():
+    return GetWorkflowDefResponse(
+        id=WF_DEF_ID,
+        created=datetime(2023, 1, 1, tzinfo=timezone.utc),
+        owner="evil/emiliano.zapata@zapatacomputing.com",
+        workflow=_workflow().model,
+        workspaceId="ws",
+        project="proj",
+        sdkVersion="0x859",
+    )
+
+
+class TestInMemory:
+    def test_fetches_once(self, wf_def_response):
+        # Given
+        cache = WorkflowDefCache()
+        fetch = Mock(return_value=wf_def_response)
+
+        # When
+        results = [cache.get(WF_DEF_ID, fetch) for _ in range(3)]
+
+        # Then
+        assert results == [wf_def_response] * 3
+        fetch.assert_called_once_with()
+        assert cache.stats() == (2, 1, 1)
+        assert cache.stats().hit_rate == pytest.approx(2 / 3)
+
+    def test_concurrent_lookups_share_a_request(self, wf_def_response):
+        # Given
+        cache = WorkflowDefCache()
+        release = threading.Event()
+        fetch = Mock()
+
+        def _slow_fetch():
+            fetch()
+            release.wait(timeout=5)
+            return wf_def_response
+
+        # When
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            futures = [
+                executor.submit(cache.get, WF_DEF_ID, _slow_fetch) for _ in range(8)
+            ]
+            release.set()
+            results = [future.result() for future in futures]
+
+        # Then
+        assert results == [wf_def_response] * 8
+        fetch.assert_called_once_with()
+        assert cache.stats() == (7, 1, 1)
+
+    def test_errors_are_not_cached(self, wf_def_response):
+        # Given
+        cache = WorkflowDefCache()
+        fetch = Mock(side_effect=[ConnectionError, wf_def_response])
+        with pytest.raises(ConnectionError):
+            _ = cache.get(WF_DEF_ID, fetch)
+
+        # When
+        result = cache.get(WF_DEF_ID, fetch)
+
+        # Then
+        assert result == wf_def_response
+        assert fetch.call_count == 2
+
+    def test_invalidate(self, wf_def_response):
+        # Given
+        cache = WorkflowDefCache()
+        fetch = Mock(return_value=wf_def_response)
+        _ = cache.get(WF_DEF_ID, fetch)
+
+        # When
+        cache.invalidate(WF_DEF_ID)
+        _ = cache.get(WF_DEF_ID, fetch)
+
+        # Then
+        assert fetch.call_count == 2
+
+    def test_empty_stats(self):
+        stats = WorkflowDefCache().stats()
+
+        assert stats == (0, 0, 0)
+        assert stats.hit_rate == 0.0
+
+
+class TestOnDisk:
+    def test_shared_across_instances(self, tmp_path: Path, wf_def_response):
+        # Given
+        fetch = Mock(return_value=wf_def_response)
+        _ = WorkflowDefCache(path=tmp_path).get(WF_DEF_ID, fetch)
+
+        # When
+        cache = WorkflowDefCache(path=tmp_path)
+        result = cache.get(WF_DEF_ID, fetch)
+
+        # Then
+        assert result == wf_def_response
+        fetch.assert_called_once_with()
+        assert cache.stats() == (1, 0, 1)
+
+    def test_corrupted_file_is_refetched(self, tmp_path: Path, wf_def_response):
+        # Given
+        fetch = Mock(return_value=wf_def_response)
+        _ = WorkflowDefCache(path=tmp_path).get(WF_DEF_ID, fetch)
+        (tmp_path / f"{WF_DEF_ID}.json").write_text("{not json")
+
+        # When
+        result = WorkflowDefCache(path=tmp_path).get(WF_DEF_ID, fetch)
+
+        # Then
+        assert result == wf_def_response
+        assert fetch.call_count == 2
+
+    def test_invalidate_removes_file(self, tmp_path: Path, wf_def_response):
+        # Given
+        cache = WorkflowDefCache(path=tmp_path)
+        _ = cache.get(WF_DEF_ID, Mock(return_value=wf_def_response))
+
+        # When
+        cache.invalidate(WF_DEF_ID)
+
+        # Then
+        assert list(tmp_path.iterdir()) == []
+
+
+class TestFromEnv:
+    def test_in_memory_by_default(self, monkeypatch: pytest.MonkeyPatch):
+        monkeypatch.delenv("ORQ_CE_WORKFLOW_DEF_CACHE_PATH", raising=False)
+
+        cache = WorkflowDefCache.from_env("https://foo.orquestra.io")
+
+        assert cache._path is None
+
+    def test_directory_per_cluster(
+        self, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+    ):
+        monkeypatch.setenv("ORQ_CE_WORKFLOW_DEF_CACHE_PATH", str(tmp_path))
+
+        cache = WorkflowDefCache.from_env("https://foo.orquestra.io")
+
+        assert cache._path == tmp_path / "foo.orquestra.io"
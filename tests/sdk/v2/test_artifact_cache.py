@@ -0,0 +1,399 @@
+################################################################################
+# © Copyright 2023 Zapata Computing Inc.
+################################################################################
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+from unittest.mock import Mock, create_autospec
+
+import numpy as np
+import pytest
+
+from orquestra.sdk._base import serde
+from orquestra.sdk._base._artifact_cache import (
+    ArtifactCache,
+    ArtifactReader,
+    cache_scope,
+)
+from orquestra.sdk._base.abc import RuntimeInterface
+from orquestra.sdk.schema import ir
+from orquestra.sdk.schema.configs import RuntimeName
+from orquestra.sdk.schema.workflow_run import State
+
+SCOPE = cache_scope("my_config", {"uri": "https://example.com"})
+
+
+def _result(value):
+    return serde.result_from_artifact(value, ir.ArtifactFormat.AUTO)
+
+
+def _set_state(runtime: Mock, state: State):
+    runtime.get_workflow_run_status.return_value.status.state = state
+
+
+class TestArtifactCache:
+    @pytest.fixture
+    def cache(self, tmp_path: Path):
+        return ArtifactCache(path=tmp_path / "artifacts")
+
+    class TestWorkflowOutputs:
+        def test_miss(self, cache: ArtifactCache):
+            assert cache.get_workflow_outputs(SCOPE, "wf.1") is None
+
+        def test_roundtrip(self, cache: ArtifactCache):
+            # Given
+            outputs = tuple(_result(value) for value in ["a", 1, np.eye(100), "a"])
+
+            # When
+            cache.put_workflow_outputs(SCOPE, "wf.1", outputs)
+
+            # Then
+            cached = cache.get_workflow_outputs(SCOPE, "wf.1")
+            assert cached is not None
+            assert [serde.deserialize(o) for o in cached[:2]] == ["a", 1]
+            np.testing.assert_array_equal(serde.deserialize(cached[2]), np.eye(100))
+            assert serde.deserialize(cached[3]) == "a"
+
+        def test_no_outputs(self, cache: ArtifactCache):
+            cache.put_workflow_outputs(SCOPE, "wf.1", ())
+
+            assert cache.get_workflow_outputs(SCOPE, "wf.1") == ()
+
+    class TestTaskOutputs:
+        def test_roundtrip(self, cache: ArtifactCache):
+            # Given
+            outputs = {"inv1": _result(1), "inv2": _result((2, 3))}
+
+            # When
+            cache.put_task_outputs(SCOPE, "wf.1", outputs)
+
+            # Then
+            assert cache.get_task_outputs(SCOPE, "wf.1") == outputs
+            # Workflow outputs are cached separately.
+            assert cache.get_workflow_outputs(SCOPE, "wf.1") is None
+
+        def test_raw_pickles_are_stored_as_text(self, cache: ArtifactCache):
+            # Given
+            raw = serde.result_from_artifact(np.eye(10), ir.ArtifactFormat.RAW_PICKLE5)
+
+            # When
+            cache.put_task_outputs(SCOPE, "wf.1", {"inv1": raw})
+
+            # Then
+            cached = cache.get_task_outputs(SCOPE, "wf.1")
+            assert cached is not None
+            np.testing.assert_array_equal(serde.deserialize(cached["inv1"]), np.eye(10))
+
+    class TestStats:
+        def test_empty(self, cache: ArtifactCache):
+            assert cache.stats() == (0, 0, 0, 0)
+
+        def test_hits_and_misses(self, cache: ArtifactCache):
+            # Given
+            _ = cache.get_task_outputs(SCOPE, "wf.1")
+            cache.put_task_outputs(SCOPE, "wf.1", {"inv1": _result(1)})
+
+            # When
+            for _ in range(3):
+                _ = cache.get_task_outputs(SCOPE, "wf.1")
+
+            # Then
+            stats = cache.stats()
+            assert stats.hits == 3
+            assert stats.misses == 1
+            assert stats.n_runs == 1
+            assert stats.size > 0
+
+        def test_shared_across_instances(self, cache: ArtifactCache, tmp_path: Path):
+            cache.put_task_outputs(SCOPE, "wf.1", {"inv1": _result(1)})
+            _ = cache.get_task_outputs(SCOPE, "wf.1")
+
+            assert ArtifactCache(path=tmp_path / "artifacts").stats().hits == 1
+
+    def test_identical_contents_are_stored_once(self, cache: ArtifactCache):
+        # Given
+        outputs = {"inv1": _result(np.eye(100))}
+        cache.put_task_outputs(SCOPE, "wf.1", outputs)
+        size = cache.stats().size
+
+        # When
+        cache.put_task_outputs(SCOPE, "wf.2", outputs)
+
+        # Then
+        assert cache.stats().size == size
+        assert cache.stats().n_runs == 2
+
+    def test_removed_files_are_a_miss(self, cache: ArtifactCache, tmp_path: Path):
+        # Given
+        cache.put_task_outputs(SCOPE, "wf.1", {"inv1": _result(1)})
+        for blob in (tmp_path / "artifacts" / "objects").glob("*/*"):
+            blob.unlink()
+
+        # Then
+        assert cache.get_task_outputs(SCOPE, "wf.1") is None
+        assert cache.stats().n_runs == 0
+
+    def test_evicts_least_recently_used_runs(self, tmp_path: Path):
+        # Given
+        result_size = len(_result("x" * 1000).json())
+        cache = ArtifactCache(path=tmp_path / "artifacts", max_size=3 * result_size)
+        for run_i in range(3):
+            cache.put_task_outputs(
+                SCOPE, f"wf.{run_i}", {"inv": _result(str(run_i) * 1000)}
+            )
+        # Mark "wf.0" as recently used.
+        _ = cache.get_task_outputs(SCOPE, "wf.0")
+
+        # When
+        cache.put_task_outputs(SCOPE, "wf.3", {"inv": _result("3" * 1000)})
+
+        # Then
+        assert cache.get_task_outputs(SCOPE, "wf.1") is None
+        for run_id in ["wf.0", "wf.2", "wf.3"]:
+            assert cache.get_task_outputs(SCOPE, run_id) is not None
+        assert cache.stats().size <= 3 * result_size
+
+    def test_skips_values_over_the_limit(self, tmp_path: Path):
+        # Given
+        cache = ArtifactCache(path=tmp_path / "artifacts", max_size=100)
+        cache.put_task_outputs(SCOPE, "wf.0", {"inv": _result("0")})
+
+        # When
+        cache.put_task_outputs(SCOPE, "wf.1", {"inv": _result("1" * 1000)})
+
+        # Then
+        assert cache.get_task_outputs(SCOPE, "wf.1") is None
+        # Other runs weren't evicted.
+        assert cache.get_task_outputs(SCOPE, "wf.0") is not None
+
+    def test_disabled(self, tmp_path: Path):
+        # Given
+        cache = ArtifactCache(path=tmp_path / "artifacts", max_size=0)
+
+        # When
+        cache.put_task_outputs(SCOPE, "wf.1", {"inv": _result(1)})
+
+        # Then
+        assert cache.get_task_outputs(SCOPE, "wf.1") is None
+        assert not (tmp_path / "artifacts").exists()
+
+    def test_runs_are_scoped(self, cache: ArtifactCache):
+        # Given
+        other_scope = cache_scope("other_config", {"uri": "https://example.com"})
+        cache.put_task_outputs(SCOPE, "wf.1", {"inv1": _result(1)})
+
+        # Then
+        assert cache.get_task_outputs(other_scope, "wf.1") is None
+        assert cache.get_workflow_outputs(other_scope, "wf.1") is None
+
+    def test_unscoped_index_is_dropped(self, cache: ArtifactCache, tmp_path: Path):
+        # Given
+        index_path = tmp_path / "artifacts" / "index.db"
+        index_path.parent.mkdir(parents=True)
+        blob_path = tmp_path / "artifacts" / "objects" / "ab" / "abc"
+        blob_path.parent.mkdir(parents=True)
+        blob_path.write_text("{}")
+        with closing(sqlite3.connect(index_path)) as db, db:
+            db.execute("CREATE TABLE runs (wf_run_id, kind, last_access)")
+            db.execute("INSERT INTO runs VALUES ('wf.1', 'task_outputs', 0)")
+            db.execute(
+                "CREATE TABLE artifacts (wf_run_id, kind, task_inv_id, artifact_id, "
+                "content_hash)"
+            )
+            db.execute("CREATE TABLE blobs (content_hash PRIMARY KEY, size)")
+            db.execute("INSERT INTO blobs VALUES ('abc', 2)")
+
+        # When
+        stats = cache.stats()
+
+        # Then
+        assert stats.n_runs == 0
+        assert stats.size == 0
+        assert not blob_path.exists()
+        assert cache.get_task_outputs(SCOPE, "wf.1") is None
+
+
+def test_cache_scope_ignores_credentials():
+    assert cache_scope("ce", {"uri": "https://a.com", "token": "1"}) == cache_scope(
+        "ce", {"uri": "https://a.com", "token": "2"}
+    )
+    assert cache_scope("ce", {"uri": "https://a.com"}) != cache_scope(
+        "ce", {"uri": "https://b.com"}
+    )
+    assert cache_scope("ce", {"uri": "https://a.com"}) != cache_scope(
+        "qe", {"uri": "https://a.com"}
+    )
+
+
+class TestArtifactReader:
+    @pytest.fixture
+    def runtime(self):
+        return create_autospec(RuntimeInterface)
+
+    @pytest.fixture
+    def reader(self, runtime, tmp_path: Path):
+        return ArtifactReader(runtime, ArtifactCache(path=tmp_path / "artifacts"))
+
+    class TestGetAvailableOutputs:
+        @pytest.mark.parametrize(
+            "state", [State.SUCCEEDED, State.FAILED, State.TERMINATED]
+        )
+        def test_finished_run_is_fetched_once(
+            self, runtime: Mock, reader: ArtifactReader, state: State
+        ):
+            # Given
+            _set_state(runtime, state)
+            outputs = {"inv1": _result(1)}
+            runtime.get_available_outputs.return_value = outputs
+
+            # When
+            results = [reader.get_available_outputs("wf.1") for _ in range(3)]
+
+            # Then
+            assert results == [outputs] * 3
+            runtime.get_available_outputs.assert_called_once_with("wf.1")
+
+        @pytest.mark.parametrize("state", [State.WAITING, State.RUNNING, State.ERROR])
+        def test_unfinished_run_isnt_cached(
+            self, runtime: Mock, reader: ArtifactReader, state: State
+        ):
+            # Given
+            _set_state(runtime, state)
+            runtime.get_available_outputs.return_value = {"inv1": _result(1)}
+
+            # When
+            for _ in range(2):
+                _ = reader.get_available_outputs("wf.1")
+
+            # Then
+            assert runtime.get_available_outputs.call_count == 2
+
+    class TestGetWorkflowRunOutputs:
+        def test_fetched_once(self, runtime: Mock, reader: ArtifactReader):
+            # Given
+            outputs = (_result(1), _result("2"))
+            runtime.get_workflow_run_outputs_non_blocking.return_value = outputs
+
+            # When
+            results = [
+                reader.get_workflow_run_outputs_non_blocking("wf.1") for _ in range(3)
+            ]
+
+            # Then
+            assert results == [outputs] * 3
+            runtime.get_workflow_run_outputs_non_blocking.assert_called_once_with(
+                "wf.1"
+            )
+
+        def test_errors_are_passed_through(self, runtime: Mock, reader: ArtifactReader):
+            # Given
+            runtime.get_workflow_run_outputs_non_blocking.side_effect = RuntimeError
+
+            # Then
+            with pytest.raises(RuntimeError):
+                _ = reader.get_workflow_run_outputs_non_blocking("wf.1")
+
+    class TestGetOutputs:
+        def test_served_from_cached_task_outputs(
+            self, runtime: Mock, reader: ArtifactReader
+        ):
+            # Given
+            _set_state(runtime, State.SUCCEEDED)
+            outputs = {"inv1": _result(1), "inv2": _result(2)}
+            runtime.get_available_outputs.return_value = outputs
+            _ = reader.get_available_outputs("wf.1")
+
+            # When
+            results = reader.get_outputs("wf.1", ["inv2", "inv3"])
+
+            # Then
+            assert results == {"inv2": outputs["inv2"]}
+            runtime.get_outputs.assert_not_called()
+
+        def test_passed_through_on_miss(self, runtime: Mock, reader: ArtifactReader):
+            # When
+            results = reader.get_outputs("wf.1", ["inv2"])
+
+            # Then
+            assert results == runtime.get_outputs.return_value
+            runtime.get_outputs.assert_called_once_with("wf.1", ["inv2"])
+
+    @pytest.mark.parametrize("cache_path", [None, "disabled"])
+    def test_without_cache(self, runtime: Mock, tmp_path: Path, cache_path):
+        # Given
+        cache = (
+            ArtifactCache(path=tmp_path / "artifacts", max_size=0)
+            if cache_path
+            else None
+        )
+        reader = ArtifactReader(runtime, cache)
+        _set_state(runtime, State.SUCCEEDED)
+
+        # When
+        for _ in range(2):
+            _ = reader.get_workflow_run_outputs_non_blocking("wf.1")
+            _ = reader.get_available_outputs("wf.1")
+            _ = reader.get_outputs("wf.1", ["inv1"])
+
+        # Then
+        assert runtime.get_workflow_run_outputs_non_blocking.call_count == 2
+        assert runtime.get_available_outputs.call_count == 2
+        assert runtime.get_outputs.call_count == 2
+        assert not (tmp_path / "artifacts").exists()
+
+    @pytest.mark.parametrize(
+        "runtime_name, cached",
+        [
+            (None, False),
+            (RuntimeName.IN_PROCESS, False),
+            (RuntimeName.RAY_LOCAL, True),
+            (RuntimeName.CE_REMOTE, True),
+        ],
+    )
+    def test_for_config(
+        self,
+        runtime: Mock,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+        runtime_name,
+        cached: bool,
+    ):
+        # Given
+        monkeypatch.setenv("ORQ_ARTIFACT_CACHE_PATH", str(tmp_path / "artifacts"))
+        reader = ArtifactReader.for_config(
+            runtime, runtime_name, "my_config", {"uri": "https://example.com"}
+        )
+        runtime.get_workflow_run_outputs_non_blocking.return_value = (_result(1),)
+
+        # When
+        for _ in range(2):
+            _ = reader.get_workflow_run_outputs_non_blocking("wf.1")
+
+        # Then
+        assert runtime.get_workflow_run_outputs_non_blocking.call_count == (
+            1 if cached else 2
+        )
+
+    def test_configs_dont_share_runs(
+        self, runtime: Mock, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ):
+        # Given
+        monkeypatch.setenv("ORQ_ARTIFACT_CACHE_PATH", str(tmp_path / "artifacts"))
+        readers = [
+            ArtifactReader.for_config(
+                runtime, RuntimeName.CE_REMOTE, "ce", {"uri": f"https://{host}"}
+            )
+            for host in ("a.com", "b.com")
+        ]
+        runtime.get_workflow_run_outputs_non_blocking.side_effect = [
+            (_result("a"),),
+            (_result("b"),),
+        ]
+
+        # When
+        results = [
+            reader.get_workflow_run_outputs_non_blocking("wf.1") for reader in readers
+        ]
+
+        # Then
+        assert results == [(_result("a"),), (_result("b"),)]
@@ -156,6 +156,21 @@ class TestQueriesAfterRunning:
                     ),
                 }
 
+    class TestGetOutputs:
+        @staticmethod
+        def test_selected_invocation(runtime, run_id):
+            assert runtime.get_outputs(
+                run_id, ["invocation-0-task-sum-tuple-numbers"]
+            ) == {
+                "invocation-0-task-sum-tuple-numbers": serde.result_from_artifact(
+                    3, ir.ArtifactFormat.AUTO
+                )
+            }
+
+        @staticmethod
+        def test_unknown_invocation(runtime, run_id):
+            assert runtime.get_outputs(run_id, ["not-an-invocation"]) == {}
+
 
 class TestStop:
     @staticmethod
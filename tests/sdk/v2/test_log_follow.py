@@ -0,0 +1,84 @@
+################################################################################
+# © Copyright 2023 Zapata Computing Inc.
+################################################################################
+from unittest.mock import Mock
+
+import pytest
+
+from orquestra.sdk._base import _log_follow
+from orquestra.sdk.schema.workflow_run import State
+
+
+class TestIsFinished:
+    @staticmethod
+    @pytest.mark.parametrize(
+        "state,expected",
+        [
+            (State.WAITING, False),
+            (State.RUNNING, False),
+            (State.SUCCEEDED, True),
+            (State.FAILED, True),
+            (State.TERMINATED, True),
+        ],
+    )
+    def test_states(state: State, expected: bool):
+        runtime = Mock()
+        runtime.get_workflow_run_states.return_value = {"wf.1": state}
+
+        assert _log_follow.is_finished(runtime, "wf.1") is expected
+        runtime.get_workflow_run_states.assert_called_once_with(["wf.1"])
+
+
+class TestPollLogs:
+    @staticmethod
+    @pytest.fixture(autouse=True)
+    def no_sleep(monkeypatch: pytest.MonkeyPatch):
+        monkeypatch.setattr(_log_follow, "LOGS_POLL_INTERVAL", 0)
+
+    @staticmethod
+    def test_without_follow():
+        # Given
+        read_logs = Mock(return_value=[("inv1", "line 1"), ("inv2", "line 2")])
+        is_finished = Mock()
+
+        # When
+        logs = list(
+            _log_follow.poll_logs(read_logs, follow=False, is_finished=is_finished)
+        )
+
+        # Then
+        assert logs == [("inv1", "line 1"), ("inv2", "line 2")]
+        read_logs.assert_called_once()
+        is_finished.assert_not_called()
+
+    @staticmethod
+    def test_follow_yields_only_new_lines():
+        # Given
+        read_logs = Mock(
+            side_effect=[
+                [("inv1", "line 1")],
+                [("inv1", "line 1")],
+                [("inv1", "line 1"), ("inv2", "line 2"), ("inv1", "line 3")],
+            ]
+        )
+        is_finished = Mock(side_effect=[False, False, True])
+
+        # When
+        logs = list(
+            _log_follow.poll_logs(read_logs, follow=True, is_finished=is_finished)
+        )
+
+        # Then
+        assert logs == [("inv1", "line 1"), ("inv2", "line 2"), ("inv1", "line 3")]
+        assert read_logs.call_count == 3
+
+    @staticmethod
+    def test_is_lazy():
+        # Given
+        read_logs = Mock(return_value=[])
+
+        # When
+        _ = _log_follow.poll_logs(read_logs, follow=True, is_finished=Mock())
+
+        # Then
+        read_logs.assert_not_called()
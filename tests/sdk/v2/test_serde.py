@@ -1,7 +1,10 @@
 ################################################################################
 # © Copyright 2022 Zapata Computing Inc.
 ################################################################################
+import binascii
 import json
+import pickle
+import typing as t
 
 import numpy as np
 import numpy.testing
@@ -11,7 +14,7 @@ from pydantic.error_wrappers import ValidationError
 import orquestra.sdk as sdk
 from orquestra.sdk._base import serde
 from orquestra.sdk.schema import ir
-from orquestra.sdk.schema.responses import JSONResult
+from orquestra.sdk.schema.responses import JSONResult, RawPickleResult
 
 ROUNDTRIP_EXAMPLES = [
     None,
@@ -72,6 +75,59 @@ class TestResultFromArtifact:
             _ = serde.value_from_result_dict(result)
 
 
+class TestRawPickle5:
+    @pytest.mark.parametrize("artifact", [*ROUNDTRIP_EXAMPLES, set(), np.eye(100)])
+    def test_roundtrip(self, artifact):
+        result = serde.result_from_artifact(artifact, ir.ArtifactFormat.RAW_PICKLE5)
+
+        assert isinstance(result, RawPickleResult)
+        np.testing.assert_equal(serde.deserialize(result), artifact)
+
+    def test_array_data_is_kept_out_of_band(self):
+        # Given
+        array = np.arange(100_000, dtype=np.float64)
+
+        # When
+        result = serde.result_from_artifact(array, ir.ArtifactFormat.RAW_PICKLE5)
+
+        # Then
+        assert isinstance(result, RawPickleResult)
+        assert len(result.buffers) == 1
+        assert memoryview(result.buffers[0]).nbytes == array.nbytes
+        # The array data isn't copied into the pickle stream.
+        assert len(result.pickle) < array.nbytes
+
+    def test_survives_pickling(self):
+        # Ray pickles task outputs with protocol 5 when moving them between workers.
+        array = np.eye(100)
+        result = serde.result_from_artifact(array, ir.ArtifactFormat.RAW_PICKLE5)
+
+        unpickled = pickle.loads(pickle.dumps(result, protocol=5))
+
+        np.testing.assert_array_equal(serde.deserialize(unpickled), array)
+
+    def test_to_text_result(self):
+        # Given
+        array = np.eye(100)
+        result = serde.result_from_artifact(array, ir.ArtifactFormat.RAW_PICKLE5)
+
+        # When
+        text_result = serde.to_text_result(result)
+
+        # Then
+        assert text_result.serialization_format == ir.ArtifactFormat.ENCODED_PICKLE
+        retrieved = serde.value_from_result_dict(json.loads(text_result.json()))
+        np.testing.assert_array_equal(retrieved, array)
+
+    @pytest.mark.parametrize(
+        "artifact_format", [ir.ArtifactFormat.JSON, ir.ArtifactFormat.ENCODED_PICKLE]
+    )
+    def test_to_text_result_passes_text_results_through(self, artifact_format):
+        result = serde.result_from_artifact([1, 2, 3], artifact_format)
+
+        assert serde.to_text_result(result) is result
+
+
 def test_deserialization_fails_for_auto_format():
     json_dict = {
         "serialization_format": ir.ArtifactFormat.AUTO.value,
@@ -94,6 +150,34 @@ def test_deserialize_constant_pickle():
     np.testing.assert_array_equal(serde.deserialize_constant(constant), array)
 
 
+class TestDeserializePickle:
+    @pytest.mark.parametrize("chunk_size", [1, 3, 77, 1000, 40_000])
+    def test_any_chunk_boundaries(self, chunk_size):
+        # Given
+        array = np.arange(10_000)
+        encoded = "".join(serde._encoded_pickle_chunks(array))
+        chunks = [
+            encoded[i : i + chunk_size] for i in range(0, len(encoded), chunk_size)
+        ]
+
+        # When
+        retrieved = serde.deserialize_pickle(chunks)
+
+        # Then
+        np.testing.assert_array_equal(retrieved, array)
+
+    def test_empty_chunks_are_skipped(self):
+        chunks = ["", *serde._encoded_pickle_chunks("hello"), ""]
+
+        assert serde.deserialize_pickle(chunks) == "hello"
+
+    def test_truncated_data(self):
+        encoded = "".join(serde._encoded_pickle_chunks("hello")).strip()
+
+        with pytest.raises(binascii.Error):
+            _ = serde.deserialize_pickle([encoded[:-1]])
+
+
 def test_roundtrip_function_serialize():
     def fun():
         return "hello there"
@@ -118,6 +202,29 @@ def test_tuple_magic():
     assert result_dict["__values__"] == [1, 2, 3]
 
 
+class TestJSONResultFromParts:
+    @pytest.mark.parametrize("container", [tuple, list])
+    def test_same_as_serializing_whole_value(self, container):
+        # Given
+        values = container([1, (2, "3"), {"4": [5.0, None]}])
+        parts: t.List[JSONResult] = []
+        for value in values:
+            part = serde.result_from_artifact(value, ir.ArtifactFormat.JSON)
+            assert isinstance(part, JSONResult)
+            parts.append(part)
+
+        # When
+        result = serde.json_result_from_parts(parts, container)
+
+        # Then
+        assert result == serde.result_from_artifact(values, ir.ArtifactFormat.JSON)
+        assert serde.deserialize(result) == values
+
+    def test_other_containers(self):
+        with pytest.raises(ValueError):
+            _ = serde.json_result_from_parts([], set)  # type: ignore[arg-type]
+
+
 @pytest.mark.parametrize(
     "package_spec, expected",
     [
@@ -69,6 +69,11 @@ def increment(number):
     return number + 1
 
 
+@_dsl.task()
+def identity(value: t.Any):
+    return value
+
+
 @_dsl.task(source_import=_dsl.GitImport(repo_url="hello", git_ref="main"))
 def git_task():
     pass
@@ -1339,3 +1344,86 @@ class TestGraphTraversal:
                 artifact_index=None,
             ),
         ]
+
+    @staticmethod
+    def test_shared_nodes_are_visited_once():
+        # Given
+        @_workflow.workflow
+        def wf():
+            text = capitalize("hello")
+            return [capitalize(text) for _ in range(3)] + [text, "hello"]
+
+        futures = _traversal.extract_root_futures(wf())
+
+        # When
+        nodes = list(_traversal._iter_nodes(futures))
+
+        # Then
+        # 4 futures and a single constant.
+        assert len(nodes) == 5
+        assert len({id(node) for node in nodes}) == 5
+
+    @staticmethod
+    def test_equal_constants_share_a_node():
+        # Given
+        @_workflow.workflow
+        def wf():
+            return [
+                identity([1, 2]),
+                identity([1, 2]),
+                identity(1),
+                identity(1.0),
+                identity(True),
+            ]
+
+        graph = _traversal.GraphTraversal()
+
+        # When
+        graph.traverse(_traversal.extract_root_futures(wf()))
+
+        # Then
+        constants = list(graph.constants)
+        json_constants = [c for c in constants if isinstance(c, ir.ConstantNodeJSON)]
+        assert json_constants == constants
+        # Equal lists are serialized to the same value. 1, 1.0, and True are not.
+        assert [c.value for c in json_constants] == ["true", "1.0", "1", "[1, 2]"]
+        assert [c.id for c in constants] == [
+            "constant-0",
+            "constant-1",
+            "constant-2",
+            "constant-3",
+        ]
+
+    @staticmethod
+    def test_constants_are_serialized_once(monkeypatch):
+        # Given
+        serialize = Mock(wraps=_traversal._serialize_constant)
+        monkeypatch.setattr(_traversal, "_serialize_constant", serialize)
+
+        @_workflow.workflow
+        def wf():
+            return [capitalize("hello") for _ in range(10)]
+
+        # When
+        model = wf().model
+
+        # Then
+        assert len(model.constant_nodes) == 1
+        serialize.assert_called_once_with("hello")
+
+    @staticmethod
+    def test_tasks_are_resolved_once(monkeypatch):
+        # Given
+        resolve = Mock(wraps=capitalize._resolve_task_source_data)
+        monkeypatch.setattr(capitalize, "_resolve_task_source_data", resolve)
+
+        @_workflow.workflow
+        def wf():
+            return [capitalize(str(i)) for i in range(10)]
+
+        # When
+        model = wf().model
+
+        # Then
+        assert len(model.task_invocations) == 10
+        assert resolve.call_count == 1
@@ -1,13 +1,17 @@
 ################################################################################
 # © Copyright 2022-2023 Zapata Computing Inc.
 ################################################################################
+import importlib
+import sys
+import threading
 import typing as t
 from pathlib import Path
+from unittest.mock import Mock
 
 import pytest
 
 import orquestra.sdk as sdk
-from orquestra.sdk._base import _workflow, loader
+from orquestra.sdk._base import _traversal, _workflow, _workflow_model_cache, loader
 from orquestra.sdk._base._dsl import InvalidPlaceholderInCustomTaskNameError
 from orquestra.sdk.exceptions import WorkflowSyntaxError
 from orquestra.sdk.schema import ir
@@ -32,7 +36,7 @@ def _simple_workflow():
 
 
 @sdk.workflow
-def _parametrized_workflow(a: int):
+def _parametrized_workflow(a: t.Any):
     return [_task_with_args(a)]
 
 
@@ -396,3 +400,148 @@ def test_default_dependency_imports(dependency_imports, expected_imports):
         pass
 
     assert my_workflow._default_dependency_imports == expected_imports
+
+
+class TestModelCaching:
+    @pytest.fixture
+    def flatten_graph(self, monkeypatch):
+        flatten_graph = Mock(wraps=_traversal.flatten_graph)
+        monkeypatch.setattr(_traversal, "flatten_graph", flatten_graph)
+        return flatten_graph
+
+    @staticmethod
+    def test_model_is_built_once(flatten_graph: Mock):
+        # Given
+        wf_def = _parametrized_workflow(1)
+
+        # When
+        models = [wf_def.model for _ in range(3)]
+
+        # Then
+        assert models[0] is models[1] is models[2]
+        assert flatten_graph.call_count == 1
+
+    @staticmethod
+    def test_changing_default_imports_rebuilds_the_model(flatten_graph: Mock):
+        # Given
+        wf_def = _parametrized_workflow(1)
+        _ = wf_def.model
+
+        # When
+        wf_def.default_dependency_imports = (sdk.PythonImports("abc"),)
+        model = wf_def.model
+
+        # Then
+        assert flatten_graph.call_count == 2
+        assert any(
+            isinstance(imp, ir.PythonImports) and imp.packages[0].name == "abc"
+            for imp in model.imports.values()
+        )
+
+    @staticmethod
+    def test_with_resources_has_its_own_model():
+        # Given
+        wf_def = _parametrized_workflow(1)
+        _ = wf_def.model
+
+        # When
+        model = wf_def.with_resources(cpu="10").model
+
+        # Then
+        assert wf_def.model.resources is None
+        assert model.resources is not None
+        assert model.resources.cpu == "10"
+
+    @staticmethod
+    def test_model_with_git_imports_is_rebuilt(flatten_graph: Mock):
+        # Given
+        wf_def = _parametrized_workflow(1)
+        wf_def.default_source_import = sdk.GitImport(repo_url="abc", git_ref="xyz")
+        _ = wf_def.model
+
+        # When
+        _ = wf_def.model
+
+        # Then
+        assert flatten_graph.call_count == 2
+
+    class TestOnDisk:
+        @pytest.fixture
+        def cache_path(self, monkeypatch, tmp_path: Path):
+            cache_path = tmp_path / "models"
+            monkeypatch.setenv("ORQ_WORKFLOW_MODEL_CACHE_PATH", str(cache_path))
+            return cache_path
+
+        @pytest.fixture
+        def wf_module(self, monkeypatch, tmp_path: Path):
+            module_path = tmp_path / "cached_wf_module.py"
+            module_path.write_text(
+                "import orquestra.sdk as sdk\n\n"
+                "@sdk.task\n"
+                "def add_one(a):\n"
+                "    return a + 1\n\n"
+                "@sdk.workflow\n"
+                "def wf(a):\n"
+                "    return [add_one(a)]\n"
+            )
+            monkeypatch.syspath_prepend(str(tmp_path))
+            module = importlib.import_module("cached_wf_module")
+            yield module
+            sys.modules.pop("cached_wf_module", None)
+
+        @staticmethod
+        def test_reused_across_workflow_defs(
+            flatten_graph: Mock, cache_path: Path, wf_module
+        ):
+            # Given
+            model = wf_module.wf(1).model
+
+            # When
+            cached = wf_module.wf(1).model
+            other_args = wf_module.wf(2).model
+
+            # Then
+            assert cached == model
+            assert other_args != model
+            assert flatten_graph.call_count == 2
+            assert len(list(cache_path.glob("*.json"))) == 2
+
+        @staticmethod
+        def test_changed_task_source_is_a_miss(
+            flatten_graph: Mock, cache_path: Path, wf_module, tmp_path: Path
+        ):
+            # Given
+            _ = wf_module.wf(1).model
+            task_file = tmp_path / "cached_wf_module.py"
+            task_file.write_text(task_file.read_text() + "\n# changed\n")
+
+            # When
+            _ = wf_module.wf(1).model
+
+            # Then
+            assert flatten_graph.call_count == 2
+
+        @staticmethod
+        def test_inline_tasks_arent_cached(cache_path: Path):
+            # Given
+            @sdk.task(source_import=sdk.InlineImport())
+            def inline_task():
+                return 1
+
+            @sdk.workflow
+            def wf():
+                return [inline_task()]
+
+            # When
+            _ = wf().model
+
+            # Then
+            assert not cache_path.exists()
+
+        @staticmethod
+        def test_unpicklable_args_arent_cached(cache_path: Path):
+            # Given
+            wf_def = _parametrized_workflow(threading.Lock())
+
+            # Then
+            assert _workflow_model_cache.cache_key(wf_def) is None